@@ -0,0 +1,60 @@
+"""Add video_generation_jobs table for queued video rendering.
+
+Revision ID: 007_video_generation_jobs
+Revises: 006_compose_fields
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007_video_generation_jobs"
+down_revision: Union[str, None] = "006_compose_fields"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "video_generation_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "video_project_id",
+            sa.String(36),
+            sa.ForeignKey("video_projects.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column("job_type", sa.String(30), nullable=False, server_default="per_scene"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("params", sa.JSON, nullable=True),
+        sa.Column("total_scenes", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("completed_scenes", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("failed_scenes", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer, nullable=False, server_default="3"),
+        sa.Column("worker_id", sa.String(100), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime, nullable=True),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+        sa.Column("error_message", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, nullable=False, server_default=sa.func.now(), onupdate=sa.func.now()),
+    )
+
+    # Workers claim the oldest queued job first
+    op.create_index(
+        "ix_video_generation_jobs_status_created",
+        "video_generation_jobs",
+        ["status", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_video_generation_jobs_status_created", table_name="video_generation_jobs")
+    op.drop_table("video_generation_jobs")
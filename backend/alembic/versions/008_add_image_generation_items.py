@@ -0,0 +1,59 @@
+"""Add image_generation_items table for persistent batch progress.
+
+Revision ID: 008_image_generation_items
+Revises: 007_video_generation_jobs
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008_image_generation_items"
+down_revision: Union[str, None] = "007_video_generation_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "image_generation_items",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "image_project_id",
+            sa.String(36),
+            sa.ForeignKey("image_projects.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column("batch_id", sa.String(50), nullable=False),
+        sa.Column("slide_number", sa.Integer, nullable=False),
+        sa.Column("variant_index", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("retry_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column(
+            "generated_image_id",
+            sa.String(36),
+            sa.ForeignKey("generated_images.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("error_message", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, nullable=False, server_default=sa.func.now(), onupdate=sa.func.now()),
+    )
+
+    op.create_index(
+        "ix_image_generation_items_batch",
+        "image_generation_items",
+        ["batch_id", "slide_number", "variant_index"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_image_generation_items_batch", table_name="image_generation_items")
+    op.drop_table("image_generation_items")
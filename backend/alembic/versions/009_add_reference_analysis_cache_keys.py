@@ -0,0 +1,34 @@
+"""Add result cache keys to reference_analyses.
+
+Revision ID: 009_reference_analysis_cache
+Revises: 008_image_generation_items
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "009_reference_analysis_cache"
+down_revision: Union[str, None] = "008_image_generation_items"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("reference_analyses", sa.Column("canonical_url_hash", sa.String(64), nullable=True))
+    op.add_column("reference_analyses", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("reference_analyses", sa.Column("analyzed_at", sa.DateTime, nullable=True))
+    op.create_index("ix_reference_analyses_canonical_url_hash", "reference_analyses", ["canonical_url_hash"])
+    op.create_index("ix_reference_analyses_content_hash", "reference_analyses", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reference_analyses_content_hash", table_name="reference_analyses")
+    op.drop_index("ix_reference_analyses_canonical_url_hash", table_name="reference_analyses")
+    op.drop_column("reference_analyses", "analyzed_at")
+    op.drop_column("reference_analyses", "content_hash")
+    op.drop_column("reference_analyses", "canonical_url_hash")
@@ -269,12 +269,10 @@ async def upload_product_image(
     # Read file content
     image_data = await file.read()
 
-    # Upload to cloud storage
-    ext = file.filename.split(".")[-1] if file.filename else "png"
-    filename = f"{product_id}.{ext}"
+    # Upload to cloud storage (stored under its content hash, so re-uploads are free)
     content_type = file.content_type or "image/jpeg"
-    image_url = cloud_storage.upload_bytes(image_data, filename, "products", content_type)
-    logger.info(f"Product image uploaded: {filename}, url: {image_url}")
+    image_url = await cloud_storage.upload_deduplicated_async(image_data, "products", content_type)
+    logger.info(f"Product image uploaded for {product_id}, url: {image_url}")
 
     # Analyze image with Gemini Vision
     try:
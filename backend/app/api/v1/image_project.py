@@ -4,23 +4,36 @@ ImageProject API endpoints for the AI Video Marketing Platform.
 Provides CRUD operations for image projects and image generation.
 """
 
+import asyncio
 import logging
 import time
 import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+import httpx
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.file_responses import local_file_response, proxy_remote_file
+from app.core.http_client import get_http_client
 from app.services.cloud_storage import cloud_storage
+from app.services.image_cache import get_image_cache
+from app.services.zip_export import ZipEntry, stream_zip
 from app.models.image_project import ImageProject
 from app.models.generated_image import GeneratedImage
+from app.models.image_generation_item import ImageGenerationItem
 from app.models.product import Product
+from app.services.batch_image_generator import (
+    BatchCancelledError,
+    BatchJobStatus,
+    get_batch_image_generator,
+)
+from app.services.slide_scheduler import SlideVariantTask, build_slide_tasks
 from app.schemas.image_project import (
     ImageProjectCreate,
     ImageProjectUpdate,
@@ -42,6 +55,8 @@ from app.schemas.image_project import (
     GenerateSingleSectionResponse,
     RegenerateRequest,
     RegenerateSectionResponse,
+    ImageGenerationItemResponse,
+    ImageGenerationProgressResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -51,60 +66,34 @@ router = APIRouter(prefix="/image-projects", tags=["Image Projects"])
 
 # ========== Helper Functions ==========
 
-async def load_image_from_url(image_url: str, settings) -> tuple[bytes, str] | tuple[None, None]:
+async def load_image_from_url(
+    image_url: str,
+    settings,
+    client: Optional[httpx.AsyncClient] = None,
+) -> tuple[bytes, str] | tuple[None, None]:
     """
     Load image from various URL formats (local, localhost, cloud).
     Returns (image_bytes, mime_type) or (None, None) if failed.
-    """
-    import os
-    import httpx
 
+    Loads go through the shared image cache, so product and reference images
+    reused across projects are served from memory. Remote images are fetched
+    with the given client, or the shared pooled client.
+    """
     if not image_url:
         return None, None
 
-    image_data = None
     mime_type = "image/png" if ".png" in image_url.lower() else "image/jpeg"
 
     try:
-        # 1. localhost URL → local path
-        if image_url.startswith("http://localhost:8000/static/"):
-            relative_path = image_url.replace("http://localhost:8000/static/", "")
-            image_path = os.path.join(settings.TEMP_DIR, relative_path)
-            if os.path.exists(image_path):
-                with open(image_path, "rb") as f:
-                    image_data = f.read()
-                logger.info(f"Loaded image from localhost path: {image_path} ({len(image_data)} bytes)")
-
-        # 2. Relative static URL → local path
-        elif image_url.startswith("/static/"):
-            image_path = os.path.join(settings.TEMP_DIR, image_url.replace("/static/", ""))
-            if os.path.exists(image_path):
-                with open(image_path, "rb") as f:
-                    image_data = f.read()
-                logger.info(f"Loaded image from static path: {image_path} ({len(image_data)} bytes)")
-
-        # 3. Cloud/External URL → download
-        elif image_url.startswith("http"):
-            logger.info(f"Downloading image from cloud: {image_url}")
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_url, timeout=30.0)
-                if response.status_code == 200:
-                    image_data = response.content
-                    logger.info(f"Downloaded image: {len(image_data)} bytes")
-                else:
-                    logger.warning(f"Failed to download image: HTTP {response.status_code}")
-
-        # 4. Direct file path
-        else:
-            if os.path.exists(image_url):
-                with open(image_url, "rb") as f:
-                    image_data = f.read()
-                logger.info(f"Loaded image from path: {image_url} ({len(image_data)} bytes)")
-
+        image_data, _ = await get_image_cache().load(image_url, client=client)
     except Exception as e:
         logger.error(f"Error loading image from {image_url}: {e}")
+        return None, None
 
-    return image_data, mime_type if image_data else (None, None)
+    if not image_data:
+        logger.warning(f"Could not load image: {image_url}")
+        return None, None
+    return image_data, mime_type
 
 
 # ========== CRUD Operations ==========
@@ -137,13 +126,13 @@ async def create_image_project(
             try:
                 # Decode base64
                 image_bytes = base64.b64decode(img_data.data)
-                ext = "jpg" if "jpeg" in img_data.mime_type else img_data.mime_type.split("/")[-1]
-                filename = f"{project_id}_ref_{idx}.{ext}"
-                content_type = img_data.mime_type
 
-                ref_url = cloud_storage.upload_bytes(image_bytes, filename, "references", content_type)
+                # Identical reference images are stored once and shared across projects
+                ref_url = await cloud_storage.upload_deduplicated_async(
+                    image_bytes, "references", img_data.mime_type
+                )
                 reference_image_urls.append(ref_url)
-                logger.info(f"Uploaded reference image: {filename}, url: {ref_url}")
+                logger.info(f"Uploaded reference image {idx}, url: {ref_url}")
             except Exception as e:
                 logger.error(f"Failed to upload reference image {idx}: {e}")
 
@@ -312,7 +301,6 @@ async def generate_images(
     """Generate images for a project slide."""
     from app.services.video_generator.image_generator import get_image_generator
     from app.services.image_editor import get_image_editor
-    import base64
     import os
     from app.core.config import settings
 
@@ -420,9 +408,9 @@ PRODUCT INTEGRATION INSTRUCTIONS:
             if image_data:
                 ext = "png" if "png" in result_mime_type else "jpg"
                 filename = f"{uuid.uuid4()}.{ext}"
-                image_bytes = base64.b64decode(image_data)
+                image_bytes = image_data.to_bytes()
                 content_type = "image/png" if ext == "png" else "image/jpeg"
-                image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
+                image_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "generated", content_type)
                 logger.info(f"Uploaded image: {filename}, size: {len(image_bytes)} bytes, url: {image_url}")
             else:
                 image_url = f"/placeholder-{project_id}-{request.slide_number}-{variant_idx}.jpg"
@@ -539,7 +527,6 @@ async def generate_section(
     """
     from app.services.video_generator.image_generator import get_image_generator
     from app.services.image_editor import get_image_editor
-    import base64
     import os
     from app.core.config import settings
 
@@ -696,9 +683,9 @@ PRODUCT INTEGRATION INSTRUCTIONS:
             if image_data:
                 ext = "png" if "png" in result_mime_type else "jpg"
                 filename = f"{uuid.uuid4()}.{ext}"
-                image_bytes = base64.b64decode(image_data)
+                image_bytes = image_data.to_bytes()
                 content_type = "image/png" if ext == "png" else "image/jpeg"
-                image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
+                image_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "generated", content_type)
                 logger.info(f"Uploaded image: {filename}, size: {len(image_bytes)} bytes, url: {image_url}")
             else:
                 image_url = f"/placeholder-{project_id}-{request.slide_number}-{variant_idx}.jpg"
@@ -826,7 +813,6 @@ async def regenerate_section(
     """
     from app.services.video_generator.image_generator import get_image_generator
     from app.services.image_editor import get_image_editor
-    import base64
     import os
     from app.core.config import settings
 
@@ -1002,9 +988,9 @@ PRODUCT INTEGRATION INSTRUCTIONS:
             if image_data:
                 ext = "png" if "png" in result_mime_type else "jpg"
                 filename = f"{uuid.uuid4()}.{ext}"
-                image_bytes = base64.b64decode(image_data)
+                image_bytes = image_data.to_bytes()
                 content_type = "image/png" if ext == "png" else "image/jpeg"
-                image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
+                image_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "generated", content_type)
                 logger.info(f"Uploaded image: {filename}, size: {len(image_bytes)} bytes, url: {image_url}")
             else:
                 image_url = f"/placeholder-{project_id}-{slide_number}-{variant_idx}.jpg"
@@ -1062,24 +1048,21 @@ async def _run_compose_generation(project, db, settings):
     Uses uploaded images and enhanced prompt to generate composed image.
     """
     from app.services.image_editor import get_image_editor
-    import httpx
     import os
 
     logger.info(f"Starting compose generation for project {project.id}")
 
     async def load_image_from_temp_id(temp_id: str) -> tuple:
-        """Load image from COS by temp_id."""
-        # Try to load from COS (temp_id is UUID, file is in COS temp folder)
+        """Load image from storage by temp_id."""
+        # temp_id is UUID, file is in the storage temp folder (immutable, so cached)
         for ext in ["png", "jpg", "jpeg", "webp"]:
-            cos_url = f"https://{settings.TENCENT_COS_BUCKET}.cos.{settings.TENCENT_COS_REGION}.myqcloud.com/temp/{temp_id}.{ext}"
-            try:
-                async with httpx.AsyncClient() as client:
-                    resp = await client.get(cos_url)
-                    if resp.status_code == 200:
-                        mime_type = f"image/{ext}" if ext != "jpg" else "image/jpeg"
-                        return (resp.content, mime_type)
-            except Exception:
-                continue
+            key = f"temp/{temp_id}.{ext}"
+            data, _ = await get_image_cache().get_or_load(
+                f"storage:{key}", lambda: cloud_storage.read_range_async(key)
+            )
+            if data is not None:
+                mime_type = f"image/{ext}" if ext != "jpg" else "image/jpeg"
+                return (data, mime_type)
         return (None, None)
 
     try:
@@ -1116,16 +1099,13 @@ async def _run_compose_generation(project, db, settings):
         if gen_result and gen_result.get("image_data"):
             # Upload image to COS
             from app.services.cloud_storage import cloud_storage
-            import base64
 
-            # image_data is base64 string, decode to bytes
-            image_data_base64 = gen_result["image_data"]
-            image_data = base64.b64decode(image_data_base64)
+            image_data = gen_result["image_data"].to_bytes()
             mime_type = gen_result.get("mime_type", "image/png")
             ext = "png" if "png" in mime_type else "jpg"
             filename = f"{project.id}_compose.{ext}"
 
-            image_url = cloud_storage.upload_bytes(image_data, filename, "generated", mime_type)
+            image_url = await cloud_storage.upload_bytes_async(image_data, filename, "generated", mime_type)
             logger.info(f"Compose image uploaded: {image_url}")
 
             # Create generated image record
@@ -1156,15 +1136,60 @@ async def _run_compose_generation(project, db, settings):
         await db.commit()
 
 
-async def run_background_image_generation(project_id: str):
+# Variants generated per slide by background generation
+BACKGROUND_NUM_VARIANTS = 2
+
+
+async def create_generation_items(
+    db: AsyncSession,
+    project_id: str,
+    slide_count: int,
+    commit: bool = True,
+) -> str:
+    """
+    Create the pending ImageGenerationItem rows of a new batch.
+
+    Returns:
+        The new batch ID.
+    """
+    batch_id = f"batch-{uuid.uuid4().hex[:12]}"
+    for task in build_slide_tasks(slide_count, BACKGROUND_NUM_VARIANTS, chained=False):
+        db.add(ImageGenerationItem(
+            id=str(uuid.uuid4()),
+            image_project_id=project_id,
+            batch_id=batch_id,
+            slide_number=task.slide_number,
+            variant_index=task.variant_index,
+            status=BatchJobStatus.PENDING.value,
+        ))
+    if commit:
+        await db.commit()
+    return batch_id
+
+
+async def get_latest_batch_id(db: AsyncSession, project_id: str) -> Optional[str]:
+    """Get the ID of the most recent background generation batch of a project."""
+    result = await db.execute(
+        select(ImageGenerationItem.batch_id)
+        .where(ImageGenerationItem.image_project_id == project_id)
+        .order_by(ImageGenerationItem.created_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def run_background_image_generation(project_id: str, batch_id: Optional[str] = None):
     """
     Background task to generate all images for a project.
     Similar to reference analysis background processing.
+
+    Runs as one BatchImageGenerator batch: slide variants are generated
+    concurrently, carousel variants wait only for the same variant of the
+    previous slide, and per-item progress is stored as ImageGenerationItem rows.
     """
     from app.services.video_generator.image_generator import get_image_generator
     from app.services.image_editor import get_image_editor
     from app.core.database import async_session_factory
-    import base64
     import os
     from app.core.config import settings
 
@@ -1231,17 +1256,12 @@ async def run_background_image_generation(project_id: str):
             total_slides = len(slides)
             generated_count = 0
             is_carousel = project.content_type == "carousel"
+            num_variants = BACKGROUND_NUM_VARIANTS
 
-            # For carousel: store previous slide images by variant index for continuity
-            # prev_variant_images[variant_idx] = (image_bytes, mime_type)
-            prev_variant_images: dict = {}
-
-            # Generate images for each slide
+            # Build prompts for every slide up front
+            slide_prompts: dict = {}
             for slide_idx, slide_data in enumerate(slides):
                 slide_number = slide_idx + 1
-                project.current_slide = slide_number
-                await db.commit()
-
                 slide_prompt = (
                     slide_data.get("visual_prompt")
                     or slide_data.get("prompt")
@@ -1272,43 +1292,42 @@ async def run_background_image_generation(project_id: str):
                 # Use prompt directly (Gemini understands Korean, optimization was truncating prompts)
                 optimized_prompt = prompt
                 logger.info(f"[프롬프트] optimized_prompt: {optimized_prompt[:150] if optimized_prompt else 'EMPTY'}")
+                slide_prompts[slide_number] = (slide_prompt, optimized_prompt, product_appearance)
 
-                # Generate 2 variants per slide
-                num_variants = 2
+            async def generate_variant(task: SlideVariantTask, previous_image):
+                """Generate and upload one variant. previous_image is the carousel reference, if any."""
+                slide_number = task.slide_number
+                variant_idx = task.variant_index
+                slide_prompt, optimized_prompt, product_appearance = slide_prompts[slide_number]
                 start_time = time.time()
 
-                # Store current slide's generated images for next slide reference
-                current_variant_images: dict = {}
+                # Prepare images data for this variant
+                images_data = []
 
-                for variant_idx in range(num_variants):
-                    try:
-                        # Prepare images data for this variant
-                        images_data = []
+                # Add reference images first (for style guidance) - IMPORTANT for matching user's reference style
+                has_reference_style = False
+                if reference_images_data:
+                    for ref_data, ref_mime in reference_images_data:
+                        images_data.append((ref_data, ref_mime))
+                    has_reference_style = True
+                    logger.info(f"Added {len(reference_images_data)} reference images for style guidance")
 
-                        # Add reference images first (for style guidance) - IMPORTANT for matching user's reference style
-                        has_reference_style = False
-                        if reference_images_data:
-                            for ref_data, ref_mime in reference_images_data:
-                                images_data.append((ref_data, ref_mime))
-                            has_reference_style = True
-                            logger.info(f"Added {len(reference_images_data)} reference images for style guidance")
+                # For carousel: use previous slide's same variant image as reference
+                if previous_image is not None:
+                    prev_img_data, prev_mime = previous_image
+                    images_data.append((prev_img_data, prev_mime))
+                    logger.info(f"Using previous slide's variant {variant_idx + 1} as reference for continuity")
 
-                        # For carousel: use previous slide's same variant image as reference
-                        if is_carousel and slide_number > 1 and variant_idx in prev_variant_images:
-                            prev_img_data, prev_mime = prev_variant_images[variant_idx]
-                            images_data.append((prev_img_data, prev_mime))
-                            logger.info(f"Using previous slide's variant {variant_idx + 1} as reference for continuity")
+                # Add product image if available
+                if product_image_data:
+                    images_data.append((product_image_data, product_mime_type))
 
-                        # Add product image if available
-                        if product_image_data:
-                            images_data.append((product_image_data, product_mime_type))
+                if images_data:
+                    editor = get_image_editor()
 
-                        if images_data:
-                            editor = get_image_editor()
-
-                            # Different prompt based on whether we have a reference image from previous slide
-                            if is_carousel and slide_number > 1 and variant_idx in prev_variant_images:
-                                generation_prompt = f"""Continue the visual story with the following new scene:
+                    # Different prompt based on whether we have a reference image from previous slide
+                    if previous_image is not None:
+                        generation_prompt = f"""Continue the visual story with the following new scene:
 
 {optimized_prompt}
 
@@ -1322,9 +1341,9 @@ PRODUCT INTEGRATION (if product image attached):
 - Place the product naturally within this new scene
 - The product should be clearly visible but integrated into the artistic vision
 - Preserve the product's key visual identity while matching the scene's style"""
-                            elif has_reference_style:
-                                # Has reference images for style guidance
-                                generation_prompt = f"""Create a marketing image with the following scene description:
+                    elif has_reference_style:
+                        # Has reference images for style guidance
+                        generation_prompt = f"""Create a marketing image with the following scene description:
 
 {optimized_prompt}
 
@@ -1340,8 +1359,8 @@ PRODUCT INTEGRATION INSTRUCTIONS:
 - Place the product naturally within this scene
 - The product should be clearly visible but integrated into the artistic vision
 - Preserve the product's key visual identity while matching BOTH the scene's atmosphere AND the reference style"""
-                            else:
-                                generation_prompt = f"""Create a marketing image with the following scene description:
+                    else:
+                        generation_prompt = f"""Create a marketing image with the following scene description:
 
 {optimized_prompt}
 
@@ -1353,64 +1372,132 @@ PRODUCT INTEGRATION INSTRUCTIONS:
 - Preserve the product's key visual identity (shape, colors, logo) while matching the scene's lighting and atmosphere
 - The scene description is the PRIMARY creative direction - create that environment first, then place the product within it"""
 
-                            gen_result = await editor.edit_with_product(
-                                edit_prompt=generation_prompt,
-                                aspect_ratio=project.aspect_ratio,
-                                product_description=product_appearance,
-                                images_data=images_data,
-                            )
-                        else:
-                            generator = get_image_generator("gemini_imagen")
-                            gen_result = await generator.generate(
-                                prompt=optimized_prompt,
-                                aspect_ratio=project.aspect_ratio,
-                                purpose=project.purpose,
-                            )
-
-                        # Save generated image
-                        image_data = gen_result.get("image_data")
-                        result_mime_type = gen_result.get("mime_type", "image/png")
-
-                        if image_data:
-                            ext = "png" if "png" in result_mime_type else "jpg"
-                            filename = f"{uuid.uuid4()}.{ext}"
-                            image_bytes = base64.b64decode(image_data)
-                            content_type = "image/png" if ext == "png" else "image/jpeg"
-                            image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
-                            logger.info(f"Uploaded image: {filename}, size: {len(image_bytes)} bytes, url: {image_url}")
-
-                            # Store this image for next slide's reference (carousel only)
-                            if is_carousel:
-                                current_variant_images[variant_idx] = (image_bytes, result_mime_type)
-                        else:
-                            image_url = f"/placeholder-{project_id}-{slide_number}-{variant_idx}.jpg"
-
-                        # Create GeneratedImage record
+                    gen_result = await editor.edit_with_product(
+                        edit_prompt=generation_prompt,
+                        aspect_ratio=project.aspect_ratio,
+                        product_description=product_appearance,
+                        images_data=images_data,
+                    )
+                else:
+                    generator = get_image_generator("gemini_imagen")
+                    gen_result = await generator.generate(
+                        prompt=optimized_prompt,
+                        aspect_ratio=project.aspect_ratio,
+                        purpose=project.purpose,
+                    )
+
+                # Save generated image
+                image_data = gen_result.get("image_data")
+                result_mime_type = gen_result.get("mime_type", "image/png")
+                provider = "gemini_editor" if images_data else "gemini_imagen"
+                if not image_data:
+                    return {
+                        "image_url": f"/placeholder-{project_id}-{slide_number}-{variant_idx}.jpg",
+                        "image_bytes": None,
+                        "mime_type": None,
+                        "provider": provider,
+                        "duration_ms": int((time.time() - start_time) * 1000),
+                    }
+
+                ext = "png" if "png" in result_mime_type else "jpg"
+                filename = f"{uuid.uuid4()}.{ext}"
+                image_bytes = image_data.to_bytes()
+                content_type = "image/png" if ext == "png" else "image/jpeg"
+                image_url = await cloud_storage.upload_bytes_async(
+                    image_bytes, filename, "generated", content_type
+                )
+                logger.info(f"Uploaded image: {filename}, size: {len(image_bytes)} bytes, url: {image_url}")
+
+                return {
+                    "image_url": image_url,
+                    "image_bytes": image_bytes,
+                    "mime_type": result_mime_type,
+                    "provider": provider,
+                    "duration_ms": int((time.time() - start_time) * 1000),
+                }
+
+            # Persisted per-item progress of this batch
+            if batch_id is None:
+                batch_id = await create_generation_items(db, project_id, total_slides)
+            items_result = await db.execute(
+                select(ImageGenerationItem).where(ImageGenerationItem.batch_id == batch_id)
+            )
+            items = {(row.slide_number, row.variant_index): row for row in items_result.scalars().all()}
+
+            # Results are written by one coroutine at a time (the session is not concurrency-safe)
+            db_lock = asyncio.Lock()
+            remaining_variants = {slide_number: num_variants for slide_number in slide_prompts}
+            finished_slides = 0
+            finished_statuses = (BatchJobStatus.COMPLETED, BatchJobStatus.FAILED, BatchJobStatus.CANCELLED)
+
+            async def save_item(task: SlideVariantTask, item, output):
+                nonlocal generated_count, finished_slides
+                slide_number = task.slide_number
+                async with db_lock:
+                    row = items.get(task.key)
+                    if row is None:
+                        row = ImageGenerationItem(
+                            id=str(uuid.uuid4()),
+                            image_project_id=project_id,
+                            batch_id=batch_id,
+                            slide_number=slide_number,
+                            variant_index=task.variant_index,
+                        )
+                        db.add(row)
+                        items[task.key] = row
+
+                    row.status = item.status.value
+                    row.retry_count = item.retry_count
+                    row.error_message = item.error
+                    if item.status == BatchJobStatus.PROCESSING and row.started_at is None:
+                        row.started_at = datetime.utcnow()
+
+                    if item.status == BatchJobStatus.COMPLETED and output is not None:
                         gen_image = GeneratedImage(
                             id=str(uuid.uuid4()),
                             image_project_id=project_id,
                             slide_number=slide_number,
-                            variant_index=variant_idx,
-                            image_url=image_url,
-                            prompt=slide_prompt,
+                            variant_index=task.variant_index,
+                            image_url=output["image_url"],
+                            prompt=slide_prompts[slide_number][0],
                             is_selected=False,
                             approval_status="pending",
                             is_reference_image=False,
-                            generation_provider="gemini_editor" if images_data else "gemini_imagen",
-                            generation_duration_ms=int((time.time() - start_time) * 1000 / (variant_idx + 1)),
+                            generation_provider=output["provider"],
+                            generation_duration_ms=output["duration_ms"],
                         )
                         db.add(gen_image)
+                        row.generated_image_id = gen_image.id
                         generated_count += 1
 
-                    except Exception as e:
-                        logger.error(f"Failed to generate variant {variant_idx + 1} for slide {slide_number}: {e}")
-                        continue
-
-                # Update previous variant images for next slide
-                if is_carousel:
-                    prev_variant_images = current_variant_images
-
+                    if item.status in finished_statuses:
+                        row.completed_at = datetime.utcnow()
+                        remaining_variants[slide_number] -= 1
+                        if remaining_variants[slide_number] == 0:
+                            finished_slides += 1
+                            project.current_slide = finished_slides
+                    await db.commit()
+
+            # Generate 2 variants per slide. Slides are independent except in carousels,
+            # where each variant continues the same variant of the previous slide.
+            tasks = build_slide_tasks(total_slides, num_variants, chained=is_carousel)
+            try:
+                await get_batch_image_generator().generate_slide_batch(
+                    tasks,
+                    generate=lambda task, previous: generate_variant(
+                        task,
+                        (previous["image_bytes"], previous["mime_type"])
+                        if previous and previous["image_bytes"] else None,
+                    ),
+                    batch_id=batch_id,
+                    on_item_update=save_item,
+                )
+            except BatchCancelledError:
+                project.status = "cancelled"
+                project.error_message = "Generation cancelled"
                 await db.commit()
+                logger.info(f"Background generation cancelled for project {project_id}: {generated_count} images generated")
+                return
 
             # Update project status
             project.status = "completed"
@@ -1438,6 +1525,7 @@ class StartBackgroundGenerationResponse(PydanticBaseModel):
     status: str
     message: str
     total_slides: int
+    batch_id: Optional[str] = None
 
 
 @router.post("/{project_id}/generate-background", response_model=StartBackgroundGenerationResponse)
@@ -1472,13 +1560,25 @@ async def start_background_generation(
             detail="No storyboard slides found. Generate storyboard first."
         )
 
+    running_batch_id = await get_latest_batch_id(db, project_id) if project.status == "generating" else None
+    if running_batch_id and get_batch_image_generator().is_running(running_batch_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Image generation is already running for this project"
+        )
+
     # Update status to pending/generating
     project.status = "generating"
     project.current_slide = 0
+
+    # Register the batch items so progress is queryable right away (compose mode has no batch)
+    batch_id = None
+    if project.content_type != "compose":
+        batch_id = await create_generation_items(db, project_id, len(slides), commit=False)
     await db.commit()
 
     # Start background task
-    background_tasks.add_task(run_background_image_generation, project_id)
+    background_tasks.add_task(run_background_image_generation, project_id, batch_id)
 
     # For compose mode, total_slides is 1
     total_slides = len(slides) if slides else 1
@@ -1488,24 +1588,193 @@ async def start_background_generation(
         status="generating",
         message=f"Image generation started for {total_slides} slides. Check status with GET /image-projects/{project_id}",
         total_slides=total_slides,
+        batch_id=batch_id,
+    )
+
+
+async def _build_generation_progress(
+    db: AsyncSession,
+    project: ImageProject,
+) -> ImageGenerationProgressResponse:
+    """Build the persisted progress of the latest batch of a project."""
+    batch_id = await get_latest_batch_id(db, project.id)
+    rows = []
+    if batch_id:
+        result = await db.execute(
+            select(ImageGenerationItem)
+            .where(ImageGenerationItem.batch_id == batch_id)
+            .order_by(ImageGenerationItem.slide_number, ImageGenerationItem.variant_index)
+        )
+        rows = result.scalars().all()
+
+    status_counts = {s.value: 0 for s in BatchJobStatus}
+    for row in rows:
+        status_counts[row.status] = status_counts.get(row.status, 0) + 1
+
+    total = len(rows)
+    return ImageGenerationProgressResponse(
+        project_id=project.id,
+        batch_id=batch_id,
+        status=project.status,
+        total=total,
+        status_counts=status_counts,
+        progress_percentage=round(status_counts["completed"] / total * 100, 1) if total else 0.0,
+        items=[ImageGenerationItemResponse.model_validate(row) for row in rows],
+    )
+
+
+async def _get_image_project_or_404(db: AsyncSession, project_id: str) -> ImageProject:
+    result = await db.execute(select(ImageProject).where(ImageProject.id == project_id))
+    project = result.scalar_one_or_none()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Image project not found: {project_id}"
+        )
+    return project
+
+
+@router.get("/{project_id}/generation-progress", response_model=ImageGenerationProgressResponse)
+async def get_background_generation_progress(
+    project_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get per-image progress of the latest background generation batch.
+
+    Progress is read from the database, so it stays available across restarts.
+    """
+    project = await _get_image_project_or_404(db, project_id)
+    return await _build_generation_progress(db, project)
+
+
+@router.post("/{project_id}/generate-background/cancel", response_model=ImageGenerationProgressResponse)
+async def cancel_background_generation(
+    project_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Cancel the running background generation batch of a project.
+
+    In-flight generation calls are cancelled; images already generated are kept.
+    """
+    project = await _get_image_project_or_404(db, project_id)
+    batch_id = await get_latest_batch_id(db, project_id)
+    if not batch_id or project.status != "generating":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No background generation is running for this project"
+        )
+
+    if not await get_batch_image_generator().cancel_batch(batch_id):
+        # Not running in this process (e.g. interrupted by a restart): close out the rows directly
+        result = await db.execute(
+            select(ImageGenerationItem).where(
+                ImageGenerationItem.batch_id == batch_id,
+                ImageGenerationItem.status.in_([BatchJobStatus.PENDING.value, BatchJobStatus.PROCESSING.value]),
+            )
+        )
+        for row in result.scalars().all():
+            row.status = BatchJobStatus.CANCELLED.value
+            row.completed_at = datetime.utcnow()
+        project.status = "cancelled"
+        project.error_message = "Generation cancelled"
+        await db.commit()
+
+    return await _build_generation_progress(db, project)
+
+
+# ========== Image Download Endpoints ==========
+
+def _image_file_type(image_url: str) -> tuple[str, str]:
+    """Content type and file extension of a generated image, from its URL."""
+    import os
+
+    ext = os.path.splitext(image_url.split("?", 1)[0])[1].lower() or '.jpg'
+    if ext in ['.jpg', '.jpeg']:
+        return 'image/jpeg', 'jpg'
+    return 'image/png', 'png'
+
+
+@router.get("/{project_id}/export")
+async def export_project_images(
+    project_id: str,
+    image_ids: Optional[List[str]] = Query(default=None),
+    selected_only: bool = False,
+    db: AsyncSession = Depends(get_db),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+):
+    """
+    Download a project's generated images as one ZIP archive.
+
+    The archive is streamed while it is built; images are fetched a few at
+    a time, so neither the images nor the archive are held in memory.
+
+    Args:
+        image_ids: Images to export (repeat the parameter); all images if omitted.
+        selected_only: Export only the selected variant of each slide.
+    """
+    project_query = select(ImageProject.id).where(ImageProject.id == project_id)
+    if (await db.execute(project_query)).scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Image project not found: {project_id}"
+        )
+
+    query = select(GeneratedImage).where(GeneratedImage.image_project_id == project_id)
+    if image_ids:
+        query = query.where(GeneratedImage.id.in_(image_ids))
+    if selected_only:
+        query = query.where(GeneratedImage.is_selected.is_(True))
+    # Regenerated variants share names; the oldest keeps the plain one
+    query = query.order_by(
+        GeneratedImage.slide_number, GeneratedImage.variant_index, GeneratedImage.created_at
     )
+    images = (await db.execute(query)).scalars().all()
 
+    if not images:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No images to export for project: {project_id}"
+        )
+
+    entries = [
+        ZipEntry(
+            name=f"slide_{image.slide_number:02d}_variant_{image.variant_index + 1}"
+                 f".{_image_file_type(image.image_url)[1]}",
+            url=image.image_url,
+        )
+        for image in images
+        if image.image_url
+    ]
+    logger.info(f"Export project {project_id}: {len(entries)} images")
+
+    return StreamingResponse(
+        stream_zip(entries, client=http_client),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="project_{project_id}.zip"',
+        }
+    )
 
-# ========== Image Download Endpoint ==========
 
 @router.get("/images/{image_id}/download")
 async def download_image(
     image_id: str,
+    redirect: Optional[bool] = None,
+    range_value: Optional[str] = Header(default=None, alias="Range"),
     db: AsyncSession = Depends(get_db),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Download a generated image as-is (original size from AI generation).
 
     The AI generates images at the requested aspect ratio during creation,
-    so no post-processing is needed. Returns the original image directly.
+    so no post-processing is needed. The image is never buffered in memory:
+    local files are served with FileResponse and byte-range support, and
+    images in object storage are either redirected to a presigned URL
+    (redirect=true, default DOWNLOAD_REDIRECT_TO_STORAGE) or streamed through.
     """
-    import io
-    import os
     from app.core.config import settings
 
     # Get the generated image record
@@ -1519,70 +1788,33 @@ async def download_image(
             detail=f"Image not found: {image_id}"
         )
 
-    # Resolve the image file path or URL
     image_url = gen_image.image_url
-    image_data = None
-    image_path = None
-
-    if image_url.startswith("http"):
-        # Download from COS or external URL
-        import httpx
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(image_url)
-                if resp.status_code == 200:
-                    image_data = resp.content
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Failed to download image from URL: {image_url}"
-                    )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to download image: {str(e)}"
-            )
-    elif image_url.startswith("/static/"):
-        image_path = os.path.join(settings.TEMP_DIR, image_url.replace("/static/", ""))
-    else:
-        image_path = image_url
-
-    if image_path:
-        if not os.path.exists(image_path):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Image file not found: {image_url}"
-            )
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-
-    if not image_data:
+    if not image_url:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Could not load image: {image_url}"
+            detail=f"Could not load image: {image_id}"
         )
 
-    # Determine content type from URL extension
-    ext = os.path.splitext(image_url)[1].lower() if '.' in image_url else '.jpg'
-    if ext in ['.jpg', '.jpeg']:
-        content_type = 'image/jpeg'
-        file_ext = 'jpg'
-    else:
-        content_type = 'image/png'
-        file_ext = 'png'
+    content_type, file_ext = _image_file_type(image_url)
 
     # Generate filename
     filename = f"image_{image_id}.{file_ext}"
 
-    logger.info(f"Download image {image_id}: {len(image_data)} bytes (original)")
-
-    return StreamingResponse(
-        io.BytesIO(image_data),
-        media_type=content_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-        }
-    )
+    local_path = get_image_cache().resolve_local_path(image_url)
+    if local_path is not None:
+        logger.info(f"Download image {image_id}: local file")
+        return local_file_response(local_path, content_type, filename, range_value)
+
+    if redirect is None:
+        redirect = settings.DOWNLOAD_REDIRECT_TO_STORAGE
+    storage_key = cloud_storage.key_for_url(image_url) if redirect else None
+    if storage_key and cloud_storage.is_cloud_storage_enabled():
+        signed_url = await cloud_storage.presigned_url_async(storage_key, download_filename=filename)
+        logger.info(f"Download image {image_id}: redirect to storage")
+        return RedirectResponse(signed_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    logger.info(f"Download image {image_id}: streaming from {image_url}")
+    return await proxy_remote_file(http_client, image_url, content_type, filename, range_value)
 
 
 __all__ = ["router"]
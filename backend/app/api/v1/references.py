@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List
 from enum import Enum
@@ -13,7 +13,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.config import settings
 from app.models.reference_analysis import ReferenceAnalysis
-from app.services.reference_analyzer.analyzer import ReferenceAnalyzer
+from app.services.reference_analyzer.pipeline import AnalysisJob, get_reference_analysis_pipeline
+from app.services.reference_analyzer.result_cache import (
+    copy_result,
+    get_analysis_result_cache,
+    source_url_cache_key,
+)
 from app.services.cloud_storage import cloud_storage
 
 router = APIRouter()
@@ -34,6 +39,7 @@ class AnalyzeRequest(BaseModel):
     title: Optional[str] = None
     tags: Optional[List[str]] = []
     extract_audio: bool = True
+    force_refresh: bool = False  # Ignore cached results for the same URL/media
 
 
 class ScoreBreakdownItem(BaseModel):
@@ -271,11 +277,11 @@ def model_to_result(analysis: ReferenceAnalysis) -> AnalysisResult:
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_video(
     request: AnalyzeRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
-    """Submit a video URL for analysis"""
+    """Submit a video URL for analysis (a fresh cached result for the same URL is returned immediately)"""
     analysis_id = str(uuid.uuid4())
+    url_key = source_url_cache_key(str(request.url))
 
     # Generate timestamp-based title if not provided
     title = request.title
@@ -287,20 +293,37 @@ async def analyze_video(
     analysis = ReferenceAnalysis(
         id=analysis_id,
         source_url=str(request.url),
+        canonical_url_hash=url_key,
         title=title,
         status=AnalysisStatus.PENDING.value,
         tags=request.tags or [],
     )
+
+    cached = None
+    if not request.force_refresh:
+        cached = await get_analysis_result_cache().find_by_url(db, url_key)
+    if cached:
+        copy_result(cached, analysis)
+        if not request.title:
+            analysis.title = cached.title
+        db.add(analysis)
+        await db.commit()
+        return AnalysisResponse(
+            analysis_id=analysis_id,
+            status=AnalysisStatus.COMPLETED,
+            message="Cached analysis of the same URL returned. Set force_refresh to analyze again",
+        )
+
     db.add(analysis)
     await db.commit()
 
-    # Run analysis in background
-    background_tasks.add_task(
-        run_analysis,
+    # Queue for the staged download/ffmpeg/Gemini worker pools
+    get_reference_analysis_pipeline().submit(AnalysisJob(
         analysis_id=analysis_id,
         url=str(request.url),
         extract_audio=request.extract_audio,
-    )
+        force_refresh=request.force_refresh,
+    ))
 
     return AnalysisResponse(
         analysis_id=analysis_id,
@@ -399,10 +422,15 @@ async def delete_analysis(analysis_id: str, db: AsyncSession = Depends(get_db)):
 @router.post("/{analysis_id}/reanalyze", response_model=AnalysisResponse)
 async def reanalyze_reference(
     analysis_id: str,
-    background_tasks: BackgroundTasks,
+    force_refresh: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    """Re-analyze an existing reference by deleting old data and starting fresh analysis"""
+    """
+    Re-analyze an existing reference by deleting old data and starting fresh analysis.
+
+    Unless force_refresh is set, a fresh cached result of the same URL (from
+    another record) is returned immediately, and unchanged media reuses its result.
+    """
     # Find the existing analysis
     result = await db.execute(
         select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id)
@@ -423,24 +451,40 @@ async def reanalyze_reference(
 
     # Create a new analysis with a new ID
     new_analysis_id = str(uuid.uuid4())
+    url_key = source_url_cache_key(original_url)
 
     new_analysis = ReferenceAnalysis(
         id=new_analysis_id,
         source_url=original_url,
+        canonical_url_hash=url_key,
         title=original_title,
         status=AnalysisStatus.PENDING.value,
         tags=original_tags,
     )
+
+    cached = None
+    if not force_refresh:
+        cached = await get_analysis_result_cache().find_by_url(db, url_key)
+    if cached:
+        copy_result(cached, new_analysis)
+        db.add(new_analysis)
+        await db.commit()
+        return AnalysisResponse(
+            analysis_id=new_analysis_id,
+            status=AnalysisStatus.COMPLETED,
+            message="Cached analysis of the same URL returned. Set force_refresh to analyze again",
+        )
+
     db.add(new_analysis)
     await db.commit()
 
-    # Run analysis in background
-    background_tasks.add_task(
-        run_analysis,
+    # Queue for the staged download/ffmpeg/Gemini worker pools
+    get_reference_analysis_pipeline().submit(AnalysisJob(
         analysis_id=new_analysis_id,
         url=original_url,
         extract_audio=True,
-    )
+        force_refresh=force_refresh,
+    ))
 
     return AnalysisResponse(
         analysis_id=new_analysis_id,
@@ -456,7 +500,6 @@ class UploadAnalysisResponse(BaseModel):
 
 @router.post("/upload", response_model=UploadAnalysisResponse)
 async def upload_images_for_analysis(
-    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     title: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db),
@@ -500,17 +543,13 @@ async def upload_images_for_analysis(
 
     try:
         for file in files:
-            # Generate unique filename
-            ext = Path(file.filename).suffix if file.filename else ".jpg"
-            unique_filename = f"{analysis_id}_{uuid.uuid4().hex[:8]}{ext}"
-
             # Read file content
             content = await file.read()
             image_bytes_list.append(content)
 
-            # Upload to cloud storage
+            # Upload to cloud storage (identical files are stored once)
             content_type = file.content_type or "image/jpeg"
-            file_url = cloud_storage.upload_bytes(content, unique_filename, "uploads", content_type)
+            file_url = await cloud_storage.upload_deduplicated_async(content, "uploads", content_type)
             saved_files.append(file_url)
 
         # Create DB record
@@ -524,13 +563,12 @@ async def upload_images_for_analysis(
         db.add(analysis)
         await db.commit()
 
-        # Run analysis in background
-        background_tasks.add_task(
-            run_upload_analysis,
+        # Queue for the Gemini worker pool (images are already in memory)
+        get_reference_analysis_pipeline().submit(AnalysisJob(
             analysis_id=analysis_id,
-            image_bytes_list=image_bytes_list,
-            saved_files=saved_files,
-        )
+            url=analysis.source_url,
+            image_bytes=image_bytes_list,
+        ))
 
         return UploadAnalysisResponse(
             analysis_ids=[analysis_id],
@@ -545,294 +583,3 @@ async def upload_images_for_analysis(
             except:
                 pass
         raise HTTPException(status_code=500, detail=f"Failed to process upload: {str(e)}")
-
-
-async def run_upload_analysis(
-    analysis_id: str,
-    image_bytes_list: List[bytes],
-    saved_files: List[str],
-):
-    """Background task to run image analysis for uploaded files"""
-    from app.core.database import async_session_factory
-    import base64
-    import io
-
-    async with async_session_factory() as db:
-        try:
-            # Get analysis record
-            result = await db.execute(
-                select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id)
-            )
-            analysis = result.scalar_one_or_none()
-
-            if not analysis:
-                return
-
-            analyzer = ReferenceAnalyzer()
-
-            # Update status: ANALYZING
-            analysis.status = AnalysisStatus.ANALYZING.value
-            analysis.error_message = None
-
-            # Upload images to cloud storage
-            all_image_urls = []
-            for idx, img in enumerate(image_bytes_list):
-                filename = f"{analysis.id}_{idx}.jpg"
-                image_url = cloud_storage.upload_bytes(img, filename, "references", "image/jpeg")
-                all_image_urls.append(image_url)
-
-            if all_image_urls:
-                analysis.thumbnail_url = all_image_urls[0]
-                analysis.images = all_image_urls
-
-            await db.commit()
-
-            # Run image analysis
-            print(f"업로드 이미지 분석 시작 ({len(image_bytes_list)}개)")
-            image_ios = [io.BytesIO(img_bytes) for img_bytes in image_bytes_list]
-            result = await analyzer.analyze_images(image_ios, source_url="upload://")
-
-            # Update with results
-            analysis.status = AnalysisStatus.COMPLETED.value
-            analysis.duration = result.get("duration")
-            analysis.segments = result.get("segments", [])
-            analysis.hook_points = result.get("hook_points", [])
-            analysis.edge_points = result.get("edge_points", [])
-            analysis.emotional_triggers = result.get("emotional_triggers", [])
-            analysis.pain_points = result.get("pain_points", [])
-            analysis.application_points = result.get("application_points", [])
-            analysis.selling_points = result.get("selling_points", [])
-            analysis.cta_analysis = result.get("cta_analysis")
-            analysis.structure_pattern = result.get("structure_pattern")
-            analysis.recommendations = result.get("recommendations", [])
-            analysis.transcript = result.get("transcript")
-            analysis.overall_evaluation = result.get("overall_evaluation")
-
-            # Update title with AI-generated reference_name if available
-            reference_name = result.get("reference_name")
-            if reference_name and isinstance(reference_name, str) and reference_name.strip():
-                analysis.title = reference_name.strip()
-
-            await db.commit()
-
-        except Exception as e:
-            error_msg = str(e)
-            print(f"업로드 이미지 분석 실패: {error_msg}")
-
-            # Rollback any pending transaction before handling error
-            try:
-                await db.rollback()
-            except Exception:
-                pass
-
-            # Update analysis with error
-            try:
-                result = await db.execute(
-                    select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id)
-                )
-                analysis = result.scalar_one_or_none()
-
-                if analysis:
-                    analysis.status = AnalysisStatus.FAILED.value
-                    analysis.error_message = error_msg
-                    analysis.recommendations = [{"action": f"분석 실패: {error_msg}"}]
-                    await db.commit()
-            except Exception as commit_error:
-                print(f"Failed to update error status: {commit_error}")
-
-
-async def run_analysis(analysis_id: str, url: str, extract_audio: bool):
-    """Background task to run video/image analysis"""
-    from app.core.database import async_session_factory
-    from app.services.sns_media_downloader import SNSMediaDownloader
-    import tempfile
-    import io
-    import base64
-
-    async with async_session_factory() as db:
-        try:
-            # Get analysis record
-            result = await db.execute(
-                select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id)
-            )
-            analysis = result.scalar_one_or_none()
-
-            if not analysis:
-                return
-
-            analyzer = ReferenceAnalyzer()
-
-            # Update status: DOWNLOADING
-            analysis.status = AnalysisStatus.DOWNLOADING.value
-            analysis.error_message = None
-            await db.commit()
-
-            # Try to download and detect media type
-            media_type = None  # 'image', 'video', or None
-            image_bytes_list = []
-            thumbnail_url = None
-            all_image_urls = []
-            result = None
-
-            # Check if URL is a supported SNS platform
-            downloader = SNSMediaDownloader()
-            is_sns_url = downloader.is_valid_url(url)
-
-            if is_sns_url:
-                # Download media - try multiple methods in order of reliability
-                try:
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        downloaded_images = []
-                        downloaded_videos = []
-
-                        # 1. Instagram: Try instaloader FIRST (best for public posts)
-                        if "instagram" in url.lower():
-                            print("Instagram 감지 - instaloader 먼저 시도...")
-                            try:
-                                extracted_images = await downloader.extract_images_from_post(url, temp_dir)
-                                if extracted_images:
-                                    media_type = 'image'
-                                    image_bytes_list = extracted_images
-                                    # Upload images to cloud storage
-                                    for idx, img in enumerate(image_bytes_list):
-                                        filename = f"{analysis.id}_{idx}.jpg"
-                                        img_url = cloud_storage.upload_bytes(img, filename, "references", "image/jpeg")
-                                        all_image_urls.append(img_url)
-                                    if all_image_urls:
-                                        thumbnail_url = all_image_urls[0]
-                                    print(f"instaloader 성공! 이미지 {len(image_bytes_list)}개 추출")
-                            except Exception as insta_err:
-                                print(f"instaloader 실패: {insta_err}")
-
-                        # 2. If instaloader didn't work or not Instagram, try gallery-dl
-                        if not image_bytes_list:
-                            print("gallery-dl 시도...")
-                            try:
-                                download_result = await downloader.download(url, temp_dir)
-                                all_media = downloader.get_all_media(temp_dir)
-                                downloaded_images = all_media['images']
-                                downloaded_videos = all_media['videos']
-                                print(f"gallery-dl 결과 - 이미지: {len(downloaded_images)}개, 영상: {len(downloaded_videos)}개")
-
-                                if downloaded_videos:
-                                    media_type = 'video'
-                                    print(f"영상 발견, 영상 분석으로 전환")
-                                elif downloaded_images:
-                                    media_type = 'image'
-                                    for img_path in downloaded_images:
-                                        with open(img_path, 'rb') as f:
-                                            image_bytes_list.append(f.read())
-                                    # Upload images to cloud storage
-                                    for idx, img in enumerate(image_bytes_list):
-                                        filename = f"{analysis.id}_{idx}.jpg"
-                                        img_url = cloud_storage.upload_bytes(img, filename, "references", "image/jpeg")
-                                        all_image_urls.append(img_url)
-                                    if all_image_urls:
-                                        thumbnail_url = all_image_urls[0]
-                                    print(f"gallery-dl 성공! 이미지 {len(image_bytes_list)}개 추출")
-                            except Exception as gdl_err:
-                                print(f"gallery-dl 실패: {gdl_err}")
-
-                        # 3. Still nothing? Will fallback to yt-dlp for video analysis
-                        if not image_bytes_list and not downloaded_videos:
-                            print("이미지 다운로드 실패, yt-dlp 영상 분석 시도...")
-
-                except Exception as e:
-                    print(f"SNS 미디어 다운로드 실패: {e}")
-                    media_type = None
-
-            # Save thumbnail and images to DB if we have them
-            if thumbnail_url:
-                analysis.thumbnail_url = thumbnail_url
-            if all_image_urls:
-                analysis.images = all_image_urls
-            await db.commit()
-
-            # Run analysis if not already done
-            if result is None:
-                # Update status: ANALYZING
-                analysis.status = AnalysisStatus.ANALYZING.value
-                await db.commit()
-
-                if media_type == 'image' and image_bytes_list:
-                    # Image analysis
-                    print(f"이미지 분석 시작 ({len(image_bytes_list)}개)")
-                    image_ios = [io.BytesIO(img_bytes) for img_bytes in image_bytes_list]
-                    result = await analyzer.analyze_images(image_ios, source_url=url)
-                else:
-                    # Video analysis (fallback for non-SNS URLs or failed downloads)
-                    print(f"영상 분석 시작: {url}")
-                    result = await analyzer.analyze(url, extract_audio=extract_audio)
-
-            # Update with results
-            analysis.status = AnalysisStatus.COMPLETED.value
-            analysis.duration = result.get("duration")
-            analysis.segments = result.get("segments", [])
-            analysis.hook_points = result.get("hook_points", [])
-            analysis.edge_points = result.get("edge_points", [])
-            analysis.emotional_triggers = result.get("emotional_triggers", [])
-            analysis.pain_points = result.get("pain_points", [])
-            analysis.application_points = result.get("application_points", [])
-            analysis.selling_points = result.get("selling_points", [])
-            analysis.cta_analysis = result.get("cta_analysis")
-            analysis.structure_pattern = result.get("structure_pattern")
-            analysis.recommendations = result.get("recommendations", [])
-            analysis.transcript = result.get("transcript")
-            analysis.overall_evaluation = result.get("overall_evaluation")
-
-            # Update title with AI-generated reference_name if available
-            reference_name = result.get("reference_name")
-            if reference_name and isinstance(reference_name, str) and reference_name.strip():
-                analysis.title = reference_name.strip()
-
-            await db.commit()
-
-        except Exception as e:
-            error_msg = str(e)
-
-            # Rollback any pending transaction before handling error
-            try:
-                await db.rollback()
-            except Exception:
-                pass
-
-            # Check if this is a "no media found" error - delete record instead of keeping failed
-            is_no_media_error = (
-                "No video formats found" in error_msg or
-                "no video formats" in error_msg.lower() or
-                "다운로드된 미디어 없음" in error_msg
-            )
-
-            if is_no_media_error:
-                # No media at all (no images, no videos) - delete the record
-                try:
-                    result = await db.execute(
-                        select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id)
-                    )
-                    analysis = result.scalar_one_or_none()
-                    if analysis:
-                        await db.delete(analysis)
-                        await db.commit()
-                        print(f"미디어 없음 - 분석 레코드 삭제: {analysis_id}")
-                except Exception as delete_error:
-                    print(f"Failed to delete analysis record: {delete_error}")
-                return  # Exit without saving failed record
-
-            # Improve timeout error message
-            if "504" in error_msg or "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
-                error_msg = "Gemini 분석 실패: 504 The request timed out. 영상이 너무 길거나 서버가 바쁩니다. 잠시 후 다시 시도해주세요."
-
-            # Update analysis with error (for other types of errors)
-            try:
-                result = await db.execute(
-                    select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id)
-                )
-                analysis = result.scalar_one_or_none()
-
-                if analysis:
-                    analysis.status = AnalysisStatus.FAILED.value
-                    analysis.error_message = error_msg
-                    analysis.recommendations = [{"action": f"분석 실패: {error_msg}"}]
-                    await db.commit()
-            except Exception as commit_error:
-                print(f"Failed to update error status: {commit_error}")
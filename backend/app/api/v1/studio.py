@@ -2,6 +2,8 @@
 Video Studio API endpoints for project and scene management.
 """
 
+import asyncio
+import json
 import logging
 import time
 import traceback
@@ -9,6 +11,7 @@ import uuid
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -16,11 +19,25 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.services.binary_image import BinaryImage
+from app.services.image_cache import get_image_cache, guess_mime_type
 from app.services.cloud_storage import cloud_storage
 from app.models import Brand, Product, ReferenceAnalysis, SceneImage, VideoProject, Storyboard
 from app.models.scene_video import SceneVideo
+from app.models.video_generation_job import VideoGenerationJob
 from app.services.video_generator import get_video_generator, SceneInput, SceneVideoResult
+from app.services.video_generator.render_progress import (
+    FINISHED_STATUSES,
+    get_render_progress_registry,
+)
+from app.services.video_generator.animatic_renderer import AnimaticScene, get_animatic_renderer
 from app.services.video_generator.video_concatenator import get_video_concatenator
+from app.services.video_job_queue import (
+    build_scene_inputs,
+    enqueue_video_generation_job,
+    get_video_job_worker_pool,
+    resolve_scene_image_path,
+)
 from app.schemas.studio import (
     ExtendedVideoGenerationRequest,
     ExtendedVideoGenerationResponse,
@@ -44,6 +61,8 @@ from app.schemas.studio import (
     StoryboardGenerateRequest,
     StoryboardResponse,
     VideoConcatenateRequest,
+    VideoGenerationJobResponse,
+    VideoRenderProgressResponse,
     VideoProjectCreate,
     VideoProjectResponse,
     VideoProjectSummary,
@@ -61,6 +80,9 @@ from app.schemas.sns import (
 
 router = APIRouter()
 
+# Interval between progress checks of the concatenation SSE stream
+PROGRESS_STREAM_INTERVAL_SECONDS = 0.5
+
 
 # ========== Video Project Endpoints ==========
 
@@ -228,7 +250,7 @@ async def upload_temp_image(
     filename = f"{temp_id}.{ext}"
     content_type = file.content_type or "image/jpeg"
 
-    preview_url = cloud_storage.upload_bytes(content, filename, "temp", content_type)
+    preview_url = await cloud_storage.upload_bytes_async(content, filename, "temp", content_type)
     logger.info(f"Temp image uploaded: {filename}, url: {preview_url}")
 
     return {
@@ -345,9 +367,6 @@ async def generate_scene_image(
     Returns temporary preview URL. Call /scenes/save to persist to database.
     """
     from app.services.video_generator.image_generator import get_image_generator
-    import base64
-    import os
-    from app.core.config import settings
 
     logger.info(f"=== generate_scene_image called ===")
     logger.info(f"project_id: {project_id}")
@@ -392,34 +411,14 @@ async def generate_scene_image(
                 context_info += f"Description: {desc}. "
                 product_description = desc
 
-            # Load product image if available
+            # Load product image if available (local or remote, through the image cache)
             if product.image_url:
                 try:
-                    image_path = product.image_url
-
-                    # Convert localhost URL to local path
-                    if image_path.startswith("http://localhost:8000/static/"):
-                        image_path = image_path.replace("http://localhost:8000/static/", "/static/")
-                        logger.info(f"Converted localhost URL to path: {image_path}")
-
-                    # Handle local static files
-                    if image_path.startswith("/static/"):
-                        local_path = image_path.replace("/static/", f"{settings.TEMP_DIR}/")
-                        if os.path.exists(local_path):
-                            with open(local_path, "rb") as f:
-                                product_image_data = f.read()
-                            logger.info(f"Loaded product image from: {local_path}")
-                        else:
-                            logger.warning(f"Product image file not found: {local_path}")
-                    elif image_path.startswith("http"):
-                        # Remote URL - skip for now
-                        logger.info(f"Product has remote image URL (skipped): {image_path}")
+                    product_image_data, _ = await get_image_cache().load(product.image_url)
+                    if product_image_data:
+                        logger.info(f"Loaded product image from: {product.image_url}")
                     else:
-                        # Direct file path
-                        if os.path.exists(image_path):
-                            with open(image_path, "rb") as f:
-                                product_image_data = f.read()
-                            logger.info(f"Loaded product image from: {image_path}")
+                        logger.warning(f"Product image not found: {product.image_url}")
                 except Exception as e:
                     logger.warning(f"Failed to load product image: {e}")
 
@@ -492,9 +491,9 @@ Place the product naturally in the scene according to the description."""
     if image_data:
         ext = "png" if "png" in mime_type else "jpg"
         filename = f"{temp_id}.{ext}"
-        image_bytes = base64.b64decode(image_data)
+        image_bytes = image_data.to_bytes()
         content_type = "image/png" if ext == "png" else "image/jpeg"
-        preview_url = cloud_storage.upload_bytes(image_bytes, filename, "temp", content_type)
+        preview_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "temp", content_type)
         logger.info(f"Generated image uploaded: {filename}, url: {preview_url}")
     else:
         # For mock provider with URL
@@ -1220,7 +1219,7 @@ async def analyze_marketing_image(
     content_type = file.content_type or "image/jpeg"
 
     # Upload to cloud storage
-    preview_url = cloud_storage.upload_bytes(content, filename, "temp", content_type)
+    preview_url = await cloud_storage.upload_bytes_async(content, filename, "temp", content_type)
     logger.info(f"Marketing image uploaded: {filename}, url: {preview_url}")
 
     # Save temp file for analysis (will be cleaned up by OS)
@@ -1339,7 +1338,6 @@ async def generate_marketing_image(
         Generated image URL
     """
     from app.services.video_generator.image_generator import get_image_generator
-    import base64
     import os
     from app.core.config import settings
 
@@ -1411,9 +1409,9 @@ Create a professional marketing image. If a product is specified, ensure the pro
         if image_data:
             ext = "png" if "png" in mime_type else "jpg"
             filename = f"{temp_id}.{ext}"
-            image_bytes = base64.b64decode(image_data)
+            image_bytes = image_data.to_bytes()
             content_type = "image/png" if ext == "png" else "image/jpeg"
-            image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
+            image_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "generated", content_type)
             logger.info(f"Marketing image uploaded: {filename}, url: {image_url}")
         else:
             # For mock provider
@@ -1453,9 +1451,6 @@ async def edit_image_with_product(
     - "Close-up shot of someone applying this product"
     """
     from app.services.image_editor import get_image_editor
-    import os
-    import httpx
-    from app.core.config import settings
 
     logger.info(f"=== edit_image_with_product called ===")
     logger.info(f"image_temp_ids: {request.image_temp_ids}")
@@ -1463,43 +1458,28 @@ async def edit_image_with_product(
     logger.info(f"prompt: {request.prompt[:100]}...")
 
     try:
-        temp_dir = os.path.join(settings.TEMP_DIR, "temp")
-
         # Helper function to find and load image by temp_id or URL
         async def find_and_load_image(temp_id_or_url: str) -> tuple:
             # Check if it's a cloud URL
             if temp_id_or_url.startswith("http"):
                 try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        resp = await client.get(temp_id_or_url)
-                        if resp.status_code == 200:
-                            content_type = resp.headers.get("content-type", "image/jpeg")
-                            return resp.content, content_type
+                    data, content_type = await get_image_cache().load(temp_id_or_url)
+                    if data:
+                        return data, content_type
                 except Exception as e:
                     logger.error(f"Failed to download image from URL: {e}")
                 return None, None
 
-            # Try to load from COS first (temp_id is UUID, file is in COS temp folder)
-            if cloud_storage.is_cloud_storage_enabled():
-                for ext in ["png", "jpg", "jpeg", "webp"]:
-                    cos_url = f"https://{settings.TENCENT_COS_BUCKET}.cos.{settings.TENCENT_COS_REGION}.myqcloud.com/temp/{temp_id_or_url}.{ext}"
-                    try:
-                        async with httpx.AsyncClient(timeout=30.0) as client:
-                            resp = await client.get(cos_url)
-                            if resp.status_code == 200:
-                                content_type = resp.headers.get("content-type", "image/jpeg")
-                                logger.info(f"Loaded image from COS: {cos_url}")
-                                return resp.content, content_type
-                    except Exception as e:
-                        continue
-
-            # Fallback: try local file
+            # temp_id is a UUID; the file is in the storage temp folder (or saved locally)
             for ext in ["png", "jpg", "jpeg", "webp"]:
-                potential_path = os.path.join(temp_dir, f"{temp_id_or_url}.{ext}")
-                if os.path.exists(potential_path):
-                    mime_type = f"image/{'jpeg' if ext in ['jpg', 'jpeg'] else ext}"
-                    with open(potential_path, "rb") as f:
-                        return f.read(), mime_type
+                key = f"temp/{temp_id_or_url}.{ext}"
+                mime_type = f"image/{'jpeg' if ext in ['jpg', 'jpeg'] else ext}"
+                data, _ = await get_image_cache().get_or_load(
+                    f"storage:{key}", lambda: cloud_storage.read_range_async(key), mime_type
+                )
+                if data is not None:
+                    logger.info(f"Loaded temp image: {temp_id_or_url}.{ext}")
+                    return data, mime_type
             return None, None
 
         images_data = []
@@ -1543,10 +1523,9 @@ async def edit_image_with_product(
         ext = "png" if "png" in mime_type else "jpg"
         filename = f"{temp_id}.{ext}"
 
-        import base64
-        image_bytes = base64.b64decode(result["image_data"])
+        image_bytes = result["image_data"].to_bytes()
         content_type = "image/png" if ext == "png" else "image/jpeg"
-        image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
+        image_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "generated", content_type)
         logger.info(f"Edited image uploaded: {filename}, url: {image_url}")
 
         response_data = {
@@ -1583,9 +1562,6 @@ async def compose_scene_with_product(
     - "Show the product being held by hands coming from the right side"
     """
     from app.services.image_editor import get_image_editor
-    import os
-    import httpx
-    from app.core.config import settings
 
     logger.info(f"=== compose_scene_with_product called ===")
     logger.info(f"product_image_temp_id: {request.product_image_temp_id}")
@@ -1593,29 +1569,27 @@ async def compose_scene_with_product(
     logger.info(f"scene_prompt: {request.scene_prompt[:100]}...")
 
     try:
-        temp_dir = os.path.join(settings.TEMP_DIR, "temp")
-
         # Helper function to load image by temp_id or URL
         async def load_image(temp_id_or_url: str) -> tuple:
             # Check if it's a cloud URL
             if temp_id_or_url.startswith("http"):
                 try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        resp = await client.get(temp_id_or_url)
-                        if resp.status_code == 200:
-                            content_type = resp.headers.get("content-type", "image/jpeg")
-                            return resp.content, content_type
+                    data, content_type = await get_image_cache().load(temp_id_or_url)
+                    if data:
+                        return data, content_type
                 except Exception as e:
                     logger.error(f"Failed to download image from URL: {e}")
                 return None, None
 
-            # Fallback: try local file
+            # temp_id is a UUID; the file is in the storage temp folder (or saved locally)
             for ext in ["png", "jpg", "jpeg", "webp"]:
-                potential_path = os.path.join(temp_dir, f"{temp_id_or_url}.{ext}")
-                if os.path.exists(potential_path):
-                    mime_type = f"image/{'jpeg' if ext in ['jpg', 'jpeg'] else ext}"
-                    with open(potential_path, "rb") as f:
-                        return f.read(), mime_type
+                key = f"temp/{temp_id_or_url}.{ext}"
+                mime_type = f"image/{'jpeg' if ext in ['jpg', 'jpeg'] else ext}"
+                data, _ = await get_image_cache().get_or_load(
+                    f"storage:{key}", lambda: cloud_storage.read_range_async(key), mime_type
+                )
+                if data is not None:
+                    return data, mime_type
             return None, None
 
         # Load product image
@@ -1649,10 +1623,9 @@ async def compose_scene_with_product(
         ext = "png" if "png" in mime_type else "jpg"
         filename = f"{temp_id}.{ext}"
 
-        import base64
-        image_bytes = base64.b64decode(result["image_data"])
+        image_bytes = result["image_data"].to_bytes()
         content_type = "image/png" if ext == "png" else "image/jpeg"
-        image_url = cloud_storage.upload_bytes(image_bytes, filename, "generated", content_type)
+        image_url = await cloud_storage.upload_bytes_async(image_bytes, filename, "generated", content_type)
         logger.info(f"Composed scene uploaded: {filename}, url: {image_url}")
 
         return {
@@ -1758,19 +1731,15 @@ async def generate_video(
 
     This endpoint supports two modes:
     - mode="single": Uses existing generate_marketing_video (backward compatible)
-    - mode="per_scene": Uses new generate_per_scene_videos for better results (default)
+    - mode="per_scene": Queues a durable job rendering each scene (default)
 
     When using per_scene mode:
     1. Gets the active storyboard
-    2. Collects all scene images
-    3. Generates individual videos for each scene
-    4. Saves SceneVideo records to database for tracking
-    5. Returns ExtendedVideoGenerationStatusResponse with scene_videos populated
+    2. Queues a VideoGenerationJob picked up by a background worker
+    3. Returns ExtendedVideoGenerationStatusResponse with status "queued" and job_id
+    4. The worker saves SceneVideo records as each scene finishes;
+       poll GET /projects/{project_id}/video/jobs/{job_id} for progress
     """
-    import base64
-    import os
-    from app.core.config import settings
-
     # Get project
     result = await db.execute(
         select(VideoProject).where(VideoProject.id == project_id)
@@ -1795,93 +1764,8 @@ async def generate_video(
     if not storyboard.scenes:
         raise HTTPException(status_code=400, detail="Storyboard has no scenes")
 
-    # Get scene images
-    result = await db.execute(
-        select(SceneImage).where(
-            SceneImage.video_project_id == project_id,
-            SceneImage.is_active == True,
-        )
-    )
-    scene_images = {img.scene_number: img for img in result.scalars().all()}
-    logger.info(f"Found {len(scene_images)} scene images for project {project_id}: {list(scene_images.keys())}")
-
-    # Get brand and product info for context
-    # IMPORTANT: This is passed separately to the video generator
-    # The PromptBuilder will handle intelligent integration
-    brand_product_context = ""
-    if project.brand_id:
-        brand_result = await db.execute(select(Brand).where(Brand.id == project.brand_id))
-        brand = brand_result.scalar_one_or_none()
-        if brand:
-            brand_product_context += f"Brand: {brand.name}. "
-
-    if project.product_id:
-        product_result = await db.execute(select(Product).where(Product.id == project.product_id))
-        product = product_result.scalar_one_or_none()
-        if product:
-            brand_product_context += f"Product: {product.name}"
-            if product.product_category:
-                brand_product_context += f" ({product.product_category})"
-            brand_product_context += ". "
-            if product.image_description:
-                brand_product_context += f"Product Appearance: {product.image_description} "
-            elif product.description:
-                desc = product.description[:150] if len(product.description) > 150 else product.description
-                brand_product_context += f"Description: {desc}. "
-
-    logger.info(f"Video generation context: {brand_product_context[:100]}...")
     logger.info(f"Video generation mode: {request.mode}")
 
-    # Build scene inputs with ALL metadata fields from storyboard
-    scenes = []
-    for scene in storyboard.scenes:
-        scene_num = scene.get("scene_number", 0)
-        scene_img = scene_images.get(scene_num)
-
-        # Read image data if available
-        image_data = None
-        if scene_img:
-            logger.info(f"Scene {scene_num}: Found SceneImage record, image_url={scene_img.image_url}")
-        else:
-            logger.warning(f"Scene {scene_num}: No SceneImage record found in scene_images dict")
-
-        if scene_img and scene_img.image_url:
-            try:
-                # Convert image_url to local file path
-                image_path = scene_img.image_url
-                if image_path.startswith("http://localhost:8000/static/"):
-                    image_path = image_path.replace("http://localhost:8000/static/", f"{settings.TEMP_DIR}/")
-                elif image_path.startswith("/static/"):
-                    image_path = image_path.replace("/static/", f"{settings.TEMP_DIR}/")
-
-                if os.path.exists(image_path):
-                    with open(image_path, "rb") as f:
-                        image_data = base64.b64encode(f.read()).decode("utf-8")
-                    logger.info(f"Loaded scene {scene_num} image from: {image_path}")
-                else:
-                    logger.warning(f"Scene {scene_num} image file not found: {image_path}")
-            except Exception as e:
-                logger.warning(f"Failed to read scene image: {e}")
-
-        # Extract scene description - do NOT prepend brand context here
-        # The PromptBuilder will handle intelligent brand context integration
-        scene_description = scene.get("description", "") or scene.get("visual_direction", "") or scene.get("title", "")
-
-        # Build SceneInput with ALL metadata fields from storyboard
-        scenes.append(SceneInput(
-            scene_number=scene_num,
-            description=scene_description,
-            duration_seconds=scene.get("duration_seconds", 3.0),
-            image_data=image_data,
-            scene_type=scene.get("scene_type") or scene.get("segment_type"),
-            narration_script=scene.get("narration_script") or scene.get("narration"),
-            visual_direction=scene.get("visual_direction"),
-            transition_effect=scene.get("transition_effect") or scene.get("transition"),
-            background_music_suggestion=scene.get("background_music_suggestion") or scene.get("music_mood"),
-            subtitle_text=scene.get("subtitle_text") or scene.get("overlay_text"),
-            title=scene.get("title"),
-        ))
-
     # Get video generator
     try:
         generator = get_video_generator(request.provider)
@@ -1893,6 +1777,7 @@ async def generate_video(
         if request.mode == "single":
             # Backward compatible: use existing generate_marketing_video
             logger.info("Using single video generation mode (backward compatible)")
+            scenes, _ = await build_scene_inputs(db, project, storyboard)
             result = await generator.generate_marketing_video(
                 scenes=scenes,
                 aspect_ratio=request.aspect_ratio,
@@ -1913,99 +1798,27 @@ async def generate_video(
             )
 
         else:
-            # Per-scene mode: use new generate_per_scene_videos
-            logger.info("Using per-scene video generation mode")
-            result = await generator.generate_per_scene_videos(
-                scenes=scenes,
-                brand_context=brand_product_context,
-                aspect_ratio=request.aspect_ratio,
+            # Per-scene mode: queue a durable job for the worker pool
+            logger.info("Queueing per-scene video generation job")
+            job = await enqueue_video_generation_job(
+                db,
+                project_id=project_id,
+                provider=request.provider,
+                params={
+                    "aspect_ratio": request.aspect_ratio,
+                    "mode": request.mode,
+                },
+                total_scenes=len(storyboard.scenes),
             )
-
-            # Save SceneVideo records to database
-            scene_video_statuses = []
-            if result.scene_results:
-                for scene_result in result.scene_results:
-                    # Check if SceneVideo record already exists for this scene
-                    existing_result = await db.execute(
-                        select(SceneVideo).where(
-                            SceneVideo.video_project_id == project_id,
-                            SceneVideo.scene_number == scene_result.scene_number,
-                            SceneVideo.is_active == True,
-                        )
-                    )
-                    existing_scene_video = existing_result.scalar_one_or_none()
-
-                    if existing_scene_video:
-                        # Update existing record
-                        existing_scene_video.status = scene_result.status
-                        existing_scene_video.video_url = scene_result.video_url
-                        existing_scene_video.thumbnail_url = scene_result.thumbnail_url
-                        existing_scene_video.duration_seconds = scene_result.duration_seconds
-                        existing_scene_video.operation_id = scene_result.operation_id
-                        existing_scene_video.error_message = scene_result.error_message
-                        existing_scene_video.generation_duration_ms = scene_result.generation_time_ms
-                        existing_scene_video.generation_prompt = scene_result.prompt_used
-                        scene_video = existing_scene_video
-                    else:
-                        # Create new SceneVideo record
-                        scene_video = SceneVideo(
-                            id=str(uuid.uuid4()),
-                            video_project_id=project_id,
-                            scene_number=scene_result.scene_number,
-                            source=request.provider,
-                            status=scene_result.status,
-                            video_url=scene_result.video_url,
-                            thumbnail_url=scene_result.thumbnail_url,
-                            duration_seconds=scene_result.duration_seconds,
-                            operation_id=scene_result.operation_id,
-                            error_message=scene_result.error_message,
-                            generation_duration_ms=scene_result.generation_time_ms,
-                            generation_prompt=scene_result.prompt_used,
-                            generation_provider=request.provider,
-                            generation_params={
-                                "aspect_ratio": request.aspect_ratio,
-                                "mode": request.mode,
-                            },
-                            version=1,
-                            is_active=True,
-                        )
-                        db.add(scene_video)
-
-                    # Find scene_type from original scene data
-                    scene_segment_type = None
-                    for scene in storyboard.scenes:
-                        if scene.get("scene_number", 0) == scene_result.scene_number:
-                            scene_segment_type = scene.get("scene_type") or scene.get("segment_type")
-                            break
-
-                    scene_video_statuses.append(SceneVideoStatus(
-                        scene_number=scene_result.scene_number,
-                        status=scene_result.status,
-                        video_url=scene_result.video_url,
-                        thumbnail_url=scene_result.thumbnail_url,
-                        duration_seconds=scene_result.duration_seconds,
-                        operation_id=scene_result.operation_id,
-                        error_message=scene_result.error_message,
-                        scene_segment_type=scene_segment_type,
-                    ))
-
-                await db.commit()
-
-            # Update project status if all scenes completed
-            if result.status == "completed":
-                project.output_video_url = result.video_url
-                project.status = "video_generated"
-                await db.commit()
+            await db.commit()
+            get_video_job_worker_pool().notify()
 
             return ExtendedVideoGenerationStatusResponse(
-                status=result.status,
-                video_url=result.video_url,
-                operation_id=result.operation_id,
-                error_message=result.error_message,
-                generation_time_ms=result.generation_time_ms,
-                scene_videos=scene_video_statuses,
-                concatenation_status=None,  # Not yet implemented
-                final_video_url=result.video_url if result.status == "completed" else None,
+                status="queued",
+                job_id=job.id,
+                scene_videos=[],
+                concatenation_status=None,
+                final_video_url=None,
             )
 
     except Exception as e:
@@ -2014,6 +1827,68 @@ async def generate_video(
         raise HTTPException(status_code=500, detail=f"Video generation failed: {str(e)}")
 
 
+@router.get("/projects/{project_id}/video/jobs/{job_id}", response_model=VideoGenerationJobResponse)
+async def get_video_job(
+    project_id: str,
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the progress of a queued video generation job.
+
+    Scene videos reflect the SceneVideo records written by the worker so far.
+    """
+    result = await db.execute(
+        select(VideoGenerationJob).where(
+            VideoGenerationJob.id == job_id,
+            VideoGenerationJob.video_project_id == project_id,
+        )
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Video generation job not found")
+
+    result = await db.execute(
+        select(SceneVideo)
+        .where(
+            SceneVideo.video_project_id == project_id,
+            SceneVideo.is_active == True,
+        )
+        .order_by(SceneVideo.scene_number)
+    )
+    scene_videos = [
+        SceneVideoStatus(
+            scene_number=sv.scene_number,
+            status=sv.status,
+            video_url=sv.video_url,
+            thumbnail_url=sv.thumbnail_url,
+            duration_seconds=sv.duration_seconds,
+            operation_id=sv.operation_id,
+            error_message=sv.error_message,
+            scene_segment_type=sv.scene_segment_type,
+        )
+        for sv in result.scalars().all()
+        if (sv.generation_params or {}).get("job_id") == job.id
+    ]
+
+    return VideoGenerationJobResponse(
+        id=job.id,
+        video_project_id=job.video_project_id,
+        status=job.status,
+        provider=job.provider,
+        total_scenes=job.total_scenes,
+        completed_scenes=job.completed_scenes,
+        failed_scenes=job.failed_scenes,
+        attempts=job.attempts,
+        error_message=job.error_message,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        scene_videos=scene_videos,
+    )
+
+
 @router.get("/projects/{project_id}/video/status", response_model=VideoGenerationStatusResponse)
 async def get_video_status(
     project_id: str,
@@ -2073,15 +1948,19 @@ async def get_video_status(
 @router.post("/projects/{project_id}/video/generate-preview", response_model=VideoGenerationStatusResponse)
 async def generate_video_preview(
     project_id: str,
-    scene_number: int,
     request: VideoGenerateRequest,
+    scene_number: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Generate a preview video for a single scene.
+    Render a low-resolution animatic preview from the scene images.
 
-    Useful for previewing individual scenes before full video generation.
+    Builds a Ken Burns slideshow of the storyboard (or of a single scene when
+    scene_number is given) with the storyboard's durations and transitions.
+    Rendered locally with FFmpeg in seconds, without using video generation quota.
     """
+    import os
+
     # Get active storyboard
     result = await db.execute(
         select(Storyboard).where(
@@ -2094,69 +1973,52 @@ async def generate_video_preview(
     if not storyboard:
         raise HTTPException(status_code=400, detail="No active storyboard found")
 
-    # Find specific scene
-    scene = None
-    for s in storyboard.scenes:
-        if s.get("scene_number") == scene_number:
-            scene = s
-            break
+    scenes = storyboard.scenes or []
+    if scene_number is not None:
+        scenes = [s for s in scenes if s.get("scene_number") == scene_number]
+        if not scenes:
+            raise HTTPException(status_code=404, detail=f"Scene {scene_number} not found")
 
-    if not scene:
-        raise HTTPException(status_code=404, detail=f"Scene {scene_number} not found")
+    if not scenes:
+        raise HTTPException(status_code=400, detail="Storyboard has no scenes")
 
-    # Get scene image if available
+    # Get active scene images
     result = await db.execute(
         select(SceneImage).where(
             SceneImage.video_project_id == project_id,
-            SceneImage.scene_number == scene_number,
-            SceneImage.is_current == True,
+            SceneImage.is_active == True,
         )
     )
-    scene_img = result.scalar_one_or_none()
-
-    image_data = None
-    if scene_img and scene_img.storage_path:
-        try:
-            with open(scene_img.storage_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode("utf-8")
-        except Exception as e:
-            logger.warning(f"Failed to read scene image: {e}")
+    scene_images = {img.scene_number: img for img in result.scalars().all()}
 
-    # Get video generator
-    try:
-        generator = get_video_generator(request.provider)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    animatic_scenes = []
+    for scene in scenes:
+        scene_img = scene_images.get(scene.get("scene_number"))
+        image_path = None
+        if scene_img and scene_img.image_url:
+            image_path = resolve_scene_image_path(scene_img.image_url)
+            if not os.path.exists(image_path):
+                logger.warning(f"Scene {scene.get('scene_number')} image file not found: {image_path}")
+                image_path = None
+
+        animatic_scenes.append(AnimaticScene(
+            duration_seconds=float(scene.get("duration_seconds") or 3.0),
+            image_path=image_path,
+            transition_effect=scene.get("transition_effect") or scene.get("transition"),
+        ))
 
-    # Generate preview
-    try:
-        description = scene.get("description", "") or scene.get("visual_direction", "") or scene.get("title", "")
+    renderer = get_animatic_renderer()
+    result = await renderer.render(animatic_scenes, aspect_ratio=request.aspect_ratio)
 
-        if image_data:
-            result = await generator.generate_from_image(
-                image_data=image_data,
-                prompt=description,
-                duration_seconds=int(scene.get("duration_seconds", 5)),
-                aspect_ratio=request.aspect_ratio,
-            )
-        else:
-            result = await generator.generate_from_prompt(
-                prompt=description,
-                duration_seconds=int(scene.get("duration_seconds", 5)),
-                aspect_ratio=request.aspect_ratio,
-            )
+    if result.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Preview generation failed: {result.error_message}")
 
-        return VideoGenerationStatusResponse(
-            status=result.status,
-            video_url=result.video_url,
-            operation_id=result.operation_id,
-            error_message=result.error_message,
-            generation_time_ms=result.generation_time_ms,
-        )
-
-    except Exception as e:
-        logger.error(f"Preview generation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Preview generation failed: {str(e)}")
+    return VideoGenerationStatusResponse(
+        status=result.status,
+        video_url=result.video_url,
+        error_message=result.error_message,
+        generation_time_ms=result.generation_time_ms,
+    )
 
 
 @router.post("/projects/{project_id}/video/generate-scene", response_model=SceneVideoResponse)
@@ -2176,7 +2038,6 @@ async def generate_single_scene_video(
 
     The generated video is saved to the SceneVideo table for tracking.
     """
-    import base64
     import os
     from app.core.config import settings
 
@@ -2232,8 +2093,7 @@ async def generate_single_scene_video(
                 image_path = image_path.replace("/static/", f"{settings.TEMP_DIR}/")
 
             if os.path.exists(image_path):
-                with open(image_path, "rb") as f:
-                    image_data = base64.b64encode(f.read()).decode("utf-8")
+                image_data = BinaryImage.from_file(image_path, guess_mime_type(image_path))
                 logger.info(f"Loaded scene {request.scene_number} image from: {image_path}")
             else:
                 logger.warning(f"Scene {request.scene_number} image file not found: {image_path}")
@@ -2418,7 +2278,7 @@ async def concatenate_scene_videos(
 
     Args:
         project_id: The project ID to concatenate videos for
-        request: Concatenation options (include_transitions, transition_duration_ms)
+        request: Concatenation options (include_transitions, transition_duration_ms, encoding_profile)
 
     Returns:
         Dict with status, video_url, duration_seconds, scene_count, transitions_applied
@@ -2430,7 +2290,7 @@ async def concatenate_scene_videos(
     """
     logger.info(f"=== concatenate_scene_videos called ===")
     logger.info(f"project_id: {project_id}")
-    logger.info(f"include_transitions: {request.include_transitions}, transition_duration_ms: {request.transition_duration_ms}")
+    logger.info(f"include_transitions: {request.include_transitions}, transition_duration_ms: {request.transition_duration_ms}, encoding_profile: {request.encoding_profile}")
 
     # Step 1: Verify project exists
     result = await db.execute(
@@ -2511,12 +2371,16 @@ async def concatenate_scene_videos(
     logger.info(f"Prepared {len(scene_video_data)} videos for concatenation")
 
     # Step 5: Call VideoConcatenator.concatenate()
+    # Progress is available at GET /projects/{project_id}/video/concatenate/progress
+    progress = get_render_progress_registry().start(project_id)
     try:
         concatenator = get_video_concatenator()
         concat_result = await concatenator.concatenate(
             scene_videos=scene_video_data,
             include_transitions=request.include_transitions if request.include_transitions is not None else True,
             transition_duration_ms=request.transition_duration_ms if request.transition_duration_ms is not None else 500,
+            encoding_profile=request.encoding_profile or "balanced",
+            progress=progress,
         )
 
         if not concat_result.success:
@@ -2552,6 +2416,7 @@ async def concatenate_scene_videos(
     except Exception as e:
         logger.error(f"Video concatenation failed with unexpected error: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
+        progress.finish(False, str(e))
 
         # Return failed response
         return {
@@ -2565,6 +2430,66 @@ async def concatenate_scene_videos(
         }
 
 
+@router.get(
+    "/projects/{project_id}/video/concatenate/progress",
+    response_model=VideoRenderProgressResponse,
+    summary="Get progress of the latest concatenation",
+)
+async def get_concatenation_progress(project_id: str):
+    """
+    Get percent complete, fps and speed of the project's latest concatenation.
+
+    Raises:
+        404: No concatenation has run for this project recently
+    """
+    progress = get_render_progress_registry().get(project_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="No concatenation in progress for this project")
+
+    return VideoRenderProgressResponse(**progress.to_dict())
+
+
+@router.get(
+    "/projects/{project_id}/video/concatenate/progress/stream",
+    summary="Stream progress of the latest concatenation (SSE)",
+)
+async def stream_concatenation_progress(project_id: str):
+    """
+    Stream concatenation progress as Server-Sent Events.
+
+    Emits a JSON progress snapshot whenever it changes and closes the
+    stream once the render has completed or failed.
+
+    Raises:
+        404: No concatenation has run for this project recently
+    """
+    registry = get_render_progress_registry()
+    if not registry.get(project_id):
+        raise HTTPException(status_code=404, detail="No concatenation in progress for this project")
+
+    async def event_stream():
+        last_sent = None
+        while True:
+            progress = registry.get(project_id)
+            if progress is None:
+                return
+
+            snapshot = progress.to_dict()
+            if snapshot != last_sent:
+                yield f"data: {json.dumps(snapshot)}\n\n"
+                last_sent = snapshot
+
+            if progress.status in FINISHED_STATUSES:
+                return
+            await asyncio.sleep(PROGRESS_STREAM_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # =============================================================================
 # Scene Extension Video Generation Endpoint
 # =============================================================================
@@ -2594,7 +2519,6 @@ async def generate_extended_video(
     for each scene and then concatenates them, this endpoint creates a single
     seamless video with smooth transitions between scenes.
     """
-    import base64
     import os
     from app.core.config import settings
 
@@ -2677,8 +2601,7 @@ async def generate_extended_video(
                     image_path = image_path.replace("/static/", f"{settings.TEMP_DIR}/")
 
                 if os.path.exists(image_path):
-                    with open(image_path, "rb") as f:
-                        image_data = base64.b64encode(f.read()).decode("utf-8")
+                    image_data = BinaryImage.from_file(image_path, guess_mime_type(image_path))
                     logger.info(f"Loaded scene {scene_num} image for extension")
                 else:
                     logger.warning(f"Scene {scene_num} image file not found: {image_path}")
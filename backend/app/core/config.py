@@ -20,6 +20,53 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-3-flash-preview"
 
+    # Veo rate limiting (shared by all video generation requests)
+    VEO_REQUESTS_PER_MINUTE: float = 10.0
+    VEO_RATE_LIMIT_BURST: int = 2
+    VEO_MAX_IN_FLIGHT: int = 4
+
+    # Video generation job queue
+    VIDEO_JOB_WORKERS: int = 2
+    VIDEO_JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    VIDEO_JOB_HEARTBEAT_SECONDS: float = 30.0
+    VIDEO_JOB_STALE_SECONDS: float = 180.0
+
+    # FFmpeg resource limits (shared by all renders in this process)
+    FFMPEG_MAX_CONCURRENT_JOBS: int = 2
+    FFMPEG_THREADS_PER_JOB: int = 2
+
+    # Image generation (shared by all image projects in this process)
+    IMAGE_GENERATION_MAX_CONCURRENCY: int = 4
+    IMAGE_BATCH_MAX_CONCURRENT_JOBS: int = 4
+    IMAGE_BATCH_MAX_RETRIES: int = 2
+    IMAGE_BATCH_TIMEOUT_SECONDS: int = 300
+
+    # Reference video keyframes (scene-change-aware, sent to Gemini for analysis)
+    REFERENCE_KEYFRAME_MAX_FRAMES: int = 15
+    REFERENCE_KEYFRAME_SAMPLE_FPS: float = 2.0
+    REFERENCE_KEYFRAME_MAX_SAMPLES: int = 600
+    REFERENCE_KEYFRAME_SCENE_THRESHOLD: float = 0.25
+    REFERENCE_KEYFRAME_MAX_SHOT_SECONDS: float = 8.0
+    REFERENCE_KEYFRAME_MAX_SIDE: int = 768
+    # Stream yt-dlp output straight into ffmpeg (no temp file, no ffprobe pass);
+    # only a video-only format up to STREAM_MAX_HEIGHT is fetched. Streams run on
+    # the pipeline's download workers, outside the shared ffmpeg render limiter
+    REFERENCE_STREAM_DOWNLOADS: bool = True
+    REFERENCE_STREAM_MAX_HEIGHT: int = 480
+
+    # Reference analysis result cache: results are reused for the same canonical
+    # URL within TTL_HOURS, and for byte-identical media within CONTENT_TTL_HOURS
+    REFERENCE_ANALYSIS_CACHE_ENABLED: bool = True
+    REFERENCE_ANALYSIS_CACHE_TTL_HOURS: float = 24.0
+    REFERENCE_ANALYSIS_CONTENT_CACHE_TTL_HOURS: float = 720.0
+
+    # Reference analysis pipeline: workers per stage (download, ffmpeg, Gemini)
+    # and jobs allowed to wait between two stages
+    REFERENCE_PIPELINE_DOWNLOAD_WORKERS: int = 4
+    REFERENCE_PIPELINE_PROCESS_WORKERS: int = 2
+    REFERENCE_PIPELINE_ANALYZE_WORKERS: int = 4
+    REFERENCE_PIPELINE_QUEUE_SIZE: int = 8
+
     # OpenAI (Whisper용, 선택사항)
     OPENAI_API_KEY: Optional[str] = None
 
@@ -33,6 +80,25 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     FRONTEND_URL: str = "http://localhost:3000"
 
+    # SNS media downloads: each gallery-dl download runs in its own process,
+    # at most MAX_CONCURRENT at once per API process
+    SNS_MAX_CONCURRENT_DOWNLOADS: int = 4
+    SNS_DOWNLOAD_TIMEOUT_SECONDS: float = 120.0
+
+    # Shared outbound HTTP client (media downloads)
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CLIENT_READ_TIMEOUT_SECONDS: float = 60.0
+
+    # In-memory cache of product/reference image bytes
+    IMAGE_CACHE_MAX_MB: int = 256
+    IMAGE_CACHE_MAX_ITEM_MB: int = 20
+    IMAGE_CACHE_REVALIDATE_SECONDS: float = 300.0
+
     # Paths
     TEMP_DIR: str = "storage"
     UPLOAD_DIR: str = "uploads"
@@ -43,6 +109,35 @@ class Settings(BaseSettings):
     TENCENT_COS_BUCKET: Optional[str] = None
     TENCENT_COS_REGION: Optional[str] = None
 
+    # S3-compatible storage (AWS S3 or the MinIO of docker-compose)
+    S3_ENDPOINT: Optional[str] = None  # None for AWS S3
+    S3_ACCESS_KEY: Optional[str] = None
+    S3_SECRET_KEY: Optional[str] = None
+    S3_BUCKET_NAME: Optional[str] = None
+    S3_REGION: str = "us-east-1"
+    S3_PUBLIC_URL: Optional[str] = None  # Public base URL of the bucket (defaults to {S3_ENDPOINT}/{bucket})
+
+    # Object storage backend: "auto" (COS if configured, else local), "cos", "s3" or "local"
+    STORAGE_BACKEND: str = "auto"
+    STORAGE_PRESIGNED_URL_EXPIRE_SECONDS: int = 3600
+
+    # Image downloads: redirect to a presigned storage URL instead of proxying
+    # (per request with ?redirect=true|false), and chunk size for streamed files
+    DOWNLOAD_REDIRECT_TO_STORAGE: bool = False
+    DOWNLOAD_CHUNK_SIZE_KB: int = 256
+
+    # Project ZIP export: images fetched ahead of the archive writer, and
+    # deflate level (0 stores images as-is; JPEG/PNG barely compress)
+    EXPORT_ZIP_PREFETCH: int = 4
+    EXPORT_ZIP_COMPRESSION_LEVEL: int = 0
+
+    # Cloud storage uploads (run on a dedicated thread pool, off the event loop)
+    CLOUD_STORAGE_UPLOAD_WORKERS: int = 8
+    CLOUD_STORAGE_MULTIPART_THRESHOLD_MB: int = 20
+    CLOUD_STORAGE_MULTIPART_PART_SIZE_MB: int = 8
+    # Content hash index for deduplicated uploads (defaults to {TEMP_DIR}/blob_index.sqlite3)
+    BLOB_INDEX_PATH: Optional[str] = None
+
     class Config:
         env_file = ".env"
         case_sensitive = True
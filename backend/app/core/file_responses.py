@@ -0,0 +1,224 @@
+"""
+Streaming responses for file downloads.
+
+Downloads are never buffered in memory:
+
+- Local files are served with FileResponse (sendfile where the server
+  supports it), and single byte ranges are answered with 206 Partial Content.
+- Remote files are proxied chunk by chunk through the shared HTTP client,
+  forwarding the Range header and the upstream length/range headers.
+"""
+
+import logging
+import os
+from typing import AsyncIterator, Optional, Tuple
+
+import anyio
+import httpx
+from fastapi import HTTPException, status
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+from app.core.config import settings
+from app.services.storage.base import attachment_disposition
+
+logger = logging.getLogger(__name__)
+
+KB = 1024
+
+# Upstream headers passed through when proxying a remote file
+PROXIED_HEADERS = ("content-length", "content-range", "accept-ranges", "etag", "last-modified")
+
+
+class RangeNotSatisfiableError(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range_header(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "Range: bytes=..." header.
+
+    Args:
+        value: Range header value.
+        size: File size in bytes.
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the whole file
+        (no header, malformed header or multiple ranges).
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts beyond the end of the file.
+    """
+    if not value or not value.startswith("bytes=") or "," in value:
+        return None
+    start_text, _, end_text = value[len("bytes="):].strip().partition("-")
+    try:
+        if not start_text:
+            # Suffix range: the last N bytes
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise RangeNotSatisfiableError(value)
+            return max(0, size - suffix), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start < 0:
+        raise RangeNotSatisfiableError(value)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+async def _iter_file_range(path: str, start: int, end: int, chunk_size: int):
+    async with await anyio.open_file(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def local_file_response(
+    path: str,
+    media_type: str,
+    filename: str,
+    range_value: Optional[str] = None,
+) -> Response:
+    """
+    Serve a local file as an attachment, honouring a single byte range.
+
+    Args:
+        path: File path.
+        media_type: Content type of the file.
+        filename: Download filename.
+        range_value: Range header of the request.
+
+    Returns:
+        FileResponse for the whole file, or a 206/416 response for a range request.
+
+    Raises:
+        HTTPException: 404 if the file does not exist.
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Image file not found: {filename}"
+        )
+
+    size = stat_result.st_size
+    headers = {"Accept-Ranges": "bytes"}
+    try:
+        byte_range = parse_range_header(range_value, size)
+    except RangeNotSatisfiableError:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{size}"},
+        )
+
+    if byte_range is None:
+        return FileResponse(
+            path,
+            media_type=media_type,
+            filename=filename,
+            headers=headers,
+            stat_result=stat_result,
+        )
+
+    start, end = byte_range
+    headers.update({
+        "Content-Range": f"bytes {start}-{end}/{size}",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": attachment_disposition(filename),
+    })
+    return StreamingResponse(
+        _iter_file_range(path, start, end, settings.DOWNLOAD_CHUNK_SIZE_KB * KB),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+async def proxy_remote_file(
+    client: httpx.AsyncClient,
+    url: str,
+    media_type: str,
+    filename: str,
+    range_value: Optional[str] = None,
+) -> Response:
+    """
+    Stream a remote file to the client chunk by chunk.
+
+    Args:
+        client: HTTP client used for the upstream request.
+        url: Remote file URL.
+        media_type: Content type of the file.
+        filename: Download filename.
+        range_value: Range header of the request, forwarded upstream.
+
+    Returns:
+        StreamingResponse mirroring the upstream status (200, 206 or 416).
+
+    Raises:
+        HTTPException: 404 if the upstream request fails.
+    """
+    # identity keeps the upstream Content-Length valid for the raw bytes we forward
+    request_headers = {"Accept-Encoding": "identity"}
+    if range_value:
+        request_headers["Range"] = range_value
+
+    try:
+        upstream = await client.send(client.build_request("GET", url, headers=request_headers), stream=True)
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to download image: {e} - {url}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Failed to download image from URL: {url}"
+        )
+
+    if upstream.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE:
+        await upstream.aclose()
+        return Response(
+            status_code=upstream.status_code,
+            headers={k: v for k, v in upstream.headers.items() if k in ("content-range", "accept-ranges")},
+        )
+    if upstream.status_code not in (status.HTTP_200_OK, status.HTTP_206_PARTIAL_CONTENT):
+        await upstream.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Failed to download image from URL: {url}"
+        )
+
+    headers = {k: upstream.headers[k] for k in PROXIED_HEADERS if k in upstream.headers}
+    headers["Content-Disposition"] = attachment_disposition(filename)
+    return StreamingResponse(
+        _stream_and_close(upstream),
+        status_code=upstream.status_code,
+        media_type=media_type,
+        headers=headers,
+        # Also closes the upstream when the client disconnects mid-body
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+async def _stream_and_close(upstream: httpx.Response) -> AsyncIterator[bytes]:
+    """Forward the upstream body, closing it even if reading fails partway through."""
+    try:
+        async for chunk in upstream.aiter_raw(settings.DOWNLOAD_CHUNK_SIZE_KB * KB):
+            yield chunk
+    finally:
+        # StreamingResponse skips its background task when the body raises
+        await upstream.aclose()
+
+
+__all__ = [
+    "RangeNotSatisfiableError",
+    "parse_range_header",
+    "local_file_response",
+    "proxy_remote_file",
+]
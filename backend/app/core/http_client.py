@@ -0,0 +1,165 @@
+"""
+Shared HTTP client for outbound media fetches.
+
+One application-scoped httpx.AsyncClient keeps connections alive across
+requests (HTTP/2 when the h2 package is installed), so loading the product
+and reference images of a project reuses connections instead of paying a
+TCP+TLS handshake per image. The client is created and closed in the app
+lifespan; code running outside the app (scripts, tests) gets one lazily.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees a per-host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that caps concurrent requests per host.
+
+    httpx only limits connections for the whole pool; this keeps one slow
+    CDN from taking every connection. A slot is held until the response
+    body is closed; waiting for one is bounded by the request's pool timeout,
+    so a response that is never closed surfaces as httpx.PoolTimeout instead
+    of blocking the host forever.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max(1, max_per_host)
+        self._host_slots: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self._max_per_host)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._host_slots[request.url.host]
+        pool_timeout = request.extensions.get("timeout", {}).get("pool")
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=pool_timeout)
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout(
+                f"No free connection slot for {request.url.host} within {pool_timeout}s",
+                request=request,
+            ) from None
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        if response.is_closed:
+            # Body already read by the transport (e.g. in-memory responses)
+            semaphore.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, semaphore)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP client configured from settings.
+
+    Args:
+        transport: Underlying transport (defaults to a pooled HTTP/1.1+2 transport).
+
+    Returns:
+        A new httpx.AsyncClient; the caller is responsible for closing it.
+    """
+    http2 = settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_CLIENT_READ_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+    )
+    base_transport = transport or httpx.AsyncHTTPTransport(limits=limits, http2=http2, retries=1)
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(base_transport, settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+# Application-scoped client
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the app lifespan)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+        logger.info(
+            f"HTTP client started - http2: {settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE}, "
+            f"max connections: {settings.HTTP_CLIENT_MAX_CONNECTIONS}, "
+            f"per host: {settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST}"
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called from the app lifespan)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client.
+
+    Also usable as a FastAPI dependency. Never close the returned client.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+__all__ = [
+    "HostLimitedTransport",
+    "create_http_client",
+    "start_http_client",
+    "close_http_client",
+    "get_http_client",
+]
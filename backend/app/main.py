@@ -18,8 +18,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 from app.core.database import engine
+from app.core.http_client import close_http_client, start_http_client
 from app.models import Base
 from app.api.v1 import router as api_v1_router
+from app.services.video_job_queue import get_video_job_worker_pool
+from app.services.reference_analyzer.pipeline import get_reference_analysis_pipeline
+from app.services.cloud_storage import cloud_storage
+from app.services.image_cache import get_image_cache
 
 
 @asynccontextmanager
@@ -52,9 +57,28 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         print("Database tables ready.")
 
+    # Shared HTTP client for outbound media fetches
+    await start_http_client()
+
+    # Start background workers for queued video generation jobs
+    video_job_workers = get_video_job_worker_pool()
+    await video_job_workers.start()
+
+    # Start the staged worker pools for reference analyses
+    reference_pipeline = get_reference_analysis_pipeline()
+    reference_pipeline.start()
+
     yield
 
     # Shutdown
+    print("Stopping video job workers...")
+    await video_job_workers.stop()
+    print("Stopping reference analysis pipeline...")
+    await reference_pipeline.stop()
+    print("Waiting for pending uploads...")
+    cloud_storage.shutdown()
+    print("Closing HTTP client...")
+    await close_http_client()
     print("Disposing database connection pool...")
     await engine.dispose()
     print("Shutdown complete.")
@@ -94,4 +118,9 @@ app.include_router(api_v1_router, prefix=settings.API_V1_PREFIX)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "app": settings.APP_NAME}
+    return {
+        "status": "healthy",
+        "app": settings.APP_NAME,
+        "image_cache": get_image_cache().stats(),
+        "reference_pipeline": get_reference_analysis_pipeline().stats(),
+    }
@@ -14,9 +14,11 @@ from app.models.reference_analysis import ReferenceAnalysis
 from app.models.video_project import VideoProject
 from app.models.scene_image import SceneImage
 from app.models.scene_video import SceneVideo
+from app.models.video_generation_job import VideoGenerationJob
 from app.models.storyboard import Storyboard
 from app.models.image_project import ImageProject
 from app.models.generated_image import GeneratedImage
+from app.models.image_generation_item import ImageGenerationItem
 from app.models.user import User, UserRole, UserStatus
 
 __all__ = [
@@ -27,9 +29,11 @@ __all__ = [
     "VideoProject",
     "SceneImage",
     "SceneVideo",
+    "VideoGenerationJob",
     "Storyboard",
     "ImageProject",
     "GeneratedImage",
+    "ImageGenerationItem",
     "User",
     "UserRole",
     "UserStatus",
@@ -0,0 +1,119 @@
+"""
+Image Generation Item ORM model for the AI Video Marketing Platform.
+
+Tracks every image (slide variant) of a background generation batch, so
+batch progress is persisted and survives API restarts.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+from app.models.base import TimestampMixin
+
+if TYPE_CHECKING:
+    from app.models.image_project import ImageProject
+
+
+class ImageGenerationItem(Base, TimestampMixin):
+    """
+    Image Generation Item model representing one image of a generation batch.
+
+    Attributes:
+        id: UUID string primary key
+        image_project_id: Foreign key to ImageProject
+        batch_id: Identifier of the generation batch
+        slide_number: Slide number (1-indexed)
+        variant_index: Variant index within the slide (0-indexed)
+        status: Item status (pending, processing, completed, failed, cancelled)
+        retry_count: Number of retries performed
+        generated_image_id: Resulting GeneratedImage, once completed
+        error_message: Error details if the item failed
+        started_at: Time generation of the item started
+        completed_at: Time the item finished
+    """
+
+    __tablename__ = "image_generation_items"
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+    )
+
+    image_project_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("image_projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    batch_id: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+
+    slide_number: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    variant_index: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+    )
+
+    retry_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    generated_image_id: Mapped[Optional[str]] = mapped_column(
+        String(36),
+        ForeignKey("generated_images.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    error_message: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    # Relationships
+    image_project: Mapped["ImageProject"] = relationship(
+        "ImageProject",
+    )
+
+    # Indexes for common queries
+    __table_args__ = (
+        Index("ix_image_generation_items_batch", "batch_id", "slide_number", "variant_index"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ImageGenerationItem(batch_id={self.batch_id!r}, slide={self.slide_number}, "
+            f"variant={self.variant_index}, status={self.status!r})>"
+        )
+
+
+__all__ = ["ImageGenerationItem"]
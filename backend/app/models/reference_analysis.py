@@ -5,9 +5,10 @@ Stores the complete analysis results from Gemini for reference videos,
 enabling reuse in Video Studio without re-analyzing.
 """
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, Float, String, Text
+from sqlalchemy import JSON, DateTime, Float, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -39,6 +40,9 @@ class ReferenceAnalysis(Base, TimestampMixin):
         tags: User-defined tags for filtering
         notes: User notes
         error_message: Error message if analysis failed
+        canonical_url_hash: sha256 of the normalized source URL, the result cache key
+        content_hash: sha256 of the downloaded media the result was produced from
+        analyzed_at: When the result was produced by Gemini (kept on cached copies)
     """
 
     __tablename__ = "reference_analyses"
@@ -170,6 +174,24 @@ class ReferenceAnalysis(Base, TimestampMixin):
         nullable=True,
     )
 
+    # Result cache keys (see app.services.reference_analyzer.result_cache)
+    canonical_url_hash: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+    )
+
+    content_hash: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+    )
+
+    analyzed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
     def __repr__(self) -> str:
         return f"<ReferenceAnalysis(id={self.id!r}, title={self.title!r}, status={self.status!r})>"
 
@@ -0,0 +1,149 @@
+"""
+Video Generation Job ORM model for the AI Video Marketing Platform.
+
+Represents a queued video generation request that is picked up by a
+background worker, so renders survive API restarts and deploys.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+from app.models.base import TimestampMixin
+
+if TYPE_CHECKING:
+    from app.models.video_project import VideoProject
+
+
+class VideoGenerationJob(Base, TimestampMixin):
+    """
+    Video Generation Job model representing a durable render job.
+
+    Attributes:
+        id: UUID string primary key
+        video_project_id: Foreign key to VideoProject
+        job_type: Kind of job (per_scene)
+        status: Job status (queued, processing, completed, partial, failed)
+        provider: Video generation provider (veo, mock, etc.)
+        params: Generation parameters JSON (aspect_ratio, mode, ...)
+        total_scenes: Number of scenes in the job
+        completed_scenes: Number of scenes completed so far
+        failed_scenes: Number of scenes failed so far
+        attempts: Number of times a worker has claimed the job
+        max_attempts: Maximum number of claims before the job fails
+        worker_id: Identifier of the worker currently running the job
+        heartbeat_at: Last time the running worker reported progress
+        started_at: Time the job was last claimed
+        completed_at: Time the job finished
+        error_message: Error details if the job failed
+    """
+
+    __tablename__ = "video_generation_jobs"
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+    )
+
+    video_project_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("video_projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    job_type: Mapped[str] = mapped_column(
+        String(30),
+        nullable=False,
+        default="per_scene",
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="queued",
+    )
+
+    provider: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+
+    params: Mapped[Optional[dict]] = mapped_column(
+        JSON,
+        nullable=True,
+    )
+
+    total_scenes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    completed_scenes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    failed_scenes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    max_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=3,
+    )
+
+    worker_id: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    error_message: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    # Relationships
+    video_project: Mapped["VideoProject"] = relationship(
+        "VideoProject",
+    )
+
+    # Indexes for common queries
+    __table_args__ = (
+        Index("ix_video_generation_jobs_status_created", "status", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<VideoGenerationJob(id={self.id!r}, status={self.status!r})>"
+
+
+__all__ = ["VideoGenerationJob"]
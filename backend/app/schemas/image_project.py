@@ -247,6 +247,34 @@ class RegenerateSectionResponse(BaseModel):
     reference_image_used: bool = False
 
 
+# ========== Background Generation Progress Schemas ==========
+
+class ImageGenerationItemResponse(BaseModel):
+    """Schema for one image of a background generation batch."""
+    slide_number: int
+    variant_index: int
+    status: str
+    retry_count: int = 0
+    generated_image_id: Optional[str] = None
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ImageGenerationProgressResponse(BaseModel):
+    """Schema for persisted background generation progress."""
+    project_id: str
+    batch_id: Optional[str] = None
+    status: str
+    total: int = 0
+    status_counts: dict = {}
+    progress_percentage: float = 0.0
+    items: List[ImageGenerationItemResponse] = []
+
+
 __all__ = [
     "GeneratedImageBase",
     "GeneratedImageCreate",
@@ -270,4 +298,6 @@ __all__ = [
     "GenerateSingleSectionResponse",
     "RegenerateRequest",
     "RegenerateSectionResponse",
+    "ImageGenerationItemResponse",
+    "ImageGenerationProgressResponse",
 ]
@@ -347,6 +347,30 @@ class ExtendedVideoGenerationStatusResponse(VideoGenerationStatusResponse):
         None,
         description="URL of the final concatenated video"
     )
+    job_id: Optional[str] = Field(
+        None,
+        description="ID of the queued video generation job, when generation runs in the background"
+    )
+
+
+class VideoGenerationJobResponse(BaseModel):
+    """Progress of a queued video generation job."""
+    id: str = Field(..., description="Unique identifier for the job")
+    video_project_id: str = Field(..., description="The video project being rendered")
+    status: str = Field(..., description="Job status: queued, processing, completed, partial, failed")
+    provider: str = Field(..., description="Video generation provider")
+    total_scenes: int = Field(..., description="Number of scenes in the job")
+    completed_scenes: int = Field(..., description="Number of scenes completed so far")
+    failed_scenes: int = Field(..., description="Number of scenes failed so far")
+    attempts: int = Field(..., description="Number of times a worker has picked up the job")
+    error_message: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: datetime = Field(..., description="Timestamp when the job was queued")
+    started_at: Optional[datetime] = Field(None, description="Timestamp when a worker last picked up the job")
+    completed_at: Optional[datetime] = Field(None, description="Timestamp when the job finished")
+    scene_videos: List[SceneVideoStatus] = Field(
+        default_factory=list,
+        description="Status of each scene video written by the job"
+    )
 
 
 class SceneVideoGenerateRequest(BaseModel):
@@ -376,6 +400,23 @@ class VideoConcatenateRequest(BaseModel):
         le=2000,
         description="Duration of transitions in milliseconds"
     )
+    encoding_profile: Optional[str] = Field(
+        default="balanced",
+        pattern=r"^(fast-preview|balanced|final)$",
+        description="Encoding profile for re-encoded output: fast-preview, balanced, or final"
+    )
+
+
+class VideoRenderProgressResponse(BaseModel):
+    """Progress of the latest video concatenation of a project."""
+    status: str = Field(..., description="Render status: running, completed, failed")
+    stage: str = Field(..., description="Current stage: preparing, downloading, rendering, joining")
+    percent: float = Field(..., description="Percent complete (0-100)")
+    fps: Optional[float] = Field(None, description="Frames encoded per second across running ffmpeg processes")
+    speed: Optional[float] = Field(None, description="Encoding speed relative to realtime")
+    error_message: Optional[str] = Field(None, description="Error message if the render failed")
+    started_at: float = Field(..., description="Unix timestamp when the render started")
+    updated_at: float = Field(..., description="Unix timestamp of the last progress update")
 
 
 # ========== Scene Extension Video Generation Schemas ==========
@@ -475,6 +516,8 @@ __all__ = [
     "SceneVideoResponse",
     "VideoGenerationStatusResponse",
     "ExtendedVideoGenerationStatusResponse",
+    "VideoGenerationJobResponse",
+    "VideoRenderProgressResponse",
     "SceneVideoGenerateRequest",
     "VideoConcatenateRequest",
     # Scene Extension Video Generation Schemas
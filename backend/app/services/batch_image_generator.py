@@ -11,11 +11,19 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Optional, Any
+from typing import Awaitable, Callable, List, Dict, Optional, Any
 from datetime import datetime
 
+from app.core.config import settings
+from app.services.binary_image import BinaryImage
 from app.services.image_composite_generator import get_composite_generator
 from app.services.image_prompt_builder import create_image_prompt_builder
+from app.services.slide_scheduler import (
+    SlideGenerationScheduler,
+    SlideVariantTask,
+    TaskKey,
+    get_image_generation_semaphore,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +36,11 @@ class BatchJobStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+
+class BatchCancelledError(Exception):
+    """Raised when a running batch is cancelled through cancel_batch."""
 
 
 @dataclass
@@ -79,8 +92,8 @@ class BatchItemResult:
     status: BatchJobStatus
     """Status of the generation."""
 
-    image_data: Optional[str] = None
-    """Generated image data (base64)."""
+    image_data: Optional[BinaryImage] = None
+    """Generated image."""
 
     error: Optional[str] = None
     """Error message if generation failed."""
@@ -95,14 +108,28 @@ class BatchItemResult:
     """Timestamp of result creation."""
 
 
+@dataclass
+class _BatchState:
+    """Tracking state of one batch."""
+
+    items: Dict[str, BatchItemResult] = field(default_factory=dict)
+    task: Optional[asyncio.Task] = None
+    cancelled: bool = False
+    finished_at: Optional[float] = None
+
+
 class BatchImageGenerator:
     """
     Generates multiple images in batch with progress tracking.
 
     Supports concurrent processing, error handling, retry logic,
-    and detailed progress reporting.
+    cancellation and detailed progress reporting. Finished batches stay
+    queryable for FINISHED_BATCH_RETENTION_SECONDS and are then evicted.
     """
 
+    FINISHED_BATCH_RETENTION_SECONDS = 600
+    RETRY_DELAY_SECONDS = 1.0
+
     def __init__(self, config: Optional[BatchConfig] = None):
         """
         Initialize the BatchImageGenerator.
@@ -113,7 +140,7 @@ class BatchImageGenerator:
         self.config = config or BatchConfig()
         self.composite_generator = get_composite_generator()
         self.prompt_builder = create_image_prompt_builder()
-        self._active_batches: Dict[str, List[BatchItemResult]] = {}
+        self._active_batches: Dict[str, _BatchState] = {}
         logger.info("BatchImageGenerator initialized")
 
     async def generate_batch(
@@ -145,7 +172,16 @@ class BatchImageGenerator:
         )
 
         # Initialize batch tracking
-        self._active_batches[batch_id] = []
+        state = self._start_batch(batch_id)
+        images = [
+            {**image_data, "image_id": image_data.get("image_id") or f"img-{uuid.uuid4().hex[:8]}"}
+            for image_data in images
+        ]
+        for image_data in images:
+            state.items[image_data["image_id"]] = BatchItemResult(
+                image_id=image_data["image_id"],
+                status=BatchJobStatus.PENDING,
+            )
 
         try:
             # Create semaphore to limit concurrent jobs
@@ -163,18 +199,32 @@ class BatchImageGenerator:
             ]
 
             # Execute all tasks
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            state.task = asyncio.ensure_future(asyncio.gather(*tasks, return_exceptions=True))
+            try:
+                results = await state.task
+            except asyncio.CancelledError:
+                if not state.cancelled:
+                    raise
+                self._mark_cancelled(state)
+                raise BatchCancelledError(f"Batch {batch_id} was cancelled")
 
             # Process results
             processed_results = []
-            for result in results:
+            for image_data, result in zip(images, results):
+                item = state.items[image_data["image_id"]]
                 if isinstance(result, Exception):
                     logger.error(f"Task failed with exception: {str(result)}")
+                    item.status = BatchJobStatus.FAILED
+                    item.error = str(result)
                     processed_results.append({
                         "status": "failed",
                         "error": str(result),
                     })
                 else:
+                    item.status = (
+                        BatchJobStatus.FAILED if result.get("status") == "failed" else BatchJobStatus.COMPLETED
+                    )
+                    item.error = result.get("error")
                     processed_results.append(result)
 
             batch_time_ms = int((time.time() - start_time) * 1000)
@@ -188,9 +238,112 @@ class BatchImageGenerator:
             return processed_results
 
         finally:
-            # Clean up batch tracking
-            if batch_id in self._active_batches:
-                del self._active_batches[batch_id]
+            self._finish_batch(state)
+
+    async def generate_slide_batch(
+        self,
+        tasks: List[SlideVariantTask],
+        generate: Callable[[SlideVariantTask, Optional[Any]], Awaitable[Any]],
+        batch_id: Optional[str] = None,
+        on_item_update: Optional[Callable[[SlideVariantTask, BatchItemResult, Optional[Any]], Awaitable[None]]] = None,
+    ) -> Dict[TaskKey, Optional[Any]]:
+        """
+        Generate the slide variants of an image project as one batch.
+
+        Tasks run as soon as their dependency (previous carousel slide) is
+        available, limited by config.max_concurrent_jobs per batch and by the
+        process-wide image generation limit. Failed items are retried and
+        every status change is reported through on_item_update.
+
+        Args:
+            tasks: Slide variant tasks (see slide_scheduler.build_slide_tasks).
+            generate: Async callable producing an item's output from its dependency's
+                output. Returning None marks the item as failed.
+            batch_id: Optional batch identifier.
+            on_item_update: Optional async callback invoked with (task, item, output)
+                whenever an item changes status.
+
+        Returns:
+            Output per task key (None for failed items).
+
+        Raises:
+            BatchCancelledError: If the batch was cancelled with cancel_batch.
+        """
+        batch_id = batch_id or f"batch-{uuid.uuid4().hex[:8]}"
+        state = self._start_batch(batch_id)
+        for task in tasks:
+            item_id = self.item_id(task)
+            state.items[item_id] = BatchItemResult(image_id=item_id, status=BatchJobStatus.PENDING)
+
+        async def notify(task: SlideVariantTask, output: Optional[Any] = None) -> None:
+            if on_item_update is not None:
+                await on_item_update(task, state.items[self.item_id(task)], output)
+
+        async def run_item(task: SlideVariantTask, previous: Optional[Any]) -> Optional[Any]:
+            item = state.items[self.item_id(task)]
+            item.status = BatchJobStatus.PROCESSING
+            await notify(task)
+            start_time = time.time()
+
+            while True:
+                try:
+                    async with get_image_generation_semaphore():
+                        output = await asyncio.wait_for(
+                            generate(task, previous),
+                            timeout=self.config.timeout_seconds,
+                        )
+                    if output is None:
+                        raise RuntimeError("No image generated")
+                    item.generation_time_ms = int((time.time() - start_time) * 1000)
+                    return output
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    item.error = str(e) or type(e).__name__
+                    if not self.config.enable_retry or item.retry_count >= self.config.max_retries:
+                        raise
+                    item.retry_count += 1
+                    logger.info(
+                        f"Retrying {item.image_id} in batch {batch_id}, "
+                        f"retry: {item.retry_count}, error: {item.error}"
+                    )
+                    await asyncio.sleep(self.RETRY_DELAY_SECONDS)
+
+        async def on_result(task: SlideVariantTask, output: Optional[Any], error: Optional[str]) -> None:
+            item = state.items[self.item_id(task)]
+            if output is not None:
+                item.status = BatchJobStatus.COMPLETED
+                item.error = None
+            else:
+                item.status = BatchJobStatus.FAILED
+                item.error = item.error or error
+            await notify(task, output)
+
+        logger.info(
+            f"Starting slide batch - batch_id: {batch_id}, items: {len(tasks)}, "
+            f"concurrent_jobs: {self.config.max_concurrent_jobs}"
+        )
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(self.config.max_concurrent_jobs))
+        state.task = asyncio.ensure_future(scheduler.run(tasks, run_item, on_result=on_result))
+        try:
+            return await state.task
+        except asyncio.CancelledError:
+            if not state.cancelled:
+                state.task.cancel()
+                raise
+            for task in tasks:
+                item = state.items[self.item_id(task)]
+                if item.status in (BatchJobStatus.PENDING, BatchJobStatus.PROCESSING):
+                    item.status = BatchJobStatus.CANCELLED
+                    await notify(task)
+            raise BatchCancelledError(f"Batch {batch_id} was cancelled")
+        finally:
+            self._finish_batch(state)
+
+    @staticmethod
+    def item_id(task: SlideVariantTask) -> str:
+        """Batch item identifier of a slide variant task."""
+        return f"slide-{task.slide_number}-variant-{task.variant_index}"
 
     async def _generate_with_semaphore(
         self,
@@ -212,6 +365,10 @@ class BatchImageGenerator:
             Generation result dictionary.
         """
         async with semaphore:
+            state = self._active_batches.get(batch_id)
+            item = state.items.get(image_data.get("image_id")) if state else None
+            if item is not None:
+                item.status = BatchJobStatus.PROCESSING
             return await self._generate_single_image(
                 image_data,
                 batch_id=batch_id,
@@ -285,7 +442,7 @@ class BatchImageGenerator:
             # Retry logic
             if self.config.enable_retry and retry_count < self.config.max_retries:
                 logger.info(f"Retrying image generation - id: {image_id}, retry: {retry_count + 1}")
-                await asyncio.sleep(1)  # Wait before retry
+                await asyncio.sleep(self.RETRY_DELAY_SECONDS)  # Wait before retry
                 return await self._generate_single_image(
                     image_data,
                     batch_id=batch_id,
@@ -312,20 +469,20 @@ class BatchImageGenerator:
         Returns:
             Progress information dictionary with status counts and percentages.
         """
-        if batch_id not in self._active_batches:
+        self._evict_finished()
+        state = self._active_batches.get(batch_id)
+        if state is None:
             return {
                 "batch_id": batch_id,
                 "status": "not_found",
                 "total": 0,
             }
 
-        results = self._active_batches[batch_id]
+        results = list(state.items.values())
 
         status_counts = {
-            "pending": sum(1 for r in results if r.status == BatchJobStatus.PENDING),
-            "processing": sum(1 for r in results if r.status == BatchJobStatus.PROCESSING),
-            "completed": sum(1 for r in results if r.status == BatchJobStatus.COMPLETED),
-            "failed": sum(1 for r in results if r.status == BatchJobStatus.FAILED),
+            status.value: sum(1 for r in results if r.status == status)
+            for status in BatchJobStatus
         }
 
         total = len(results)
@@ -333,30 +490,72 @@ class BatchImageGenerator:
             (status_counts["completed"] / total * 100) if total > 0 else 0
         )
 
+        if state.cancelled:
+            batch_status = "cancelled"
+        elif state.finished_at is not None:
+            batch_status = "completed"
+        else:
+            batch_status = "processing"
+
         return {
             "batch_id": batch_id,
+            "status": batch_status,
             "total": total,
             "status_counts": status_counts,
             "progress_percentage": progress_percentage,
         }
 
+    def is_running(self, batch_id: str) -> bool:
+        """Whether a batch is currently running in this process."""
+        state = self._active_batches.get(batch_id)
+        return state is not None and state.finished_at is None
+
     async def cancel_batch(self, batch_id: str) -> bool:
         """
         Cancel a batch generation.
 
+        Cancels the in-flight generation tasks of the batch; the running
+        generate call raises BatchCancelledError.
+
         Args:
             batch_id: Batch identifier.
 
         Returns:
-            True if batch was cancelled, False if batch not found.
+            True if batch was cancelled, False if batch not found or already finished.
         """
-        if batch_id not in self._active_batches:
+        state = self._active_batches.get(batch_id)
+        if state is None or state.finished_at is not None:
             return False
 
         logger.info(f"Cancelling batch - batch_id: {batch_id}")
-        del self._active_batches[batch_id]
+        state.cancelled = True
+        if state.task is not None:
+            state.task.cancel()
         return True
 
+    def _start_batch(self, batch_id: str) -> _BatchState:
+        self._evict_finished()
+        state = _BatchState()
+        self._active_batches[batch_id] = state
+        return state
+
+    def _finish_batch(self, state: _BatchState) -> None:
+        state.finished_at = time.time()
+        state.task = None
+
+    def _mark_cancelled(self, state: _BatchState) -> None:
+        for item in state.items.values():
+            if item.status in (BatchJobStatus.PENDING, BatchJobStatus.PROCESSING):
+                item.status = BatchJobStatus.CANCELLED
+
+    def _evict_finished(self) -> None:
+        cutoff = time.time() - self.FINISHED_BATCH_RETENTION_SECONDS
+        for batch_id in [
+            b for b, state in self._active_batches.items()
+            if state.finished_at is not None and state.finished_at < cutoff
+        ]:
+            del self._active_batches[batch_id]
+
 
 def create_batch_generator(
     config: Optional[BatchConfig] = None,
@@ -373,11 +572,32 @@ def create_batch_generator(
     return BatchImageGenerator(config=config)
 
 
+# Singleton instance
+_batch_generator: Optional[BatchImageGenerator] = None
+
+
+def get_batch_image_generator() -> BatchImageGenerator:
+    """Get or create the process-wide BatchImageGenerator configured from settings."""
+    global _batch_generator
+    if _batch_generator is None:
+        _batch_generator = BatchImageGenerator(
+            config=BatchConfig(
+                max_concurrent_jobs=settings.IMAGE_BATCH_MAX_CONCURRENT_JOBS,
+                max_retries=settings.IMAGE_BATCH_MAX_RETRIES,
+                enable_retry=settings.IMAGE_BATCH_MAX_RETRIES > 0,
+                timeout_seconds=settings.IMAGE_BATCH_TIMEOUT_SECONDS,
+            )
+        )
+    return _batch_generator
+
+
 __all__ = [
     "BatchImageGenerator",
     "BatchConfig",
     "BatchRequest",
     "BatchJobStatus",
     "BatchItemResult",
+    "BatchCancelledError",
     "create_batch_generator",
+    "get_batch_image_generator",
 ]
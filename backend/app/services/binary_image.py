@@ -0,0 +1,105 @@
+"""
+Binary Image Type.
+
+Generated and uploaded images are passed between generators, storage and
+video generation as raw bytes plus MIME type. Base64 is only used at the
+HTTP edge (JSON request/response bodies), never between services.
+"""
+
+import base64
+import binascii
+import io
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# JPEG starts with FF D8, PNG with 89 50 4E 47, WebP with RIFF....WEBP
+IMAGE_SIGNATURES = (b"\xff\xd8", b"\x89PNG", b"RIFF", b"GIF8")
+
+
+@dataclass(frozen=True)
+class BinaryImage:
+    """Raw image bytes (or a zero-copy view of them) with their MIME type."""
+
+    data: Union[bytes, memoryview]
+    mime_type: str = "image/png"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __bool__(self) -> bool:
+        return len(self.data) > 0
+
+    def to_bytes(self) -> bytes:
+        """The image as bytes (copies only if backed by a memoryview)."""
+        return self.data if isinstance(self.data, bytes) else bytes(self.data)
+
+    def to_base64(self) -> str:
+        """Base64 text for JSON responses."""
+        return base64.b64encode(self.data).decode("utf-8")
+
+    def to_pil(self) -> Image.Image:
+        """Open the image with Pillow."""
+        return Image.open(io.BytesIO(self.data))
+
+    @classmethod
+    def from_base64(cls, value: Union[str, bytes], mime_type: str = "image/png") -> "BinaryImage":
+        """Decode base64 from a JSON request (data: URL prefixes are accepted)."""
+        if isinstance(value, str) and value.startswith("data:"):
+            header, _, value = value.partition(",")
+            mime_type = header[len("data:"):].split(";", 1)[0] or mime_type
+        return cls(base64.b64decode(value), mime_type)
+
+    @classmethod
+    def from_file(cls, path: str, mime_type: str = "image/png") -> "BinaryImage":
+        """Read an image file."""
+        with open(path, "rb") as f:
+            return cls(f.read(), mime_type)
+
+
+def image_from_inline_data(data: Union[str, bytes, None], mime_type: Optional[str] = None) -> Optional[BinaryImage]:
+    """
+    Build a BinaryImage from a Gemini inline_data payload.
+
+    The SDK normally returns raw bytes, but some responses carry base64 text
+    (as str or bytes); those are decoded once here.
+
+    Args:
+        data: inline_data.data from a response part.
+        mime_type: inline_data.mime_type from the response part.
+
+    Returns:
+        The image, or None if the payload is empty or not decodable.
+    """
+    if not data:
+        return None
+    mime_type = mime_type or "image/png"
+    if isinstance(data, bytes) and data.startswith(IMAGE_SIGNATURES):
+        return BinaryImage(data, mime_type)
+    try:
+        return BinaryImage(base64.b64decode(data, validate=True), mime_type)
+    except (binascii.Error, ValueError):
+        if isinstance(data, bytes):
+            return BinaryImage(data, mime_type)
+        logger.warning("Image payload is neither binary nor base64")
+        return None
+
+
+def first_inline_image(parts: Optional[Iterable]) -> Optional[BinaryImage]:
+    """First image among the parts of a Gemini response, or None."""
+    for part in parts or []:
+        inline_data = getattr(part, "inline_data", None)
+        if inline_data:
+            return image_from_inline_data(inline_data.data, inline_data.mime_type)
+    return None
+
+
+__all__ = [
+    "BinaryImage",
+    "image_from_inline_data",
+    "first_inline_image",
+]
@@ -0,0 +1,110 @@
+"""
+Content Hash Index for Deduplicated Uploads.
+
+Maps (sha256, folder) to the URL of an object already in storage, so
+identical bytes are uploaded once and every later upload reuses the stored
+object. The index lives in a small SQLite file next to local storage and is
+shared by all worker processes on the host. It is only a cache: the object
+keys are derived from the hash, so a lost index is rebuilt from storage.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BlobIndex:
+    """SQLite-backed index of stored blobs by content hash."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the index.
+
+        Args:
+            path: SQLite file path; created on first use.
+        """
+        self.path = path
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use."""
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_type TEXT,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (digest, folder)
+                )
+                """
+            )
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def get(self, digest: str, folder: str) -> Optional[str]:
+        """
+        Look up the URL of a stored blob.
+
+        Args:
+            digest: sha256 hex digest of the content.
+            folder: Storage folder the blob was stored in.
+
+        Returns:
+            URL of the stored object, or None if unknown.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT url FROM blobs WHERE digest = ? AND folder = ?",
+                (digest, folder),
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def put(self, digest: str, folder: str, url: str, size: int, content_type: Optional[str] = None) -> None:
+        """
+        Record a stored blob.
+
+        Args:
+            digest: sha256 hex digest of the content.
+            folder: Storage folder the blob was stored in.
+            url: URL of the stored object.
+            size: Content size in bytes.
+            content_type: MIME type of the content.
+        """
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO blobs (digest, folder, url, size, content_type, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, folder, url, size, content_type, time.time()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def remove(self, digest: str, folder: str) -> None:
+        """Forget a blob (e.g. when its object no longer exists)."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM blobs WHERE digest = ? AND folder = ?", (digest, folder))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+__all__ = ["BlobIndex"]
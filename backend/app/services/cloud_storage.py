@@ -1,64 +1,115 @@
 """
-Tencent COS Cloud Storage Service
+Cloud Storage Service
 
-Handles file uploads to Tencent Cloud Object Storage.
-Falls back to local storage if COS is not configured.
+Handles file uploads to the object store selected by STORAGE_BACKEND
+(Tencent COS, S3/MinIO or the local filesystem; see app.services.storage).
+Falls back to local storage if the backend is not configured or fails.
+
+The storage SDKs are blocking, so async callers should use the *_async methods,
+which run uploads on a dedicated, bounded thread pool instead of the event
+loop. Large files are uploaded in parts, several parts at a time.
+
+upload_deduplicated_async stores content under a key derived from its hash,
+so identical bytes (the same product image, reference image or SNS download)
+are uploaded once and shared by every project that uses them.
 """
 
+import asyncio
+import hashlib
+import mimetypes
 import os
 import logging
-from typing import Optional
-from qcloud_cos import CosConfig, CosS3Client
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 
 from app.core.config import settings
+from app.services.blob_index import BlobIndex
+from app.services.storage import LocalStorageDriver, StorageDriverBase, create_storage_driver
 
 logger = logging.getLogger(__name__)
 
+MB = 1024 * 1024
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "video/mp4": "mp4",
+}
+
+
+@dataclass
+class UploadRequest:
+    """One object to upload with upload_many_async."""
+
+    data: bytes
+    filename: Optional[str] = None  # None stores the content deduplicated under its hash
+    folder: str = "temp"
+    content_type: str = "image/jpeg"
+
+
+def content_filename(digest: str, content_type: str) -> str:
+    """Storage filename for deduplicated content."""
+    extension = CONTENT_TYPE_EXTENSIONS.get(content_type)
+    if extension is None:
+        guessed = mimetypes.guess_extension(content_type or "")
+        extension = guessed.lstrip(".") if guessed else "bin"
+    return f"{digest}.{extension}"
+
 
 class CloudStorageService:
-    """Service for uploading files to Tencent COS or local storage."""
-
-    def __init__(self):
-        self._cos_client: Optional[CosS3Client] = None
-        self._bucket: Optional[str] = None
-        self._region: Optional[str] = None
-        self._initialized = False
-
-    def _init_cos(self) -> bool:
-        """Initialize COS client if credentials are available."""
-        if self._initialized:
-            return self._cos_client is not None
-
-        self._initialized = True
-
-        if not all([
-            settings.TENCENT_SECRET_ID,
-            settings.TENCENT_SECRET_KEY,
-            settings.TENCENT_COS_BUCKET,
-            settings.TENCENT_COS_REGION,
-        ]):
-            logger.warning("Tencent COS not configured, using local storage")
-            return False
+    """Service for uploading files to the configured storage backend."""
 
-        try:
-            config = CosConfig(
-                Region=settings.TENCENT_COS_REGION,
-                SecretId=settings.TENCENT_SECRET_ID,
-                SecretKey=settings.TENCENT_SECRET_KEY,
-                Scheme="https",
-            )
-            self._cos_client = CosS3Client(config)
-            self._bucket = settings.TENCENT_COS_BUCKET
-            self._region = settings.TENCENT_COS_REGION
-            logger.info(f"Tencent COS initialized: bucket={self._bucket}, region={self._region}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to initialize Tencent COS: {e}")
-            return False
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        multipart_threshold: Optional[int] = None,
+        part_size: Optional[int] = None,
+        driver: Optional[StorageDriverBase] = None,
+    ):
+        """
+        Initialize the storage service.
+
+        Args:
+            max_workers: Size of the upload thread pool (and of the driver's connection pool).
+            multipart_threshold: Size in bytes from which uploads are split into parts.
+            part_size: Size in bytes of each multipart part.
+            driver: Storage driver to use. Defaults to the STORAGE_BACKEND driver.
+        """
+        self._driver = driver
 
-    def _get_cos_url(self, key: str) -> str:
-        """Get the public URL for a COS object."""
-        return f"https://{self._bucket}.cos.{self._region}.myqcloud.com/{key}"
+        self.max_workers = max(1, max_workers or settings.CLOUD_STORAGE_UPLOAD_WORKERS)
+        self.multipart_threshold = multipart_threshold or settings.CLOUD_STORAGE_MULTIPART_THRESHOLD_MB * MB
+        self.part_size = part_size or settings.CLOUD_STORAGE_MULTIPART_PART_SIZE_MB * MB
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._blob_index: Optional[BlobIndex] = None
+        self._pending_blobs: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    @property
+    def driver(self) -> StorageDriverBase:
+        """Storage driver for the configured backend (local storage if it is unusable)."""
+        if self._driver is None:
+            try:
+                self._driver = create_storage_driver(max_pool_connections=self.max_workers)
+            except Exception as e:
+                logger.error(f"Failed to initialize {settings.STORAGE_BACKEND} storage, using local storage: {e}")
+                self._driver = LocalStorageDriver(settings.TEMP_DIR)
+            logger.info(f"Storage backend: {self._driver.name}")
+        return self._driver
+
+    def _fallback_driver(self) -> LocalStorageDriver:
+        """Local storage used when the configured backend fails."""
+        return LocalStorageDriver(settings.TEMP_DIR)
+
+    def get_url(self, key: str) -> str:
+        """Get the public URL of an object key (e.g. "temp/abc.png")."""
+        return self.driver.get_url(key)
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        """Object key of a URL in the configured storage, or None for other URLs."""
+        return self.driver.key_for_url(url)
 
     def upload_bytes(
         self,
@@ -70,6 +121,8 @@ class CloudStorageService:
         """
         Upload bytes to cloud storage or local storage.
 
+        Blocks until the upload finishes; use upload_bytes_async from async code.
+
         Args:
             data: File content as bytes
             filename: Name of the file
@@ -77,64 +130,263 @@ class CloudStorageService:
             content_type: MIME type of the file
 
         Returns:
-            URL to access the file (COS URL or local /static/ path)
+            URL to access the file (storage URL or local /static/ path)
         """
-        if self._init_cos():
-            return self._upload_to_cos(data, filename, folder, content_type)
-        else:
-            return self._save_locally(data, filename, folder)
+        key = f"{folder}/{filename}"
+        driver = self.driver
+
+        try:
+            driver.put_object(key, data, content_type)
+            url = driver.get_url(key)
+            logger.info(f"Uploaded to {driver.name}: {key} -> {url}")
+            return url
+        except Exception as e:
+            if driver.name == "local":
+                raise
+            logger.error(f"Failed to upload to {driver.name}: {e}")
 
-    def _upload_to_cos(
+        fallback = self._fallback_driver()
+        fallback.put_object(key, data, content_type)
+        url = fallback.get_url(key)
+        logger.info(f"Saved locally: {key} -> {url}")
+        return url
+
+    def upload_file(
         self,
-        data: bytes,
+        file_path: str,
         filename: str,
-        folder: str,
-        content_type: str,
+        folder: str = "temp",
+        content_type: str = "image/jpeg",
     ) -> str:
-        """Upload to Tencent COS."""
+        """
+        Upload a file from disk to cloud storage.
+
+        Args:
+            file_path: Path to the file on disk
+            filename: Name to use in storage
+            folder: Folder/prefix for the file
+            content_type: MIME type of the file
+
+        Returns:
+            URL to access the file
+        """
         key = f"{folder}/{filename}"
+        driver = self.driver
+
+        try:
+            driver.put_file(key, file_path, content_type)
+            url = driver.get_url(key)
+            logger.info(f"Uploaded to {driver.name}: {key} -> {url}")
+            return url
+        except Exception as e:
+            if driver.name == "local":
+                raise
+            logger.error(f"Failed to upload to {driver.name}: {e}")
+
+        fallback = self._fallback_driver()
+        fallback.put_file(key, file_path, content_type)
+        return fallback.get_url(key)
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        """
+        Read an object, or a byte range of it.
 
+        Objects that were saved locally after a failed upload are found too.
+
+        Args:
+            key: Object key (e.g. "temp/abc.png").
+            start: First byte to read.
+            end: Last byte to read (inclusive); None reads to the end.
+
+        Returns:
+            The bytes read, or None if the object does not exist.
+        """
+        driver = self.driver
         try:
-            from io import BytesIO
-            file_obj = BytesIO(data)
-
-            response = self._cos_client.put_object(
-                Bucket=self._bucket,
-                Body=file_obj,
-                Key=key,
-                ContentType=content_type,
+            data = driver.read_range(key, start, end)
+        except Exception as e:
+            logger.error(f"Failed to read {key} from {driver.name}: {e}")
+            data = None
+        if data is None and driver.name != "local":
+            data = self._fallback_driver().read_range(key, start, end)
+        return data
+
+    def is_cloud_storage_enabled(self) -> bool:
+        """Check if a remote storage backend is configured and available."""
+        return self.driver.name != "local"
+
+    # ----------------------------------------------------------------------
+    # Async API
+    # ----------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get or create the upload thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="cloud-storage",
+            )
+        return self._executor
+
+    async def _run(self, func: Callable, *args):
+        """Run a blocking storage call on the upload thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def upload_bytes_async(
+        self,
+        data: bytes,
+        filename: str,
+        folder: str = "temp",
+        content_type: str = "image/jpeg",
+    ) -> str:
+        """
+        Upload bytes without blocking the event loop.
+
+        Args:
+            data: File content as bytes
+            filename: Name of the file
+            folder: Folder/prefix for the file (e.g., "temp", "products", "references")
+            content_type: MIME type of the file
+
+        Returns:
+            URL to access the file (storage URL or local /static/ path)
+        """
+        if len(data) >= self.multipart_threshold and self.driver.supports_multipart:
+            return await self._upload_multipart(
+                len(data),
+                lambda offset, size: data[offset:offset + size],
+                filename,
+                folder,
+                content_type,
+                fallback=lambda: self._fallback_driver().put_object(f"{folder}/{filename}", data, content_type),
+            )
+        return await self._run(self.upload_bytes, data, filename, folder, content_type)
+
+    async def upload_many_async(self, uploads: List[UploadRequest]) -> List[str]:
+        """
+        Upload several objects concurrently.
+
+        Args:
+            uploads: Objects to upload.
+
+        Returns:
+            URLs in the same order as the requests.
+        """
+        return list(await asyncio.gather(*(
+            self.upload_bytes_async(u.data, u.filename, u.folder, u.content_type)
+            if u.filename is not None
+            else self.upload_deduplicated_async(u.data, u.folder, u.content_type)
+            for u in uploads
+        )))
+
+    @property
+    def blob_index(self) -> BlobIndex:
+        """Content hash index used for deduplicated uploads."""
+        if self._blob_index is None:
+            self._blob_index = BlobIndex(
+                settings.BLOB_INDEX_PATH or os.path.join(settings.TEMP_DIR, "blob_index.sqlite3")
             )
+        return self._blob_index
+
+    async def upload_deduplicated_async(
+        self,
+        data: bytes,
+        folder: str = "temp",
+        content_type: str = "image/jpeg",
+    ) -> str:
+        """
+        Upload content once per folder, keyed by its sha256 hash.
+
+        Content already in storage (per the index, or found under its
+        content key) is not uploaded again; concurrent uploads of the same
+        content share one upload.
+
+        Args:
+            data: File content as bytes
+            folder: Folder/prefix for the file
+            content_type: MIME type of the file
+
+        Returns:
+            URL to access the file
+        """
+        digest = await self._run(lambda: hashlib.sha256(data).hexdigest())
+        pending_key = (digest, folder)
 
-            url = self._get_cos_url(key)
-            logger.info(f"Uploaded to COS: {key} -> {url}")
+        task = self._pending_blobs.get(pending_key)
+        if task is None:
+            task = asyncio.create_task(self._store_blob(data, digest, folder, content_type))
+            self._pending_blobs[pending_key] = task
+            task.add_done_callback(lambda _: self._pending_blobs.pop(pending_key, None))
+        return await asyncio.shield(task)
+
+    async def _store_blob(self, data: bytes, digest: str, folder: str, content_type: str) -> str:
+        """Return the existing URL for the content, uploading it if needed."""
+        filename = content_filename(digest, content_type)
+
+        url = await self._run(self._find_blob, digest, folder, filename, len(data), content_type)
+        if url is not None:
+            logger.info(f"Deduplicated upload: {folder}/{filename} already stored")
             return url
 
+        url = await self.upload_bytes_async(data, filename, folder, content_type)
+        try:
+            await self._run(self.blob_index.put, digest, folder, url, len(data), content_type)
+        except Exception as e:
+            logger.warning(f"Failed to record blob in index: {e}")
+        return url
+
+    def _find_blob(
+        self,
+        digest: str,
+        folder: str,
+        filename: str,
+        size: int,
+        content_type: str,
+    ) -> Optional[str]:
+        """Find stored content via the index, falling back to the storage itself."""
+        try:
+            url = self.blob_index.get(digest, folder)
         except Exception as e:
-            logger.error(f"Failed to upload to COS: {e}")
-            return self._save_locally(data, filename, folder)
+            logger.warning(f"Blob index lookup failed: {e}")
+            url = None
 
-    def _save_locally(self, data: bytes, filename: str, folder: str) -> str:
-        """Fallback: save to local storage."""
-        local_dir = os.path.join(settings.TEMP_DIR, folder)
-        os.makedirs(local_dir, exist_ok=True)
+        key = f"{folder}/{filename}"
+        local = self._fallback_driver()
+        if url is not None:
+            # Local files can be cleaned up, so verify them; remote objects are trusted
+            if url != local.get_url(key) or local.exists(key):
+                return url
+            self.blob_index.remove(digest, folder)
 
-        local_path = os.path.join(local_dir, filename)
-        with open(local_path, "wb") as f:
-            f.write(data)
+        # Index miss: the key is derived from the hash, so check storage directly
+        driver = self.driver
+        try:
+            if not driver.exists(key):
+                return None
+        except Exception as e:
+            logger.warning(f"{driver.name} existence check failed for {key}: {e}")
+            return None
+        url = driver.get_url(key)
 
-        url = f"/static/{folder}/{filename}"
-        logger.info(f"Saved locally: {local_path} -> {url}")
+        try:
+            self.blob_index.put(digest, folder, url, size, content_type)
+        except Exception as e:
+            logger.warning(f"Failed to record blob in index: {e}")
         return url
 
-    def upload_file(
+    async def upload_file_async(
         self,
         file_path: str,
         filename: str,
         folder: str = "temp",
-        content_type: str = "image/jpeg",
+        content_type: str = "video/mp4",
     ) -> str:
         """
-        Upload a file from disk to cloud storage.
+        Upload a file from disk without blocking the event loop.
+
+        Files at or above the multipart threshold are streamed to storage part
+        by part, so large videos are never read into memory as a whole.
 
         Args:
             file_path: Path to the file on disk
@@ -145,13 +397,129 @@ class CloudStorageService:
         Returns:
             URL to access the file
         """
-        with open(file_path, "rb") as f:
-            data = f.read()
-        return self.upload_bytes(data, filename, folder, content_type)
+        size = os.path.getsize(file_path)
+        if size < self.multipart_threshold or not self.driver.supports_multipart:
+            return await self._run(self.upload_file, file_path, filename, folder, content_type)
 
-    def is_cloud_storage_enabled(self) -> bool:
-        """Check if cloud storage is configured and available."""
-        return self._init_cos()
+        def read_part(offset: int, part_size: int) -> bytes:
+            with open(file_path, "rb") as f:
+                f.seek(offset)
+                return f.read(part_size)
+
+        return await self._upload_multipart(
+            size,
+            read_part,
+            filename,
+            folder,
+            content_type,
+            fallback=lambda: self._fallback_driver().put_file(f"{folder}/{filename}", file_path, content_type),
+        )
+
+    async def _upload_multipart(
+        self,
+        size: int,
+        read_part: Callable[[int, int], bytes],
+        filename: str,
+        folder: str,
+        content_type: str,
+        fallback: Callable[[], str],
+    ) -> str:
+        """
+        Upload an object in parts, several parts at a time.
+
+        Args:
+            size: Total object size in bytes.
+            read_part: Returns the bytes at (offset, size); called on the upload thread pool.
+            filename: Name of the file
+            folder: Folder/prefix for the file
+            content_type: MIME type of the file
+            fallback: Stores the object locally; called on the upload thread pool if the upload fails.
+
+        Returns:
+            URL to access the file
+        """
+        key = f"{folder}/{filename}"
+        driver = self.driver
+        upload_id = None
+        # Leave pool capacity for other uploads while a large file is in flight
+        part_slots = asyncio.Semaphore(max(1, self.max_workers // 2))
+
+        def upload_part(part_number: int, offset: int) -> dict:
+            body = read_part(offset, min(self.part_size, size - offset))
+            etag = driver.upload_part(key, upload_id, part_number, body)
+            return {"PartNumber": part_number, "ETag": etag}
+
+        async def run_part(part_number: int, offset: int) -> dict:
+            async with part_slots:
+                return await self._run(upload_part, part_number, offset)
+
+        try:
+            upload_id = await self._run(driver.create_multipart_upload, key, content_type)
+
+            parts = await asyncio.gather(*(
+                run_part(part_number, offset)
+                for part_number, offset in enumerate(range(0, size, self.part_size), start=1)
+            ))
+
+            await self._run(driver.complete_multipart_upload, key, upload_id, list(parts))
+
+            url = driver.get_url(key)
+            logger.info(f"Uploaded to {driver.name} in {len(parts)} parts: {key} -> {url}")
+            return url
+
+        except Exception as e:
+            logger.error(f"Failed multipart upload to {driver.name}: {e}")
+            if upload_id is not None:
+                try:
+                    await self._run(driver.abort_multipart_upload, key, upload_id)
+                except Exception as abort_error:
+                    logger.warning(f"Failed to abort multipart upload {upload_id}: {abort_error}")
+            await self._run(fallback)
+            return self._fallback_driver().get_url(key)
+
+    async def read_range_async(self, key: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        """
+        Read an object, or a byte range of it, without blocking the event loop.
+
+        Args:
+            key: Object key (e.g. "temp/abc.png").
+            start: First byte to read.
+            end: Last byte to read (inclusive); None reads to the end.
+
+        Returns:
+            The bytes read, or None if the object does not exist.
+        """
+        return await self._run(self.read_range, key, start, end)
+
+    async def presigned_url_async(
+        self,
+        key: str,
+        expires_seconds: Optional[int] = None,
+        download_filename: Optional[str] = None,
+    ) -> str:
+        """
+        Get a time-limited download URL for an object.
+
+        Args:
+            key: Object key (e.g. "generated/abc.png").
+            expires_seconds: URL lifetime. Defaults to STORAGE_PRESIGNED_URL_EXPIRE_SECONDS.
+            download_filename: If set, the object is served as an attachment with this filename.
+
+        Returns:
+            Signed URL (the public URL for local storage).
+        """
+        return await self._run(
+            self.driver.presigned_url,
+            key,
+            expires_seconds or settings.STORAGE_PRESIGNED_URL_EXPIRE_SECONDS,
+            download_filename,
+        )
+
+    def shutdown(self) -> None:
+        """Wait for pending uploads and release the upload thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
 
 # Singleton instance
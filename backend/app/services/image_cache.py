@@ -0,0 +1,272 @@
+"""
+In-process LRU Cache for Source Image Bytes.
+
+Product and reference images are loaded again by every generation of every
+project that uses them. This cache keeps recently used images in memory,
+bounded by total size:
+
+- Local files are keyed by path and revalidated by mtime/size on every load.
+- Remote URLs are trusted for IMAGE_CACHE_REVALIDATE_SECONDS, then
+  revalidated with a conditional GET (ETag / Last-Modified), so an unchanged
+  image costs a 304 instead of a full download.
+- Immutable storage objects (e.g. uuid-named temp uploads) go through
+  get_or_load and are never revalidated.
+"""
+
+import asyncio
+import logging
+import mimetypes
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+IMMUTABLE = "immutable"
+LOCALHOST_STATIC_PREFIX = "http://localhost:8000/static/"
+
+
+@dataclass
+class CachedImage:
+    """One cached image."""
+
+    data: bytes
+    mime_type: str
+    version: str  # mtime/size for files, ETag or Last-Modified for URLs
+    validated_at: float
+
+
+def guess_mime_type(url: str, default: str = "image/jpeg") -> str:
+    """Guess an image MIME type from a URL or path."""
+    mime_type, _ = mimetypes.guess_type(url.split("?", 1)[0])
+    return mime_type if mime_type and mime_type.startswith("image/") else default
+
+
+class ImageByteCache:
+    """Size-bounded LRU cache of image bytes with hit/miss metrics."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_item_bytes: Optional[int] = None,
+        revalidate_seconds: float = 300.0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size of cached images; least recently used are evicted first.
+            max_item_bytes: Larger images are passed through without caching.
+            revalidate_seconds: How long a remote image is served without revalidation.
+        """
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes if max_item_bytes is not None else max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self._entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """Get an entry and mark it as recently used (does not count as a hit)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, data: bytes, mime_type: str, version: str) -> None:
+        """Store an entry, evicting least recently used entries to stay within max_bytes."""
+        self.invalidate(key)
+        if not data or len(data) > self.max_item_bytes:
+            return
+        self._entries[key] = CachedImage(data, mime_type, version, time.monotonic())
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.data)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.data)
+
+    def clear(self) -> None:
+        """Remove all entries (metrics are kept)."""
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Cache metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _hit(self, entry: CachedImage) -> Tuple[bytes, str]:
+        self.hits += 1
+        return entry.data, entry.mime_type
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[bytes]]],
+        mime_type: Optional[str] = None,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Load an immutable object through the cache.
+
+        Args:
+            key: Cache key (e.g. "storage:temp/<uuid>.png").
+            loader: Loads the bytes on a miss; None means not found (not cached).
+            mime_type: MIME type of the object. Guessed from the key if omitted.
+
+        Returns:
+            Tuple of (bytes, mime_type), or (None, None) if not found.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return self._hit(entry)
+
+        self.misses += 1
+        data = await loader()
+        if data is None:
+            return None, None
+        mime_type = mime_type or guess_mime_type(key)
+        self.put(key, data, mime_type, IMMUTABLE)
+        return data, mime_type
+
+    async def load(
+        self,
+        url: str,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Load an image from a local path, /static URL or remote URL through the cache.
+
+        Args:
+            url: Image location (localhost/static URL, remote URL or file path).
+            client: HTTP client for remote images. Defaults to the shared client.
+
+        Returns:
+            Tuple of (bytes, mime_type), or (None, None) if the image could not be loaded.
+        """
+        if not url:
+            return None, None
+
+        local_path = self.resolve_local_path(url)
+        if local_path is not None:
+            return await self._load_file(url, local_path)
+        if url.startswith("http"):
+            return await self._load_remote(url, client or get_http_client())
+        return None, None
+
+    @staticmethod
+    def resolve_local_path(url: str) -> Optional[str]:
+        """Map localhost/static URLs and plain paths to a local file path."""
+        if url.startswith(LOCALHOST_STATIC_PREFIX):
+            return os.path.join(settings.TEMP_DIR, url[len(LOCALHOST_STATIC_PREFIX):])
+        if url.startswith("/static/"):
+            return os.path.join(settings.TEMP_DIR, url[len("/static/"):])
+        if url.startswith("http"):
+            return None
+        return url
+
+    async def _load_file(self, url: str, path: str) -> Tuple[Optional[bytes], Optional[str]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.invalidate(url)
+            return None, None
+
+        version = f"{stat.st_mtime_ns}:{stat.st_size}"
+        entry = self.get(url)
+        if entry is not None and entry.version == version:
+            return self._hit(entry)
+
+        self.misses += 1
+        data = await asyncio.to_thread(_read_file, path)
+        mime_type = guess_mime_type(path)
+        self.put(url, data, mime_type, version)
+        return data, mime_type
+
+    async def _load_remote(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        entry = self.get(url)
+        if entry is not None and time.monotonic() - entry.validated_at < self.revalidate_seconds:
+            return self._hit(entry)
+
+        headers = {}
+        if entry is not None and entry.version:
+            validator = "If-Modified-Since" if entry.version.startswith("lm:") else "If-None-Match"
+            headers[validator] = entry.version.removeprefix("lm:")
+
+        response = await client.get(url, headers=headers, timeout=30.0)
+        if response.status_code == 304 and entry is not None:
+            entry.validated_at = time.monotonic()
+            self.revalidations += 1
+            return self._hit(entry)
+
+        self.misses += 1
+        if response.status_code != 200:
+            logger.warning(f"Failed to download image: HTTP {response.status_code} - {url}")
+            self.invalidate(url)
+            return None, None
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        version = etag or (f"lm:{last_modified}" if last_modified else "")
+        content_type = response.headers.get("content-type", "").split(";")[0].strip()
+        mime_type = content_type if content_type.startswith("image/") else guess_mime_type(url)
+        self.put(url, response.content, mime_type, version)
+        return response.content, mime_type
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# Singleton instance
+_image_cache: Optional[ImageByteCache] = None
+
+
+def get_image_cache() -> ImageByteCache:
+    """Get or create the process-wide image cache."""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageByteCache(
+            max_bytes=settings.IMAGE_CACHE_MAX_MB * MB,
+            max_item_bytes=settings.IMAGE_CACHE_MAX_ITEM_MB * MB,
+            revalidate_seconds=settings.IMAGE_CACHE_REVALIDATE_SECONDS,
+        )
+    return _image_cache
+
+
+__all__ = [
+    "CachedImage",
+    "ImageByteCache",
+    "guess_mime_type",
+    "get_image_cache",
+]
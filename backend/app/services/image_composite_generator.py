@@ -7,7 +7,6 @@ It handles product-background composition and natural integration.
 """
 
 import asyncio
-import base64
 import io
 import logging
 import time
@@ -19,6 +18,7 @@ from google.genai import types
 from PIL import Image
 
 from app.core.config import settings
+from app.services.binary_image import first_inline_image
 
 logger = logging.getLogger(__name__)
 
@@ -125,7 +125,7 @@ class CompositeImageGenerator:
 
         Returns:
             Dictionary with keys:
-                - image_data: Base64 encoded image data
+                - image_data: BinaryImage with the composite image
                 - mime_type: MIME type of image
                 - composite_time_ms: Generation time in milliseconds
         """
@@ -304,7 +304,7 @@ class CompositeImageGenerator:
             images: Optional list of image bytes to include.
 
         Returns:
-            Dictionary with image_data and mime_type.
+            Dictionary with image_data (BinaryImage) and mime_type.
         """
         # Build contents list
         contents = [prompt]
@@ -336,41 +336,15 @@ class CompositeImageGenerator:
             response = await asyncio.to_thread(_generate)
 
             # Extract image from response
-            image_data = None
-            mime_type = "image/png"
-
-            for part in response.parts:
-                if hasattr(part, 'inline_data') and part.inline_data:
-                    raw_data = part.inline_data.data
-                    mime_type = part.inline_data.mime_type or "image/png"
-
-                    if isinstance(raw_data, bytes):
-                        # Log first bytes for debugging
-                        logger.info(f"raw_data type: bytes, first 20 bytes: {raw_data[:20]}")
-                        # Check if raw_data is actual binary or base64-encoded bytes
-                        # JPEG starts with FF D8 FF, PNG starts with 89 50 4E 47
-                        if raw_data[:2] == b'\xff\xd8' or raw_data[:4] == b'\x89PNG':
-                            # Actual binary image data
-                            logger.info("Detected actual binary image, encoding to base64")
-                            image_data = base64.b64encode(raw_data).decode("utf-8")
-                        else:
-                            # Likely base64 string as bytes, decode to string
-                            logger.info("Detected base64 string as bytes, decoding to string")
-                            image_data = raw_data.decode("utf-8")
-                    else:
-                        logger.info(f"raw_data type: {type(raw_data)}, first 50 chars: {str(raw_data)[:50]}")
-                        image_data = raw_data
-
-                    break
-
-            if not image_data:
+            image = first_inline_image(response.parts)
+            if not image:
                 raise Exception("No image generated in response")
 
-            logger.debug(f"Image generated successfully, mime_type: {mime_type}")
+            logger.debug(f"Image generated successfully, mime_type: {image.mime_type}")
 
             return {
-                "image_data": image_data,
-                "mime_type": mime_type,
+                "image_data": image,
+                "mime_type": image.mime_type,
             }
 
         except Exception as e:
@@ -395,7 +369,7 @@ class CompositeImageGenerator:
             Image data as bytes.
         """
         result = await self._generate_with_gemini(prompt, aspect_ratio, images)
-        return base64.b64decode(result["image_data"])
+        return result["image_data"].to_bytes()
 
 
 # Singleton instance
@@ -6,7 +6,6 @@ while preserving the original product appearance.
 """
 
 import asyncio
-import base64
 import io
 import logging
 import time
@@ -17,6 +16,7 @@ from google.genai import types
 from PIL import Image
 
 from app.core.config import settings
+from app.services.binary_image import first_inline_image
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +65,7 @@ class GeminiImageEditor:
 
         Returns:
             dict with keys:
-                - image_data: Base64 encoded image data
+                - image_data: BinaryImage with the generated image
                 - mime_type: MIME type of the generated image
                 - generation_time_ms: Time taken in milliseconds
         """
@@ -123,29 +123,8 @@ CRITICAL RULES:
             logger.info(f"[RESPONSE] 이미지 생성 완료")
 
             # Extract the generated image from response
-            image_data = None
-            mime_type = "image/png"
-
-            for part in response.parts:
-                if part.inline_data is not None:
-                    # Get raw image data from inline_data
-                    raw_data = part.inline_data.data
-                    mime_type = part.inline_data.mime_type or "image/png"
-
-                    if isinstance(raw_data, bytes):
-                        # Check if raw_data is actual binary or base64-encoded bytes
-                        if raw_data[:2] == b'\xff\xd8' or raw_data[:4] == b'\x89PNG':
-                            # Actual binary image data - encode to base64
-                            image_data = base64.b64encode(raw_data).decode("utf-8")
-                        else:
-                            # Likely base64 string as bytes - just decode to string
-                            image_data = raw_data.decode("utf-8")
-                    else:
-                        # If it's already a string (base64), use as-is
-                        image_data = raw_data
-                    break
-
-            if not image_data:
+            image = first_inline_image(response.parts)
+            if not image:
                 logger.error("No image in response")
                 raise Exception("No image generated in response")
 
@@ -153,8 +132,8 @@ CRITICAL RULES:
             logger.info(f"Image edit completed in {generation_time_ms}ms")
 
             return {
-                "image_data": image_data,
-                "mime_type": mime_type,
+                "image_data": image,
+                "mime_type": image.mime_type,
                 "generation_time_ms": generation_time_ms,
             }
 
@@ -185,7 +164,7 @@ CRITICAL RULES:
             product_description: Optional text description of the product
 
         Returns:
-            dict with image_data, mime_type, generation_time_ms
+            dict with image_data (BinaryImage), mime_type, generation_time_ms
         """
         start_time = time.time()
         logger.info(f"Starting scene composition - prompt: {scene_prompt[:100]}...")
@@ -220,37 +199,16 @@ CRITICAL RULES:
             response = await asyncio.to_thread(_generate)
 
             # Extract the generated image from response
-            image_data = None
-            mime_type = "image/png"
-
-            for part in response.parts:
-                if part.inline_data is not None:
-                    # Get raw image data from inline_data
-                    raw_data = part.inline_data.data
-                    mime_type = part.inline_data.mime_type or "image/png"
-
-                    if isinstance(raw_data, bytes):
-                        # Check if raw_data is actual binary or base64-encoded bytes
-                        if raw_data[:2] == b'\xff\xd8' or raw_data[:4] == b'\x89PNG':
-                            # Actual binary image data - encode to base64
-                            image_data = base64.b64encode(raw_data).decode("utf-8")
-                        else:
-                            # Likely base64 string as bytes - just decode to string
-                            image_data = raw_data.decode("utf-8")
-                    else:
-                        # If it's already a string (base64), use as-is
-                        image_data = raw_data
-                    break
-
-            if not image_data:
+            image = first_inline_image(response.parts)
+            if not image:
                 raise Exception("No image generated in response")
 
             generation_time_ms = int((time.time() - start_time) * 1000)
             logger.info(f"Scene composition completed in {generation_time_ms}ms")
 
             return {
-                "image_data": image_data,
-                "mime_type": mime_type,
+                "image_data": image,
+                "mime_type": image.mime_type,
                 "generation_time_ms": generation_time_ms,
             }
 
@@ -1,9 +1,10 @@
 import os
 import asyncio
+import hashlib
 import json
 import re
 import tempfile
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Callable, Awaitable, Tuple
 from pathlib import Path
 import base64
 
@@ -12,6 +13,11 @@ from google.genai.types import HttpOptions
 from PIL import Image
 
 from app.core.config import settings
+from app.services.reference_analyzer.keyframes import Keyframe, extract_keyframes, stream_keyframes
+from app.services.reference_analyzer.result_cache import hash_media
+
+# yt-dlp stdout is read in chunks of this size when streaming into ffmpeg
+STREAM_CHUNK_SIZE = 256 * 1024
 
 
 class ReferenceAnalyzer:
@@ -37,131 +43,231 @@ class ReferenceAnalyzer:
         self,
         video_url: str,
         extract_audio: bool = True,
+        on_content_hash: Optional[Callable[[str], Awaitable[Optional[Dict[str, Any]]]]] = None,
     ) -> Dict[str, Any]:
         """
         분석 파이프라인:
-        1. 영상 다운로드
+        1. 영상 다운로드 (REFERENCE_STREAM_DOWNLOADS면 다운로드와 키 프레임 추출을 스트리밍으로 동시에)
         2. 키 프레임 추출
         3. Gemini로 분석 (통신 오류 시 최대 3회 재시도)
+
+        on_content_hash는 받은 미디어의 sha256으로 호출되며, 결과 dict를 반환하면
+        (예: 같은 영상의 캐시된 분석) Gemini 분석을 건너뛰고 그 결과를 반환.
+        단계별로 동시 실행 수를 나누어 제한하려면 reference_analyzer.pipeline 사용
         """
         video_path = None
-        frames = []
         try:
-            # 1. 영상 다운로드
-            video_path = await self._download_video(video_url)
+            streamed = None
+            if settings.REFERENCE_STREAM_DOWNLOADS:
+                # 1-2. 스트리밍 다운로드 + 키 프레임 추출 (Gemini에는 프레임만 보내므로 저해상도 영상만 받음)
+                streamed = await self.stream_video(video_url, frames_only=True)
 
-            # 2. 메타데이터 추출
-            metadata = await self._get_metadata(video_path)
+            if streamed:
+                metadata, frames, content_hash = streamed
+            else:
+                # 1. 영상 다운로드
+                video_path = await self._download_video(video_url)
+                content_hash = await asyncio.to_thread(hash_media, [video_path])
 
-            # 3. 키 프레임 추출 (영상 전체를 균등하게 샘플링)
-            frames = await self._extract_frames(
-                video_path,
-                duration=metadata.get("duration", 0),
-                target_frames=20
-            )
+            if on_content_hash:
+                cached = await on_content_hash(content_hash)
+                if cached is not None:
+                    return cached
 
-            # 4. Gemini로 분석 (통신 오류 시 최대 3회 재시도)
-            max_retries = 3
-            last_error = None
-            print(f"[분석] Gemini 분석 시작 - 프레임 {len(frames)}개, duration={metadata.get('duration', 0):.1f}초")
+            if not streamed:
+                # 2-3. 메타데이터 및 키 프레임 추출
+                metadata, frames = await self.prepare_video(video_path)
 
-            for attempt in range(1, max_retries + 1):
-                try:
-                    print(f"[분석] 시도 {attempt}/{max_retries}")
-                    analysis = await self._analyze_with_gemini(
-                        video_path=video_path,
-                        frames=frames,
-                        duration=metadata.get("duration", 0),
-                    )
-                    # 분석 성공 시 루프 종료
-                    print(f"[분석] 분석 성공!")
-                    break
-                except Exception as e:
-                    last_error = e
-                    error_msg = str(e).lower()
-                    print(f"[분석] 시도 {attempt} 실패: {str(e)[:200]}")
+            # 4. Gemini로 분석
+            return await self.analyze_frames(video_path, frames, metadata.get("duration", 0))
 
-                    # 통신/네트워크 관련 오류인지 확인
-                    is_network_error = any(keyword in error_msg for keyword in [
-                        'timeout', 'timed out', 'connection', 'network',
-                        'reset', 'refused', 'unavailable', '503', '504',
-                        '502', '500', 'internal', 'server error', 'rate limit',
-                        'quota', 'overloaded', 'resource exhausted'
-                    ])
+        finally:
+            if video_path and os.path.exists(video_path):
+                os.remove(video_path)
 
-                    if is_network_error and attempt < max_retries:
-                        wait_time = attempt * 5  # 5초, 10초, 15초 대기
-                        print(f"통신 오류 발생 (시도 {attempt}/{max_retries}): {e}")
-                        print(f"{wait_time}초 후 재시도...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        # 네트워크 오류가 아니거나 마지막 시도인 경우
-                        raise
-            else:
-                # 모든 재시도 실패
-                raise Exception(f"Gemini 분석 실패 (최대 {max_retries}회 재시도 후): {last_error}")
+    async def prepare_video(self, video_path: str) -> Tuple[Dict[str, Any], List[Keyframe]]:
+        """
+        ffmpeg 단계: 메타데이터와 키 프레임 추출 (장면 전환 기준, 메모리에서 바로 사용)
 
-            # 5. 프레임 정리
-            for frame in frames:
-                if os.path.exists(frame["path"]):
-                    os.remove(frame["path"])
+        Returns:
+            (metadata, frames)
+        """
+        metadata = await self._get_metadata(video_path)
+        frames = await self._extract_frames(
+            video_path,
+            duration=metadata.get("duration", 0),
+            width=metadata.get("width", 0),
+            height=metadata.get("height", 0),
+        )
+        return metadata, frames
 
-            return {
-                "duration": metadata.get("duration"),
-                "reference_name": analysis.get("reference_name"),
-                "segments": analysis.get("segments", []),
-                "hook_points": analysis.get("hook_points", []),
-                "edge_points": analysis.get("edge_points", []),
-                "emotional_triggers": analysis.get("emotional_triggers", []),
-                "pain_points": analysis.get("pain_points", []),
-                "application_points": analysis.get("application_points", []),
-                "selling_points": analysis.get("selling_points", []),
-                "cta_analysis": analysis.get("cta_analysis", {}),
-                "structure_pattern": analysis.get("structure_pattern", {}),
-                "recommendations": analysis.get("recommendations", []),
-                "transcript": analysis.get("transcript"),
-                "overall_evaluation": analysis.get("overall_evaluation", {}),
-            }
+    async def analyze_frames(
+        self,
+        video_path: Optional[str],
+        frames: List[Keyframe],
+        duration: float = 0,
+    ) -> Dict[str, Any]:
+        """Gemini 단계: 추출된 키 프레임으로 분석 (통신 오류 시 최대 3회 재시도)"""
+        max_retries = 3
+        last_error = None
+        print(f"[분석] Gemini 분석 시작 - 프레임 {len(frames)}개, duration={duration:.1f}초")
 
-        finally:
-            # 프레임 정리 (예외 발생 시에도 정리)
-            for frame in frames:
-                if os.path.exists(frame.get("path", "")):
-                    try:
-                        os.remove(frame["path"])
-                    except:
-                        pass
-            if video_path and os.path.exists(video_path):
-                os.remove(video_path)
+        for attempt in range(1, max_retries + 1):
+            try:
+                print(f"[분석] 시도 {attempt}/{max_retries}")
+                analysis = await self._analyze_with_gemini(
+                    video_path=video_path,
+                    frames=frames,
+                    duration=duration,
+                )
+                # 분석 성공 시 루프 종료
+                print(f"[분석] 분석 성공!")
+                break
+            except Exception as e:
+                last_error = e
+                error_msg = str(e).lower()
+                print(f"[분석] 시도 {attempt} 실패: {str(e)[:200]}")
+
+                # 통신/네트워크 관련 오류인지 확인
+                is_network_error = any(keyword in error_msg for keyword in [
+                    'timeout', 'timed out', 'connection', 'network',
+                    'reset', 'refused', 'unavailable', '503', '504',
+                    '502', '500', 'internal', 'server error', 'rate limit',
+                    'quota', 'overloaded', 'resource exhausted'
+                ])
+
+                if is_network_error and attempt < max_retries:
+                    wait_time = attempt * 5  # 5초, 10초, 15초 대기
+                    print(f"통신 오류 발생 (시도 {attempt}/{max_retries}): {e}")
+                    print(f"{wait_time}초 후 재시도...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    # 네트워크 오류가 아니거나 마지막 시도인 경우
+                    raise
+        else:
+            # 모든 재시도 실패
+            raise Exception(f"Gemini 분석 실패 (최대 {max_retries}회 재시도 후): {last_error}")
 
-    async def _download_video(self, url: str) -> str:
-        """yt-dlp로 영상 다운로드"""
-        output_path = self.temp_dir / f"video_{os.urandom(8).hex()}.mp4"
+        return {
+            "duration": duration,
+            "reference_name": analysis.get("reference_name"),
+            "segments": analysis.get("segments", []),
+            "hook_points": analysis.get("hook_points", []),
+            "edge_points": analysis.get("edge_points", []),
+            "emotional_triggers": analysis.get("emotional_triggers", []),
+            "pain_points": analysis.get("pain_points", []),
+            "application_points": analysis.get("application_points", []),
+            "selling_points": analysis.get("selling_points", []),
+            "cta_analysis": analysis.get("cta_analysis", {}),
+            "structure_pattern": analysis.get("structure_pattern", {}),
+            "recommendations": analysis.get("recommendations", []),
+            "transcript": analysis.get("transcript"),
+            "overall_evaluation": analysis.get("overall_evaluation", {}),
+        }
+
+    async def stream_video(
+        self,
+        url: str,
+        frames_only: bool = True,
+    ) -> Optional[Tuple[Dict[str, Any], List[Keyframe], str]]:
+        """
+        yt-dlp 출력을 파일 없이 ffmpeg 하나로 바로 흘려보내 메타데이터와 키 프레임을 동시에 추출
 
+        frames_only면 오디오 없이 REFERENCE_STREAM_MAX_HEIGHT 이하 영상 포맷만 요청.
+        병합이 필요한 포맷은 stdout으로 받을 수 없으므로 단일 파일 포맷만 사용
+
+        Returns:
+            (metadata, frames, content_hash), 스트림에서 프레임을 얻지 못하면 None
+            (인덱스가 파일 끝에 있는 MP4 등 - 호출자는 파일 다운로드로 대체)
+        """
+        max_height = settings.REFERENCE_STREAM_MAX_HEIGHT
+        if frames_only:
+            video_format = f"bv[height<={max_height}]/b[height<={max_height}]/wv/w"
+        else:
+            video_format = "b[height<=720]/b"
+        cmd = self._yt_dlp_command(url, video_format, "-")
+        digest = hashlib.sha256()
+
+        async def chunks():
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stderr_task = asyncio.create_task(process.stderr.read())
+            try:
+                while True:
+                    chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    yield chunk
+                await process.wait()
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            stderr = await stderr_task
+            if process.returncode != 0:
+                raise self._download_error(stderr.decode(errors="replace"))
+
+        metadata, frames = await stream_keyframes(chunks())
+        print(f"스트리밍 키 프레임 추출 완료: {len(frames)}개, duration={metadata['duration']:.1f}초")
+        if not frames:
+            print("경고: 스트림에서 프레임을 추출하지 못함, 파일 다운로드로 대체")
+            return None
+        # hash_media 형식 (항목별 sha256의 sha256)
+        return metadata, frames, hashlib.sha256(digest.digest()).hexdigest()
+
+    def _yt_dlp_command(self, url: str, video_format: str, output: str, *extra_args: str) -> List[str]:
+        """yt-dlp 명령 (쿠키 파일이 있으면 사용)"""
         cmd = [
             "yt-dlp",
-            # 비디오+오디오 포맷 명시적 선택 (오디오만 다운로드 방지)
-            "-f", "bestvideo[height<=720]+bestaudio/bestvideo+bestaudio/best[height<=720]/best",
-            "--merge-output-format", "mp4",  # mp4로 병합
-            "-o", str(output_path),
+            "-f", video_format,
+            *extra_args,
+            "-o", output,
             "--no-playlist",
             "--no-check-certificates",
             "--remote-components", "ejs:github",  # YouTube JS 챌린지 해결용
-            url,
         ]
 
-        print(f"yt-dlp 명령: {' '.join(cmd)}")
-
         # Add cookies if available
         cookies_file = os.environ.get("YOUTUBE_COOKIES_FILE", "/app/config/youtube_cookies.txt")
         if os.path.exists(cookies_file):
-            cmd.insert(-1, "--cookies")
-            cmd.insert(-1, cookies_file)
+            cmd += ["--cookies", cookies_file]
             print(f"YouTube 쿠키 사용: {cookies_file}")
         else:
             print(f"경고: YouTube 쿠키 파일 없음: {cookies_file}")
 
+        cmd.append(url)
+        print(f"yt-dlp 명령: {' '.join(cmd)}")
+        return cmd
+
+    @staticmethod
+    def _download_error(error_text: str) -> Exception:
+        """yt-dlp 오류를 사용자용 메시지로 변환"""
+        if "Sign in to confirm you're not a bot" in error_text:
+            return Exception("YouTube에서 봇으로 감지되어 다운로드할 수 없습니다. 직접 영상을 다운로드하여 업로드해주세요.")
+        elif "Video unavailable" in error_text or "Private video" in error_text:
+            return Exception("영상이 비공개이거나 삭제되었습니다.")
+        elif "age-restricted" in error_text.lower():
+            return Exception("연령 제한 영상은 다운로드할 수 없습니다.")
+        else:
+            return Exception(f"영상 다운로드 실패. 직접 영상을 다운로드하여 업로드해주세요.")
+
+    async def _download_video(self, url: str) -> str:
+        """yt-dlp로 영상 다운로드"""
+        output_path = self.temp_dir / f"video_{os.urandom(8).hex()}.mp4"
+
+        cmd = self._yt_dlp_command(
+            url,
+            # 비디오+오디오 포맷 명시적 선택 (오디오만 다운로드 방지)
+            "bestvideo[height<=720]+bestaudio/bestvideo+bestaudio/best[height<=720]/best",
+            str(output_path),
+            "--merge-output-format", "mp4",  # mp4로 병합
+        )
+
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
@@ -179,16 +285,8 @@ class ReferenceAnalyzer:
                     print(f"yt-dlp: {line}")
 
         if process.returncode != 0:
-            error_text = stderr.decode()
             # Convert technical errors to user-friendly messages
-            if "Sign in to confirm you're not a bot" in error_text:
-                raise Exception("YouTube에서 봇으로 감지되어 다운로드할 수 없습니다. 직접 영상을 다운로드하여 업로드해주세요.")
-            elif "Video unavailable" in error_text or "Private video" in error_text:
-                raise Exception("영상이 비공개이거나 삭제되었습니다.")
-            elif "age-restricted" in error_text.lower():
-                raise Exception("연령 제한 영상은 다운로드할 수 없습니다.")
-            else:
-                raise Exception(f"영상 다운로드 실패. 직접 영상을 다운로드하여 업로드해주세요.")
+            raise self._download_error(stderr.decode())
 
         # yt-dlp가 확장자를 바꿀 수 있으므로 실제 파일 찾기
         if not output_path.exists():
@@ -224,7 +322,15 @@ class ReferenceAnalyzer:
         try:
             data = json.loads(stdout.decode())
             duration = float(data.get("format", {}).get("duration", 0))
-            return {"duration": duration}
+            video_stream = next(
+                (st for st in data.get("streams", []) if st.get("codec_type") == "video"),
+                {},
+            )
+            return {
+                "duration": duration,
+                "width": int(video_stream.get("width") or 0),
+                "height": int(video_stream.get("height") or 0),
+            }
         except:
             return {"duration": 0}
 
@@ -232,70 +338,14 @@ class ReferenceAnalyzer:
         self,
         video_path: str,
         duration: float = 0,
-        target_frames: int = 20,
-    ) -> List[Dict[str, Any]]:
-        """프레임 추출 - 영상 전체를 균등하게 샘플링"""
-        frames_dir = self.temp_dir / f"frames_{os.urandom(8).hex()}"
-        frames_dir.mkdir(exist_ok=True)
-
-        # 영상 길이에 맞게 fps 계산 (전체 영상을 target_frames개로 균등 분할)
-        if duration > 0:
-            fps = target_frames / duration
-            fps = max(0.1, min(fps, 2))  # 0.1 ~ 2 fps 범위로 제한
-        else:
-            fps = 1
-
-        print(f"프레임 추출 시작: {video_path}, duration={duration:.1f}s, target={target_frames}, fps={fps:.2f}")
-
-        # 영상 파일 존재 확인
-        video_file = Path(video_path)
-        if video_file.exists():
-            print(f"영상 파일 확인: {video_path}, 크기={video_file.stat().st_size} bytes")
-        else:
-            print(f"경고: 영상 파일이 존재하지 않음! {video_path}")
-
-        print(f"frames_dir: {frames_dir}")
-
-        # 절대 경로로 변환 (Railway 환경에서 작업 디렉토리 문제 방지)
+        width: int = 0,
+        height: int = 0,
+    ) -> List[Keyframe]:
+        """키 프레임 추출 - 한 번의 디코딩으로 장면 전환을 감지하고 장면별 대표 프레임만 메모리에 유지"""
         abs_video_path = str(Path(video_path).resolve())
-        abs_frames_pattern = str((frames_dir / "frame_%04d.jpg").resolve())
-
-        cmd = [
-            "ffmpeg",
-            "-y",  # 덮어쓰기 자동 승인
-            "-i", abs_video_path,
-            "-vf", f"fps={fps}",
-            "-q:v", "2",
-            abs_frames_pattern,
-        ]
-
-        print(f"FFmpeg 명령: {' '.join(cmd)}")
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            error_msg = stderr.decode() if stderr else "Unknown error"
-            # 에러 메시지에서 마지막 10줄만 출력 (핵심 에러 부분)
-            error_lines = error_msg.strip().split('\n')
-            last_lines = '\n'.join(error_lines[-10:])
-            print(f"FFmpeg 프레임 추출 실패 (returncode={process.returncode}):\n{last_lines}")
-
-        frames = []
-        for i, frame_file in enumerate(sorted(frames_dir.glob("frame_*.jpg"))):
-            frames.append({
-                "path": str(frame_file),
-                "timestamp": i / fps,
-                "index": i,
-            })
-
-        print(f"프레임 추출 완료: {len(frames)}개 추출됨")
+        frames = await extract_keyframes(abs_video_path, duration=duration, width=width, height=height)
 
+        print(f"키 프레임 추출 완료: {len(frames)}개 ({', '.join(f'{f.timestamp:.1f}s' for f in frames)})")
         if not frames:
             print(f"경고: 프레임이 추출되지 않음! video_path={video_path}")
 
@@ -304,7 +354,7 @@ class ReferenceAnalyzer:
     async def _analyze_with_gemini(
         self,
         video_path: str,
-        frames: List[Dict[str, Any]],
+        frames: List[Keyframe],
         duration: float,
     ) -> Dict[str, Any]:
         """Gemini로 영상 분석"""
@@ -313,31 +363,18 @@ class ReferenceAnalyzer:
         if not frames:
             raise Exception("영상에서 프레임을 추출할 수 없습니다. 영상 파일이 손상되었거나 지원하지 않는 형식일 수 있습니다.")
 
-        # 프레임 샘플링 (최대 15개로 Gemini에 전송)
-        max_gemini_frames = 15
-        if len(frames) > max_gemini_frames:
-            sample_interval = len(frames) // max_gemini_frames
-            sampled_frames = frames[::sample_interval][:max_gemini_frames]
-        else:
-            sampled_frames = frames
-
-        print(f"Gemini 분석: {len(frames)}개 프레임 중 {len(sampled_frames)}개 샘플링")
-
-        # 이미지 로드
-        images = []
-        for frame in sampled_frames:
-            img = Image.open(frame["path"])
-            images.append(img)
-
-        if not images:
-            raise Exception("프레임 이미지를 로드할 수 없습니다.")
+        # 장면별 대표 프레임 (이미 REFERENCE_KEYFRAME_MAX_FRAMES개 이하로 선별됨)
+        images = [frame.image for frame in frames]
+        frame_times = ", ".join(f"{frame.timestamp:.1f}초" for frame in frames)
+        print(f"Gemini 분석: 키 프레임 {len(images)}개 전송")
 
         # 분석 프롬프트
         prompt = f"""당신은 10년 경력의 퍼포먼스 마케팅 전문가입니다. 이 영상 프레임들을 심층 분석해주세요.
 
 영상 정보:
 - 길이: {duration:.1f}초
-- 프레임 수: {len(frames)}개 (샘플: {len(sampled_frames)}개)
+- 프레임 수: {len(frames)}개 (장면 전환 기준 키 프레임)
+- 각 프레임의 시점: {frame_times}
 
 다음 항목들을 마케팅 관점에서 **철저하고 상세하게** 분석해주세요.
 **중요**: 각 항목을 가능한 한 많이 찾아내세요. 예시는 형식 참고용이며, 실제로는 발견되는 모든 요소를 포함해야 합니다.
@@ -0,0 +1,454 @@
+"""
+Scene-change-aware Keyframe Extraction.
+
+Decodes a reference video once with a single ffmpeg process that pipes
+downscaled raw RGB frames, sampled at a low rate, to stdout. Each sampled
+frame is compared with the previous one (colour histogram and luma
+difference) to detect shot boundaries, and only the most informative frame
+of each shot is kept, in memory. Long static shots are split so the whole
+timeline stays covered, and the number of candidates held at once is
+bounded by merging the most similar neighbouring shots.
+
+stream_keyframes() does the same for media arriving as a byte stream (e.g.
+yt-dlp writing to stdout): ffmpeg decodes from stdin while the download is
+still running, and the duration and frame size are read from its stream
+header instead of a separate ffprobe pass.
+"""
+
+import asyncio
+import logging
+import re
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+from app.core.config import settings
+from app.services.video_generator.ffmpeg_limiter import FFmpegLimiter, get_ffmpeg_limiter
+
+logger = logging.getLogger(__name__)
+
+# Size of the thumbnails frames are compared and scored on
+SIGNATURE_SIZE = (64, 36)
+SCORE_WIDTH = 160
+HISTOGRAM_BINS = 16
+
+
+@dataclass
+class Keyframe:
+    """The most informative frame of one shot."""
+
+    image: Image.Image
+    timestamp: float
+    shot_start: float
+    shot_end: float
+    score: float
+
+
+@dataclass
+class _Shot:
+    start: float
+    end: float
+    boundary_delta: float  # Difference to the previous shot at the cut
+    image: Image.Image
+    timestamp: float
+    score: float
+
+
+def _signature(image: Image.Image) -> Tuple[Image.Image, List[float]]:
+    """Small luma thumbnail and normalized colour histogram of a frame."""
+    thumb = image.resize(SIGNATURE_SIZE, Image.BILINEAR)
+    raw = thumb.histogram()  # 256 bins per RGB channel
+    step = 256 // HISTOGRAM_BINS
+    total = float(SIGNATURE_SIZE[0] * SIGNATURE_SIZE[1] * 3)
+    histogram = [sum(raw[i:i + step]) / total for i in range(0, len(raw), step)]
+    return thumb.convert("L"), histogram
+
+
+def frame_delta(a: Tuple[Image.Image, List[float]], b: Tuple[Image.Image, List[float]]) -> float:
+    """
+    Difference between two frame signatures, from 0 (identical) to 1.
+
+    Averages the colour histogram distance (robust to motion within a shot)
+    and the mean luma difference (catches cuts between similarly coloured shots).
+    """
+    histogram_delta = sum(abs(x - y) for x, y in zip(a[1], b[1])) / 2
+    luma_delta = ImageStat.Stat(ImageChops.difference(a[0], b[0])).mean[0] / 255
+    return (histogram_delta + luma_delta) / 2
+
+
+def informativeness(image: Image.Image) -> float:
+    """Score a frame by detail: luma entropy weighted by edge strength."""
+    height = max(1, round(image.height * SCORE_WIDTH / max(1, image.width)))
+    gray = image.convert("L").resize((SCORE_WIDTH, height), Image.BILINEAR)
+    edges = ImageStat.Stat(gray.filter(ImageFilter.FIND_EDGES)).stddev[0]
+    return gray.entropy() * (1 + edges / 32)
+
+
+class KeyframeSelector:
+    """Incrementally splits sampled frames into shots and keeps the best frame of each."""
+
+    def __init__(
+        self,
+        max_keyframes: int = 15,
+        scene_threshold: float = 0.25,
+        max_shot_seconds: float = 8.0,
+        max_candidates: Optional[int] = None,
+    ):
+        """
+        Initialize the selector.
+
+        Args:
+            max_keyframes: Number of keyframes returned at most.
+            scene_threshold: Frame difference (0-1) that starts a new shot.
+            max_shot_seconds: Longer shots are split to keep the timeline covered.
+            max_candidates: Shots held in memory at once (default 2 x max_keyframes).
+        """
+        self.max_keyframes = max(1, max_keyframes)
+        self.scene_threshold = scene_threshold
+        self.max_shot_seconds = max_shot_seconds
+        self.max_candidates = max(self.max_keyframes, max_candidates or self.max_keyframes * 2)
+        self.frames_seen = 0
+        self.cuts = 0
+        self._shots: List[_Shot] = []
+        self._previous = None
+
+    def add(self, image: Image.Image, timestamp: float) -> None:
+        """Add the next sampled frame (in timestamp order)."""
+        signature = _signature(image)
+        score = informativeness(image)
+        self.frames_seen += 1
+
+        if self._previous is None:
+            self._shots.append(_Shot(timestamp, timestamp, 1.0, image, timestamp, score))
+        else:
+            delta = frame_delta(self._previous, signature)
+            current = self._shots[-1]
+            if delta >= self.scene_threshold:
+                self.cuts += 1
+                self._shots.append(_Shot(timestamp, timestamp, delta, image, timestamp, score))
+            elif timestamp - current.start >= self.max_shot_seconds:
+                self._shots.append(_Shot(timestamp, timestamp, delta, image, timestamp, score))
+            else:
+                current.end = timestamp
+                if score > current.score:
+                    current.image, current.timestamp, current.score = image, timestamp, score
+        self._previous = signature
+
+        if len(self._shots) > self.max_candidates:
+            self._merge_most_similar()
+
+    def _merge_most_similar(self) -> None:
+        """Merge the shot with the weakest cut into its predecessor."""
+        index = min(range(1, len(self._shots)), key=lambda i: self._shots[i].boundary_delta)
+        shot = self._shots.pop(index)
+        previous = self._shots[index - 1]
+        previous.end = shot.end
+        if shot.score > previous.score:
+            previous.image, previous.timestamp, previous.score = shot.image, shot.timestamp, shot.score
+
+    def keyframes(self) -> List[Keyframe]:
+        """Best frame of the most significant shots, in timeline order."""
+        shots = list(self._shots)
+        if len(shots) > self.max_keyframes:
+            def weight(shot: _Shot) -> float:
+                length = min(shot.end - shot.start, self.max_shot_seconds) / max(self.max_shot_seconds, 1e-6)
+                return shot.score * (0.5 + length) * (0.5 + shot.boundary_delta)
+
+            # The opening shot (the hook) is always kept
+            ranked = sorted(shots[1:], key=weight, reverse=True)[:self.max_keyframes - 1]
+            shots = [shots[0]] + sorted(ranked, key=lambda s: s.start)
+
+        keyframes = []
+        for i, shot in enumerate(shots):
+            shot_end = shots[i + 1].start if i + 1 < len(shots) else shot.end
+            keyframes.append(Keyframe(shot.image, shot.timestamp, shot.start, shot_end, shot.score))
+        return keyframes
+
+
+def output_size(width: int, height: int, max_side: int) -> Tuple[int, int]:
+    """Even frame size fitting max_side, keeping the aspect ratio (16:9 if unknown)."""
+    if width <= 0 or height <= 0:
+        width, height = max_side, max_side * 9 // 16
+    scale = min(1.0, max_side / max(width, height))
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+def sample_rate(duration: float, sample_fps: float, max_samples: int) -> float:
+    """Frames per second to sample so long videos stay within max_samples."""
+    if duration <= 0:
+        return sample_fps
+    return max(0.1, min(sample_fps, max_samples / duration))
+
+
+async def extract_keyframes(
+    video_path: str,
+    duration: float = 0,
+    width: int = 0,
+    height: int = 0,
+    ffmpeg_path: str = "ffmpeg",
+    selector: Optional[KeyframeSelector] = None,
+    ffmpeg_limiter: Optional[FFmpegLimiter] = None,
+) -> List[Keyframe]:
+    """
+    Extract scene-change-aware keyframes from a video in one decoding pass.
+
+    Args:
+        video_path: Video file (or URL ffmpeg can read).
+        duration: Video duration in seconds (0 if unknown).
+        width: Source width (0 if unknown).
+        height: Source height (0 if unknown).
+        ffmpeg_path: ffmpeg executable.
+        selector: Keyframe selector. Defaults to one configured from settings.
+        ffmpeg_limiter: Limiter for concurrent ffmpeg processes.
+
+    Returns:
+        Keyframes in timeline order (empty if the video could not be decoded).
+    """
+    selector = selector or KeyframeSelector(
+        max_keyframes=settings.REFERENCE_KEYFRAME_MAX_FRAMES,
+        scene_threshold=settings.REFERENCE_KEYFRAME_SCENE_THRESHOLD,
+        max_shot_seconds=settings.REFERENCE_KEYFRAME_MAX_SHOT_SECONDS,
+    )
+    limiter = ffmpeg_limiter or get_ffmpeg_limiter()
+    fps = sample_rate(duration, settings.REFERENCE_KEYFRAME_SAMPLE_FPS, settings.REFERENCE_KEYFRAME_MAX_SAMPLES)
+    out_width, out_height = output_size(width, height, settings.REFERENCE_KEYFRAME_MAX_SIDE)
+    video_filter = f"fps={fps:.4f},scale={out_width}:{out_height}"
+    if width <= 0 or height <= 0:
+        video_filter += (
+            f":force_original_aspect_ratio=decrease,"
+            f"pad={out_width}:{out_height}:(ow-iw)/2:(oh-ih)/2"
+        )
+
+    cmd = [
+        ffmpeg_path,
+        "-v", "error",
+        "-i", video_path,
+        "-vf", video_filter,
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        *limiter.thread_args(),
+        "-",
+    ]
+
+    logger.info(f"Keyframe extraction: {video_path}, duration={duration:.1f}s, fps={fps:.2f}, size={out_width}x{out_height}")
+
+    async with limiter.slot():
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr_task = asyncio.create_task(process.stderr.read())
+        try:
+            await _read_frames(process, (out_width, out_height), fps, selector)
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        stderr = await stderr_task
+
+    if process.returncode != 0:
+        error_lines = stderr.decode(errors="replace").strip().split("\n")
+        logger.warning(f"ffmpeg keyframe extraction failed (returncode={process.returncode}): {' | '.join(error_lines[-5:])}")
+
+    keyframes = selector.keyframes()
+    logger.info(
+        f"Keyframe extraction done: {selector.frames_seen} frames sampled, "
+        f"{selector.cuts} cuts, {len(keyframes)} keyframes kept"
+    )
+    return keyframes
+
+
+async def _read_frames(
+    process: asyncio.subprocess.Process,
+    size: Tuple[int, int],
+    fps: float,
+    selector: KeyframeSelector,
+) -> None:
+    """Feed raw RGB frames from ffmpeg's stdout to the selector until EOF."""
+    frame_size = size[0] * size[1] * 3
+    index = 0
+    while True:
+        try:
+            buffer = await process.stdout.readexactly(frame_size)
+        except asyncio.IncompleteReadError:
+            break
+        image = Image.frombytes("RGB", size, buffer)
+        await asyncio.to_thread(selector.add, image, index / fps)
+        index += 1
+
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_FRAME_SIZE_RE = re.compile(r"\b(\d{2,5})x(\d{2,5})\b")
+
+
+async def _read_stream_header(stderr: asyncio.StreamReader, info: Dict[str, float]) -> List[str]:
+    """
+    Parse ffmpeg's stream dump until the output video stream is known.
+
+    Fills info with duration, width and height of the input and out_width and
+    out_height of the raw frames (missing if ffmpeg failed before writing any).
+
+    Returns:
+        The stderr lines read, for error reporting.
+    """
+    section = None
+    lines = []
+    while True:
+        raw = await stderr.readline()
+        if not raw:
+            return lines
+        line = raw.decode(errors="replace").rstrip()
+        lines.append(line)
+        if line.startswith("Input #"):
+            section = "input"
+        elif line.startswith("Output #"):
+            section = "output"
+        elif "Duration:" in line and section == "input":
+            match = _DURATION_RE.search(line)
+            if match:
+                hours, minutes, seconds = match.groups()
+                info["duration"] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        elif line.lstrip().startswith("Stream #") and " Video: " in line:
+            match = _FRAME_SIZE_RE.search(line.split(" Video: ", 1)[1])
+            if not match:
+                continue
+            if section == "input" and "width" not in info:
+                info["width"], info["height"] = int(match.group(1)), int(match.group(2))
+            elif section == "output":
+                info["out_width"], info["out_height"] = int(match.group(1)), int(match.group(2))
+                return lines
+
+
+async def stream_keyframes(
+    chunks: AsyncIterator[bytes],
+    ffmpeg_path: str = "ffmpeg",
+    selector: Optional[KeyframeSelector] = None,
+    ffmpeg_limiter: Optional[FFmpegLimiter] = None,
+) -> Tuple[Dict[str, float], List[Keyframe]]:
+    """
+    Extract keyframes and metadata from media arriving as a byte stream.
+
+    One ffmpeg process decodes from stdin while chunks are still arriving.
+    Its stream header provides the duration and frame size, so no ffprobe
+    pass or temporary file is needed. Frames are sampled at
+    REFERENCE_KEYFRAME_SAMPLE_FPS (the duration is not known up front) and
+    scaled to fit REFERENCE_KEYFRAME_MAX_SIDE.
+
+    Containers that need seeking (MP4 with the index at the end) cannot be
+    decoded from a stream; callers get no keyframes and should fall back
+    to a downloaded file.
+
+    Args:
+        chunks: Media bytes in order. Errors raised by the iterator are re-raised
+            after ffmpeg has exited.
+        ffmpeg_path: ffmpeg executable.
+        selector: Keyframe selector. Defaults to one configured from settings.
+        ffmpeg_limiter: Limiter whose slot is held while streaming. By default
+            no slot is taken: the process is paced by the download, so holding
+            a slot of the shared render limiter would stall video renders.
+            Callers bound concurrency instead (the pipeline's download
+            workers); the shared limiter's thread cap still applies.
+
+    Returns:
+        Tuple of (metadata with duration/width/height, keyframes in timeline order).
+    """
+    selector = selector or KeyframeSelector(
+        max_keyframes=settings.REFERENCE_KEYFRAME_MAX_FRAMES,
+        scene_threshold=settings.REFERENCE_KEYFRAME_SCENE_THRESHOLD,
+        max_shot_seconds=settings.REFERENCE_KEYFRAME_MAX_SHOT_SECONDS,
+    )
+    limiter = ffmpeg_limiter or get_ffmpeg_limiter()
+    fps = settings.REFERENCE_KEYFRAME_SAMPLE_FPS
+    max_side = settings.REFERENCE_KEYFRAME_MAX_SIDE
+    cmd = [
+        ffmpeg_path,
+        "-hide_banner",
+        "-nostats",
+        "-v", "info",
+        "-i", "pipe:0",
+        "-vf", f"fps={fps:.4f},scale={max_side}:{max_side}:force_original_aspect_ratio=decrease:force_divisible_by=2",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        *limiter.thread_args(),
+        "-",
+    ]
+    info: Dict[str, float] = {}
+    source_error: Optional[BaseException] = None
+
+    async def feed(stdin: asyncio.StreamWriter) -> None:
+        nonlocal source_error
+        try:
+            async for chunk in chunks:
+                stdin.write(chunk)
+                await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg exited early; its own error is reported below
+        except Exception as e:
+            source_error = e
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose:
+                await aclose()
+            if not stdin.is_closing():
+                stdin.close()
+
+    async with ffmpeg_limiter.slot() if ffmpeg_limiter else nullcontext():
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        feeder = asyncio.create_task(feed(process.stdin))
+        stderr_tail: List[str] = []
+        try:
+            stderr_tail = await _read_stream_header(process.stderr, info)
+            stderr_task = asyncio.create_task(process.stderr.read())
+            if "out_width" in info:
+                await _read_frames(process, (int(info["out_width"]), int(info["out_height"])), fps, selector)
+            else:
+                await process.stdout.read()  # Drain so ffmpeg can exit
+            await process.wait()
+            stderr_tail += (await stderr_task).decode(errors="replace").strip().split("\n")
+            await feeder
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if not feeder.done():
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+
+    if source_error is not None:
+        raise source_error
+    if process.returncode != 0:
+        logger.warning(
+            f"ffmpeg stream keyframe extraction failed (returncode={process.returncode}): "
+            f"{' | '.join(line for line in stderr_tail[-5:] if line)}"
+        )
+
+    metadata = {
+        "duration": info.get("duration") or selector.frames_seen / fps,
+        "width": int(info.get("width", 0)),
+        "height": int(info.get("height", 0)),
+    }
+    keyframes = selector.keyframes()
+    logger.info(
+        f"Stream keyframe extraction done: {selector.frames_seen} frames sampled, "
+        f"{selector.cuts} cuts, {len(keyframes)} keyframes kept, duration={metadata['duration']:.1f}s"
+    )
+    return metadata, keyframes
+
+
+__all__ = [
+    "Keyframe",
+    "KeyframeSelector",
+    "extract_keyframes",
+    "frame_delta",
+    "informativeness",
+    "stream_keyframes",
+]
@@ -0,0 +1,563 @@
+"""
+Stage-parallel Reference Analysis Pipeline.
+
+Reference analyses run through three stages, each with its own bounded
+worker pool:
+
+- download: SNS image extraction (instaloader/gallery-dl), yt-dlp video
+  downloads and storage uploads (network bound). With
+  REFERENCE_STREAM_DOWNLOADS, videos are streamed from yt-dlp into ffmpeg
+  here, paced by the network, and go straight to analyze
+- process: ffprobe metadata and keyframe extraction of downloaded video
+  files (ffmpeg, CPU bound, under the shared ffmpeg limiter)
+- analyze: Gemini calls
+
+Jobs move to the next stage's queue as soon as a stage finishes, so a burst
+of submissions keeps every stage busy while no stage runs more than its
+worker count at once. The queues between stages are bounded: when Gemini
+falls behind, download workers wait instead of filling the disk with videos
+nobody is analyzing yet. Queue depth and per-stage latency are exposed by
+stats() (and /health).
+"""
+
+import asyncio
+import io
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.reference_analysis import ReferenceAnalysis
+from app.services.cloud_storage import UploadRequest, cloud_storage
+from app.services.image_cache import get_image_cache
+from app.services.reference_analyzer.analyzer import ReferenceAnalyzer
+from app.services.reference_analyzer.keyframes import Keyframe
+from app.services.reference_analyzer.result_cache import (
+    UPLOAD_URL_PREFIX,
+    get_analysis_result_cache,
+    hash_media,
+    result_from_analysis,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the post has no media at all; the record is deleted instead of kept as failed
+NO_MEDIA_ERRORS = ("No video formats found", "no video formats", "다운로드된 미디어 없음")
+
+# Recent samples kept per stage for latency statistics
+LATENCY_WINDOW = 200
+
+
+@dataclass
+class AnalysisJob:
+    """One reference analysis moving through the pipeline."""
+
+    analysis_id: str
+    url: str
+    extract_audio: bool = True
+    force_refresh: bool = False
+    image_bytes: Optional[List[bytes]] = None  # Uploaded images, already in memory
+
+    # Filled in by the stages
+    media_type: Optional[str] = None  # "image" or "video"
+    video_path: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    frames: List[Keyframe] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    cached: Optional[ReferenceAnalysis] = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    stage_entered_at: float = field(default_factory=time.monotonic)
+
+
+class StageStats:
+    """Counters and recent latencies of one stage."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.active = 0
+        self.processed = 0
+        self.failed = 0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._waits: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, wait: float, latency: float, ok: bool) -> None:
+        self._waits.append(wait)
+        self._latencies.append(latency)
+        if ok:
+            self.processed += 1
+        else:
+            self.failed += 1
+
+    def snapshot(self, queued: int) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        return {
+            "workers": self.workers,
+            "queued": queued,
+            "active": self.active,
+            "processed": self.processed,
+            "failed": self.failed,
+            "avg_wait_seconds": round(sum(self._waits) / len(self._waits), 2) if self._waits else 0.0,
+            "avg_latency_seconds": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p95_latency_seconds": round(p95, 2),
+        }
+
+
+class _Stage:
+    def __init__(self, name: str, workers: int, handler: Callable, queue_size: int = 0):
+        self.name = name
+        self.workers = max(1, workers)
+        self.handler = handler
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = StageStats(name, self.workers)
+
+
+class ReferenceAnalysisPipeline:
+    """
+    Runs reference analyses through download, process and analyze worker pools.
+
+    Jobs live in memory only: analyses still in the pipeline when the
+    process stops are marked failed so they can be re-analyzed.
+    """
+
+    def __init__(
+        self,
+        download_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        analyze_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        analyzer: Optional[ReferenceAnalyzer] = None,
+        session_factory: Optional[Callable] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            download_workers: Concurrent downloads. Defaults to REFERENCE_PIPELINE_DOWNLOAD_WORKERS.
+            process_workers: Concurrent ffmpeg jobs. Defaults to REFERENCE_PIPELINE_PROCESS_WORKERS.
+            analyze_workers: Concurrent Gemini calls. Defaults to REFERENCE_PIPELINE_ANALYZE_WORKERS.
+            queue_size: Jobs waiting between two stages before upstream workers block.
+                Defaults to REFERENCE_PIPELINE_QUEUE_SIZE.
+            analyzer: Reference analyzer. Created on first use by default.
+            session_factory: Database session factory. Defaults to the app's factory.
+        """
+        queue_size = settings.REFERENCE_PIPELINE_QUEUE_SIZE if queue_size is None else queue_size
+        self._stages: Dict[str, _Stage] = {
+            "download": _Stage(
+                "download",
+                download_workers or settings.REFERENCE_PIPELINE_DOWNLOAD_WORKERS,
+                self._download,
+            ),
+            "process": _Stage(
+                "process",
+                process_workers or settings.REFERENCE_PIPELINE_PROCESS_WORKERS,
+                self._process,
+                queue_size,
+            ),
+            "analyze": _Stage(
+                "analyze",
+                analyze_workers or settings.REFERENCE_PIPELINE_ANALYZE_WORKERS,
+                self._analyze,
+                queue_size,
+            ),
+        }
+        self._analyzer = analyzer
+        self._session_factory = session_factory or async_session_factory
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._workers: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def analyzer(self) -> ReferenceAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = ReferenceAnalyzer()
+        return self._analyzer
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Start the worker pools."""
+        if self._workers:
+            return
+        for stage in self._stages.values():
+            for _ in range(stage.workers):
+                self._workers.append(asyncio.create_task(self._worker(stage)))
+        logger.info(
+            "Reference analysis pipeline started: "
+            + ", ".join(f"{s.name}={s.workers}" for s in self._stages.values())
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers and mark unfinished analyses failed."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        for job in jobs:
+            self._cleanup(job)
+        if jobs:
+            async with self._session_factory() as db:
+                await db.execute(
+                    update(ReferenceAnalysis)
+                    .where(ReferenceAnalysis.id.in_([job.analysis_id for job in jobs]))
+                    .values(status="failed", error_message="서버 재시작으로 분석이 중단되었습니다. 다시 분석해주세요.")
+                )
+                await db.commit()
+            logger.info(f"Marked {len(jobs)} unfinished reference analysis job(s) failed on shutdown")
+
+    def submit(self, job: AnalysisJob) -> bool:
+        """
+        Queue an analysis (never blocks; the download queue is unbounded).
+
+        Args:
+            job: Analysis to run. Its ReferenceAnalysis row must already exist.
+
+        Returns:
+            False if the same analysis is already in the pipeline.
+        """
+        if job.analysis_id in self._jobs:
+            return False
+        if not self._workers:
+            self.start()
+        self._jobs[job.analysis_id] = job
+        job.stage_entered_at = time.monotonic()
+        self._stages["download"].queue.put_nowait(job)
+        return True
+
+    async def join(self) -> None:
+        """Wait until every submitted job has left the pipeline."""
+        while self._jobs:
+            await asyncio.sleep(0.01)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency of each stage."""
+        return {
+            "in_flight": len(self._jobs),
+            "completed": self.completed,
+            "failed": self.failed,
+            "stages": {
+                name: stage.stats.snapshot(stage.queue.qsize())
+                for name, stage in self._stages.items()
+            },
+        }
+
+    async def _worker(self, stage: _Stage) -> None:
+        while True:
+            job = await stage.queue.get()
+            started = time.monotonic()
+            wait = started - job.stage_entered_at
+            stage.stats.active += 1
+            next_stage = None
+            ok = True
+            try:
+                next_stage = await stage.handler(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                ok = False
+                logger.warning(f"Reference analysis {job.analysis_id} failed in {stage.name}: {str(e)[:300]}")
+                await self._fail(job, e)
+            finally:
+                stage.stats.active -= 1
+                stage.stats.record(wait, time.monotonic() - started, ok)
+                stage.queue.task_done()
+
+            if next_stage:
+                job.stage_entered_at = time.monotonic()
+                # Blocks while the next stage is saturated (backpressure)
+                await self._stages[next_stage].queue.put(job)
+            else:
+                self._finish(job)
+
+    def _finish(self, job: AnalysisJob) -> None:
+        self._cleanup(job)
+        self._jobs.pop(job.analysis_id, None)
+        logger.info(
+            f"Reference analysis {job.analysis_id} left the pipeline after "
+            f"{time.monotonic() - job.submitted_at:.1f}s"
+        )
+
+    @staticmethod
+    def _cleanup(job: AnalysisJob) -> None:
+        if job.video_path and os.path.exists(job.video_path):
+            os.remove(job.video_path)
+        job.video_path = None
+        job.frames = []
+
+    async def _set_status(self, job: AnalysisJob, status: str, **values) -> bool:
+        """Update the analysis row; False if it was deleted meanwhile (the job is dropped)."""
+        async with self._session_factory() as db:
+            result = await db.execute(
+                update(ReferenceAnalysis)
+                .where(ReferenceAnalysis.id == job.analysis_id)
+                .values(status=status, **values)
+            )
+            await db.commit()
+        if result.rowcount == 0:
+            logger.info(f"Reference analysis {job.analysis_id} was deleted, dropping job")
+            return False
+        return True
+
+    async def _find_cached(self, job: AnalysisJob, content_hash: str) -> bool:
+        """Record the media hash and reuse the result of identical media, if any."""
+        async with self._session_factory() as db:
+            await db.execute(
+                update(ReferenceAnalysis)
+                .where(ReferenceAnalysis.id == job.analysis_id)
+                .values(content_hash=content_hash)
+            )
+            await db.commit()
+            if not job.force_refresh:
+                job.cached = await get_analysis_result_cache().find_by_content(
+                    db, content_hash, exclude_id=job.analysis_id
+                )
+        if job.cached:
+            logger.info(f"Reusing analysis {job.cached.id} for identical media")
+            job.result = result_from_analysis(job.cached)
+            return True
+        return False
+
+    # Stages
+
+    async def _download(self, job: AnalysisJob) -> Optional[str]:
+        """Fetch the media: uploaded images, SNS images, or the video via yt-dlp."""
+        if not await self._set_status(job, "downloading", error_message=None):
+            return None
+
+        if job.image_bytes is None and job.url.startswith(UPLOAD_URL_PREFIX):
+            job.image_bytes = await self._load_uploaded_images(job.url)
+        if job.image_bytes is None:
+            job.image_bytes = await self._download_sns_images(job.url) or None
+
+        if job.image_bytes:
+            job.media_type = "image"
+            image_urls = await cloud_storage.upload_many_async([
+                UploadRequest(img, folder="references", content_type="image/jpeg")
+                for img in job.image_bytes
+            ])
+            if image_urls:
+                if not await self._set_status(job, "downloading", thumbnail_url=image_urls[0], images=image_urls):
+                    return None
+            if await self._find_cached(job, await asyncio.to_thread(hash_media, job.image_bytes)):
+                await self._complete(job)
+                return None
+            return "analyze"
+
+        # Video analysis (fallback for non-SNS URLs or failed image downloads)
+        logger.info(f"Starting video analysis: {job.url}")
+        job.media_type = "video"
+        if settings.REFERENCE_STREAM_DOWNLOADS:
+            streamed = await self.analyzer.stream_video(job.url, frames_only=True)
+            if streamed:
+                # Frames were extracted while downloading; nothing left for the process stage
+                job.metadata, job.frames, content_hash = streamed
+                if await self._find_cached(job, content_hash):
+                    await self._complete(job)
+                    return None
+                return "analyze"
+            # Not decodable from a stream (e.g. MP4 index at the end): download the file
+        return await self._download_video_file(job)
+
+    async def _download_video_file(self, job: AnalysisJob) -> Optional[str]:
+        job.video_path = await self.analyzer._download_video(job.url)
+        if await self._find_cached(job, await asyncio.to_thread(hash_media, [job.video_path])):
+            await self._complete(job)
+            return None
+        return "process"
+
+    async def _process(self, job: AnalysisJob) -> Optional[str]:
+        """Keyframes and metadata of the downloaded video file."""
+        if not await self._set_status(job, "extracting"):
+            return None
+
+        job.metadata, job.frames = await self.analyzer.prepare_video(job.video_path)
+        return "analyze"
+
+    async def _analyze(self, job: AnalysisJob) -> Optional[str]:
+        """Gemini analysis of the images or keyframes, then store the result."""
+        if not await self._set_status(job, "analyzing"):
+            return None
+
+        if job.media_type == "image":
+            logger.info(f"Starting image analysis ({len(job.image_bytes)} images)")
+            image_ios = [io.BytesIO(img_bytes) for img_bytes in job.image_bytes]
+            source_url = UPLOAD_URL_PREFIX if job.url.startswith(UPLOAD_URL_PREFIX) else job.url
+            job.result = await self.analyzer.analyze_images(image_ios, source_url=source_url)
+        else:
+            job.result = await self.analyzer.analyze_frames(
+                job.video_path, job.frames, job.metadata.get("duration", 0)
+            )
+
+        await self._complete(job)
+        return None
+
+    # Helpers
+
+    async def _load_uploaded_images(self, url: str) -> Optional[List[bytes]]:
+        """Reload uploaded images from storage (their URLs follow upload://, separated by ';')."""
+        image_cache = get_image_cache()
+        images = []
+        for image_url in filter(None, url[len(UPLOAD_URL_PREFIX):].split(";")):
+            data, _ = await image_cache.load(image_url)
+            if data:
+                images.append(data)
+        if not images:
+            raise Exception("업로드된 이미지를 불러올 수 없습니다. 다시 업로드해주세요.")
+        return images
+
+    async def _download_sns_images(self, url: str) -> List[bytes]:
+        """Images of an SNS post (instaloader, then gallery-dl); empty for videos or other URLs."""
+        from app.services.sns_media_downloader import SNSMediaDownloader
+
+        downloader = SNSMediaDownloader()
+        if not downloader.is_valid_url(url):
+            return []
+
+        image_bytes_list: List[bytes] = []
+        # Download media - try multiple methods in order of reliability
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                downloaded_videos = []
+
+                # 1. Instagram: Try instaloader FIRST (best for public posts)
+                if "instagram" in url.lower():
+                    logger.info("Instagram URL detected, trying instaloader first")
+                    try:
+                        image_bytes_list = await downloader.extract_images_from_post(url, temp_dir) or []
+                        if image_bytes_list:
+                            logger.info(f"instaloader extracted {len(image_bytes_list)} images")
+                    except Exception as insta_err:
+                        logger.warning(f"instaloader failed: {insta_err}")
+
+                # 2. If instaloader didn't work or not Instagram, try gallery-dl
+                if not image_bytes_list:
+                    logger.info("Trying gallery-dl")
+                    try:
+                        await downloader.download(url, temp_dir)
+                        all_media = downloader.get_all_media(temp_dir)
+                        downloaded_images = all_media['images']
+                        downloaded_videos = all_media['videos']
+                        logger.info(f"gallery-dl found {len(downloaded_images)} images, {len(downloaded_videos)} videos")
+
+                        if downloaded_videos:
+                            logger.info("Video found, switching to video analysis")
+                        elif downloaded_images:
+                            for img_path in downloaded_images:
+                                with open(img_path, 'rb') as f:
+                                    image_bytes_list.append(f.read())
+                            logger.info(f"gallery-dl extracted {len(image_bytes_list)} images")
+                    except Exception as gdl_err:
+                        logger.warning(f"gallery-dl failed: {gdl_err}")
+
+                # 3. Still nothing? Will fallback to yt-dlp for video analysis
+                if not image_bytes_list and not downloaded_videos:
+                    logger.info("Image download failed, falling back to yt-dlp video analysis")
+
+        except Exception as e:
+            logger.warning(f"SNS media download failed: {e}")
+            return []
+
+        return image_bytes_list
+
+    async def _complete(self, job: AnalysisJob) -> None:
+        """Store the analysis result."""
+        result = job.result
+        async with self._session_factory() as db:
+            analysis = (await db.execute(
+                select(ReferenceAnalysis).where(ReferenceAnalysis.id == job.analysis_id)
+            )).scalar_one_or_none()
+            if not analysis:
+                return
+
+            analysis.status = "completed"
+            analysis.error_message = None
+            analysis.duration = result.get("duration")
+            analysis.segments = result.get("segments", [])
+            analysis.hook_points = result.get("hook_points", [])
+            analysis.edge_points = result.get("edge_points", [])
+            analysis.emotional_triggers = result.get("emotional_triggers", [])
+            analysis.pain_points = result.get("pain_points", [])
+            analysis.application_points = result.get("application_points", [])
+            analysis.selling_points = result.get("selling_points", [])
+            analysis.cta_analysis = result.get("cta_analysis")
+            analysis.structure_pattern = result.get("structure_pattern")
+            analysis.recommendations = result.get("recommendations", [])
+            analysis.transcript = result.get("transcript")
+            analysis.overall_evaluation = result.get("overall_evaluation")
+            analysis.analyzed_at = job.cached.analyzed_at if job.cached else datetime.utcnow()
+            if job.cached and not analysis.images:
+                analysis.thumbnail_url = job.cached.thumbnail_url
+                analysis.images = job.cached.images or []
+
+            # Update title with AI-generated reference_name if available
+            reference_name = result.get("reference_name")
+            if reference_name and isinstance(reference_name, str) and reference_name.strip():
+                analysis.title = reference_name.strip()
+
+            await db.commit()
+        self.completed += 1
+
+    async def _fail(self, job: AnalysisJob, error: Exception) -> None:
+        """Record a failed analysis (posts without any media are deleted instead)."""
+        self.failed += 1
+        error_msg = str(error)
+
+        try:
+            async with self._session_factory() as db:
+                analysis = (await db.execute(
+                    select(ReferenceAnalysis).where(ReferenceAnalysis.id == job.analysis_id)
+                )).scalar_one_or_none()
+                if not analysis:
+                    return
+
+                # No media at all (no images, no videos) - delete the record
+                if any(marker.lower() in error_msg.lower() for marker in NO_MEDIA_ERRORS):
+                    await db.delete(analysis)
+                    await db.commit()
+                    logger.info(f"No media found, deleted reference analysis {job.analysis_id}")
+                    return
+
+                # Improve timeout error message
+                if "504" in error_msg or "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
+                    error_msg = "Gemini 분석 실패: 504 The request timed out. 영상이 너무 길거나 서버가 바쁩니다. 잠시 후 다시 시도해주세요."
+
+                analysis.status = "failed"
+                analysis.error_message = error_msg
+                analysis.recommendations = [{"action": f"분석 실패: {error_msg}"}]
+                await db.commit()
+        except Exception as commit_error:
+            logger.error(f"Failed to update error status: {commit_error}")
+
+
+# Shared pipeline for all reference analyses in this process
+_pipeline: Optional[ReferenceAnalysisPipeline] = None
+
+
+def get_reference_analysis_pipeline() -> ReferenceAnalysisPipeline:
+    """Get or create the reference analysis pipeline."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ReferenceAnalysisPipeline()
+    return _pipeline
+
+
+__all__ = [
+    "AnalysisJob",
+    "ReferenceAnalysisPipeline",
+    "get_reference_analysis_pipeline",
+]
@@ -0,0 +1,267 @@
+"""
+Reference Analysis Result Cache.
+
+Completed analyses are stored with two cache keys:
+
+- canonical_url_hash: sha256 of the source URL reduced to platform +
+  post/video ID (or, for other sites, a normalized URL without tracking
+  parameters), so the many share-link variants of one YouTube/Instagram post
+  map to one fixed-length key. Uploaded images (upload:// sources) have none.
+- content_hash: sha256 of the downloaded media, so an unchanged video or
+  carousel reached through a different URL skips frame extraction and Gemini.
+
+A URL hit within REFERENCE_ANALYSIS_CACHE_TTL_HOURS is returned without
+downloading anything. Past that TTL the media is downloaded again and the
+result is still reused if the bytes are identical. Freshness is measured
+from analyzed_at, which is copied along with the result so a chain of cached
+copies never outlives the original analysis.
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.reference_analysis import ReferenceAnalysis
+from app.services.sns_parser import SNSParser
+
+logger = logging.getLogger(__name__)
+
+# Analysis output copied between records on a cache hit
+RESULT_FIELDS = (
+    "duration",
+    "thumbnail_url",
+    "images",
+    "segments",
+    "hook_points",
+    "edge_points",
+    "emotional_triggers",
+    "pain_points",
+    "application_points",
+    "selling_points",
+    "cta_analysis",
+    "structure_pattern",
+    "recommendations",
+    "transcript",
+    "overall_evaluation",
+)
+
+# Share/tracking query parameters that do not change the content
+TRACKING_PARAMS = {"si", "feature", "igshid", "igsh", "fbclid", "gclid", "ref", "ref_src", "share_id", "pp"}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+UPLOAD_URL_PREFIX = "upload://"
+
+
+def canonical_source_url(url: str) -> str:
+    """
+    Canonical form of a reference URL, used as the result cache key.
+
+    Args:
+        url: URL as submitted by the user.
+
+    Returns:
+        https://www.youtube.com/watch?v={id}, https://www.instagram.com/p/{shortcode}/
+        or https://www.pinterest.com/pin/{id}/ for recognized posts (reels and
+        posts share shortcodes); otherwise the URL with a lowercase host
+        without "www."/"m.", no fragment, no trailing slash and no tracking
+        parameters, remaining parameters sorted.
+    """
+    url = url.strip()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    ]
+
+    video_id = SNSParser._match_patterns(url, SNSParser.YOUTUBE_PATTERNS)
+    if not video_id and host == "youtube.com" and parts.path == "/watch":
+        video_id = dict(query).get("v")
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+
+    shortcode = SNSParser._match_patterns(url, SNSParser.INSTAGRAM_PATTERNS)
+    if shortcode:
+        return f"https://www.instagram.com/p/{shortcode}/"
+
+    pin_id = SNSParser._match_patterns(url, SNSParser.PINTEREST_PATTERNS)
+    if pin_id:
+        return f"https://www.pinterest.com/pin/{pin_id}/"
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def source_url_cache_key(url: str) -> Optional[str]:
+    """
+    Result cache key of a source URL.
+
+    Args:
+        url: URL as submitted by the user.
+
+    Returns:
+        sha256 hex digest of canonical_source_url(url), or None for uploaded
+        images, which are only matched by content hash.
+    """
+    if url.startswith(UPLOAD_URL_PREFIX):
+        return None
+    return hashlib.sha256(canonical_source_url(url).encode()).hexdigest()
+
+
+def hash_media(items: Iterable[Union[str, bytes]]) -> str:
+    """
+    Content hash of downloaded media (blocking; run in a thread for large files).
+
+    Args:
+        items: File paths or raw bytes, in post order (carousel order matters).
+
+    Returns:
+        sha256 hex digest over the per-item digests.
+    """
+    combined = hashlib.sha256()
+    for item in items:
+        digest = hashlib.sha256()
+        if isinstance(item, (bytes, bytearray, memoryview)):
+            digest.update(item)
+        else:
+            with open(item, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        combined.update(digest.digest())
+    return combined.hexdigest()
+
+
+def result_from_analysis(analysis: ReferenceAnalysis) -> Dict[str, Any]:
+    """Stored analysis in the shape returned by ReferenceAnalyzer."""
+    result = {field: getattr(analysis, field) for field in RESULT_FIELDS}
+    result["reference_name"] = analysis.title
+    return result
+
+
+def copy_result(source: ReferenceAnalysis, target: ReferenceAnalysis) -> None:
+    """Copy a completed analysis into another record, marking it completed."""
+    for field in RESULT_FIELDS:
+        setattr(target, field, getattr(source, field))
+    target.content_hash = source.content_hash
+    target.analyzed_at = source.analyzed_at
+    target.status = "completed"
+    target.error_message = None
+
+
+class AnalysisResultCache:
+    """Looks up reusable completed analyses by canonical URL or content hash."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl_hours: Optional[float] = None,
+        content_ttl_hours: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            enabled: Whether lookups can hit. Defaults to REFERENCE_ANALYSIS_CACHE_ENABLED.
+            ttl_hours: Freshness of URL hits. Defaults to REFERENCE_ANALYSIS_CACHE_TTL_HOURS.
+            content_ttl_hours: Freshness of content hash hits.
+                Defaults to REFERENCE_ANALYSIS_CONTENT_CACHE_TTL_HOURS.
+        """
+        self.enabled = settings.REFERENCE_ANALYSIS_CACHE_ENABLED if enabled is None else enabled
+        self.ttl_hours = settings.REFERENCE_ANALYSIS_CACHE_TTL_HOURS if ttl_hours is None else ttl_hours
+        self.content_ttl_hours = (
+            settings.REFERENCE_ANALYSIS_CONTENT_CACHE_TTL_HOURS if content_ttl_hours is None else content_ttl_hours
+        )
+
+    async def find_by_url(
+        self,
+        db: AsyncSession,
+        url_key: Optional[str],
+        exclude_id: Optional[str] = None,
+    ) -> Optional[ReferenceAnalysis]:
+        """
+        Most recent fresh analysis of the same canonical URL.
+
+        Args:
+            db: Database session.
+            url_key: Key from source_url_cache_key() (None never hits).
+            exclude_id: Analysis to ignore (the one being produced).
+
+        Returns:
+            Completed analysis, or None on a miss.
+        """
+        return await self._find(db, ReferenceAnalysis.canonical_url_hash, url_key, self.ttl_hours, exclude_id)
+
+    async def find_by_content(
+        self,
+        db: AsyncSession,
+        content_hash: str,
+        exclude_id: Optional[str] = None,
+    ) -> Optional[ReferenceAnalysis]:
+        """
+        Most recent fresh analysis of byte-identical media.
+
+        Args:
+            db: Database session.
+            content_hash: Key from hash_media().
+            exclude_id: Analysis to ignore (the one being produced).
+
+        Returns:
+            Completed analysis, or None on a miss.
+        """
+        return await self._find(db, ReferenceAnalysis.content_hash, content_hash, self.content_ttl_hours, exclude_id)
+
+    async def _find(self, db, column, value, ttl_hours, exclude_id) -> Optional[ReferenceAnalysis]:
+        if not self.enabled or not value or ttl_hours <= 0:
+            return None
+
+        query = (
+            select(ReferenceAnalysis)
+            .where(
+                column == value,
+                ReferenceAnalysis.status == "completed",
+                ReferenceAnalysis.analyzed_at >= datetime.utcnow() - timedelta(hours=ttl_hours),
+            )
+            .order_by(ReferenceAnalysis.analyzed_at.desc())
+            .limit(1)
+        )
+        if exclude_id:
+            query = query.where(ReferenceAnalysis.id != exclude_id)
+
+        analysis = (await db.execute(query)).scalar_one_or_none()
+        if analysis:
+            logger.info(f"Reference analysis cache hit: {column.key}={value} -> {analysis.id}")
+        return analysis
+
+
+# Singleton instance
+_result_cache: Optional[AnalysisResultCache] = None
+
+
+def get_analysis_result_cache() -> AnalysisResultCache:
+    """Get the analysis result cache singleton."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = AnalysisResultCache()
+    return _result_cache
+
+
+__all__ = [
+    "AnalysisResultCache",
+    "canonical_source_url",
+    "copy_result",
+    "get_analysis_result_cache",
+    "hash_media",
+    "result_from_analysis",
+    "source_url_cache_key",
+]
@@ -0,0 +1,160 @@
+"""
+Dependency-aware Scheduler for Slide Image Generation.
+
+Each (slide, variant) image of an image project is one task. Tasks without a
+dependency start immediately; carousel tasks wait only for the same variant
+of the previous slide, whose image they use for visual continuity. All tasks
+share a process-wide concurrency limit for image generation calls.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TaskKey = Tuple[int, int]  # (slide_number, variant_index)
+
+
+@dataclass(frozen=True)
+class SlideVariantTask:
+    """One image to generate: a variant of a slide."""
+
+    slide_number: int
+    variant_index: int
+    depends_on: Optional[TaskKey] = None  # Task whose output this task uses as reference
+
+    @property
+    def key(self) -> TaskKey:
+        return (self.slide_number, self.variant_index)
+
+
+def build_slide_tasks(slide_count: int, num_variants: int, chained: bool) -> List[SlideVariantTask]:
+    """
+    Build the task graph for a project.
+
+    Args:
+        slide_count: Number of slides.
+        num_variants: Variants generated per slide.
+        chained: Whether each slide continues the same variant of the previous slide (carousel).
+
+    Returns:
+        Tasks in slide order.
+    """
+    return [
+        SlideVariantTask(
+            slide_number=slide_number,
+            variant_index=variant_index,
+            depends_on=(slide_number - 1, variant_index) if chained and slide_number > 1 else None,
+        )
+        for slide_number in range(1, slide_count + 1)
+        for variant_index in range(num_variants)
+    ]
+
+
+class SlideGenerationScheduler:
+    """
+    Runs slide variant tasks as soon as their dependencies resolve.
+
+    Tasks waiting on a dependency do not hold a concurrency slot. A failed
+    task resolves its dependants with None, so they still run (without the
+    continuity reference) instead of failing the whole chain.
+    """
+
+    def __init__(self, semaphore: Optional[asyncio.Semaphore] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            semaphore: Concurrency limit for generation calls. Defaults to the process-wide limit.
+        """
+        self.semaphore = semaphore or get_image_generation_semaphore()
+
+    async def run(
+        self,
+        tasks: List[SlideVariantTask],
+        generate: Callable[[SlideVariantTask, Optional[Any]], Awaitable[Any]],
+        on_result: Optional[Callable[[SlideVariantTask, Optional[Any], Optional[str]], Awaitable[None]]] = None,
+    ) -> Dict[TaskKey, Optional[Any]]:
+        """
+        Run all tasks.
+
+        Args:
+            tasks: Tasks to run. Dependencies must be part of the same list.
+            generate: Async callable producing a task's output from its dependency's output
+                (None when the task has no dependency or the dependency failed).
+                Returning None marks the task as failed.
+            on_result: Optional async callback invoked as each task finishes with
+                (task, output, error message). Its errors are logged and do not
+                affect other tasks.
+
+        Returns:
+            Output per task key (None for failed tasks).
+        """
+        loop = asyncio.get_running_loop()
+        outputs: Dict[TaskKey, asyncio.Future] = {task.key: loop.create_future() for task in tasks}
+
+        async def run_task(task: SlideVariantTask) -> None:
+            output = None
+            error = None
+            try:
+                previous = await outputs[task.depends_on] if task.depends_on in outputs else None
+                async with self.semaphore:
+                    output = await generate(task, previous)
+                if output is None:
+                    error = "No image generated"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e)
+                logger.error(
+                    f"Failed to generate variant {task.variant_index + 1} "
+                    f"for slide {task.slide_number}: {e}"
+                )
+            finally:
+                future = outputs[task.key]
+                if not future.done():
+                    future.set_result(output)
+
+            if on_result is not None:
+                try:
+                    await on_result(task, output, error)
+                except Exception as e:
+                    logger.error(
+                        f"Result callback failed for variant {task.variant_index + 1} "
+                        f"of slide {task.slide_number}: {e}"
+                    )
+
+        runners = [asyncio.create_task(run_task(task)) for task in tasks]
+        try:
+            await asyncio.gather(*runners)
+        except BaseException:
+            for runner in runners:
+                runner.cancel()
+            await asyncio.gather(*runners, return_exceptions=True)
+            raise
+
+        return {key: future.result() for key, future in outputs.items()}
+
+
+# Shared limit for all image generation calls in this process
+_generation_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_image_generation_semaphore() -> asyncio.Semaphore:
+    """Get or create the process-wide image generation concurrency limit."""
+    global _generation_semaphore
+    if _generation_semaphore is None:
+        _generation_semaphore = asyncio.Semaphore(max(1, settings.IMAGE_GENERATION_MAX_CONCURRENCY))
+    return _generation_semaphore
+
+
+__all__ = [
+    "SlideVariantTask",
+    "SlideGenerationScheduler",
+    "build_slide_tasks",
+    "get_image_generation_semaphore",
+]
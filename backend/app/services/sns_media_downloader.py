@@ -8,6 +8,11 @@ This module provides a unified interface for downloading media from various
 social media platforms. It uses gallery-dl as the underlying downloader and
 provides additional validation, error handling, and image processing.
 
+gallery-dl keeps its configuration in process-global state, so each download
+runs as a separate `python -m gallery_dl` process with its own destination
+and cookies on the command line. Concurrent downloads cannot overwrite each
+other's settings; SNS_MAX_CONCURRENT_DOWNLOADS caps how many run at once.
+
 Supported platforms:
 - Instagram: Posts and stories
 - Facebook: Posts, photos, and albums
@@ -27,6 +32,7 @@ import io
 import logging
 import os
 import re
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
@@ -35,11 +41,13 @@ from PIL import Image
 
 import httpx
 
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
 try:
-    from gallery_dl import job, config as gallery_config
+    import gallery_dl
 except ImportError:
-    job = None
-    gallery_config = None
+    gallery_dl = None
 
 try:
     import instaloader
@@ -48,6 +56,17 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Shared by all downloader instances in this process
+_gallery_dl_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_gallery_dl_semaphore() -> asyncio.Semaphore:
+    """Get or create the process-wide limit on running gallery-dl processes."""
+    global _gallery_dl_semaphore
+    if _gallery_dl_semaphore is None:
+        _gallery_dl_semaphore = asyncio.Semaphore(max(1, settings.SNS_MAX_CONCURRENT_DOWNLOADS))
+    return _gallery_dl_semaphore
+
 
 class SNSMediaDownloadError(Exception):
     """Raised when SNS media download fails."""
@@ -102,19 +121,33 @@ class SNSMediaDownloader:
         'cookies.txt',
     ]
 
-    def __init__(self, max_concurrent_downloads: int = 3, cookies_file: Optional[str] = None):
+    def __init__(
+        self,
+        max_concurrent_downloads: Optional[int] = None,
+        cookies_file: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        gallery_dl_command: Optional[List[str]] = None,
+    ):
         """
         Initialize SNS Media Downloader.
 
         Args:
-            max_concurrent_downloads: Maximum concurrent downloads allowed
+            max_concurrent_downloads: Maximum concurrent image downloads of one post.
+                Defaults to SNS_MAX_CONCURRENT_DOWNLOADS.
             cookies_file: Optional path to cookies file for authentication
+            http_client: HTTP client for image downloads. Defaults to the shared pooled client.
+            gallery_dl_command: Command that starts gallery-dl. Defaults to
+                `python -m gallery_dl` with the current interpreter.
         """
         self.supported_platforms = self.SUPPORTED_PLATFORMS
-        self.max_concurrent_downloads = max_concurrent_downloads
+        self.max_concurrent_downloads = max_concurrent_downloads or settings.SNS_MAX_CONCURRENT_DOWNLOADS
         self.cookies_file = cookies_file or self._find_cookies_file()
+        self.http_client = http_client
+        self.gallery_dl_command = gallery_dl_command or (
+            [sys.executable, "-m", "gallery_dl"] if gallery_dl is not None else None
+        )
 
-        if job is None:
+        if not self.gallery_dl_command:
             logger.warning("gallery-dl not installed. Download functionality limited.")
 
         if self.cookies_file:
@@ -289,7 +322,7 @@ class SNSMediaDownloader:
             Path(output_dir).mkdir(parents=True, exist_ok=True)
 
             # Configure gallery-dl job
-            if job is None:
+            if not self.gallery_dl_command:
                 raise SNSMediaDownloadError("gallery-dl is not installed")
 
             # Create options dict for gallery-dl
@@ -303,13 +336,9 @@ class SNSMediaDownloader:
             if cookies_file and os.path.exists(cookies_file):
                 options['cookies'] = cookies_file
 
-            # Use asyncio to run gallery-dl in thread pool to avoid blocking
+            # Run gallery-dl in its own process (isolated config, no blocking)
             try:
-                download_job = await asyncio.to_thread(
-                    self._run_gallery_dl_job,
-                    url,
-                    options
-                )
+                await self._run_gallery_dl(url, options)
 
                 # Get downloaded images
                 images = self.get_downloaded_images(output_dir)
@@ -333,33 +362,54 @@ class SNSMediaDownloader:
             logger.error(f"Unexpected error downloading {url}: {error}")
             raise SNSMediaDownloadError(f"Unexpected error: {str(error)}")
 
-    @staticmethod
-    def _run_gallery_dl_job(url: str, options: Dict[str, Any]) -> None:
+    async def _run_gallery_dl(self, url: str, options: Dict[str, Any]) -> None:
         """
-        Run gallery-dl download job in sync context.
+        Run one gallery-dl download in a separate process.
 
         Args:
             url: URL to download from
-            options: gallery-dl options
+            options: gallery-dl options ('output', 'retries', 'cookies', 'quiet')
 
         Raises:
-            Exception: If download fails
+            asyncio.TimeoutError: If the download exceeds SNS_DOWNLOAD_TIMEOUT_SECONDS
+            Exception: If gallery-dl exits with an error before downloading anything
         """
-        try:
-            # Configure gallery-dl using its config module
-            if gallery_config is not None:
-                gallery_config.clear()
-                gallery_config.set(("extractor",), "base-directory", options.get('output', '.'))
-                gallery_config.set(("extractor",), "retries", options.get('retries', 3))
-                if options.get('cookies'):
-                    gallery_config.set(("extractor",), "cookies", options.get('cookies'))
-
-            # Create and run download job without options parameter
-            download_job = job.DownloadJob(url)
-            download_job.run()
-        except Exception as error:
-            logger.error(f"gallery-dl job failed: {error}")
-            raise
+        command = [
+            *self.gallery_dl_command,
+            "--config-ignore",  # Same as the cleared config of a fresh job
+            "--destination", options.get('output', '.'),
+            "--retries", str(options.get('retries', 3)),
+        ]
+        if options.get('cookies'):
+            command += ["--cookies", options['cookies']]
+        if options.get('quiet'):
+            command.append("--quiet")
+        command += ["--", url]
+
+        async with _get_gallery_dl_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=settings.SNS_DOWNLOAD_TIMEOUT_SECONDS
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                process.kill()
+                await process.wait()
+                raise
+
+        if process.returncode != 0:
+            error_text = stderr.decode(errors="replace").strip()
+            media = self.get_all_media(options.get('output', '.'))
+            if media['images'] or media['videos']:
+                # Partial failure (e.g. one carousel item); keep what was downloaded
+                logger.warning(f"gallery-dl exited with {process.returncode} after downloading media: {error_text[-500:]}")
+                return
+            logger.error(f"gallery-dl job failed ({process.returncode}): {error_text[-500:]}")
+            raise Exception(error_text.splitlines()[-1] if error_text else f"gallery-dl exited with {process.returncode}")
 
     def get_downloaded_images(self, directory: str) -> List[str]:
         """
@@ -500,20 +550,22 @@ class SNSMediaDownloader:
                 # Single image post
                 image_urls.append(post.url)
 
-            # Download images
-            images_data = []
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                for img_url in image_urls:
-                    try:
-                        response = await client.get(img_url)
-                        if response.status_code == 200:
-                            image_bytes = response.content
-                            if self.is_valid_image(image_bytes):
-                                images_data.append(image_bytes)
-                    except Exception as e:
-                        logger.warning(f"Failed to download image {img_url}: {e}")
+            # Download images over the pooled client, a few at a time, keeping post order
+            client = self.http_client or get_http_client()
+            semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
 
-            return images_data
+            async def fetch(img_url: str) -> Optional[bytes]:
+                try:
+                    async with semaphore:
+                        response = await client.get(img_url, timeout=30.0)
+                    if response.status_code == 200 and self.is_valid_image(response.content):
+                        return response.content
+                except Exception as e:
+                    logger.warning(f"Failed to download image {img_url}: {e}")
+                return None
+
+            downloaded = await asyncio.gather(*(fetch(img_url) for img_url in image_urls))
+            return [image_bytes for image_bytes in downloaded if image_bytes is not None]
 
         except Exception as error:
             logger.error(f"Instaloader extraction failed: {error}")
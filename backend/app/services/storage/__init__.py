@@ -0,0 +1,90 @@
+"""
+Object Storage Drivers.
+
+Provides interchangeable drivers for Tencent COS, S3-compatible stores
+(AWS S3, MinIO) and the local filesystem, selected via STORAGE_BACKEND.
+"""
+
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.services.storage.base import StorageDriverBase
+from app.services.storage.local_driver import LocalStorageDriver
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKENDS = ("auto", "cos", "s3", "local")
+
+
+def _cos_configured() -> bool:
+    return all([
+        settings.TENCENT_SECRET_ID,
+        settings.TENCENT_SECRET_KEY,
+        settings.TENCENT_COS_BUCKET,
+        settings.TENCENT_COS_REGION,
+    ])
+
+
+def create_storage_driver(
+    backend: Optional[str] = None,
+    max_pool_connections: int = 10,
+) -> StorageDriverBase:
+    """
+    Create the storage driver for a backend.
+
+    Args:
+        backend: "cos", "s3", "local" or "auto" (COS when configured, else local).
+            Defaults to settings.STORAGE_BACKEND.
+        max_pool_connections: HTTP connection pool size for remote drivers.
+
+    Returns:
+        A storage driver.
+
+    Raises:
+        ValueError: If the backend is unknown or not configured.
+    """
+    backend = (backend or settings.STORAGE_BACKEND).lower()
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}. Available: {list(STORAGE_BACKENDS)}")
+
+    if backend == "auto":
+        backend = "cos" if _cos_configured() else "local"
+
+    if backend == "cos":
+        if not _cos_configured():
+            raise ValueError("Tencent COS is not configured")
+        from app.services.storage.cos_driver import CosStorageDriver
+
+        return CosStorageDriver(
+            bucket=settings.TENCENT_COS_BUCKET,
+            region=settings.TENCENT_COS_REGION,
+            secret_id=settings.TENCENT_SECRET_ID,
+            secret_key=settings.TENCENT_SECRET_KEY,
+            max_pool_connections=max_pool_connections,
+        )
+
+    if backend == "s3":
+        if not settings.S3_BUCKET_NAME:
+            raise ValueError("S3_BUCKET_NAME is not configured")
+        from app.services.storage.s3_driver import S3StorageDriver
+
+        return S3StorageDriver(
+            bucket=settings.S3_BUCKET_NAME,
+            endpoint_url=settings.S3_ENDPOINT,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+            public_url=settings.S3_PUBLIC_URL,
+            max_pool_connections=max_pool_connections,
+        )
+
+    return LocalStorageDriver(settings.TEMP_DIR)
+
+
+__all__ = [
+    "StorageDriverBase",
+    "LocalStorageDriver",
+    "STORAGE_BACKENDS",
+    "create_storage_driver",
+]
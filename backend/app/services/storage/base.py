@@ -0,0 +1,109 @@
+"""
+Storage Driver Interface.
+
+A storage driver talks to one object store (Tencent COS, S3/MinIO or the
+local filesystem). Drivers are synchronous and thread-safe;
+CloudStorageService runs them on its upload thread pool.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class StorageDriverBase(ABC):
+    """Abstract base class for object storage drivers."""
+
+    name: str = "base"
+    supports_multipart: bool = False
+
+    @abstractmethod
+    def put_object(self, key: str, data: bytes, content_type: str) -> None:
+        """Store bytes under the given key."""
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Check whether an object exists."""
+        pass
+
+    @abstractmethod
+    def get_url(self, key: str) -> str:
+        """Get the public URL of an object."""
+        pass
+
+    @abstractmethod
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        """
+        Read an object, or a byte range of it.
+
+        Args:
+            key: Object key.
+            start: First byte to read.
+            end: Last byte to read (inclusive); None reads to the end.
+
+        Returns:
+            The bytes read, or None if the object does not exist.
+        """
+        pass
+
+    def presigned_url(
+        self,
+        key: str,
+        expires_seconds: int = 3600,
+        download_filename: Optional[str] = None,
+    ) -> str:
+        """
+        Get a time-limited download URL for an object.
+
+        Drivers without request signing return the public URL.
+
+        Args:
+            key: Object key.
+            expires_seconds: URL lifetime.
+            download_filename: If set, the store serves the object as an
+                attachment with this filename.
+        """
+        return self.get_url(key)
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        """Object key of a URL returned by get_url, or None for other URLs."""
+        prefix = self.get_url("")
+        if url and url.startswith(prefix) and len(url) > len(prefix):
+            return url[len(prefix):].split("?", 1)[0]
+        return None
+
+    def put_file(self, key: str, file_path: str, content_type: str) -> None:
+        """Store a file from disk under the given key."""
+        with open(file_path, "rb") as f:
+            data = f.read()
+        self.put_object(key, data, content_type)
+
+    # Multipart uploads (only called when supports_multipart is True)
+
+    def create_multipart_upload(self, key: str, content_type: str) -> str:
+        """Start a multipart upload and return its upload id."""
+        raise NotImplementedError(f"{self.name} does not support multipart uploads")
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        """Upload one part and return its ETag."""
+        raise NotImplementedError(f"{self.name} does not support multipart uploads")
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: List[dict]) -> None:
+        """Complete a multipart upload from [{"PartNumber", "ETag"}] entries."""
+        raise NotImplementedError(f"{self.name} does not support multipart uploads")
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        """Abort a multipart upload and discard its parts."""
+        raise NotImplementedError(f"{self.name} does not support multipart uploads")
+
+
+def attachment_disposition(filename: str) -> str:
+    """Content-Disposition value that downloads an object as the given filename."""
+    return f'attachment; filename="{filename}"'
+
+
+def range_header(start: int, end: Optional[int]) -> Optional[str]:
+    """HTTP Range header value for a byte range, or None for the whole object."""
+    if start <= 0 and end is None:
+        return None
+    return f"bytes={max(start, 0)}-{'' if end is None else end}"
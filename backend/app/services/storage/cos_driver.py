@@ -0,0 +1,126 @@
+"""
+Tencent COS Storage Driver.
+"""
+
+from io import BytesIO
+from typing import List, Optional
+
+from qcloud_cos import CosConfig, CosS3Client
+from qcloud_cos.cos_exception import CosServiceError
+
+from app.services.storage.base import (
+    StorageDriverBase,
+    attachment_disposition,
+    range_header,
+)
+
+
+class CosStorageDriver(StorageDriverBase):
+    """Stores objects in a Tencent COS bucket."""
+
+    name = "cos"
+    supports_multipart = True
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        secret_id: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        max_pool_connections: int = 10,
+        client: Optional[CosS3Client] = None,
+    ):
+        """
+        Initialize the driver.
+
+        Args:
+            bucket: Bucket name (with appid suffix).
+            region: COS region, e.g. "ap-seoul".
+            secret_id: API secret id.
+            secret_key: API secret key.
+            max_pool_connections: Size of the HTTP connection pool.
+            client: Pre-built client (used instead of the credentials).
+        """
+        self.bucket = bucket
+        self.region = region
+        self.client = client or CosS3Client(CosConfig(
+            Region=region,
+            SecretId=secret_id,
+            SecretKey=secret_key,
+            Scheme="https",
+            PoolConnections=max_pool_connections,
+            PoolMaxSize=max_pool_connections,
+        ))
+
+    def put_object(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Body=BytesIO(data),
+            Key=key,
+            ContentType=content_type,
+        )
+
+    def exists(self, key: str) -> bool:
+        return self.client.object_exists(Bucket=self.bucket, Key=key)
+
+    def get_url(self, key: str) -> str:
+        return f"https://{self.bucket}.cos.{self.region}.myqcloud.com/{key}"
+
+    def presigned_url(
+        self,
+        key: str,
+        expires_seconds: int = 3600,
+        download_filename: Optional[str] = None,
+    ) -> str:
+        params = {}
+        if download_filename:
+            params["response-content-disposition"] = attachment_disposition(download_filename)
+        return self.client.get_presigned_url(
+            Bucket=self.bucket,
+            Key=key,
+            Method="GET",
+            Expired=expires_seconds,
+            Params=params,
+        )
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        kwargs = {}
+        byte_range = range_header(start, end)
+        if byte_range:
+            kwargs["Range"] = byte_range
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key, **kwargs)
+        except CosServiceError as e:
+            if e.get_status_code() == 404:
+                return None
+            raise
+        return response["Body"].get_raw_stream().read()
+
+    def create_multipart_upload(self, key: str, content_type: str) -> str:
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            ContentType=content_type,
+        )
+        return response["UploadId"]
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            PartNumber=part_number,
+            UploadId=upload_id,
+        )
+        return response["ETag"]
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: List[dict]) -> None:
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Part": parts},
+        )
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
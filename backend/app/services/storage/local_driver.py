@@ -0,0 +1,59 @@
+"""
+Local Filesystem Storage Driver.
+
+Stores objects under TEMP_DIR, which the app serves at /static.
+"""
+
+import os
+import shutil
+from typing import Optional
+
+from app.services.storage.base import StorageDriverBase
+
+
+class LocalStorageDriver(StorageDriverBase):
+    """Stores objects as files under a root directory."""
+
+    name = "local"
+
+    def __init__(self, root_dir: str, url_prefix: str = "/static"):
+        """
+        Initialize the driver.
+
+        Args:
+            root_dir: Directory objects are stored in.
+            url_prefix: URL prefix the directory is served under.
+        """
+        self.root_dir = root_dir
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def path_for(self, key: str) -> str:
+        """Local path of an object."""
+        return os.path.join(self.root_dir, *key.split("/"))
+
+    def _prepare(self, key: str) -> str:
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def put_object(self, key: str, data: bytes, content_type: str) -> None:
+        with open(self._prepare(key), "wb") as f:
+            f.write(data)
+
+    def put_file(self, key: str, file_path: str, content_type: str) -> None:
+        # Copy without reading the whole file into memory
+        shutil.copyfile(file_path, self._prepare(key))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def get_url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        try:
+            with open(self.path_for(key), "rb") as f:
+                f.seek(start)
+                return f.read() if end is None else f.read(max(0, end - start + 1))
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,144 @@
+"""
+S3-compatible Storage Driver (AWS S3, MinIO).
+"""
+
+from typing import List, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.services.storage.base import (
+    StorageDriverBase,
+    attachment_disposition,
+    range_header,
+)
+
+
+class S3StorageDriver(StorageDriverBase):
+    """Stores objects in an S3-compatible bucket, e.g. the MinIO of docker-compose."""
+
+    name = "s3"
+    supports_multipart = True
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: str = "us-east-1",
+        public_url: Optional[str] = None,
+        max_pool_connections: int = 10,
+        client=None,
+    ):
+        """
+        Initialize the driver.
+
+        Args:
+            bucket: Bucket name.
+            endpoint_url: Endpoint for S3-compatible servers (None for AWS).
+            access_key: Access key id.
+            secret_key: Secret access key.
+            region: Bucket region.
+            public_url: Base URL objects are publicly served under.
+                Defaults to path-style URLs on the endpoint.
+            max_pool_connections: Size of the HTTP connection pool.
+            client: Pre-built boto3 S3 client (used instead of the credentials).
+        """
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.client = client or boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                signature_version="s3v4",
+                retries={"max_attempts": 3, "mode": "standard"},
+                # MinIO serves buckets path-style
+                s3={"addressing_style": "path" if endpoint_url else "auto"},
+            ),
+        )
+
+        if public_url:
+            self.public_url = public_url.rstrip("/")
+        elif endpoint_url:
+            self.public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_url = f"https://{bucket}.s3.{region}.amazonaws.com"
+
+    def put_object(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType=content_type)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def get_url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def presigned_url(
+        self,
+        key: str,
+        expires_seconds: int = 3600,
+        download_filename: Optional[str] = None,
+    ) -> str:
+        params = {"Bucket": self.bucket, "Key": key}
+        if download_filename:
+            params["ResponseContentDisposition"] = attachment_disposition(download_filename)
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params=params,
+            ExpiresIn=expires_seconds,
+        )
+
+    def read_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        kwargs = {}
+        byte_range = range_header(start, end)
+        if byte_range:
+            kwargs["Range"] = byte_range
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key, **kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return response["Body"].read()
+
+    def create_multipart_upload(self, key: str, content_type: str) -> str:
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            ContentType=content_type,
+        )
+        return response["UploadId"]
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            PartNumber=part_number,
+            UploadId=upload_id,
+        )
+        return response["ETag"]
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: List[dict]) -> None:
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
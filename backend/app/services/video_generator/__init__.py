@@ -40,8 +40,25 @@ from app.services.video_generator.video_concatenator import (
     ConcatenationResult,
     SceneVideo,
     TRANSITION_EFFECTS,
+    EncodingProfile,
+    ENCODING_PROFILES,
     get_video_concatenator,
 )
+from app.services.video_generator.animatic_renderer import (
+    AnimaticRenderer,
+    AnimaticScene,
+    get_animatic_renderer,
+)
+from app.services.video_generator.ffmpeg_limiter import (
+    FFmpegLimiter,
+    get_ffmpeg_limiter,
+)
+from app.services.video_generator.rate_limiter import (
+    TokenBucketRateLimiter,
+    get_veo_rate_limiter,
+)
+from app.services.video_generator.scene_scheduler import SceneScheduler
+from app.services.video_generator.operation_tracker import OperationTracker
 
 __all__ = [
     # Image Generator
@@ -76,5 +93,18 @@ __all__ = [
     "ConcatenationResult",
     "SceneVideo",
     "TRANSITION_EFFECTS",
+    "EncodingProfile",
+    "ENCODING_PROFILES",
     "get_video_concatenator",
+    "FFmpegLimiter",
+    "get_ffmpeg_limiter",
+    # Animatic Preview
+    "AnimaticRenderer",
+    "AnimaticScene",
+    "get_animatic_renderer",
+    # Scheduling
+    "TokenBucketRateLimiter",
+    "get_veo_rate_limiter",
+    "SceneScheduler",
+    "OperationTracker",
 ]
@@ -0,0 +1,262 @@
+"""
+Animatic Preview Renderer using FFmpeg.
+
+Builds a low-resolution slideshow ("animatic") of a storyboard directly from
+its scene images: every image gets a slow Ken Burns pan/zoom for the scene's
+duration and scenes are joined with the storyboard's transitions. Rendering
+takes seconds and spends no video generation quota, so timing and
+transitions can be iterated on before the real render.
+"""
+
+import hashlib
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.services.video_generator.video_concatenator import (
+    ENCODING_PROFILES,
+    TRANSITION_EFFECTS,
+    VideoConcatenator,
+)
+from app.services.video_generator.video_generator_service import VideoGenerationResult
+
+logger = logging.getLogger(__name__)
+
+# Output size per aspect ratio (kept small on purpose)
+PREVIEW_RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "16:9": (480, 270),
+    "9:16": (270, 480),
+    "1:1": (360, 360),
+}
+
+PREVIEW_ENCODING_PROFILE = "fast-preview"
+
+# Ken Burns motions, cycled through the scenes
+KEN_BURNS_MOTIONS = ("zoom_in", "zoom_out", "pan_right")
+
+
+@dataclass
+class AnimaticScene:
+    """One storyboard scene of an animatic."""
+
+    duration_seconds: float
+    image_path: Optional[str] = None  # Local image file; None renders a blank card
+    transition_effect: Optional[str] = None  # Transition into the next scene
+
+
+class AnimaticRenderer(VideoConcatenator):
+    """
+    Renders storyboard animatics with FFmpeg.
+
+    Shares the output directory, ffmpeg limiter and process handling of
+    VideoConcatenator. Renders are cached by their inputs, so re-requesting
+    an unchanged storyboard returns the existing file immediately.
+    """
+
+    FPS = 24
+    ZOOM = 1.15  # Maximum Ken Burns zoom factor
+    OVERSAMPLE = 4  # Images are scaled up before zoompan to avoid jitter
+    DEFAULT_SCENE_SECONDS = 3.0
+    BLANK_CARD_COLOR = "0x1f2937"
+
+    async def render(
+        self,
+        scenes: List[AnimaticScene],
+        aspect_ratio: str = "16:9",
+        transition_duration_ms: int = 500,
+    ) -> VideoGenerationResult:
+        """
+        Render an animatic of the given scenes.
+
+        Args:
+            scenes: Scenes in playback order.
+            aspect_ratio: Output aspect ratio (16:9, 9:16 or 1:1).
+            transition_duration_ms: Duration of each transition in milliseconds.
+
+        Returns:
+            VideoGenerationResult with the URL of the preview video.
+        """
+        start_time = time.time()
+
+        if not scenes:
+            return VideoGenerationResult(status="failed", error_message="No scenes to render")
+
+        width, height = PREVIEW_RESOLUTIONS.get(aspect_ratio, PREVIEW_RESOLUTIONS["16:9"])
+        durations = [
+            scene.duration_seconds if scene.duration_seconds and scene.duration_seconds > 0
+            else self.DEFAULT_SCENE_SECONDS
+            for scene in scenes
+        ]
+
+        key = self._animatic_key(scenes, durations, width, height, transition_duration_ms)
+        output_filename = f"animatic_{key[:24]}.mp4"
+        output_path = self.output_dir / output_filename
+        output_url = f"http://localhost:8000/uploads/videos/{output_filename}"
+
+        args, total_duration = self._build_args(
+            scenes, durations, width, height, transition_duration_ms / 1000.0
+        )
+
+        if output_path.exists():
+            logger.info(f"Animatic cache hit: {output_filename}")
+            return VideoGenerationResult(
+                video_url=output_url,
+                duration_seconds=total_duration,
+                generation_time_ms=int((time.time() - start_time) * 1000),
+            )
+
+        # Render next to the final file and move it in place when complete; the
+        # partial name is unique per render so concurrent previews don't collide
+        partial_path = self.output_dir / f".{output_filename}.{uuid.uuid4().hex[:8]}.partial.mp4"
+        success, error_msg = await self._run_ffmpeg([*args, str(partial_path)])
+        generation_time_ms = int((time.time() - start_time) * 1000)
+
+        if not success:
+            partial_path.unlink(missing_ok=True)
+            logger.error(f"Animatic render failed: {error_msg}")
+            return VideoGenerationResult(
+                status="failed",
+                error_message=error_msg,
+                generation_time_ms=generation_time_ms,
+            )
+
+        os.replace(partial_path, output_path)
+        logger.info(
+            f"Animatic rendered - {len(scenes)} scenes, {total_duration:.1f}s, "
+            f"{width}x{height}, {generation_time_ms}ms"
+        )
+        return VideoGenerationResult(
+            video_url=output_url,
+            duration_seconds=total_duration,
+            generation_time_ms=generation_time_ms,
+        )
+
+    def _build_args(
+        self,
+        scenes: List[AnimaticScene],
+        durations: List[float],
+        width: int,
+        height: int,
+        transition_duration: float,
+    ) -> Tuple[List[str], float]:
+        """
+        Build the FFmpeg arguments (without output path) for an animatic.
+
+        Returns:
+            Tuple of (arguments, total output duration in seconds).
+        """
+        args = [self.ffmpeg_path, "-y"]
+        filter_parts = []
+
+        for i, (scene, duration) in enumerate(zip(scenes, durations)):
+            frames = max(1, round(duration * self.FPS))
+            if scene.image_path:
+                args.extend(["-i", scene.image_path])
+                filter_parts.append(
+                    f"[{i}:v]{self._ken_burns_filter(i, frames, width, height)},"
+                    f"format=yuv420p,setsar=1,settb=AVTB[s{i}]"
+                )
+            else:
+                args.extend([
+                    "-f", "lavfi",
+                    "-i", f"color=c={self.BLANK_CARD_COLOR}:s={width}x{height}:r={self.FPS}:d={frames / self.FPS:.3f}",
+                ])
+                filter_parts.append(f"[{i}:v]format=yuv420p,setsar=1,settb=AVTB[s{i}]")
+
+        # Chain scenes: xfade for supported transitions, concat for cuts
+        current = "[s0]"
+        timeline = durations[0]
+        for i in range(1, len(scenes)):
+            output_label = f"[j{i}]" if i < len(scenes) - 1 else "[outv]"
+            effect_name = scenes[i - 1].transition_effect or "fade"
+            xfade_effect = TRANSITION_EFFECTS.get(effect_name)
+            # Never let a transition eat more than half of either scene
+            overlap = min(transition_duration, durations[i - 1] / 2, durations[i] / 2)
+
+            if xfade_effect is None or overlap <= 0:
+                filter_parts.append(f"{current}[s{i}]concat=n=2:v=1:a=0,settb=AVTB{output_label}")
+                timeline += durations[i]
+            else:
+                offset = timeline - overlap
+                filter_parts.append(
+                    f"{current}[s{i}]xfade=transition={xfade_effect}:"
+                    f"duration={overlap:.3f}:offset={offset:.3f}{output_label}"
+                )
+                timeline = offset + durations[i]
+            current = output_label
+
+        if len(scenes) == 1:
+            filter_parts[-1] = filter_parts[-1].replace("[s0]", "[outv]")
+
+        args.extend(["-filter_complex", ";".join(filter_parts), "-map", "[outv]", "-an"])
+        args.extend(ENCODING_PROFILES[PREVIEW_ENCODING_PROFILE].video_args())
+        args.extend(["-r", str(self.FPS), "-movflags", "+faststart"])
+        return args, round(timeline, 3)
+
+    def _ken_burns_filter(self, index: int, frames: int, width: int, height: int) -> str:
+        """Scale/crop an image and apply a pan/zoom motion over the given frames."""
+        big_w, big_h = width * self.OVERSAMPLE, height * self.OVERSAMPLE
+        zoom_range = self.ZOOM - 1
+        motion = KEN_BURNS_MOTIONS[index % len(KEN_BURNS_MOTIONS)]
+
+        center_x = "iw/2-(iw/zoom/2)"
+        center_y = "ih/2-(ih/zoom/2)"
+        if motion == "zoom_in":
+            zoom, x = f"1+{zoom_range}*on/{frames}", center_x
+        elif motion == "zoom_out":
+            zoom, x = f"{self.ZOOM}-{zoom_range}*on/{frames}", center_x
+        else:
+            zoom, x = f"{self.ZOOM}", f"(iw-iw/zoom)*on/{frames}"
+
+        return (
+            f"scale={big_w}:{big_h}:force_original_aspect_ratio=increase,"
+            f"crop={big_w}:{big_h},"
+            f"zoompan=z='{zoom}':x='{x}':y='{center_y}':d={frames}:s={width}x{height}:fps={self.FPS}"
+        )
+
+    def _animatic_key(
+        self,
+        scenes: List[AnimaticScene],
+        durations: List[float],
+        width: int,
+        height: int,
+        transition_duration_ms: int,
+    ) -> str:
+        """Cache key covering every input that affects the rendered animatic."""
+        digest = hashlib.sha256()
+        digest.update(
+            f"{width}x{height}|{transition_duration_ms}|{PREVIEW_ENCODING_PROFILE}|".encode()
+        )
+        for scene, duration in zip(scenes, durations):
+            image = "-"
+            if scene.image_path:
+                try:
+                    stat = os.stat(scene.image_path)
+                    image = f"{os.path.abspath(scene.image_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+                except OSError:
+                    image = scene.image_path
+            digest.update(f"{image}|{duration:.3f}|{scene.transition_effect or ''}\n".encode())
+        return digest.hexdigest()
+
+
+# Singleton instance
+_animatic_renderer: Optional[AnimaticRenderer] = None
+
+
+def get_animatic_renderer() -> AnimaticRenderer:
+    """Get or create the AnimaticRenderer instance."""
+    global _animatic_renderer
+    if _animatic_renderer is None:
+        _animatic_renderer = AnimaticRenderer()
+    return _animatic_renderer
+
+
+__all__ = [
+    "AnimaticRenderer",
+    "AnimaticScene",
+    "PREVIEW_RESOLUTIONS",
+    "get_animatic_renderer",
+]
@@ -0,0 +1,85 @@
+"""
+Process-wide FFmpeg Resource Limiter.
+
+Caps how many ffmpeg processes run at the same time and how many threads
+each one may use, so video rendering cannot take over every core of a
+shared API host.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FFmpegLimiter:
+    """
+    Concurrency and thread limiter for ffmpeg processes.
+
+    Callers hold a ``slot()`` while an ffmpeg process runs and pass
+    ``thread_args()`` on its command line.
+    """
+
+    def __init__(self, max_concurrent_jobs: int, threads_per_job: int = 0):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrent_jobs: Maximum number of ffmpeg processes running at once.
+            threads_per_job: Threads per ffmpeg process. 0 lets ffmpeg decide.
+        """
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be at least 1")
+
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.threads_per_job = max(0, threads_per_job)
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        """Number of ffmpeg processes currently holding a slot."""
+        return self._active
+
+    def thread_args(self) -> List[str]:
+        """Output options limiting the threads of one ffmpeg process."""
+        if self.threads_per_job <= 0:
+            return []
+        return ["-threads", str(self.threads_per_job)]
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the lifetime of one ffmpeg process."""
+        if self._semaphore.locked():
+            logger.debug(f"All {self.max_concurrent_jobs} ffmpeg slots busy, waiting")
+        async with self._semaphore:
+            self._active += 1
+            try:
+                yield
+            finally:
+                self._active -= 1
+
+
+# Shared limiter for all ffmpeg processes in this process
+_ffmpeg_limiter: Optional[FFmpegLimiter] = None
+
+
+def get_ffmpeg_limiter() -> FFmpegLimiter:
+    """Get or create the process-wide ffmpeg limiter."""
+    global _ffmpeg_limiter
+    if _ffmpeg_limiter is None:
+        _ffmpeg_limiter = FFmpegLimiter(
+            max_concurrent_jobs=settings.FFMPEG_MAX_CONCURRENT_JOBS,
+            threads_per_job=settings.FFMPEG_THREADS_PER_JOB,
+        )
+    return _ffmpeg_limiter
+
+
+__all__ = [
+    "FFmpegLimiter",
+    "get_ffmpeg_limiter",
+]
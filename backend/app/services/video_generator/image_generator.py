@@ -6,7 +6,6 @@ Supports multiple providers:
 - mock: Mock provider for testing (returns picsum images)
 """
 
-import base64
 import logging
 import time
 import traceback
@@ -20,6 +19,7 @@ from google.genai import types
 from PIL import Image
 
 from app.core.config import settings
+from app.services.binary_image import first_inline_image
 
 logger = logging.getLogger(__name__)
 
@@ -160,7 +160,7 @@ class ImageGeneratorBase(ABC):
 
         Returns:
             dict with keys:
-                - image_data: Base64 encoded image data (or None if URL provided)
+                - image_data: BinaryImage with the generated image (or None if URL provided)
                 - image_url: URL to the generated image (or None if data provided)
                 - mime_type: MIME type of the image
                 - generation_time_ms: Time taken to generate in milliseconds
@@ -253,41 +253,20 @@ CRITICAL RULES:
             logger.info(f"[RESPONSE] 이미지 생성 완료")
 
             # Extract image from response
-            image_data = None
-            mime_type = "image/png"
-
-            for part in response.candidates[0].content.parts:
-                if hasattr(part, 'inline_data') and part.inline_data:
-                    raw_data = part.inline_data.data
-                    mime_type = part.inline_data.mime_type or "image/png"
-
-                    if isinstance(raw_data, bytes):
-                        # Check if raw_data is actual binary or base64-encoded bytes
-                        # JPEG starts with FF D8, PNG starts with 89 50 4E 47
-                        if raw_data[:2] == b'\xff\xd8' or raw_data[:4] == b'\x89PNG':
-                            # Actual binary image data - encode to base64
-                            image_data = base64.b64encode(raw_data).decode("utf-8")
-                        else:
-                            # Likely base64 string as bytes - just decode to string
-                            image_data = raw_data.decode("utf-8")
-                    else:
-                        # Already a string (base64)
-                        image_data = raw_data
-                    break
-
-            if not image_data:
+            image = first_inline_image(response.candidates[0].content.parts)
+            if not image:
                 logger.error("No images in response")
                 raise Exception("No images generated")
 
-            logger.info(f"Image data length: {len(image_data)}")
+            logger.info(f"Image data length: {len(image)}")
 
             generation_time_ms = int((time.time() - start_time) * 1000)
             logger.info(f"Image generation completed in {generation_time_ms}ms")
 
             return {
-                "image_data": image_data,
+                "image_data": image,
                 "image_url": None,
-                "mime_type": mime_type,
+                "mime_type": image.mime_type,
                 "generation_time_ms": generation_time_ms,
             }
 
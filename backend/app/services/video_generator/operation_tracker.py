@@ -0,0 +1,263 @@
+"""
+Shared Long-Running Operation Tracker for Video Generation.
+
+Veo generations are long-running operations that must be polled until done.
+Instead of one polling loop per request, a single background task polls every
+outstanding operation in one worker thread per tick and resolves the futures
+of anyone awaiting them.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrackedOperation:
+    """State for a single tracked operation."""
+
+    operation_id: str
+    operation: Any
+    expected_seconds: float
+    submitted_at: float
+    next_poll_at: float
+    poll_count: int = 0
+    done: bool = False
+    finished_at: Optional[float] = None
+    error: Optional[BaseException] = None
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+
+class OperationTracker:
+    """
+    Polls all outstanding operations from one background task.
+
+    Poll timing adapts to the expected render time: polls are sparse while
+    an operation is far from its expected completion, dense around it, and
+    back off again once the operation is overdue.
+    """
+
+    def __init__(
+        self,
+        poll_operation: Callable[[Any], Any],
+        min_poll_interval: float = 5.0,
+        max_poll_interval: float = 30.0,
+        overdue_backoff: float = 0.25,
+        max_track_seconds: float = 1800.0,
+        finished_retention_seconds: float = 3600.0,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            poll_operation: Blocking function returning the refreshed operation.
+                Called from a worker thread.
+            min_poll_interval: Shortest delay between polls of one operation.
+            max_poll_interval: Longest delay between polls of one operation.
+            overdue_backoff: Seconds of extra delay per second overdue.
+            max_track_seconds: Stop polling operations older than this.
+            finished_retention_seconds: Keep finished operations for status lookups this long.
+        """
+        self._poll_operation = poll_operation
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.overdue_backoff = overdue_backoff
+        self.max_track_seconds = max_track_seconds
+        self.finished_retention_seconds = finished_retention_seconds
+
+        self._operations: Dict[str, TrackedOperation] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.polls_issued = 0
+        self.poll_batches = 0
+
+    @property
+    def outstanding(self) -> int:
+        """Number of operations still being polled."""
+        return sum(1 for t in self._operations.values() if not t.done)
+
+    def _next_delay(self, tracked: TrackedOperation, now: float) -> float:
+        remaining = tracked.expected_seconds - (now - tracked.submitted_at)
+        if remaining > self.min_poll_interval:
+            return max(self.min_poll_interval, remaining / 2)
+        overdue = max(0.0, -remaining)
+        return min(self.max_poll_interval, self.min_poll_interval + overdue * self.overdue_backoff)
+
+    def track(self, operation: Any, expected_seconds: float = 90.0) -> str:
+        """
+        Start tracking an operation.
+
+        Args:
+            operation: Operation returned by the generation call
+            expected_seconds: Expected time until the operation completes
+
+        Returns:
+            Operation ID used for wait() and get()
+        """
+        self._prune_finished()
+
+        now = time.monotonic()
+        operation_id = str(uuid.uuid4())
+        tracked = TrackedOperation(
+            operation_id=operation_id,
+            operation=operation,
+            expected_seconds=expected_seconds,
+            submitted_at=now,
+            next_poll_at=now,
+        )
+        tracked.next_poll_at = now + self._next_delay(tracked, now)
+
+        if getattr(operation, "done", False):
+            tracked.done = True
+            tracked.finished_at = now
+
+        self._operations[operation_id] = tracked
+        self._ensure_running()
+        return operation_id
+
+    async def wait(self, operation_id: str, timeout_seconds: float = 300.0) -> Any:
+        """
+        Wait for an operation to finish.
+
+        Tracking continues in the background after a timeout, so a later
+        get() can still return the finished operation.
+
+        Args:
+            operation_id: ID returned by track()
+            timeout_seconds: Maximum time to wait
+
+        Returns:
+            The latest operation snapshot (check ``operation.done``)
+
+        Raises:
+            KeyError: If the operation is not tracked
+            Exception: The polling error, if polling the operation failed
+        """
+        tracked = self._operations[operation_id]
+        if tracked.done:
+            if tracked.error:
+                raise tracked.error
+            return tracked.operation
+
+        future = asyncio.get_running_loop().create_future()
+        tracked.waiters.append(future)
+        self._ensure_running()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.info(f"Operation {operation_id} not done after {timeout_seconds}s, still tracking")
+            return tracked.operation
+        finally:
+            if future in tracked.waiters:
+                tracked.waiters.remove(future)
+
+    def get(self, operation_id: str) -> Optional[Any]:
+        """Get the latest snapshot of a tracked operation without polling."""
+        tracked = self._operations.get(operation_id)
+        return tracked.operation if tracked else None
+
+    def forget(self, operation_id: str) -> None:
+        """Stop tracking an operation."""
+        self._operations.pop(operation_id, None)
+
+    def _prune_finished(self) -> None:
+        now = time.monotonic()
+        expired = [
+            op_id for op_id, t in self._operations.items()
+            if t.done and t.finished_at is not None
+            and now - t.finished_at > self.finished_retention_seconds
+        ]
+        for op_id in expired:
+            del self._operations[op_id]
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    def _poll_batch(self, operations: List[Any]) -> List[Any]:
+        """Poll a batch of operations in one worker thread."""
+        results = []
+        for operation in operations:
+            try:
+                results.append(self._poll_operation(operation))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _finish(self, tracked: TrackedOperation, now: float) -> None:
+        tracked.done = True
+        tracked.finished_at = now
+        for future in tracked.waiters:
+            if future.done():
+                continue
+            if tracked.error:
+                future.set_exception(tracked.error)
+            else:
+                future.set_result(tracked.operation)
+
+    async def _run(self) -> None:
+        """Background polling loop; exits when nothing is outstanding."""
+        while True:
+            now = time.monotonic()
+
+            # Resolve waiters of operations that finished before they waited
+            for tracked in self._operations.values():
+                if tracked.done and tracked.waiters:
+                    self._finish(tracked, tracked.finished_at or now)
+
+            pending = [t for t in self._operations.values() if not t.done]
+            if not pending:
+                return
+
+            due = [t for t in pending if t.next_poll_at <= now]
+            if due:
+                self.poll_batches += 1
+                self.polls_issued += len(due)
+                results = await asyncio.to_thread(self._poll_batch, [t.operation for t in due])
+                now = time.monotonic()
+
+                for tracked, result in zip(due, results):
+                    tracked.poll_count += 1
+                    if isinstance(result, Exception):
+                        logger.error(f"Polling operation {tracked.operation_id} failed: {result}")
+                        tracked.error = result
+                        self._finish(tracked, now)
+                        continue
+
+                    tracked.operation = result
+                    if getattr(result, "done", False):
+                        logger.info(
+                            f"Operation {tracked.operation_id} done after "
+                            f"{now - tracked.submitted_at:.0f}s ({tracked.poll_count} polls)"
+                        )
+                        self._finish(tracked, now)
+                    elif now - tracked.submitted_at > self.max_track_seconds:
+                        logger.warning(f"Operation {tracked.operation_id} exceeded tracking limit, giving up")
+                        self._finish(tracked, now)
+                    else:
+                        tracked.next_poll_at = now + self._next_delay(tracked, now)
+
+                continue
+
+            sleep_for = max(0.0, min(t.next_poll_at for t in pending) - now)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+
+__all__ = [
+    "OperationTracker",
+    "TrackedOperation",
+]
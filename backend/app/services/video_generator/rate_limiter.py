@@ -0,0 +1,119 @@
+"""
+Token Bucket Rate Limiter for Video Generation APIs.
+
+Limits both the rate of submitted generation requests (requests per minute)
+and the number of long-running operations in flight at the same time.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket rate limiter with an in-flight operation cap.
+
+    Tokens refill continuously at ``requests_per_minute / 60`` per second up to
+    ``burst`` tokens. Each submitted request consumes one token, and at most
+    ``max_in_flight`` operations may hold a slot at the same time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        max_in_flight: int,
+        burst: int = 1,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Sustained request rate. Values <= 0 disable rate limiting.
+            max_in_flight: Maximum number of concurrent operations.
+            burst: Maximum number of requests that may be sent back to back.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.requests_per_minute = requests_per_minute
+        self.max_in_flight = max_in_flight
+        self.burst = max(1, burst)
+
+        self._rate_per_second = requests_per_minute / 60.0
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._in_flight_count = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of operations currently holding a slot."""
+        return self._in_flight_count
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self._rate_per_second)
+
+    async def acquire(self) -> None:
+        """Wait until a request token is available and consume it."""
+        if self._rate_per_second <= 0:
+            return
+
+        while True:
+            async with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self._rate_per_second
+
+            logger.debug(f"Rate limit reached, waiting {wait_seconds:.2f}s for next token")
+            await asyncio.sleep(wait_seconds)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold an in-flight slot for the duration of an operation.
+
+        The in-flight slot is taken before the request token so that queued
+        operations do not consume tokens they cannot use yet.
+        """
+        async with self._in_flight:
+            await self.acquire()
+            self._in_flight_count += 1
+            try:
+                yield
+            finally:
+                self._in_flight_count -= 1
+
+
+# Shared limiter for all Veo requests in this process
+_veo_rate_limiter: Optional[TokenBucketRateLimiter] = None
+
+
+def get_veo_rate_limiter() -> TokenBucketRateLimiter:
+    """Get or create the process-wide Veo rate limiter."""
+    global _veo_rate_limiter
+    if _veo_rate_limiter is None:
+        _veo_rate_limiter = TokenBucketRateLimiter(
+            requests_per_minute=settings.VEO_REQUESTS_PER_MINUTE,
+            max_in_flight=settings.VEO_MAX_IN_FLIGHT,
+            burst=settings.VEO_RATE_LIMIT_BURST,
+        )
+    return _veo_rate_limiter
+
+
+__all__ = [
+    "TokenBucketRateLimiter",
+    "get_veo_rate_limiter",
+]
@@ -0,0 +1,232 @@
+"""
+Render Progress Tracking for FFmpeg Jobs.
+
+Parses ffmpeg's machine-readable ``-progress`` output and aggregates it into
+a per-project progress snapshot (percent, fps, speed) that API endpoints can
+poll or stream while a concatenation runs.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Terminal render statuses
+FINISHED_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class FFmpegProgress:
+    """One progress report of a running ffmpeg process."""
+
+    out_time_seconds: float = 0.0
+    frame: Optional[int] = None
+    fps: Optional[float] = None
+    speed: Optional[float] = None
+    done: bool = False
+
+
+class FFmpegProgressParser:
+    """
+    Incremental parser for ``ffmpeg -progress`` output.
+
+    ffmpeg writes ``key=value`` lines and ends every report with a
+    ``progress=continue`` or ``progress=end`` line.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, str] = {}
+
+    def feed(self, line: str) -> Optional[FFmpegProgress]:
+        """
+        Consume one output line.
+
+        Args:
+            line: A single line of ffmpeg progress output.
+
+        Returns:
+            FFmpegProgress when the line completes a report, otherwise None.
+        """
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+
+        if key != "progress":
+            self._values[key] = value.strip()
+            return None
+
+        values, self._values = self._values, {}
+        return FFmpegProgress(
+            out_time_seconds=self._out_time(values),
+            frame=self._number(values.get("frame"), int),
+            fps=self._number(values.get("fps"), float),
+            speed=self._number(values.get("speed", "").rstrip("x"), float),
+            done=value.strip() == "end",
+        )
+
+    @classmethod
+    def _out_time(cls, values: Dict[str, str]) -> float:
+        # out_time_ms is in microseconds as well (long-standing ffmpeg quirk)
+        for key in ("out_time_us", "out_time_ms"):
+            micros = cls._number(values.get(key), int)
+            if micros is not None:
+                return max(0.0, micros / 1_000_000)
+        return 0.0
+
+    @staticmethod
+    def _number(value: Optional[str], cast):
+        if value is None or value in ("", "N/A"):
+            return None
+        try:
+            return cast(value)
+        except ValueError:
+            return None
+
+
+@dataclass
+class RenderProgress:
+    """
+    Aggregated progress of one render (e.g. a project concatenation).
+
+    Work is registered as units with an expected output duration and a
+    weight; percent complete is the weighted share of output time produced.
+    """
+
+    key: str
+    status: str = "running"  # running, completed, failed
+    stage: str = "preparing"  # preparing, downloading, rendering, joining
+    percent: float = 0.0
+    fps: Optional[float] = None
+    speed: Optional[float] = None
+    error_message: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    # unit_id -> (expected_seconds, weight, out_time_seconds)
+    _units: Dict[str, Tuple[float, float, float]] = field(default_factory=dict, repr=False)
+    # unit_id -> (fps, speed) of running units
+    _rates: Dict[str, Tuple[Optional[float], Optional[float]]] = field(default_factory=dict, repr=False)
+
+    def set_stage(self, stage: str) -> None:
+        """Move to a new stage of the render."""
+        self.stage = stage
+        self.updated_at = time.time()
+
+    def add_work(self, unit_id: str, expected_seconds: float, weight: float = 1.0) -> None:
+        """Register a unit of ffmpeg work before it starts."""
+        self._units[unit_id] = (max(expected_seconds, 0.001), weight, 0.0)
+        self._recompute()
+
+    def update(self, unit_id: str, progress: FFmpegProgress) -> None:
+        """Record a progress report of a running unit."""
+        expected, weight, _ = self._units.get(unit_id, (progress.out_time_seconds or 0.001, 1.0, 0.0))
+        out_time = expected if progress.done else min(progress.out_time_seconds, expected)
+        self._units[unit_id] = (expected, weight, out_time)
+
+        if progress.done:
+            self._rates.pop(unit_id, None)
+        else:
+            self._rates[unit_id] = (progress.fps, progress.speed)
+        self._recompute()
+
+    def complete_work(self, unit_id: str) -> None:
+        """Mark a unit as fully done (e.g. served from cache)."""
+        if unit_id in self._units:
+            expected, weight, _ = self._units[unit_id]
+            self._units[unit_id] = (expected, weight, expected)
+        self._rates.pop(unit_id, None)
+        self._recompute()
+
+    def finish(self, success: bool, error_message: Optional[str] = None) -> None:
+        """Mark the render as finished."""
+        self.status = "completed" if success else "failed"
+        self.error_message = error_message
+        if success:
+            self.percent = 100.0
+        self.fps = None
+        self.speed = None
+        self._rates.clear()
+        self.finished_at = self.updated_at = time.time()
+
+    def _recompute(self) -> None:
+        total = sum(expected * weight for expected, weight, _ in self._units.values())
+        done = sum(out_time * weight for _, weight, out_time in self._units.values())
+        self.percent = round(min(100.0, 100.0 * done / total), 1) if total else 0.0
+
+        fps_values = [fps for fps, _ in self._rates.values() if fps is not None]
+        speed_values = [speed for _, speed in self._rates.values() if speed is not None]
+        self.fps = round(sum(fps_values), 2) if fps_values else None
+        self.speed = round(sum(speed_values), 2) if speed_values else None
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict:
+        """Public snapshot of the progress."""
+        return {
+            "status": self.status,
+            "stage": self.stage,
+            "percent": self.percent,
+            "fps": self.fps,
+            "speed": self.speed,
+            "error_message": self.error_message,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class RenderProgressRegistry:
+    """In-process registry of render progress keyed by project ID."""
+
+    def __init__(self, finished_retention_seconds: float = 600):
+        """
+        Initialize the registry.
+
+        Args:
+            finished_retention_seconds: How long finished renders stay queryable.
+        """
+        self.finished_retention_seconds = finished_retention_seconds
+        self._renders: Dict[str, RenderProgress] = {}
+
+    def start(self, key: str) -> RenderProgress:
+        """Begin tracking a new render, replacing any previous one for the key."""
+        self._evict_finished()
+        progress = RenderProgress(key=key)
+        self._renders[key] = progress
+        return progress
+
+    def get(self, key: str) -> Optional[RenderProgress]:
+        """Get the latest render progress for a key."""
+        self._evict_finished()
+        return self._renders.get(key)
+
+    def _evict_finished(self) -> None:
+        cutoff = time.time() - self.finished_retention_seconds
+        for key in [
+            k for k, p in self._renders.items()
+            if p.finished_at is not None and p.finished_at < cutoff
+        ]:
+            del self._renders[key]
+
+
+# Singleton instance
+_registry: Optional[RenderProgressRegistry] = None
+
+
+def get_render_progress_registry() -> RenderProgressRegistry:
+    """Get or create the process-wide render progress registry."""
+    global _registry
+    if _registry is None:
+        _registry = RenderProgressRegistry()
+    return _registry
+
+
+__all__ = [
+    "FFmpegProgress",
+    "FFmpegProgressParser",
+    "RenderProgress",
+    "RenderProgressRegistry",
+    "get_render_progress_registry",
+    "FINISHED_STATUSES",
+]
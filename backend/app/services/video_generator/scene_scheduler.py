@@ -0,0 +1,227 @@
+"""
+Concurrent Scene Video Scheduler.
+
+Submits per-scene video generations concurrently under a shared rate limiter,
+so the wall-clock time of a storyboard approaches its slowest scene instead of
+the sum of all scenes.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from app.services.video_generator.prompt_builder import create_prompt_builder
+from app.services.video_generator.rate_limiter import TokenBucketRateLimiter
+from app.services.video_generator.video_generator_service import (
+    SceneInput,
+    SceneVideoResult,
+    VideoGenerationResult,
+    VideoGeneratorBase,
+)
+
+logger = logging.getLogger(__name__)
+
+# Called with each scene result as soon as that scene finishes
+SceneResultCallback = Callable[[SceneVideoResult], Awaitable[None]]
+
+
+class SceneScheduler:
+    """
+    Schedules per-scene video generation for a video generator.
+
+    Each scene is generated with the generator's ``generate_from_image`` or
+    ``generate_from_prompt`` while holding a rate limiter slot. Scene failures
+    are isolated and reported per scene.
+    """
+
+    def __init__(self, rate_limiter: Optional[TokenBucketRateLimiter] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate_limiter: Optional shared limiter. When omitted, all scenes are
+                submitted at once.
+        """
+        self.rate_limiter = rate_limiter
+
+    async def generate(
+        self,
+        generator: VideoGeneratorBase,
+        scenes: List[SceneInput],
+        brand_context: Optional[str] = None,
+        aspect_ratio: str = "16:9",
+        on_scene_result: Optional[SceneResultCallback] = None,
+    ) -> VideoGenerationResult:
+        """
+        Generate videos for all scenes concurrently.
+
+        Args:
+            generator: Video generator used for each scene
+            scenes: List of scene inputs with descriptions and images
+            brand_context: Optional brand context for prompt building
+            aspect_ratio: Video aspect ratio
+            on_scene_result: Optional callback invoked as each scene finishes
+
+        Returns:
+            VideoGenerationResult with scene_results in storyboard order
+        """
+        start_time = time.time()
+
+        if not scenes:
+            return VideoGenerationResult(
+                status="failed",
+                error_message="No scenes provided",
+                generation_time_ms=0,
+            )
+
+        prompt_builder = create_prompt_builder(storyboard_priority=True)
+
+        async def run_scene(scene: SceneInput) -> SceneVideoResult:
+            scene_result = await self._generate_scene(
+                generator, prompt_builder, scene, brand_context, aspect_ratio
+            )
+            if on_scene_result is not None:
+                try:
+                    await on_scene_result(scene_result)
+                except Exception as e:
+                    logger.error(f"Scene {scene.scene_number} result callback failed: {str(e)}")
+            return scene_result
+
+        scene_results: List[SceneVideoResult] = await asyncio.gather(*[
+            run_scene(scene) for scene in scenes
+        ])
+
+        completed_count = sum(1 for r in scene_results if r.status == "completed")
+        failed_count = sum(1 for r in scene_results if r.status == "failed")
+        total_generation_time = int((time.time() - start_time) * 1000)
+
+        if completed_count == len(scenes):
+            overall_status = "completed"
+        elif completed_count > 0:
+            overall_status = "partial"
+        elif any(r.status == "processing" for r in scene_results):
+            overall_status = "processing"
+        else:
+            overall_status = "failed"
+
+        total_duration = sum(
+            r.duration_seconds or 0
+            for r in scene_results
+            if r.status == "completed" and r.duration_seconds
+        )
+
+        logger.info(
+            f"Per-scene generation complete: {completed_count}/{len(scenes)} succeeded, "
+            f"{failed_count} failed, total time: {total_generation_time}ms"
+        )
+
+        return VideoGenerationResult(
+            status=overall_status,
+            scene_results=scene_results,
+            duration_seconds=total_duration,
+            generation_time_ms=total_generation_time,
+            error_message=f"{failed_count} scene(s) failed" if failed_count > 0 else None,
+        )
+
+    async def _generate_scene(
+        self,
+        generator: VideoGeneratorBase,
+        prompt_builder,
+        scene: SceneInput,
+        brand_context: Optional[str],
+        aspect_ratio: str,
+    ) -> SceneVideoResult:
+        """Generate a single scene, never raising."""
+        prompt = None
+        scene_start_time = time.time()
+
+        try:
+            prompt = prompt_builder.build_scene_prompt(
+                scene=scene,
+                brand_context=brand_context,
+            )
+
+            # Respect Veo 4-8 second limit per scene
+            scene_duration = int(scene.duration_seconds) if scene.duration_seconds else 6
+            scene_duration = max(4, min(8, scene_duration))
+
+            if self.rate_limiter is not None:
+                async with self.rate_limiter.slot():
+                    scene_start_time = time.time()
+                    result = await self._submit(generator, scene, prompt, scene_duration, aspect_ratio)
+            else:
+                result = await self._submit(generator, scene, prompt, scene_duration, aspect_ratio)
+
+            scene_generation_time = int((time.time() - scene_start_time) * 1000)
+
+            if result.status == "completed":
+                logger.info(f"Scene {scene.scene_number} completed successfully: {result.video_url}")
+                return SceneVideoResult(
+                    scene_number=scene.scene_number,
+                    status="completed",
+                    video_url=result.video_url,
+                    duration_seconds=result.duration_seconds or scene_duration,
+                    generation_time_ms=scene_generation_time,
+                    prompt_used=prompt,
+                )
+            elif result.status == "processing":
+                logger.info(f"Scene {scene.scene_number} still processing: {result.operation_id}")
+                return SceneVideoResult(
+                    scene_number=scene.scene_number,
+                    status="processing",
+                    operation_id=result.operation_id,
+                    generation_time_ms=scene_generation_time,
+                    prompt_used=prompt,
+                )
+            else:
+                logger.error(f"Scene {scene.scene_number} failed: {result.error_message}")
+                return SceneVideoResult(
+                    scene_number=scene.scene_number,
+                    status="failed",
+                    error_message=result.error_message,
+                    generation_time_ms=scene_generation_time,
+                    prompt_used=prompt,
+                )
+
+        except Exception as e:
+            # Handle unexpected errors gracefully - don't stop other scenes
+            logger.error(f"Scene {scene.scene_number} unexpected error: {str(e)}", exc_info=True)
+            return SceneVideoResult(
+                scene_number=scene.scene_number,
+                status="failed",
+                error_message=str(e),
+                generation_time_ms=int((time.time() - scene_start_time) * 1000),
+                prompt_used=prompt,
+            )
+
+    async def _submit(
+        self,
+        generator: VideoGeneratorBase,
+        scene: SceneInput,
+        prompt: str,
+        duration_seconds: int,
+        aspect_ratio: str,
+    ) -> VideoGenerationResult:
+        """Choose generation method based on image availability."""
+        if scene.image_data:
+            logger.info(f"Scene {scene.scene_number}: Using image-to-video generation")
+            return await generator.generate_from_image(
+                image_data=scene.image_data,
+                prompt=prompt,
+                duration_seconds=duration_seconds,
+                aspect_ratio=aspect_ratio,
+            )
+
+        logger.info(f"Scene {scene.scene_number}: Using text-to-video generation")
+        return await generator.generate_from_prompt(
+            prompt=prompt,
+            duration_seconds=duration_seconds,
+            aspect_ratio=aspect_ratio,
+        )
+
+
+__all__ = [
+    "SceneScheduler",
+    "SceneResultCallback",
+]
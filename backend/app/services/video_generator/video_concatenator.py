@@ -6,6 +6,7 @@ Supports downloading videos from remote URLs and applying transition effects.
 """
 
 import asyncio
+import hashlib
 import logging
 import os
 import shutil
@@ -14,12 +15,19 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import aiofiles
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.services.video_generator.ffmpeg_limiter import FFmpegLimiter, get_ffmpeg_limiter
+from app.services.video_generator.render_progress import (
+    FFmpegProgress,
+    FFmpegProgressParser,
+    RenderProgress,
+)
 
 # Video output directory (same as video generator service)
 VIDEO_OUTPUT_DIR = Path(settings.UPLOAD_DIR) / "videos"
@@ -27,6 +35,55 @@ VIDEO_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 logger = logging.getLogger(__name__)
 
+# Cached transition/body segments (reused across renders)
+SEGMENT_CACHE_DIR = Path(settings.TEMP_DIR) / "concat_segments"
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """Encoder settings for re-encoded output (transitions)."""
+
+    name: str
+    preset: str
+    crf: int
+    audio_bitrate: str
+
+    def video_args(self) -> List[str]:
+        """FFmpeg video encoder options for this profile."""
+        return [
+            "-c:v",
+            "libx264",
+            "-preset",
+            self.preset,
+            "-crf",
+            str(self.crf),
+            "-pix_fmt",
+            "yuv420p",
+        ]
+
+    def encode_args(self) -> List[str]:
+        """FFmpeg output options (video and audio) for this profile."""
+        return [
+            *self.video_args(),
+            "-c:a",
+            "aac",
+            "-b:a",
+            self.audio_bitrate,
+            "-ar",
+            "48000",
+            "-ac",
+            "2",
+        ]
+
+
+# Named encoding profiles selectable per concatenation request
+ENCODING_PROFILES: Dict[str, EncodingProfile] = {
+    "fast-preview": EncodingProfile(name="fast-preview", preset="ultrafast", crf=30, audio_bitrate="128k"),
+    "balanced": EncodingProfile(name="balanced", preset="fast", crf=23, audio_bitrate="192k"),
+    "final": EncodingProfile(name="final", preset="slow", crf=18, audio_bitrate="192k"),
+}
+DEFAULT_ENCODING_PROFILE = "balanced"
+
 
 # Transition effect mappings for FFmpeg xfade filter
 TRANSITION_EFFECTS: Dict[str, Optional[str]] = {
@@ -104,6 +161,7 @@ class VideoConcatenator:
     Uses FFmpeg for video processing, supporting:
     - Simple concatenation (cut between scenes)
     - Transition effects (fade, dissolve, wipe, slide, etc.)
+    - Incremental re-rendering from cached transition segments
     - Downloading videos from remote URLs
     - Async file operations
     """
@@ -111,12 +169,20 @@ class VideoConcatenator:
     # HTTP client timeout settings
     DOWNLOAD_TIMEOUT = 120.0  # seconds
     DOWNLOAD_CHUNK_SIZE = 8192  # bytes
+    DOWNLOAD_CONCURRENCY = 4  # scene clips fetched at the same time
+    SEGMENT_CACHE_MAX_BYTES = 5 * 1024 * 1024 * 1024  # 5 GB
+    SEGMENT_RENDER_ROUNDS = 3  # Re-renders of segments pruned by concurrent renders
+    STALL_TIMEOUT_SECONDS = 120.0  # kill ffmpeg when its output time stops advancing
+    JOIN_PROGRESS_WEIGHT = 0.05  # stream-copy joins are much faster than encoding
 
     def __init__(
         self,
         output_dir: Optional[str] = None,
         ffmpeg_path: str = "ffmpeg",
         ffprobe_path: str = "ffprobe",
+        segment_cache_dir: Optional[str] = None,
+        ffmpeg_limiter: Optional[FFmpegLimiter] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initialize the video concatenator.
@@ -125,99 +191,151 @@ class VideoConcatenator:
             output_dir: Directory for output videos. Defaults to VIDEO_OUTPUT_DIR.
             ffmpeg_path: Path to FFmpeg executable. Defaults to "ffmpeg".
             ffprobe_path: Path to FFprobe executable. Defaults to "ffprobe".
+            segment_cache_dir: Directory for cached transition segments. Defaults to SEGMENT_CACHE_DIR.
+            ffmpeg_limiter: Limiter for ffmpeg processes. Defaults to the process-wide limiter.
+            http_client: HTTP client for clip downloads. Defaults to the shared pooled client.
         """
         self.output_dir = Path(output_dir) if output_dir else VIDEO_OUTPUT_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.ffmpeg_path = ffmpeg_path
         self.ffprobe_path = ffprobe_path
-        self._temp_dir: Optional[Path] = None
+        self.segment_cache_dir = Path(segment_cache_dir) if segment_cache_dir else SEGMENT_CACHE_DIR
+        self.ffmpeg_limiter = ffmpeg_limiter or get_ffmpeg_limiter()
+        self.http_client = http_client
+        self._digest_memo: Dict[Tuple[str, int, int], str] = {}
         logger.info(
             f"VideoConcatenator initialized - output_dir: {self.output_dir}, "
             f"ffmpeg: {self.ffmpeg_path}"
         )
 
-    async def download_video(self, url: str, destination: str) -> bool:
+    async def download_video(
+        self,
+        url: str,
+        destination: str,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> bool:
         """
         Download a video from URL to local path.
 
         Args:
             url: URL of the video to download.
             destination: Local file path to save the video.
+            client: HTTP client to use. Defaults to the concatenator's client.
 
         Returns:
             True if download succeeded, False otherwise.
         """
         logger.info(f"Downloading video from {url} to {destination}")
 
+        # Local sources (file://, plain paths, localhost uploads) are linked, not copied
+        local_source = self.resolve_local_path(url)
+        if local_source is not None:
+            return await self._link_or_copy(local_source, destination)
+
+        # Download from remote URL using httpx
+        try:
+            await self._stream_to_file(client or self.http_client or get_http_client(), url, destination)
+
+            file_size = os.path.getsize(destination)
+            logger.info(f"Downloaded video successfully - size: {file_size} bytes")
+            return True
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error downloading video: {e.response.status_code} - {url}")
+            return False
+        except httpx.RequestError as e:
+            logger.error(f"Request error downloading video: {e} - {url}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error downloading video: {e} - {url}")
+            return False
+
+    def resolve_local_path(self, url: str) -> Optional[str]:
+        """
+        Map a video URL to an existing local file, if it refers to one.
+
+        Handles file:// URLs, plain local paths and localhost URLs served
+        from the uploads directory.
+
+        Args:
+            url: URL or path of the video.
+
+        Returns:
+            Local file path, or None if the video must be downloaded.
+        """
         # Handle local file paths (file:// or absolute paths)
         if url.startswith("file://"):
             local_source = url[7:]  # Remove file:// prefix
-            try:
-                shutil.copy2(local_source, destination)
-                logger.info(f"Copied local file from {local_source}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to copy local file: {e}")
-                return False
+            return local_source if os.path.isfile(local_source) else None
 
         # Handle local paths without file:// prefix
-        if os.path.exists(url):
-            try:
-                shutil.copy2(url, destination)
-                logger.info(f"Copied local file from {url}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to copy local file: {e}")
-                return False
+        if os.path.isfile(url):
+            return url
 
         # Handle localhost URLs (local server)
+        # e.g., http://localhost:8000/uploads/videos/video_abc.mp4
         if "localhost" in url or "127.0.0.1" in url:
-            # Extract the file path from localhost URL
-            # e.g., http://localhost:8000/uploads/videos/video_abc.mp4
             try:
                 from urllib.parse import urlparse
 
-                parsed = urlparse(url)
                 # Remove leading slash and construct local path
-                local_path = parsed.path.lstrip("/")
+                local_path = urlparse(url).path.lstrip("/")
                 # Check if it's in uploads directory
                 if local_path.startswith("uploads"):
                     full_local_path = Path(settings.UPLOAD_DIR).parent / local_path
-                    if full_local_path.exists():
-                        shutil.copy2(str(full_local_path), destination)
-                        logger.info(f"Copied from localhost path: {full_local_path}")
-                        return True
+                    if full_local_path.is_file():
+                        return str(full_local_path)
             except Exception as e:
                 logger.warning(f"Failed to handle localhost URL as local file: {e}")
-                # Fall through to HTTP download
 
-        # Download from remote URL using httpx
-        try:
-            async with httpx.AsyncClient(timeout=self.DOWNLOAD_TIMEOUT) as client:
-                async with client.stream("GET", url) as response:
-                    response.raise_for_status()
+        return None
 
-                    # Write to file in chunks
-                    async with aiofiles.open(destination, "wb") as f:
-                        async for chunk in response.aiter_bytes(
-                            chunk_size=self.DOWNLOAD_CHUNK_SIZE
-                        ):
-                            await f.write(chunk)
+    async def _link_or_copy(self, source: str, destination: str) -> bool:
+        """
+        Place a local file at destination without copying its data when possible.
 
-            file_size = os.path.getsize(destination)
-            logger.info(f"Downloaded video successfully - size: {file_size} bytes")
+        Uses a hardlink when source and destination are on the same
+        filesystem, and falls back to a copy in a worker thread otherwise.
+
+        Args:
+            source: Existing local file.
+            destination: Path to create.
+
+        Returns:
+            True if the file is available at destination, False otherwise.
+        """
+        try:
+            os.link(source, destination)
+            logger.info(f"Hardlinked local file from {source}")
             return True
+        except OSError as e:
+            logger.debug(f"Hardlink not possible for {source} ({e}), copying instead")
 
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error downloading video: {e.response.status_code} - {url}")
-            return False
-        except httpx.RequestError as e:
-            logger.error(f"Request error downloading video: {e} - {url}")
-            return False
+        try:
+            await asyncio.to_thread(shutil.copy2, source, destination)
+            logger.info(f"Copied local file from {source}")
+            return True
         except Exception as e:
-            logger.error(f"Unexpected error downloading video: {e} - {url}")
+            logger.error(f"Failed to copy local file: {e}")
             return False
 
+    async def _stream_to_file(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        destination: str,
+    ) -> None:
+        """Stream a remote file to disk in chunks."""
+        async with client.stream("GET", url, timeout=self.DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+
+            # Write to file in chunks
+            async with aiofiles.open(destination, "wb") as f:
+                async for chunk in response.aiter_bytes(
+                    chunk_size=self.DOWNLOAD_CHUNK_SIZE
+                ):
+                    await f.write(chunk)
+
     async def get_video_duration(self, video_path: str) -> Optional[float]:
         """
         Get the duration of a video file using ffprobe.
@@ -267,6 +385,8 @@ class VideoConcatenator:
         output_filename: Optional[str] = None,
         include_transitions: bool = True,
         transition_duration_ms: int = 500,
+        encoding_profile: str = DEFAULT_ENCODING_PROFILE,
+        progress: Optional[RenderProgress] = None,
     ) -> ConcatenationResult:
         """
         Concatenate multiple scene videos into a single video.
@@ -279,14 +399,40 @@ class VideoConcatenator:
             output_filename: Optional output filename. Auto-generated if not provided.
             include_transitions: Whether to apply transition effects. Default True.
             transition_duration_ms: Duration of transitions in milliseconds. Default 500.
+            encoding_profile: Name of the encoding profile used when re-encoding
+                (see ENCODING_PROFILES). Default "balanced".
+            progress: Optional progress tracker updated from ffmpeg's progress output.
 
         Returns:
             ConcatenationResult with output URL/path and metadata.
         """
+        result = await self._concatenate_scenes(
+            scene_videos,
+            output_filename,
+            include_transitions,
+            transition_duration_ms,
+            encoding_profile,
+            progress,
+        )
+        if progress is not None:
+            progress.finish(result.success, result.error_message)
+        return result
+
+    async def _concatenate_scenes(
+        self,
+        scene_videos: List[Dict],
+        output_filename: Optional[str],
+        include_transitions: bool,
+        transition_duration_ms: int,
+        encoding_profile: str,
+        progress: Optional[RenderProgress],
+    ) -> ConcatenationResult:
+        """Run the download and render stages of concatenate()."""
         start_time = time.time()
         logger.info(
             f"Starting concatenation of {len(scene_videos)} videos, "
-            f"transitions: {include_transitions}, duration: {transition_duration_ms}ms"
+            f"transitions: {include_transitions}, duration: {transition_duration_ms}ms, "
+            f"profile: {encoding_profile}"
         )
 
         # Validate input
@@ -297,60 +443,42 @@ class VideoConcatenator:
                 processing_time_ms=0,
             )
 
+        profile = ENCODING_PROFILES.get(encoding_profile)
+        if profile is None:
+            return ConcatenationResult(
+                success=False,
+                error_message=f"Unknown encoding profile: {encoding_profile}",
+                processing_time_ms=0,
+            )
+
         # Create temporary directory for processing
-        self._temp_dir = Path(tempfile.mkdtemp(prefix="video_concat_"))
-        logger.debug(f"Created temp directory: {self._temp_dir}")
+        temp_dir = Path(tempfile.mkdtemp(prefix="video_concat_"))
+        logger.debug(f"Created temp directory: {temp_dir}")
 
         try:
-            # Step 1: Download all videos to temp directory
-            local_videos: List[SceneVideo] = []
-            for i, scene in enumerate(scene_videos):
-                video_url = scene.get("video_url")
-                if not video_url:
-                    logger.warning(f"Scene {i} has no video_url, skipping")
-                    continue
-
-                local_filename = f"scene_{i:03d}.mp4"
-                local_path = self._temp_dir / local_filename
-
-                download_success = await self.download_video(
-                    video_url, str(local_path)
-                )
-
-                if not download_success:
-                    logger.error(f"Failed to download scene {i} from {video_url}")
-                    # Clean up and return error
-                    await self._cleanup_temp_dir()
-                    return ConcatenationResult(
-                        success=False,
-                        error_message=f"Failed to download video for scene {i}",
-                        processing_time_ms=int((time.time() - start_time) * 1000),
-                    )
+            # Step 1: Download all videos to temp directory concurrently.
+            # Durations are only needed to place xfade transitions.
+            probe_durations = include_transitions and len(scene_videos) > 1
+            if progress is not None:
+                progress.set_stage("downloading")
+            local_videos, failed_index = await self._download_scene_videos(
+                scene_videos, temp_dir, probe_durations
+            )
 
-                # Get video duration if not provided
-                duration = scene.get("duration_seconds")
-                if duration is None:
-                    duration = await self.get_video_duration(str(local_path))
-
-                local_videos.append(
-                    SceneVideo(
-                        video_url=video_url,
-                        transition_effect=scene.get("transition_effect"),
-                        duration_seconds=duration,
-                        local_path=str(local_path),
-                    )
+            if failed_index is not None:
+                return ConcatenationResult(
+                    success=False,
+                    error_message=f"Failed to download video for scene {failed_index}",
+                    processing_time_ms=int((time.time() - start_time) * 1000),
                 )
 
             if not local_videos:
-                await self._cleanup_temp_dir()
                 return ConcatenationResult(
                     success=False,
                     error_message="No valid videos to concatenate",
                     processing_time_ms=int((time.time() - start_time) * 1000),
                 )
 
-            logger.info(f"Downloaded {len(local_videos)} videos successfully")
-
             # Step 2: Choose concatenation method based on transitions
             if output_filename is None:
                 output_filename = f"final_{uuid.uuid4().hex[:12]}.mp4"
@@ -358,17 +486,22 @@ class VideoConcatenator:
             output_path = self.output_dir / output_filename
 
             if include_transitions and len(local_videos) > 1:
-                # Use xfade filter for transitions
-                success, error_msg = await self._concatenate_with_transitions(
+                # Use xfade transitions, re-encoding only segments that changed
+                success, error_msg = await self._concatenate_incremental(
                     local_videos,
                     str(output_path),
                     transition_duration_ms,
+                    temp_dir,
+                    profile,
+                    progress,
                 )
             else:
                 # Use simple concat demuxer (faster, no re-encoding)
                 success, error_msg = await self._concatenate_simple(
                     local_videos,
                     str(output_path),
+                    temp_dir,
+                    progress,
                 )
 
             # Step 3: Calculate results
@@ -423,12 +556,98 @@ class VideoConcatenator:
 
         finally:
             # Clean up temp directory
-            await self._cleanup_temp_dir()
+            await self._cleanup_temp_dir(temp_dir)
+
+    async def _download_scene_videos(
+        self,
+        scene_videos: List[Dict],
+        temp_dir: Path,
+        probe_durations: bool,
+    ) -> Tuple[List[SceneVideo], Optional[int]]:
+        """
+        Download all scene videos concurrently with a shared HTTP client.
+
+        At most DOWNLOAD_CONCURRENCY downloads run at once. Clips that are
+        already local are used in place. Each clip's duration is probed as soon
+        as its own download finishes, while other downloads continue. The first
+        failed download cancels the remaining ones.
+
+        Args:
+            scene_videos: Scene dicts as passed to concatenate().
+            temp_dir: Directory to download the clips into.
+            probe_durations: Whether to ffprobe clips missing duration_seconds.
+
+        Returns:
+            Tuple of (SceneVideo list in scene order, index of the first failed scene or None).
+        """
+        semaphore = asyncio.Semaphore(self.DOWNLOAD_CONCURRENCY)
+        client = self.http_client or get_http_client()
+
+        async def fetch(i: int, scene: Dict) -> Optional[SceneVideo]:
+            video_url = scene["video_url"]
+
+            # Local clips are read by ffmpeg in place, nothing is copied
+            local_path = self.resolve_local_path(video_url)
+            if local_path is None:
+                local_path = str(temp_dir / f"scene_{i:03d}.mp4")
+                async with semaphore:
+                    download_success = await self.download_video(
+                        video_url, local_path, client=client
+                    )
+                if not download_success:
+                    logger.error(f"Failed to download scene {i} from {video_url}")
+                    return None
+
+            # Get video duration if not provided
+            duration = scene.get("duration_seconds")
+            if duration is None and probe_durations:
+                duration = await self.get_video_duration(local_path)
+
+            return SceneVideo(
+                video_url=video_url,
+                transition_effect=scene.get("transition_effect"),
+                duration_seconds=duration,
+                local_path=local_path,
+            )
+
+        tasks: Dict[asyncio.Task, int] = {}
+        for i, scene in enumerate(scene_videos):
+            if not scene.get("video_url"):
+                logger.warning(f"Scene {i} has no video_url, skipping")
+                continue
+            tasks[asyncio.create_task(fetch(i, scene))] = i
+
+        results: Dict[int, SceneVideo] = {}
+        failed_index: Optional[int] = None
+        pending = set(tasks)
+        try:
+            while pending and failed_index is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    video = task.result()
+                    if video is None:
+                        index = tasks[task]
+                        failed_index = index if failed_index is None else min(failed_index, index)
+                    else:
+                        results[tasks[task]] = video
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if failed_index is not None:
+            return [], failed_index
+
+        logger.info(f"Downloaded {len(results)} videos successfully")
+        return [results[i] for i in sorted(results)], None
 
     async def _concatenate_simple(
         self,
         videos: List[SceneVideo],
         output_path: str,
+        temp_dir: Path,
+        progress: Optional[RenderProgress] = None,
     ) -> Tuple[bool, Optional[str]]:
         """
         Concatenate videos using FFmpeg concat demuxer (no transitions).
@@ -439,6 +658,8 @@ class VideoConcatenator:
         Args:
             videos: List of SceneVideo objects with local paths.
             output_path: Path for the output video.
+            temp_dir: Working directory for the concat file.
+            progress: Optional progress tracker.
 
         Returns:
             Tuple of (success, error_message).
@@ -447,7 +668,7 @@ class VideoConcatenator:
             return False, "No videos to concatenate"
 
         # Create concat file
-        concat_file_path = self._temp_dir / "concat.txt"
+        concat_file_path = temp_dir / "concat.txt"
         self._create_concat_file(
             [v.local_path for v in videos if v.local_path],
             str(concat_file_path),
@@ -468,13 +689,18 @@ class VideoConcatenator:
             output_path,
         ]
 
-        return await self._run_ffmpeg(args)
+        if progress is not None:
+            progress.set_stage("joining")
+            progress.add_work("join", sum(v.duration_seconds or 5.0 for v in videos))
+        return await self._run_ffmpeg(args, on_progress=self._progress_callback(progress, "join"))
 
     async def _concatenate_with_transitions(
         self,
         videos: List[SceneVideo],
         output_path: str,
         transition_duration_ms: int,
+        profile: EncodingProfile,
+        progress: Optional[RenderProgress] = None,
     ) -> Tuple[bool, Optional[str]]:
         """
         Concatenate videos with transition effects using xfade filter.
@@ -483,6 +709,8 @@ class VideoConcatenator:
             videos: List of SceneVideo objects with local paths.
             output_path: Path for the output video.
             transition_duration_ms: Duration of each transition in milliseconds.
+            profile: Encoding profile for the output.
+            progress: Optional progress tracker.
 
         Returns:
             Tuple of (success, error_message).
@@ -491,9 +719,10 @@ class VideoConcatenator:
             return False, "No videos to concatenate"
 
         if len(videos) == 1:
-            # Single video, just copy
-            shutil.copy2(videos[0].local_path, output_path)
-            return True, None
+            # Single video, just link or copy
+            if await self._link_or_copy(videos[0].local_path, output_path):
+                return True, None
+            return False, "Failed to copy single video to output"
 
         transition_duration = transition_duration_ms / 1000.0
 
@@ -566,21 +795,261 @@ class VideoConcatenator:
         args.extend(["-map", "[outv]", "-map", "[outa]"])
 
         # Output settings
-        args.extend([
-            "-c:v",
-            "libx264",
-            "-preset",
-            "fast",
-            "-crf",
-            "23",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "192k",
+        args.extend(profile.encode_args())
+        args.append(output_path)
+
+        if progress is not None:
+            progress.set_stage("rendering")
+            progress.add_work("render", cumulative_offset + (videos[-1].duration_seconds or 5.0))
+        return await self._run_ffmpeg(args, on_progress=self._progress_callback(progress, "render"))
+
+    async def _concatenate_incremental(
+        self,
+        videos: List[SceneVideo],
+        output_path: str,
+        transition_duration_ms: int,
+        temp_dir: Path,
+        profile: EncodingProfile,
+        progress: Optional[RenderProgress] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Concatenate videos with transitions from cached, independently encoded segments.
+
+        The output is split into a body segment per clip and a transition
+        segment per adjacent pair. Each segment is cached under a key derived
+        from the content hash of its clips, its render parameters and the
+        encoding profile, so after
+        a single scene changes only that scene's body and its two transitions
+        are re-encoded. The segments are then joined with a stream-copy concat.
+
+        Falls back to the single filter graph when a clip is too short to hold
+        its transitions.
+
+        Args:
+            videos: List of SceneVideo objects with local paths and durations.
+            output_path: Path for the output video.
+            transition_duration_ms: Duration of each transition in milliseconds.
+            temp_dir: Working directory for the concat file.
+            profile: Encoding profile for the segments.
+            progress: Optional progress tracker.
+
+        Returns:
+            Tuple of (success, error_message).
+        """
+        transition = transition_duration_ms / 1000.0
+        durations = [v.duration_seconds or 5.0 for v in videos]
+
+        if transition <= 0 or any(d < 2 * transition for d in durations):
+            logger.info("Clips too short for incremental transitions, rendering full filter graph")
+            return await self._concatenate_with_transitions(
+                videos, output_path, transition_duration_ms, profile, progress
+            )
+
+        self.segment_cache_dir.mkdir(parents=True, exist_ok=True)
+        digests = await asyncio.gather(*[self._file_digest(v.local_path) for v in videos])
+
+        # (cache key, ffmpeg input args, filter_complex, seconds) in output order
+        segments: List[Tuple[str, List[str], str, float]] = []
+        for i, video in enumerate(videos):
+            start = transition if i > 0 else 0.0
+            end = durations[i] - transition if i < len(videos) - 1 else durations[i]
+            segments.append((
+                self._segment_key(profile, "body", digests[i], f"{start:.3f}", f"{end:.3f}"),
+                ["-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", video.local_path],
+                "[0:v]null[outv];[0:a]anull[outa]",
+                end - start,
+            ))
+
+            if i < len(videos) - 1:
+                effect_name = video.transition_effect or "fade"
+                xfade_effect = TRANSITION_EFFECTS.get(effect_name) or "fade"
+                tail_start = durations[i] - transition
+                segments.append((
+                    self._segment_key(
+                        profile, "xfade", digests[i], digests[i + 1], xfade_effect,
+                        f"{tail_start:.3f}", f"{transition:.3f}",
+                    ),
+                    [
+                        "-ss", f"{tail_start:.3f}", "-t", f"{transition:.3f}", "-i", video.local_path,
+                        "-t", f"{transition:.3f}", "-i", videos[i + 1].local_path,
+                    ],
+                    f"[0:v][1:v]xfade=transition={xfade_effect}:duration={transition}:offset=0[outv];"
+                    f"[0:a][1:a]acrossfade=d={transition}[outa]",
+                    transition,
+                ))
+
+        # Render missing segments; identical segments are rendered once
+        missing: Dict[str, Tuple[List[str], str]] = {}
+        for key, input_args, filter_complex, seconds in segments:
+            if progress is not None:
+                progress.add_work(key, seconds)
+            # Touch cached hits now, so a concurrent render's prune keeps them
+            if not self._touch_segment(key):
+                missing.setdefault(key, (input_args, filter_complex))
+            elif progress is not None:
+                progress.complete_work(key)
+
+        output_seconds = sum(seconds for _, _, _, seconds in segments)
+        if progress is not None:
+            progress.add_work("join", output_seconds, weight=self.JOIN_PROGRESS_WEIGHT)
+            progress.set_stage("rendering")
+
+        logger.info(
+            f"Incremental concatenation: {len(segments)} segments, "
+            f"{len(segments) - len(missing)} cached, {len(missing)} to render"
+        )
+
+        for _ in range(self.SEGMENT_RENDER_ROUNDS):
+            # Concurrency is bounded by the process-wide ffmpeg limiter
+            results = await asyncio.gather(*[
+                self._render_segment(key, input_args, filter_complex, profile, progress)
+                for key, (input_args, filter_complex) in missing.items()
+            ])
+            for success, error_msg in results:
+                if not success:
+                    return False, error_msg
+
+            # Mark every segment as recently used before the join; one pruned
+            # by a concurrent render in the meantime is rendered again
+            missing = {
+                key: (input_args, filter_complex)
+                for key, input_args, filter_complex, _ in segments
+                if not self._touch_segment(key)
+            }
+            if not missing:
+                break
+        else:
+            return False, "Cached segments were pruned while rendering"
+
+        segment_paths = [str(self._segment_path(key)) for key, _, _, _ in segments]
+
+        concat_file_path = temp_dir / "segments.txt"
+        self._create_concat_file(segment_paths, str(concat_file_path))
+        if progress is not None:
+            progress.set_stage("joining")
+        success, error_msg = await self._run_ffmpeg([
+            self.ffmpeg_path,
+            "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(concat_file_path),
+            "-c",
+            "copy",
             output_path,
-        ])
+        ], on_progress=self._progress_callback(progress, "join"))
+
+        await asyncio.to_thread(self._prune_segment_cache)
+        return success, error_msg
+
+    async def _render_segment(
+        self,
+        key: str,
+        input_args: List[str],
+        filter_complex: str,
+        profile: EncodingProfile,
+        progress: Optional[RenderProgress] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """Encode one segment into the cache, publishing it atomically."""
+        segment_path = self._segment_path(key)
+        partial_path = segment_path.with_name(f"{key}.{uuid.uuid4().hex[:8]}.partial.mp4")
+
+        args = [self.ffmpeg_path, "-y", *input_args]
+        args.extend(["-filter_complex", filter_complex])
+        args.extend(["-map", "[outv]", "-map", "[outa]"])
+        args.extend(profile.encode_args())
+        args.append(str(partial_path))
+
+        success, error_msg = await self._run_ffmpeg(
+            args, on_progress=self._progress_callback(progress, key)
+        )
+        if success:
+            os.replace(partial_path, segment_path)
+        elif partial_path.exists():
+            partial_path.unlink()
+        return success, error_msg
+
+    @staticmethod
+    def _progress_callback(
+        progress: Optional[RenderProgress],
+        unit_id: str,
+    ) -> Optional[Callable[[FFmpegProgress], None]]:
+        """Route ffmpeg progress reports of one unit of work to the tracker."""
+        if progress is None:
+            return None
+        return lambda report: progress.update(unit_id, report)
+
+    def _segment_key(self, profile: EncodingProfile, *parts: str) -> str:
+        """Cache key for a segment, including the encoder settings."""
+        material = "|".join([*parts, *profile.encode_args()])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+    def _segment_path(self, key: str) -> Path:
+        return self.segment_cache_dir / f"{key}.mp4"
 
-        return await self._run_ffmpeg(args)
+    async def _file_digest(self, path: str) -> str:
+        """
+        Content hash of a clip, memoized by path, size and mtime.
+
+        Args:
+            path: Local file path.
+
+        Returns:
+            Hex SHA-256 digest of the file contents.
+        """
+        stat = os.stat(path)
+        memo_key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._digest_memo.get(memo_key)
+        if digest is None:
+            digest = await asyncio.to_thread(self._hash_file, path)
+            if len(self._digest_memo) >= 1024:
+                self._digest_memo.clear()
+            self._digest_memo[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _touch_segment(self, key: str) -> bool:
+        """Mark a cached segment as recently used; False if it is not (or no longer) cached."""
+        try:
+            os.utime(self._segment_path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _prune_segment_cache(self) -> None:
+        """Delete least recently used segments beyond SEGMENT_CACHE_MAX_BYTES."""
+        entries = []
+        try:
+            for p in self.segment_cache_dir.glob("*.mp4"):
+                if p.name.endswith(".partial.mp4"):
+                    continue
+                try:
+                    stat = p.stat()
+                except FileNotFoundError:
+                    continue  # Pruned by a concurrent render
+                entries.append((stat.st_mtime, stat.st_size, p))
+        except OSError as e:
+            logger.warning(f"Failed to scan segment cache: {e}")
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.SEGMENT_CACHE_MAX_BYTES:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError as e:
+                logger.warning(f"Failed to prune cached segment {path}: {e}")
 
     def _create_concat_file(self, video_paths: List[str], concat_file_path: str) -> None:
         """
@@ -598,31 +1067,68 @@ class VideoConcatenator:
 
         logger.debug(f"Created concat file at {concat_file_path} with {len(video_paths)} entries")
 
-    async def _run_ffmpeg(self, args: List[str]) -> Tuple[bool, Optional[str]]:
+    async def _run_ffmpeg(
+        self,
+        args: List[str],
+        on_progress: Optional[Callable[[FFmpegProgress], None]] = None,
+    ) -> Tuple[bool, Optional[str]]:
         """
         Run FFmpeg command asynchronously.
 
+        Waits for a slot of the process-wide ffmpeg limiter and caps the
+        threads of the process. The last argument must be the output path.
+        Progress is read from ffmpeg's ``-progress`` output as it runs; a
+        process whose output time stops advancing for STALL_TIMEOUT_SECONDS
+        is killed.
+
         Args:
             args: FFmpeg command arguments.
+            on_progress: Optional callback for each progress report.
 
         Returns:
             Tuple of (success, error_message).
         """
+        args = [
+            args[0],
+            "-progress",
+            "pipe:1",
+            "-nostats",
+            *args[1:-1],
+            *self.ffmpeg_limiter.thread_args(),
+            args[-1],
+        ]
         logger.debug(f"Running FFmpeg: {' '.join(args[:10])}...")
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+            async with self.ffmpeg_limiter.slot():
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stderr_task = asyncio.create_task(process.stderr.read())
+                try:
+                    stalled = await self._read_progress(process, on_progress)
+                    if stalled:
+                        process.kill()
+                    await process.wait()
+                    stderr = await stderr_task
+                except asyncio.CancelledError:
+                    if process.returncode is None:
+                        process.kill()
+                    stderr_task.cancel()
+                    raise
+
+            if stalled:
+                error_msg = f"FFmpeg stalled: no progress for {self.STALL_TIMEOUT_SECONDS:.0f}s"
+                logger.error(error_msg)
+                return False, error_msg
 
             if process.returncode == 0:
                 logger.debug("FFmpeg completed successfully")
                 return True, None
             else:
-                error_output = stderr.decode()
+                error_output = stderr.decode(errors="replace")
                 logger.error(f"FFmpeg failed with code {process.returncode}: {error_output}")
                 return False, f"FFmpeg error: {error_output[-500:]}"  # Last 500 chars
 
@@ -630,21 +1136,60 @@ class VideoConcatenator:
             error_msg = f"FFmpeg not found at {self.ffmpeg_path}"
             logger.error(error_msg)
             return False, error_msg
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             error_msg = f"Error running FFmpeg: {e}"
             logger.error(error_msg, exc_info=True)
             return False, error_msg
 
-    async def _cleanup_temp_dir(self) -> None:
+    async def _read_progress(
+        self,
+        process: asyncio.subprocess.Process,
+        on_progress: Optional[Callable[[FFmpegProgress], None]],
+    ) -> bool:
+        """
+        Consume ffmpeg's progress output until it exits.
+
+        Returns:
+            True if the process stalled, False when the output ended normally.
+        """
+        parser = FFmpegProgressParser()
+        loop = asyncio.get_running_loop()
+        last_advance = loop.time()
+        last_out_time = -1.0
+
+        while True:
+            timeout = last_advance + self.STALL_TIMEOUT_SECONDS - loop.time()
+            try:
+                line = await asyncio.wait_for(process.stdout.readline(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                return True
+            if not line:
+                return False
+
+            report = parser.feed(line.decode(errors="replace"))
+            if report is None:
+                continue
+
+            if report.out_time_seconds > last_out_time:
+                last_out_time = report.out_time_seconds
+                last_advance = loop.time()
+
+            if on_progress is not None:
+                try:
+                    on_progress(report)
+                except Exception as e:
+                    logger.warning(f"FFmpeg progress callback failed: {e}")
+
+    async def _cleanup_temp_dir(self, temp_dir: Path) -> None:
         """Clean up temporary directory and files."""
-        if self._temp_dir and self._temp_dir.exists():
+        if temp_dir.exists():
             try:
-                shutil.rmtree(self._temp_dir)
-                logger.debug(f"Cleaned up temp directory: {self._temp_dir}")
+                shutil.rmtree(temp_dir)
+                logger.debug(f"Cleaned up temp directory: {temp_dir}")
             except Exception as e:
                 logger.warning(f"Failed to clean up temp directory: {e}")
-            finally:
-                self._temp_dir = None
 
 
 # Singleton instance
@@ -679,5 +1224,8 @@ __all__ = [
     "ConcatenationResult",
     "SceneVideo",
     "TRANSITION_EFFECTS",
+    "EncodingProfile",
+    "ENCODING_PROFILES",
+    "DEFAULT_ENCODING_PROFILE",
     "get_video_concatenator",
 ]
@@ -6,7 +6,6 @@ Supports multiple providers:
 - mock: Mock provider for testing
 """
 
-import base64
 import logging
 import os
 import time
@@ -14,13 +13,16 @@ import traceback
 import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Awaitable, Callable, Optional, List, Tuple
 from dataclasses import dataclass
 
 from google import genai
 from google.genai import types
 
 from app.core.config import settings
+from app.services.binary_image import BinaryImage
+from app.services.video_generator.operation_tracker import OperationTracker
+from app.services.video_generator.rate_limiter import TokenBucketRateLimiter, get_veo_rate_limiter
 
 # Video output directory
 VIDEO_OUTPUT_DIR = Path(settings.UPLOAD_DIR) / "videos"
@@ -101,7 +103,7 @@ class SceneInput:
         description: Visual description of what the scene should depict.
         duration_seconds: Length of the scene in seconds.
         image_url: Optional URL to a reference image for the scene.
-        image_data: Optional Base64 encoded image data for image-to-video generation.
+        image_data: Optional image (BinaryImage) for image-to-video generation.
         scene_type: Marketing strategy type for the scene. Valid values include
             'hook' (attention grabber), 'problem' (pain point identification),
             'solution' (product/service introduction), 'benefit' (value proposition),
@@ -122,7 +124,7 @@ class SceneInput:
     description: str
     duration_seconds: float
     image_url: Optional[str] = None
-    image_data: Optional[str] = None
+    image_data: Optional[BinaryImage] = None
     scene_type: Optional[str] = None
     narration_script: Optional[str] = None
     visual_direction: Optional[str] = None
@@ -158,7 +160,7 @@ class VideoGeneratorBase(ABC):
     @abstractmethod
     async def generate_from_image(
         self,
-        image_data: str,
+        image_data: BinaryImage,
         prompt: Optional[str] = None,
         duration_seconds: int = 5,
         aspect_ratio: str = "16:9",
@@ -167,7 +169,7 @@ class VideoGeneratorBase(ABC):
         Generate a video from an image (image-to-video).
 
         Args:
-            image_data: Base64 encoded image data
+            image_data: Source image
             prompt: Optional text prompt to guide the animation
             duration_seconds: Duration of the video
             aspect_ratio: Video aspect ratio
@@ -217,7 +219,7 @@ class VideoGeneratorBase(ABC):
         scenes: List[SceneInput],
         brand_context: Optional[str] = None,
         aspect_ratio: str = "16:9",
-        delay_between_scenes: int = 30,
+        on_scene_result: Optional[Callable[[SceneVideoResult], Awaitable[None]]] = None,
     ) -> VideoGenerationResult:
         """
         Generate individual videos for each scene.
@@ -230,7 +232,7 @@ class VideoGeneratorBase(ABC):
             scenes: List of scene inputs with descriptions and images
             brand_context: Optional brand context for prompt building
             aspect_ratio: Video aspect ratio (16:9, 9:16, 1:1)
-            delay_between_scenes: Delay in seconds between scene generations to avoid rate limits (default: 30)
+            on_scene_result: Optional async callback invoked as each scene finishes
 
         Returns:
             VideoGenerationResult with scene_results populated
@@ -315,6 +317,10 @@ class GeminiVeoGenerator(VideoGeneratorBase):
     MODEL_LATEST = "veo-3.1-generate-preview"
     MODEL_V2 = "veo-2.0-generate-001"
 
+    # Operation polling
+    EXPECTED_RENDER_SECONDS = 90
+    MAX_WAIT_SECONDS = 300
+
     def __init__(self):
         logger.info("Initializing GeminiVeoGenerator...")
         if not settings.GOOGLE_API_KEY:
@@ -323,9 +329,35 @@ class GeminiVeoGenerator(VideoGeneratorBase):
 
         self.client = genai.Client(api_key=settings.GOOGLE_API_KEY)
         self.model_name = self.MODEL_LATEST
-        self._pending_operations: dict[str, any] = {}
+        self.rate_limiter = get_veo_rate_limiter()
+        self.operation_tracker = OperationTracker(
+            poll_operation=lambda operation: self.client.operations.get(operation=operation),
+        )
         logger.info(f"GeminiVeoGenerator initialized with model: {self.model_name}")
 
+    async def _wait_for_operation(
+        self,
+        operation,
+        expected_seconds: Optional[float] = None,
+    ) -> Tuple[str, Any]:
+        """
+        Register an operation with the shared tracker and wait for it.
+
+        Returns:
+            Tuple of (operation_id, latest operation). If the operation is not
+            done within MAX_WAIT_SECONDS it stays tracked for check_generation_status.
+        """
+        operation_id = self.operation_tracker.track(
+            operation,
+            expected_seconds=expected_seconds or self.EXPECTED_RENDER_SECONDS,
+        )
+        logger.info(f"Video operation started, operation_id: {operation_id}")
+
+        operation = await self.operation_tracker.wait(operation_id, timeout_seconds=self.MAX_WAIT_SECONDS)
+        if operation.done:
+            self.operation_tracker.forget(operation_id)
+        return operation_id, operation
+
     async def generate_from_prompt(
         self,
         prompt: str,
@@ -358,23 +390,7 @@ class GeminiVeoGenerator(VideoGeneratorBase):
 
         try:
             operation = await asyncio.to_thread(_generate)
-            operation_id = str(uuid.uuid4())
-            self._pending_operations[operation_id] = operation
-
-            logger.info(f"Video generation started, operation_id: {operation_id}")
-
-            # Poll for completion (with timeout)
-            max_wait_seconds = 300  # 5 minutes
-            poll_interval = 10  # 10 seconds
-            elapsed = 0
-
-            while not operation.done and elapsed < max_wait_seconds:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                operation = await asyncio.to_thread(
-                    lambda: self.client.operations.get(operation=operation)
-                )
-                logger.info(f"Polling video generation... elapsed: {elapsed}s")
+            operation_id, operation = await self._wait_for_operation(operation)
 
             if not operation.done:
                 return VideoGenerationResult(
@@ -440,7 +456,7 @@ class GeminiVeoGenerator(VideoGeneratorBase):
 
     async def generate_from_image(
         self,
-        image_data: str,
+        image_data: BinaryImage,
         prompt: Optional[str] = None,
         duration_seconds: int = 6,
         aspect_ratio: str = "16:9",
@@ -457,16 +473,13 @@ class GeminiVeoGenerator(VideoGeneratorBase):
         clamped_duration = max(4, min(8, int(duration_seconds)))
         logger.info(f"Duration: {duration_seconds} -> clamped to {clamped_duration}")
 
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data)
-
         def _generate():
             return self.client.models.generate_videos(
                 model=self.model_name,
                 prompt=prompt,
                 image=types.Image(
-                    image_bytes=image_bytes,
-                    mime_type="image/png",
+                    image_bytes=image_data.to_bytes(),
+                    mime_type=image_data.mime_type,
                 ),
                 config=types.GenerateVideosConfig(
                     duration_seconds=clamped_duration,
@@ -477,20 +490,7 @@ class GeminiVeoGenerator(VideoGeneratorBase):
 
         try:
             operation = await asyncio.to_thread(_generate)
-            operation_id = str(uuid.uuid4())
-            self._pending_operations[operation_id] = operation
-
-            # Poll for completion
-            max_wait_seconds = 300
-            poll_interval = 10
-            elapsed = 0
-
-            while not operation.done and elapsed < max_wait_seconds:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                operation = await asyncio.to_thread(
-                    lambda: self.client.operations.get(operation=operation)
-                )
+            operation_id, operation = await self._wait_for_operation(operation)
 
             if not operation.done:
                 return VideoGenerationResult(
@@ -617,28 +617,28 @@ class GeminiVeoGenerator(VideoGeneratorBase):
         self,
         operation_id: str,
     ) -> VideoGenerationResult:
-        """Check status of a pending video generation."""
+        """
+        Check status of a pending video generation.
+
+        Reads the latest snapshot kept by the shared operation tracker
+        instead of polling the API again.
+        """
         import asyncio
 
-        if operation_id not in self._pending_operations:
+        if self.operation_tracker.get(operation_id) is None:
             return VideoGenerationResult(
                 operation_id=operation_id,
                 status="failed",
                 error_message="Operation not found",
             )
 
-        operation = self._pending_operations[operation_id]
-
         try:
-            operation = await asyncio.to_thread(
-                lambda: self.client.operations.get(operation=operation)
-            )
-            self._pending_operations[operation_id] = operation
+            operation = await self.operation_tracker.wait(operation_id, timeout_seconds=0)
 
             if operation.done:
+                self.operation_tracker.forget(operation_id)
                 if operation.result and operation.result.generated_videos:
                     generated_video = operation.result.generated_videos[0]
-                    del self._pending_operations[operation_id]
 
                     # Download and save video locally
                     video_filename = f"video_{uuid.uuid4().hex[:12]}.mp4"
@@ -668,7 +668,6 @@ class GeminiVeoGenerator(VideoGeneratorBase):
                             status="completed",
                         )
                 else:
-                    del self._pending_operations[operation_id]
                     return VideoGenerationResult(
                         status="failed",
                         error_message="No video in result",
@@ -692,187 +691,41 @@ class GeminiVeoGenerator(VideoGeneratorBase):
         scenes: List[SceneInput],
         brand_context: Optional[str] = None,
         aspect_ratio: str = "16:9",
-        delay_between_scenes: int = 30,  # Delay in seconds to avoid rate limits
+        on_scene_result: Optional[Callable[[SceneVideoResult], Awaitable[None]]] = None,
     ) -> VideoGenerationResult:
         """
         Generate individual videos for each scene.
 
         Unlike generate_marketing_video which creates a single video,
         this method generates separate videos for each scene that can
-        later be concatenated.
+        later be concatenated. Scenes are submitted concurrently under the
+        shared Veo rate limiter instead of sleeping between scenes.
 
         Args:
             scenes: List of scene inputs with descriptions and images
             brand_context: Optional brand context for prompt building
             aspect_ratio: Video aspect ratio (16:9, 9:16, 1:1)
-            delay_between_scenes: Delay in seconds between scene generations to avoid rate limits (default: 30)
+            on_scene_result: Optional async callback invoked as each scene finishes
 
         Returns:
             VideoGenerationResult with scene_results populated
         """
-        # Import prompt builder here to avoid circular import
-        from .prompt_builder import create_prompt_builder
+        # Import scheduler here to avoid circular import
+        from .scene_scheduler import SceneScheduler
 
-        start_time = time.time()
         logger.info(f"Starting per-scene video generation for {len(scenes)} scenes")
 
-        if not scenes:
-            return VideoGenerationResult(
-                status="failed",
-                error_message="No scenes provided",
-                generation_time_ms=0,
-            )
-
         if aspect_ratio not in self.SUPPORTED_ASPECT_RATIOS:
             logger.warning(f"Unsupported aspect ratio {aspect_ratio}, defaulting to 16:9")
             aspect_ratio = "16:9"
 
-        # Initialize the prompt builder for optimized prompt construction
-        prompt_builder = create_prompt_builder(storyboard_priority=True)
-
-        scene_results: List[SceneVideoResult] = []
-        completed_count = 0
-        failed_count = 0
-
-        # Process scenes sequentially
-        for scene in scenes:
-            scene_start_time = time.time()
-            logger.info(
-                f"Processing scene {scene.scene_number}/{len(scenes)}: "
-                f"{scene.description[:50] if scene.description else 'No description'}..."
-            )
-
-            # Build optimized prompt using VideoPromptBuilder
-            prompt = prompt_builder.build_scene_prompt(
-                scene=scene,
-                brand_context=brand_context,
-            )
-            logger.info(f"Scene {scene.scene_number} prompt: {prompt[:100]}...")
-
-            # Respect Veo 4-8 second limit per scene
-            scene_duration = int(scene.duration_seconds) if scene.duration_seconds else 6
-            # Clamp to valid range: 4-8 seconds (Veo API requirement)
-            scene_duration = max(4, min(8, scene_duration))
-
-            try:
-                # Choose generation method based on image availability
-                if scene.image_data:
-                    logger.info(f"Scene {scene.scene_number}: Using image-to-video generation")
-                    result = await self.generate_from_image(
-                        image_data=scene.image_data,
-                        prompt=prompt,
-                        duration_seconds=scene_duration,
-                        aspect_ratio=aspect_ratio,
-                    )
-                else:
-                    logger.info(f"Scene {scene.scene_number}: Using text-to-video generation")
-                    result = await self.generate_from_prompt(
-                        prompt=prompt,
-                        duration_seconds=scene_duration,
-                        aspect_ratio=aspect_ratio,
-                    )
-
-                scene_generation_time = int((time.time() - scene_start_time) * 1000)
-
-                if result.status == "completed":
-                    completed_count += 1
-                    scene_results.append(
-                        SceneVideoResult(
-                            scene_number=scene.scene_number,
-                            status="completed",
-                            video_url=result.video_url,
-                            duration_seconds=result.duration_seconds or scene_duration,
-                            generation_time_ms=scene_generation_time,
-                            prompt_used=prompt,
-                        )
-                    )
-                    logger.info(
-                        f"Scene {scene.scene_number} completed successfully: {result.video_url}"
-                    )
-                elif result.status == "processing":
-                    # Scene is still processing, track operation_id
-                    scene_results.append(
-                        SceneVideoResult(
-                            scene_number=scene.scene_number,
-                            status="processing",
-                            operation_id=result.operation_id,
-                            generation_time_ms=scene_generation_time,
-                            prompt_used=prompt,
-                        )
-                    )
-                    logger.info(
-                        f"Scene {scene.scene_number} still processing: {result.operation_id}"
-                    )
-                else:
-                    # Scene failed
-                    failed_count += 1
-                    scene_results.append(
-                        SceneVideoResult(
-                            scene_number=scene.scene_number,
-                            status="failed",
-                            error_message=result.error_message,
-                            generation_time_ms=scene_generation_time,
-                            prompt_used=prompt,
-                        )
-                    )
-                    logger.error(
-                        f"Scene {scene.scene_number} failed: {result.error_message}"
-                    )
-
-            except Exception as e:
-                # Handle unexpected errors gracefully - don't stop other scenes
-                failed_count += 1
-                scene_generation_time = int((time.time() - scene_start_time) * 1000)
-                error_msg = str(e)
-                logger.error(
-                    f"Scene {scene.scene_number} unexpected error: {error_msg}",
-                    exc_info=True,
-                )
-                scene_results.append(
-                    SceneVideoResult(
-                        scene_number=scene.scene_number,
-                        status="failed",
-                        error_message=error_msg,
-                        generation_time_ms=scene_generation_time,
-                        prompt_used=prompt,
-                    )
-                )
-
-            # Add delay between scenes to avoid rate limits (skip for last scene)
-            if delay_between_scenes > 0 and scene != scenes[-1]:
-                logger.info(f"Waiting {delay_between_scenes} seconds before next scene to avoid rate limits...")
-                await asyncio.sleep(delay_between_scenes)
-
-        # Determine overall status
-        total_generation_time = int((time.time() - start_time) * 1000)
-
-        if completed_count == len(scenes):
-            overall_status = "completed"
-        elif completed_count > 0:
-            overall_status = "partial"
-        elif any(r.status == "processing" for r in scene_results):
-            overall_status = "processing"
-        else:
-            overall_status = "failed"
-
-        # Calculate total duration from completed scenes
-        total_duration = sum(
-            r.duration_seconds or 0
-            for r in scene_results
-            if r.status == "completed" and r.duration_seconds
-        )
-
-        logger.info(
-            f"Per-scene generation complete: {completed_count}/{len(scenes)} succeeded, "
-            f"{failed_count} failed, total time: {total_generation_time}ms"
-        )
-
-        return VideoGenerationResult(
-            status=overall_status,
-            scene_results=scene_results,
-            duration_seconds=total_duration,
-            generation_time_ms=total_generation_time,
-            error_message=f"{failed_count} scene(s) failed" if failed_count > 0 else None,
+        scheduler = SceneScheduler(rate_limiter=self.rate_limiter)
+        return await scheduler.generate(
+            self,
+            scenes=scenes,
+            brand_context=brand_context,
+            aspect_ratio=aspect_ratio,
+            on_scene_result=on_scene_result,
         )
 
     async def extend_video(
@@ -917,8 +770,7 @@ class GeminiVeoGenerator(VideoGeneratorBase):
 
         # Read video bytes
         try:
-            with open(video_path, "rb") as f:
-                video_bytes = f.read()
+            video_bytes = await asyncio.to_thread(video_file.read_bytes)
             logger.info(f"Read video file: {len(video_bytes)} bytes")
         except Exception as e:
             return ExtendedVideoResult(
@@ -927,6 +779,70 @@ class GeminiVeoGenerator(VideoGeneratorBase):
                 generation_time_ms=int((time.time() - start_time) * 1000),
             )
 
+        try:
+            status, extended_bytes, error_msg = await self._run_extension(
+                video_bytes, extension_prompt, aspect_ratio
+            )
+            generation_time_ms = int((time.time() - start_time) * 1000)
+
+            if status != "completed":
+                return ExtendedVideoResult(
+                    status=status,
+                    error_message=error_msg,
+                    generation_time_ms=generation_time_ms,
+                )
+
+            output_path, local_video_url = await self._save_extended_video(extended_bytes)
+            return ExtendedVideoResult(
+                status="completed",
+                video_url=local_video_url,
+                video_path=str(output_path),
+                extension_hops_completed=1,
+                extension_hops_requested=1,
+                generation_time_ms=generation_time_ms,
+                hop_results=[
+                    ExtensionHopResult(
+                        hop_number=1,
+                        status="completed",
+                        video_url=local_video_url,
+                        video_path=str(output_path),
+                        duration_added_seconds=7.0,
+                        prompt_used=extension_prompt,
+                        generation_time_ms=generation_time_ms,
+                    )
+                ],
+            )
+
+        except Exception as e:
+            logger.error(f"Video extension failed: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return ExtendedVideoResult(
+                status="failed",
+                error_message=str(e),
+                generation_time_ms=int((time.time() - start_time) * 1000),
+            )
+
+    async def _run_extension(
+        self,
+        video_bytes: bytes,
+        extension_prompt: str,
+        aspect_ratio: str,
+    ) -> Tuple[str, Optional[bytes], Optional[str]]:
+        """
+        Submit one extension hop and download its output into memory.
+
+        Holds a slot of the shared Veo rate limiter while the operation runs.
+
+        Args:
+            video_bytes: The video to extend
+            extension_prompt: Text prompt describing the continuation
+            aspect_ratio: Video aspect ratio (16:9 or 9:16)
+
+        Returns:
+            Tuple of (status, extended video bytes, error message)
+        """
+        import asyncio
+
         def _extend():
             # Use generate_videos with video input for extension
             # Note: Do NOT pass mime_type - SDK converts it to 'encoding' which Veo 3.1 doesn't support
@@ -943,100 +859,43 @@ class GeminiVeoGenerator(VideoGeneratorBase):
                 ),
             )
 
-        try:
+        async with self.rate_limiter.slot():
             operation = await asyncio.to_thread(_extend)
-            operation_id = str(uuid.uuid4())
-            self._pending_operations[operation_id] = operation
-
-            logger.info(f"Video extension started, operation_id: {operation_id}")
+            operation_id, operation = await self._wait_for_operation(operation)
 
-            # Poll for completion
-            max_wait_seconds = 300
-            poll_interval = 10
-            elapsed = 0
+        if not operation.done:
+            return "processing", None, f"Extension still processing (operation {operation_id})"
 
-            while not operation.done and elapsed < max_wait_seconds:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                operation = await asyncio.to_thread(
-                    lambda: self.client.operations.get(operation=operation)
-                )
-                logger.info(f"Polling video extension... elapsed: {elapsed}s")
-
-            if not operation.done:
-                return ExtendedVideoResult(
-                    status="processing",
-                    generation_time_ms=int((time.time() - start_time) * 1000),
-                )
+        if not (operation.result and operation.result.generated_videos):
+            error_msg = "No extended video generated"
+            if hasattr(operation, 'result') and operation.result:
+                if hasattr(operation.result, 'rai_media_filtered_reasons') and operation.result.rai_media_filtered_reasons:
+                    error_msg = operation.result.rai_media_filtered_reasons[0]
+            return "failed", None, error_msg
 
-            # Get result
-            if operation.result and operation.result.generated_videos:
-                generated_video = operation.result.generated_videos[0]
-                generation_time_ms = int((time.time() - start_time) * 1000)
-
-                # Download and save extended video locally
-                video_filename = f"extended_{uuid.uuid4().hex[:12]}.mp4"
-                output_path = VIDEO_OUTPUT_DIR / video_filename
-
-                try:
-                    await asyncio.to_thread(
-                        lambda: self.client.files.download(file=generated_video.video)
-                    )
-                    await asyncio.to_thread(
-                        lambda: generated_video.video.save(str(output_path))
-                    )
-                    logger.info(f"Extended video saved to: {output_path}")
+        generated_video = operation.result.generated_videos[0]
+        extended_bytes = await asyncio.to_thread(
+            lambda: self.client.files.download(file=generated_video.video)
+        )
+        extended_bytes = extended_bytes or generated_video.video.video_bytes
+        if not extended_bytes:
+            return "failed", None, "Extended video could not be downloaded"
+        return "completed", extended_bytes, None
 
-                    local_video_url = f"http://localhost:8000/uploads/videos/{video_filename}"
+    async def _save_extended_video(self, video_bytes: bytes) -> Tuple[Path, str]:
+        """
+        Write an extended video to the output directory.
 
-                    return ExtendedVideoResult(
-                        status="completed",
-                        video_url=local_video_url,
-                        video_path=str(output_path),
-                        extension_hops_completed=1,
-                        extension_hops_requested=1,
-                        generation_time_ms=generation_time_ms,
-                        hop_results=[
-                            ExtensionHopResult(
-                                hop_number=1,
-                                status="completed",
-                                video_url=local_video_url,
-                                video_path=str(output_path),
-                                duration_added_seconds=7.0,
-                                prompt_used=extension_prompt,
-                                generation_time_ms=generation_time_ms,
-                            )
-                        ],
-                    )
-                except Exception as download_error:
-                    logger.error(f"Failed to download extended video: {download_error}")
-                    video = generated_video.video
-                    return ExtendedVideoResult(
-                        status="completed",
-                        video_url=video.uri if hasattr(video, 'uri') else None,
-                        extension_hops_completed=1,
-                        extension_hops_requested=1,
-                        generation_time_ms=generation_time_ms,
-                    )
-            else:
-                error_msg = "No extended video generated"
-                if hasattr(operation, 'result') and operation.result:
-                    if hasattr(operation.result, 'rai_media_filtered_reasons') and operation.result.rai_media_filtered_reasons:
-                        error_msg = operation.result.rai_media_filtered_reasons[0]
-                return ExtendedVideoResult(
-                    status="failed",
-                    error_message=error_msg,
-                    generation_time_ms=int((time.time() - start_time) * 1000),
-                )
+        Returns:
+            Tuple of (local path, served URL)
+        """
+        import asyncio
 
-        except Exception as e:
-            logger.error(f"Video extension failed: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return ExtendedVideoResult(
-                status="failed",
-                error_message=str(e),
-                generation_time_ms=int((time.time() - start_time) * 1000),
-            )
+        video_filename = f"extended_{uuid.uuid4().hex[:12]}.mp4"
+        output_path = VIDEO_OUTPUT_DIR / video_filename
+        await asyncio.to_thread(output_path.write_bytes, video_bytes)
+        logger.info(f"Extended video saved to: {output_path}")
+        return output_path, f"http://localhost:8000/uploads/videos/{video_filename}"
 
     async def generate_extended_video(
         self,
@@ -1053,6 +912,10 @@ class GeminiVeoGenerator(VideoGeneratorBase):
         2. Extends the video using subsequent scene prompts (7 seconds each)
         3. Continues until target duration is reached or scenes are exhausted
 
+        Each hop is submitted with the previous hop's output straight from
+        memory as soon as it resolves, paced by the shared Veo rate limiter.
+        Hop outputs are written to disk in the background.
+
         Args:
             scenes: List of scene inputs with descriptions
             target_duration_seconds: Target duration (max 148 seconds)
@@ -1101,28 +964,32 @@ class GeminiVeoGenerator(VideoGeneratorBase):
         prompt_builder = create_prompt_builder(storyboard_priority=True)
         hop_results: List[ExtensionHopResult] = []
 
+        # Build every hop prompt up front so nothing but the API calls sits between hops
+        hop_prompts = [
+            prompt_builder.build_scene_prompt(scene=scene, brand_context=brand_context)
+            for scene in scenes[:hops_needed + 1]
+        ]
+
         # Step 1: Generate initial video from first scene
         first_scene = scenes[0]
-        initial_prompt = prompt_builder.build_scene_prompt(
-            scene=first_scene,
-            brand_context=brand_context,
-        )
+        initial_prompt = hop_prompts[0]
 
         logger.info(f"Generating initial {initial_duration}s video...")
 
-        if first_scene.image_data:
-            initial_result = await self.generate_from_image(
-                image_data=first_scene.image_data,
-                prompt=initial_prompt,
-                duration_seconds=initial_duration,
-                aspect_ratio=aspect_ratio,
-            )
-        else:
-            initial_result = await self.generate_from_prompt(
-                prompt=initial_prompt,
-                duration_seconds=initial_duration,
-                aspect_ratio=aspect_ratio,
-            )
+        async with self.rate_limiter.slot():
+            if first_scene.image_data:
+                initial_result = await self.generate_from_image(
+                    image_data=first_scene.image_data,
+                    prompt=initial_prompt,
+                    duration_seconds=initial_duration,
+                    aspect_ratio=aspect_ratio,
+                )
+            else:
+                initial_result = await self.generate_from_prompt(
+                    prompt=initial_prompt,
+                    duration_seconds=initial_duration,
+                    aspect_ratio=aspect_ratio,
+                )
 
         if initial_result.status != "completed":
             return ExtendedVideoResult(
@@ -1149,6 +1016,20 @@ class GeminiVeoGenerator(VideoGeneratorBase):
 
         logger.info(f"Initial video generated: {current_video_path}, duration: {current_duration}s")
 
+        # The previous hop's output stays in memory; only the initial video is read from disk
+        try:
+            current_bytes = await asyncio.to_thread(Path(current_video_path).read_bytes) if hops_needed else b""
+        except Exception as e:
+            return ExtendedVideoResult(
+                status="failed",
+                error_message=f"Failed to read initial video: {str(e)}",
+                generation_time_ms=int((time.time() - start_time) * 1000),
+            )
+
+        # Hop outputs are written to disk in the background while the next hop runs
+        save_tasks: List[asyncio.Task] = []
+        stop_error: Optional[str] = None
+
         # Step 2: Extend video with subsequent scenes
         for hop_idx in range(hops_needed):
             scene_idx = hop_idx + 1  # Start from second scene
@@ -1161,92 +1042,99 @@ class GeminiVeoGenerator(VideoGeneratorBase):
                 logger.info(f"Target duration {target_duration_seconds}s reached at {current_duration}s")
                 break
 
-            scene = scenes[scene_idx]
             hop_start_time = time.time()
-
-            # Build extension prompt
-            extension_prompt = prompt_builder.build_scene_prompt(
-                scene=scene,
-                brand_context=brand_context,
-            )
+            extension_prompt = hop_prompts[scene_idx]
 
             logger.info(f"Extension hop {hop_idx + 1}/{hops_needed}: scene {scene_idx + 1}")
 
-            # Extend the current video
-            extension_result = await self.extend_video(
-                video_path=current_video_path,
-                extension_prompt=extension_prompt,
-                aspect_ratio=aspect_ratio,
-            )
+            # Extend the current video (pacing comes from the shared rate limiter)
+            try:
+                status, extended_bytes, error_msg = await self._run_extension(
+                    current_bytes, extension_prompt, aspect_ratio
+                )
+            except Exception as e:
+                logger.error(f"Traceback: {traceback.format_exc()}")
+                status, extended_bytes, error_msg = "failed", None, str(e)
 
             hop_time_ms = int((time.time() - hop_start_time) * 1000)
 
-            if extension_result.status == "completed" and extension_result.video_path:
-                # Update current video for next iteration
-                current_video_path = extension_result.video_path
-                current_video_url = extension_result.video_url
-                current_duration += extension_per_hop
-                scenes_processed += 1
-
-                hop_results.append(
-                    ExtensionHopResult(
-                        hop_number=hop_idx + 1,
-                        status="completed",
-                        video_url=extension_result.video_url,
-                        video_path=extension_result.video_path,
-                        duration_added_seconds=extension_per_hop,
-                        total_duration_seconds=current_duration,
-                        prompt_used=extension_prompt,
-                        generation_time_ms=hop_time_ms,
-                    )
-                )
-
-                logger.info(
-                    f"Extension hop {hop_idx + 1} completed: "
-                    f"new duration {current_duration}s"
-                )
-            else:
+            if status != "completed":
                 # Extension failed, stop and return partial result
                 hop_results.append(
                     ExtensionHopResult(
                         hop_number=hop_idx + 1,
                         status="failed",
-                        error_message=extension_result.error_message,
+                        error_message=error_msg,
                         prompt_used=extension_prompt,
                         generation_time_ms=hop_time_ms,
                     )
                 )
+                logger.error(f"Extension hop {hop_idx + 1} failed: {error_msg}")
+                stop_error = f"Extension stopped at hop {hop_idx + 1}: {error_msg}"
+                break
 
-                logger.error(
-                    f"Extension hop {hop_idx + 1} failed: {extension_result.error_message}"
-                )
+            current_bytes = extended_bytes
+            current_duration += extension_per_hop
+            scenes_processed += 1
+
+            hop_result = ExtensionHopResult(
+                hop_number=hop_idx + 1,
+                status="completed",
+                duration_added_seconds=extension_per_hop,
+                total_duration_seconds=current_duration,
+                prompt_used=extension_prompt,
+                generation_time_ms=hop_time_ms,
+            )
+            hop_results.append(hop_result)
+            save_tasks.append(asyncio.create_task(self._save_hop_video(hop_result, extended_bytes)))
 
-                # Return partial result with what we have
-                return ExtendedVideoResult(
-                    status="partial",
-                    video_url=current_video_url,
-                    video_path=current_video_path,
-                    initial_duration_seconds=initial_duration,
-                    final_duration_seconds=current_duration,
-                    extension_hops_completed=hop_idx,
-                    extension_hops_requested=hops_needed,
-                    hop_results=hop_results,
-                    generation_time_ms=int((time.time() - start_time) * 1000),
-                    error_message=f"Extension stopped at hop {hop_idx + 1}: {extension_result.error_message}",
-                    scenes_processed=scenes_processed,
-                )
+            logger.info(
+                f"Extension hop {hop_idx + 1} completed: "
+                f"new duration {current_duration}s"
+            )
 
-            # Add delay between extension hops to avoid rate limits
-            if hop_idx < hops_needed - 1:
-                logger.info("Waiting 30 seconds before next extension hop...")
-                await asyncio.sleep(30)
+        # Step 3: Wait for pending writes; the last saved hop is the final video.
+        # Each hop's output contains every hop before it, so a failed save only
+        # matters when no later hop was saved.
+        save_results = await asyncio.gather(*save_tasks, return_exceptions=True)
+        extended_hops = [h for h in hop_results if h.status == "completed"]
+        last_saved: Optional[ExtensionHopResult] = None
+        for hop_result in extended_hops:
+            if hop_result.video_path:
+                last_saved = hop_result
+                current_video_url = hop_result.video_url
+                current_video_path = hop_result.video_path
+        save_errors = [
+            error for hop_result, error in zip(extended_hops, save_results)
+            if error is not None and (last_saved is None or hop_result.hop_number > last_saved.hop_number)
+        ]
+        if save_errors:
+            logger.error(f"Failed to save extension hop output: {save_errors[0]}")
+            stop_error = stop_error or f"Failed to save extended video: {save_errors[0]}"
 
-        # Step 3: Return final result
+        completed_hops = last_saved.hop_number if last_saved else 0
+        final_duration = last_saved.total_duration_seconds if last_saved else initial_duration
+        scenes_processed = 1 + completed_hops
         total_time_ms = int((time.time() - start_time) * 1000)
 
+        if stop_error:
+            return ExtendedVideoResult(
+                status="partial",
+                video_url=current_video_url,
+                video_path=current_video_path,
+                initial_duration_seconds=initial_duration,
+                final_duration_seconds=final_duration,
+                extension_hops_completed=completed_hops,
+                extension_hops_requested=hops_needed,
+                hop_results=hop_results,
+                generation_time_ms=total_time_ms,
+                error_message=stop_error,
+                scenes_processed=scenes_processed,
+            )
+
         logger.info(
             f"Extended video generation complete: "
-            f"final duration {current_duration}s, "
+            f"final duration {final_duration}s, "
             f"{len(hop_results)} hops, "
             f"{scenes_processed} scenes processed, "
             f"total time {total_time_ms}ms"
@@ -1257,18 +1145,27 @@ class GeminiVeoGenerator(VideoGeneratorBase):
             video_url=current_video_url,
             video_path=current_video_path,
             initial_duration_seconds=initial_duration,
-            final_duration_seconds=current_duration,
-            extension_hops_completed=len([h for h in hop_results if h.status == "completed"]),
+            final_duration_seconds=final_duration,
+            extension_hops_completed=completed_hops,
             extension_hops_requested=hops_needed,
             hop_results=hop_results,
             generation_time_ms=total_time_ms,
             scenes_processed=scenes_processed,
         )
 
+    async def _save_hop_video(self, hop_result: ExtensionHopResult, video_bytes: bytes) -> None:
+        """Write a hop's output to disk and record its location on the hop result."""
+        output_path, video_url = await self._save_extended_video(video_bytes)
+        hop_result.video_path = str(output_path)
+        hop_result.video_url = video_url
+
 
 class MockVideoGenerator(VideoGeneratorBase):
     """Mock video generator for testing."""
 
+    def __init__(self, rate_limiter: Optional[TokenBucketRateLimiter] = None):
+        self.rate_limiter = rate_limiter
+
     async def generate_from_prompt(
         self,
         prompt: str,
@@ -1291,7 +1188,7 @@ class MockVideoGenerator(VideoGeneratorBase):
 
     async def generate_from_image(
         self,
-        image_data: str,
+        image_data: BinaryImage,
         prompt: Optional[str] = None,
         duration_seconds: int = 5,
         aspect_ratio: str = "16:9",
@@ -1343,74 +1240,24 @@ class MockVideoGenerator(VideoGeneratorBase):
         scenes: List[SceneInput],
         brand_context: Optional[str] = None,
         aspect_ratio: str = "16:9",
-        delay_between_scenes: int = 30,  # Not used in mock, just for interface consistency
+        on_scene_result: Optional[Callable[[SceneVideoResult], Awaitable[None]]] = None,
     ) -> VideoGenerationResult:
         """
         Mock implementation of per-scene video generation.
 
-        Simulates generating individual videos for each scene with mock URLs.
+        Runs the same concurrent scheduler as the Veo generator, backed by
+        the mock generate_from_prompt/generate_from_image methods.
         """
-        # Import prompt builder here to avoid circular import
-        from .prompt_builder import create_prompt_builder
-        import asyncio
-
-        start_time = time.time()
-
-        if not scenes:
-            return VideoGenerationResult(
-                status="failed",
-                error_message="No scenes provided",
-                generation_time_ms=0,
-            )
-
-        # Initialize prompt builder for consistent mock behavior
-        prompt_builder = create_prompt_builder(storyboard_priority=True)
-
-        # Sample video URLs for mock responses
-        mock_video_urls = [
-            "https://storage.googleapis.com/gtv-videos-bucket/sample/BigBuckBunny.mp4",
-            "https://storage.googleapis.com/gtv-videos-bucket/sample/ElephantsDream.mp4",
-            "https://storage.googleapis.com/gtv-videos-bucket/sample/ForBiggerBlazes.mp4",
-            "https://storage.googleapis.com/gtv-videos-bucket/sample/ForBiggerEscapes.mp4",
-            "https://storage.googleapis.com/gtv-videos-bucket/sample/ForBiggerFun.mp4",
-        ]
-
-        scene_results: List[SceneVideoResult] = []
-
-        for i, scene in enumerate(scenes):
-            scene_start = time.time()
-            await asyncio.sleep(0.5)  # Simulate per-scene generation delay
+        # Import scheduler here to avoid circular import
+        from .scene_scheduler import SceneScheduler
 
-            # Build prompt for consistency
-            prompt = prompt_builder.build_scene_prompt(
-                scene=scene,
-                brand_context=brand_context,
-            )
-
-            scene_duration = min(8, scene.duration_seconds) if scene.duration_seconds else 5
-
-            scene_results.append(
-                SceneVideoResult(
-                    scene_number=scene.scene_number,
-                    status="completed",
-                    video_url=mock_video_urls[i % len(mock_video_urls)],
-                    duration_seconds=scene_duration,
-                    generation_time_ms=int((time.time() - scene_start) * 1000),
-                    prompt_used=prompt,
-                )
-            )
-
-        total_duration = sum(
-            r.duration_seconds or 0
-            for r in scene_results
-            if r.duration_seconds
-        )
-
-        return VideoGenerationResult(
-            status="completed",
-            scene_results=scene_results,
-            duration_seconds=total_duration,
-            generation_time_ms=int((time.time() - start_time) * 1000),
+        scheduler = SceneScheduler(rate_limiter=self.rate_limiter)
+        return await scheduler.generate(
+            self,
+            scenes=scenes,
+            brand_context=brand_context,
+            aspect_ratio=aspect_ratio,
+            on_scene_result=on_scene_result,
         )
 
     async def extend_video(
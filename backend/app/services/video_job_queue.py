@@ -0,0 +1,632 @@
+"""
+Durable Video Generation Job Queue.
+
+Video generation requests are stored as VideoGenerationJob rows and executed
+by a pool of background workers instead of inside the HTTP request. Workers
+persist per-scene progress into SceneVideo rows as each scene finishes, send
+heartbeats while running, and jobs abandoned by a dead worker are requeued.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models import Brand, Product, SceneImage, Storyboard, VideoProject
+from app.models.scene_video import SceneVideo
+from app.models.video_generation_job import VideoGenerationJob
+from app.services.binary_image import BinaryImage
+from app.services.image_cache import guess_mime_type
+from app.services.video_generator import SceneInput, SceneVideoResult, get_video_generator
+
+logger = logging.getLogger(__name__)
+
+# Job statuses that a worker will no longer touch
+TERMINAL_JOB_STATUSES = ("completed", "partial", "failed")
+
+
+async def build_brand_product_context(db: AsyncSession, project: VideoProject) -> str:
+    """
+    Build the brand/product context string passed to the video generator.
+
+    The PromptBuilder handles intelligent integration of this context,
+    so it is kept separate from the scene descriptions.
+    """
+    brand_product_context = ""
+    if project.brand_id:
+        brand_result = await db.execute(select(Brand).where(Brand.id == project.brand_id))
+        brand = brand_result.scalar_one_or_none()
+        if brand:
+            brand_product_context += f"Brand: {brand.name}. "
+
+    if project.product_id:
+        product_result = await db.execute(select(Product).where(Product.id == project.product_id))
+        product = product_result.scalar_one_or_none()
+        if product:
+            brand_product_context += f"Product: {product.name}"
+            if product.product_category:
+                brand_product_context += f" ({product.product_category})"
+            brand_product_context += ". "
+            if product.image_description:
+                brand_product_context += f"Product Appearance: {product.image_description} "
+            elif product.description:
+                desc = product.description[:150] if len(product.description) > 150 else product.description
+                brand_product_context += f"Description: {desc}. "
+
+    return brand_product_context
+
+
+def resolve_scene_image_path(image_url: str) -> str:
+    """
+    Convert a scene image URL served from /static to its local file path.
+
+    Args:
+        image_url: Stored SceneImage.image_url
+
+    Returns:
+        Local file path (unchanged for URLs outside /static)
+    """
+    if image_url.startswith("http://localhost:8000/static/"):
+        return image_url.replace("http://localhost:8000/static/", f"{settings.TEMP_DIR}/")
+    if image_url.startswith("/static/"):
+        return image_url.replace("/static/", f"{settings.TEMP_DIR}/")
+    return image_url
+
+
+async def build_scene_inputs(
+    db: AsyncSession,
+    project: VideoProject,
+    storyboard: Storyboard,
+) -> Tuple[List[SceneInput], str]:
+    """
+    Build SceneInput objects with ALL metadata fields from the storyboard.
+
+    Args:
+        db: Database session
+        project: Video project being rendered
+        storyboard: Active storyboard of the project
+
+    Returns:
+        Tuple of (scene inputs, brand/product context)
+    """
+    result = await db.execute(
+        select(SceneImage).where(
+            SceneImage.video_project_id == project.id,
+            SceneImage.is_active == True,
+        )
+    )
+    scene_images = {img.scene_number: img for img in result.scalars().all()}
+    logger.info(f"Found {len(scene_images)} scene images for project {project.id}: {list(scene_images.keys())}")
+
+    brand_product_context = await build_brand_product_context(db, project)
+    logger.info(f"Video generation context: {brand_product_context[:100]}...")
+
+    scenes = []
+    for scene in storyboard.scenes:
+        scene_num = scene.get("scene_number", 0)
+        scene_img = scene_images.get(scene_num)
+
+        # Read image data if available
+        image_data = None
+        if scene_img:
+            logger.info(f"Scene {scene_num}: Found SceneImage record, image_url={scene_img.image_url}")
+        else:
+            logger.warning(f"Scene {scene_num}: No SceneImage record found in scene_images dict")
+
+        if scene_img and scene_img.image_url:
+            try:
+                image_path = resolve_scene_image_path(scene_img.image_url)
+                if os.path.exists(image_path):
+                    image_data = BinaryImage.from_file(image_path, guess_mime_type(image_path))
+                    logger.info(f"Loaded scene {scene_num} image from: {image_path}")
+                else:
+                    logger.warning(f"Scene {scene_num} image file not found: {image_path}")
+            except Exception as e:
+                logger.warning(f"Failed to read scene image: {e}")
+
+        # Do NOT prepend brand context here - the PromptBuilder handles it
+        scene_description = scene.get("description", "") or scene.get("visual_direction", "") or scene.get("title", "")
+
+        scenes.append(SceneInput(
+            scene_number=scene_num,
+            description=scene_description,
+            duration_seconds=scene.get("duration_seconds", 3.0),
+            image_data=image_data,
+            scene_type=scene.get("scene_type") or scene.get("segment_type"),
+            narration_script=scene.get("narration_script") or scene.get("narration"),
+            visual_direction=scene.get("visual_direction"),
+            transition_effect=scene.get("transition_effect") or scene.get("transition"),
+            background_music_suggestion=scene.get("background_music_suggestion") or scene.get("music_mood"),
+            subtitle_text=scene.get("subtitle_text") or scene.get("overlay_text"),
+            title=scene.get("title"),
+        ))
+
+    return scenes, brand_product_context
+
+
+async def enqueue_video_generation_job(
+    db: AsyncSession,
+    project_id: str,
+    provider: str,
+    params: Optional[Dict[str, Any]] = None,
+    total_scenes: int = 0,
+    job_type: str = "per_scene",
+) -> VideoGenerationJob:
+    """
+    Add a video generation job to the queue.
+
+    The caller commits the session and then calls
+    ``get_video_job_worker_pool().notify()`` to wake up local workers.
+    """
+    job = VideoGenerationJob(
+        id=str(uuid.uuid4()),
+        video_project_id=project_id,
+        job_type=job_type,
+        status="queued",
+        provider=provider,
+        params=params or {},
+        total_scenes=total_scenes,
+        completed_scenes=0,
+        failed_scenes=0,
+        attempts=0,
+        max_attempts=3,
+    )
+    db.add(job)
+    await db.flush()
+    logger.info(f"Queued video generation job {job.id} for project {project_id}")
+    return job
+
+
+async def _get_active_scene_video(
+    db: AsyncSession,
+    project_id: str,
+    scene_number: int,
+) -> Optional[SceneVideo]:
+    result = await db.execute(
+        select(SceneVideo).where(
+            SceneVideo.video_project_id == project_id,
+            SceneVideo.scene_number == scene_number,
+            SceneVideo.is_active == True,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def save_scene_video_result(
+    db: AsyncSession,
+    job: VideoGenerationJob,
+    scene_result: SceneVideoResult,
+    scene_segment_type: Optional[str] = None,
+) -> SceneVideo:
+    """Create or update the active SceneVideo row for a scene result."""
+    scene_video = await _get_active_scene_video(db, job.video_project_id, scene_result.scene_number)
+    generation_params = {**(job.params or {}), "job_id": job.id}
+
+    if scene_video:
+        scene_video.status = scene_result.status
+        scene_video.video_url = scene_result.video_url
+        scene_video.thumbnail_url = scene_result.thumbnail_url
+        scene_video.duration_seconds = scene_result.duration_seconds
+        scene_video.operation_id = scene_result.operation_id
+        scene_video.error_message = scene_result.error_message
+        scene_video.generation_duration_ms = scene_result.generation_time_ms
+        scene_video.generation_prompt = scene_result.prompt_used
+        scene_video.generation_params = generation_params
+        if scene_segment_type:
+            scene_video.scene_segment_type = scene_segment_type
+    else:
+        scene_video = SceneVideo(
+            id=str(uuid.uuid4()),
+            video_project_id=job.video_project_id,
+            scene_number=scene_result.scene_number,
+            source=job.provider,
+            status=scene_result.status,
+            video_url=scene_result.video_url,
+            thumbnail_url=scene_result.thumbnail_url,
+            duration_seconds=scene_result.duration_seconds,
+            operation_id=scene_result.operation_id,
+            error_message=scene_result.error_message,
+            generation_duration_ms=scene_result.generation_time_ms,
+            generation_prompt=scene_result.prompt_used,
+            generation_provider=job.provider,
+            generation_params=generation_params,
+            scene_segment_type=scene_segment_type,
+            version=1,
+            is_active=True,
+        )
+        db.add(scene_video)
+
+    return scene_video
+
+
+async def _fail_processing_scenes(db: AsyncSession, job_id: str, error_message: str) -> None:
+    """Mark the scenes a failed job left in "processing" as failed, so clients stop polling them."""
+    job = await db.get(VideoGenerationJob, job_id)
+    if job is None:
+        return
+
+    result = await db.execute(
+        select(SceneVideo).where(
+            SceneVideo.video_project_id == job.video_project_id,
+            SceneVideo.is_active == True,
+            SceneVideo.status == "processing",
+        )
+    )
+    for scene_video in result.scalars().all():
+        if (scene_video.generation_params or {}).get("job_id") == job_id:
+            scene_video.status = "failed"
+            scene_video.error_message = error_message
+
+
+class VideoJobWorkerPool:
+    """
+    Pool of background workers executing queued video generation jobs.
+
+    Jobs are claimed from the database with a conditional UPDATE, so several
+    API processes can share one queue. Each running job sends heartbeats; jobs
+    whose heartbeat is older than ``stale_seconds`` are requeued.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        num_workers: Optional[int] = None,
+        poll_interval_seconds: Optional[float] = None,
+        heartbeat_seconds: Optional[float] = None,
+        stale_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            session_factory: Factory for database sessions (defaults to the app session factory)
+            num_workers: Maximum number of jobs run concurrently by this process
+            poll_interval_seconds: How often to look for jobs queued by other processes
+            heartbeat_seconds: How often running jobs report liveness
+            stale_seconds: Heartbeat age after which a processing job is requeued
+        """
+        self._session_factory = session_factory or async_session_factory
+        self.num_workers = settings.VIDEO_JOB_WORKERS if num_workers is None else num_workers
+        self.poll_interval_seconds = poll_interval_seconds or settings.VIDEO_JOB_POLL_INTERVAL_SECONDS
+        self.heartbeat_seconds = heartbeat_seconds or settings.VIDEO_JOB_HEARTBEAT_SECONDS
+        self.stale_seconds = stale_seconds or settings.VIDEO_JOB_STALE_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._running_jobs: Dict[str, asyncio.Task] = {}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running_jobs(self) -> List[str]:
+        """IDs of jobs currently executed by this pool."""
+        return list(self._running_jobs.keys())
+
+    async def start(self) -> None:
+        """Requeue abandoned jobs and start dispatching."""
+        if self.num_workers <= 0:
+            logger.info("Video job workers disabled in this process")
+            return
+
+        await self.recover_stale_jobs()
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        logger.info(f"Video job worker pool started: {self.worker_id}, workers={self.num_workers}")
+
+    async def stop(self) -> None:
+        """Stop dispatching and hand running jobs back to the queue."""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        job_ids = list(self._running_jobs.keys())
+        for task in self._running_jobs.values():
+            task.cancel()
+        if job_ids:
+            await asyncio.gather(*self._running_jobs.values(), return_exceptions=True)
+            async with self._session_factory() as db:
+                await db.execute(
+                    update(VideoGenerationJob)
+                    .where(
+                        VideoGenerationJob.id.in_(job_ids),
+                        VideoGenerationJob.status == "processing",
+                    )
+                    .values(status="queued", worker_id=None)
+                )
+                await db.commit()
+            logger.info(f"Requeued {len(job_ids)} running video job(s) on shutdown")
+
+    def notify(self) -> None:
+        """Wake up the dispatcher after a job was enqueued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def recover_stale_jobs(self) -> int:
+        """
+        Requeue processing jobs whose worker stopped sending heartbeats.
+
+        Jobs that already used all attempts are marked failed.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(VideoGenerationJob).where(
+                    VideoGenerationJob.status == "processing",
+                    (VideoGenerationJob.heartbeat_at == None) | (VideoGenerationJob.heartbeat_at < cutoff),
+                )
+            )
+            stale_jobs = [j for j in result.scalars().all() if j.id not in self._running_jobs]
+
+            for job in stale_jobs:
+                if job.attempts >= job.max_attempts:
+                    job.status = "failed"
+                    job.error_message = f"Worker lost after {job.attempts} attempt(s)"
+                    job.completed_at = datetime.utcnow()
+                    logger.warning(f"Video job {job.id} failed permanently: worker lost")
+                else:
+                    logger.warning(f"Requeued stale video job {job.id} (worker {job.worker_id})")
+                    job.status = "queued"
+                    job.worker_id = None
+
+            await db.commit()
+            return len(stale_jobs)
+
+    async def _claim_next_job(self) -> Optional[str]:
+        """Atomically claim the oldest queued job, if any."""
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(VideoGenerationJob.id)
+                .where(VideoGenerationJob.status == "queued")
+                .order_by(VideoGenerationJob.created_at)
+                .limit(5)
+            )
+            for job_id in result.scalars().all():
+                now = datetime.utcnow()
+                claimed = await db.execute(
+                    update(VideoGenerationJob)
+                    .where(
+                        VideoGenerationJob.id == job_id,
+                        VideoGenerationJob.status == "queued",
+                    )
+                    .values(
+                        status="processing",
+                        worker_id=self.worker_id,
+                        attempts=VideoGenerationJob.attempts + 1,
+                        started_at=now,
+                        heartbeat_at=now,
+                    )
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    return job_id
+        return None
+
+    async def _dispatch_loop(self) -> None:
+        last_recovery = time.monotonic()
+        while True:
+            try:
+                if time.monotonic() - last_recovery > self.stale_seconds:
+                    await self.recover_stale_jobs()
+                    last_recovery = time.monotonic()
+
+                while len(self._running_jobs) < self.num_workers:
+                    job_id = await self._claim_next_job()
+                    if not job_id:
+                        break
+                    task = asyncio.create_task(self._run_job(job_id))
+                    self._running_jobs[job_id] = task
+                    task.add_done_callback(lambda _t, j=job_id: self._on_job_done(j))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Video job dispatcher error: {str(e)}", exc_info=True)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_job_done(self, job_id: str) -> None:
+        self._running_jobs.pop(job_id, None)
+        self.notify()
+
+    async def _heartbeat_loop(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                async with self._session_factory() as db:
+                    await db.execute(
+                        update(VideoGenerationJob)
+                        .where(VideoGenerationJob.id == job_id)
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Heartbeat for video job {job_id} failed: {str(e)}")
+
+    async def _run_job(self, job_id: str) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job_id))
+        try:
+            await self.process_job(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Video job {job_id} failed: {str(e)}", exc_info=True)
+            async with self._session_factory() as db:
+                await db.execute(
+                    update(VideoGenerationJob)
+                    .where(VideoGenerationJob.id == job_id)
+                    .values(status="failed", error_message=str(e), completed_at=datetime.utcnow())
+                )
+                await _fail_processing_scenes(db, job_id, str(e))
+                await db.commit()
+        finally:
+            heartbeat.cancel()
+
+    async def process_job(self, job_id: str) -> None:
+        """
+        Execute a claimed job and persist its results.
+
+        Scenes already completed by an earlier attempt of the same job
+        are not generated again.
+        """
+        async with self._session_factory() as db:
+            job = await db.get(VideoGenerationJob, job_id)
+            if job is None:
+                logger.warning(f"Video job {job_id} no longer exists")
+                return
+
+            project = await db.get(VideoProject, job.video_project_id)
+            result = await db.execute(
+                select(Storyboard).where(
+                    Storyboard.video_project_id == job.video_project_id,
+                    Storyboard.is_active == True,
+                )
+            )
+            storyboard = result.scalar_one_or_none()
+
+            if not project or not storyboard or not storyboard.scenes:
+                job.status = "failed"
+                job.error_message = "Project or active storyboard not found"
+                job.completed_at = datetime.utcnow()
+                await db.commit()
+                return
+
+            scenes, brand_context = await build_scene_inputs(db, project, storyboard)
+            segment_types = {
+                s.get("scene_number", 0): s.get("scene_type") or s.get("segment_type")
+                for s in storyboard.scenes
+            }
+
+            # Resume: keep scenes completed by an earlier attempt of this job
+            pending_scenes = []
+            already_completed = 0
+            for scene in scenes:
+                existing = await _get_active_scene_video(db, job.video_project_id, scene.scene_number)
+                if (
+                    existing
+                    and existing.status == "completed"
+                    and (existing.generation_params or {}).get("job_id") == job.id
+                ):
+                    already_completed += 1
+                    continue
+                pending_scenes.append(scene)
+                await save_scene_video_result(
+                    db,
+                    job,
+                    SceneVideoResult(scene_number=scene.scene_number, status="processing"),
+                    scene_segment_type=segment_types.get(scene.scene_number),
+                )
+
+            job.total_scenes = len(scenes)
+            job.completed_scenes = already_completed
+            job.failed_scenes = 0
+            await db.commit()
+
+            aspect_ratio = (job.params or {}).get("aspect_ratio", "16:9")
+
+        logger.info(
+            f"Running video job {job_id}: {len(pending_scenes)} scene(s) to generate, "
+            f"{already_completed} already completed"
+        )
+
+        async def persist_scene_result(scene_result: SceneVideoResult) -> None:
+            async with self._session_factory() as scene_db:
+                scene_job = await scene_db.get(VideoGenerationJob, job_id)
+                await save_scene_video_result(
+                    scene_db,
+                    scene_job,
+                    scene_result,
+                    scene_segment_type=segment_types.get(scene_result.scene_number),
+                )
+                counter = None
+                if scene_result.status == "completed":
+                    counter = {"completed_scenes": VideoGenerationJob.completed_scenes + 1}
+                elif scene_result.status == "failed":
+                    counter = {"failed_scenes": VideoGenerationJob.failed_scenes + 1}
+                await scene_db.execute(
+                    update(VideoGenerationJob)
+                    .where(VideoGenerationJob.id == job_id)
+                    .values(heartbeat_at=datetime.utcnow(), **(counter or {}))
+                )
+                await scene_db.commit()
+
+        if pending_scenes:
+            generator = get_video_generator(job.provider)
+            generation_result = await generator.generate_per_scene_videos(
+                scenes=pending_scenes,
+                brand_context=brand_context,
+                aspect_ratio=aspect_ratio,
+                on_scene_result=persist_scene_result,
+            )
+            error_message = generation_result.error_message
+        else:
+            error_message = None
+
+        async with self._session_factory() as db:
+            job = await db.get(VideoGenerationJob, job_id)
+            project = await db.get(VideoProject, job.video_project_id)
+
+            if job.completed_scenes >= job.total_scenes:
+                job.status = "completed"
+            elif job.completed_scenes > 0:
+                job.status = "partial"
+            else:
+                job.status = "failed"
+
+            still_processing = job.total_scenes - job.completed_scenes - job.failed_scenes
+            if still_processing > 0 and job.status != "completed":
+                error_message = f"{still_processing} scene(s) still processing at the provider"
+
+            job.error_message = error_message if job.status != "completed" else None
+            job.completed_at = datetime.utcnow()
+
+            # Update project status if all scenes completed
+            if job.status == "completed" and project:
+                project.status = "video_generated"
+
+            await db.commit()
+            logger.info(
+                f"Video job {job_id} finished: {job.status} "
+                f"({job.completed_scenes}/{job.total_scenes} scenes)"
+            )
+
+
+# Singleton instance
+_worker_pool: Optional[VideoJobWorkerPool] = None
+
+
+def get_video_job_worker_pool() -> VideoJobWorkerPool:
+    """Get or create the process-wide video job worker pool."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = VideoJobWorkerPool()
+    return _worker_pool
+
+
+__all__ = [
+    "VideoJobWorkerPool",
+    "build_brand_product_context",
+    "build_scene_inputs",
+    "enqueue_video_generation_job",
+    "get_video_job_worker_pool",
+    "resolve_scene_image_path",
+    "save_scene_video_result",
+    "TERMINAL_JOB_STATUSES",
+]
@@ -0,0 +1,182 @@
+"""
+Streaming ZIP Export of Generated Images.
+
+Builds a ZIP archive as it is sent: images are fetched concurrently in a
+small sliding window (local files from disk, remote blobs through the shared
+HTTP client), then written to the archive in order and yielded chunk by
+chunk. At most EXPORT_ZIP_PREFETCH images are held in memory at a time,
+never the whole archive.
+"""
+
+import asyncio
+import logging
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Set
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.services.image_cache import ImageByteCache
+
+logger = logging.getLogger(__name__)
+
+KB = 1024
+
+
+@dataclass
+class ZipEntry:
+    """One file of the archive."""
+
+    name: str  # Path inside the archive
+    url: str  # Image URL or local path
+
+
+class _ChunkBuffer:
+    """Write-only file object the ZIP writer emits into; drained after each write."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def load_export_image(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[bytes]:
+    """
+    Load one image for an export.
+
+    Bypasses the image cache so exports do not evict source images.
+
+    Args:
+        url: Image URL (localhost/static URL, remote URL or file path).
+        client: HTTP client for remote images. Defaults to the shared client.
+
+    Returns:
+        Image bytes, or None if the image could not be loaded.
+    """
+    local_path = ImageByteCache.resolve_local_path(url)
+    try:
+        if local_path is not None:
+            return await asyncio.to_thread(_read_file, local_path)
+        response = await (client or get_http_client()).get(url)
+        if response.status_code != 200:
+            logger.warning(f"Export skipped image: HTTP {response.status_code} - {url}")
+            return None
+        return response.content
+    except (OSError, httpx.HTTPError) as e:
+        logger.warning(f"Export skipped image: {e} - {url}")
+        return None
+
+
+async def stream_zip(
+    entries: List[ZipEntry],
+    client: Optional[httpx.AsyncClient] = None,
+    prefetch: Optional[int] = None,
+    compression_level: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive of images.
+
+    Images that cannot be loaded are left out of the archive. Repeated names
+    get a counter ("a.png", "a_2.png") so no entry overwrites another on unzip.
+
+    Args:
+        entries: Files of the archive, in order.
+        client: HTTP client for remote images. Defaults to the shared client.
+        prefetch: Images fetched ahead of the writer. Defaults to EXPORT_ZIP_PREFETCH.
+        compression_level: Deflate level 1-9; 0 stores files uncompressed
+            (JPEG/PNG barely compress). Defaults to EXPORT_ZIP_COMPRESSION_LEVEL.
+        chunk_size: Size of the pieces each image is written in.
+
+    Yields:
+        Consecutive chunks of the archive.
+    """
+    prefetch = max(1, prefetch or settings.EXPORT_ZIP_PREFETCH)
+    if compression_level is None:
+        compression_level = settings.EXPORT_ZIP_COMPRESSION_LEVEL
+    chunk_size = chunk_size or settings.DOWNLOAD_CHUNK_SIZE_KB * KB
+    compress_type = zipfile.ZIP_DEFLATED if compression_level > 0 else zipfile.ZIP_STORED
+
+    pending = iter(entries)
+    window: deque = deque()
+
+    def schedule_next() -> None:
+        entry = next(pending, None)
+        if entry is not None:
+            window.append((entry, asyncio.create_task(load_export_image(entry.url, client))))
+
+    buffer = _ChunkBuffer()
+    archive = zipfile.ZipFile(
+        buffer,
+        mode="w",
+        compression=compress_type,
+        compresslevel=compression_level if compress_type == zipfile.ZIP_DEFLATED else None,
+    )
+    written = 0
+    used_names: Set[str] = set()
+    try:
+        for _ in range(prefetch):
+            schedule_next()
+
+        while window:
+            entry, task = window.popleft()
+            data = await task
+            schedule_next()
+            if data is None:
+                continue
+
+            with archive.open(_unique_name(entry.name, used_names), mode="w") as f:
+                for offset in range(0, len(data), chunk_size):
+                    f.write(data[offset:offset + chunk_size])
+                    chunk = buffer.drain()
+                    if chunk:
+                        yield chunk
+            written += 1
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+
+        archive.close()
+        yield buffer.drain()
+        logger.info(f"ZIP export finished: {written}/{len(entries)} images")
+    finally:
+        for _, task in window:
+            task.cancel()
+
+
+def _unique_name(name: str, used: Set[str]) -> str:
+    """name, or name with a counter before the extension if it is already used."""
+    stem, dot, extension = name.rpartition(".")
+    if not dot:
+        stem, extension = name, ""
+    candidate, counter = name, 1
+    while candidate in used:
+        counter += 1
+        candidate = f"{stem}_{counter}{dot}{extension}"
+    used.add(candidate)
+    return candidate
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+__all__ = [
+    "ZipEntry",
+    "load_export_image",
+    "stream_zip",
+]
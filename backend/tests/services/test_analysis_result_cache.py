@@ -0,0 +1,146 @@
+"""
+Tests for the reference analysis result cache.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.reference_analysis import ReferenceAnalysis
+from app.services.reference_analyzer.analyzer import ReferenceAnalyzer
+from app.services.reference_analyzer.result_cache import (
+    AnalysisResultCache,
+    canonical_source_url,
+    copy_result,
+    hash_media,
+    result_from_analysis,
+    source_url_cache_key,
+)
+
+
+def _analysis(hours_ago: float, status: str = "completed", **kwargs) -> ReferenceAnalysis:
+    return ReferenceAnalysis(
+        id=str(uuid.uuid4()),
+        source_url="https://youtu.be/abc123",
+        canonical_url_hash=source_url_cache_key("https://youtu.be/abc123"),
+        title="Cached reference",
+        status=status,
+        analyzed_at=datetime.utcnow() - timedelta(hours=hours_ago),
+        segments=[{"segment_type": "hook", "start_time": 0, "end_time": 3}],
+        hook_points=[{"timestamp": "0:00", "hook_type": "question", "effectiveness_score": 0.9}],
+        **kwargs,
+    )
+
+
+class TestCanonicalSourceUrl:
+    """Test suite for canonical_source_url."""
+
+    def test_share_links_map_to_one_key(self):
+        video = "https://www.youtube.com/watch?v=abc123"
+        assert canonical_source_url("https://youtu.be/abc123?si=share") == video
+        assert canonical_source_url("https://m.youtube.com/watch?feature=share&v=abc123") == video
+        assert canonical_source_url("https://youtube.com/shorts/abc123") == video
+
+        post = "https://www.instagram.com/p/C1x_Y-z/"
+        assert canonical_source_url("https://www.instagram.com/reel/C1x_Y-z/?igsh=abc") == post
+        assert canonical_source_url("instagram.com/p/C1x_Y-z") == post
+
+        assert canonical_source_url("https://pinterest.com/pin/12345/") == "https://www.pinterest.com/pin/12345/"
+
+    def test_other_urls_are_normalized(self):
+        assert (
+            canonical_source_url("HTTP://WWW.Example.com/ads/video/?utm_source=x&b=2&a=1#top")
+            == "https://example.com/ads/video?a=1&b=2"
+        )
+
+    def test_url_cache_keys(self):
+        long_url = "https://example.com/ads/" + "a" * 900
+        assert source_url_cache_key("https://youtu.be/abc123?si=x") == source_url_cache_key("youtube.com/shorts/abc123")
+        assert len(source_url_cache_key(long_url)) == 64  # Fits the column whatever the URL length
+        # Uploads are only matched by content, never by their storage URLs
+        assert source_url_cache_key("upload://https://cdn/a.jpg;https://cdn/b.jpg") is None
+
+    def test_hash_media(self, tmp_path):
+        video = tmp_path / "video.mp4"
+        video.write_bytes(b"video" * 1000)
+
+        assert hash_media([str(video)]) == hash_media([b"video" * 1000])
+        assert hash_media([b"a", b"b"]) != hash_media([b"b", b"a"])  # Carousel order matters
+        assert hash_media([b"ab"]) != hash_media([b"a", b"b"])
+
+
+class TestAnalysisResultCache:
+    """Test suite for AnalysisResultCache lookups."""
+
+    @pytest.mark.asyncio
+    async def test_url_hits_respect_ttl_and_status(self, session_factory):
+        cache = AnalysisResultCache(enabled=True, ttl_hours=24, content_ttl_hours=720)
+        fresh, stale, failed = _analysis(1), _analysis(48), _analysis(0.5, status="failed")
+        async with session_factory() as db:
+            db.add_all([fresh, stale, failed])
+            await db.commit()
+
+            url_key = source_url_cache_key("https://www.youtube.com/watch?v=abc123")
+            hit = await cache.find_by_url(db, url_key)
+            assert hit.id == fresh.id
+            assert await cache.find_by_url(db, url_key, exclude_id=fresh.id) is None
+            assert await cache.find_by_url(db, source_url_cache_key("https://www.youtube.com/watch?v=other")) is None
+
+            disabled = AnalysisResultCache(enabled=False)
+            assert await disabled.find_by_url(db, url_key) is None
+
+    @pytest.mark.asyncio
+    async def test_content_hits_outlive_url_ttl(self, session_factory):
+        cache = AnalysisResultCache(enabled=True, ttl_hours=24, content_ttl_hours=720)
+        original = _analysis(48, content_hash="f" * 64)
+        async with session_factory() as db:
+            db.add(original)
+            await db.commit()
+
+            assert await cache.find_by_url(db, original.canonical_url_hash) is None
+            assert (await cache.find_by_content(db, "f" * 64)).id == original.id
+
+    def test_copies_keep_original_analysis_time(self):
+        original = _analysis(3, content_hash="f" * 64, images=["https://cdn/1.jpg"])
+        copy = ReferenceAnalysis(id=str(uuid.uuid4()), source_url="x", title="t", status="pending")
+
+        copy_result(original, copy)
+
+        assert copy.status == "completed"
+        assert copy.analyzed_at == original.analyzed_at
+        assert copy.content_hash == original.content_hash
+        assert copy.segments == original.segments and copy.images == original.images
+        assert result_from_analysis(original)["reference_name"] == "Cached reference"
+
+
+class TestAnalyzerReusesDownloadedMediaResult:
+    """ReferenceAnalyzer.analyze skips frames and Gemini when on_content_hash returns a result."""
+
+    @pytest.mark.asyncio
+    async def test_on_content_hash_short_circuits(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "REFERENCE_STREAM_DOWNLOADS", False)
+        video = tmp_path / "video.mp4"
+        video.write_bytes(b"video")
+        analyzer = ReferenceAnalyzer()
+
+        async def download(url):
+            return str(video)
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("should not run on a cache hit")
+
+        monkeypatch.setattr(analyzer, "_download_video", download)
+        monkeypatch.setattr(analyzer, "_get_metadata", fail)
+        seen = []
+
+        async def on_content_hash(content_hash):
+            seen.append(content_hash)
+            return {"segments": ["cached"]}
+
+        result = await analyzer.analyze("https://youtu.be/abc123", on_content_hash=on_content_hash)
+
+        assert result == {"segments": ["cached"]}
+        assert seen == [hash_media([b"video"])]
+        assert not video.exists()  # Downloaded file is still cleaned up
@@ -0,0 +1,121 @@
+"""
+Tests for the AnimaticRenderer preview engine.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.services.video_generator.animatic_renderer import AnimaticRenderer, AnimaticScene
+from app.services.video_generator.ffmpeg_limiter import FFmpegLimiter
+
+
+class _FakeFFmpeg:
+    """Records ffmpeg invocations and writes the output file."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    async def __call__(self, args, on_progress=None):
+        self.calls.append(args)
+        if self.fail:
+            return False, "FFmpeg error: boom"
+        Path(args[-1]).write_bytes(b"mp4")
+        return True, None
+
+    def filter_complex(self, call=-1):
+        args = self.calls[call]
+        return args[args.index("-filter_complex") + 1]
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    return AnimaticRenderer(output_dir=str(tmp_path / "out"), ffmpeg_limiter=FFmpegLimiter(1))
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = []
+    for name in ("a.png", "b.png"):
+        path = tmp_path / name
+        path.write_bytes(b"image-" + name.encode())
+        paths.append(str(path))
+    return paths
+
+
+class TestAnimaticRenderer:
+    """Test suite for animatic rendering."""
+
+    @pytest.mark.asyncio
+    async def test_renders_ken_burns_slideshow(self, renderer, images, monkeypatch):
+        fake = _FakeFFmpeg()
+        monkeypatch.setattr(renderer, "_run_ffmpeg", fake)
+        scenes = [
+            AnimaticScene(duration_seconds=3, image_path=images[0], transition_effect="fade"),
+            AnimaticScene(duration_seconds=4, image_path=images[1]),
+        ]
+
+        result = await renderer.render(scenes, aspect_ratio="9:16")
+
+        assert result.status == "completed"
+        assert result.video_url.startswith("http://localhost:8000/uploads/videos/animatic_")
+        assert result.duration_seconds == pytest.approx(6.5)
+        filter_complex = fake.filter_complex()
+        assert filter_complex.count("zoompan=") == 2
+        assert "s=270x480" in filter_complex
+        assert "xfade=transition=fade:duration=0.500:offset=2.500[outv]" in filter_complex
+        args = fake.calls[0]
+        assert "-an" in args
+        assert args[args.index("-preset") + 1] == "ultrafast"
+        assert list(Path(renderer.output_dir).glob("*.partial.mp4")) == []
+
+    @pytest.mark.asyncio
+    async def test_cut_and_missing_images(self, renderer, images, monkeypatch):
+        fake = _FakeFFmpeg()
+        monkeypatch.setattr(renderer, "_run_ffmpeg", fake)
+        scenes = [
+            AnimaticScene(duration_seconds=2, image_path=None, transition_effect="cut"),
+            AnimaticScene(duration_seconds=2, image_path=images[0], transition_effect="wipeleft"),
+            AnimaticScene(duration_seconds=0.4, image_path=images[1]),
+        ]
+
+        result = await renderer.render(scenes, transition_duration_ms=1000)
+
+        filter_complex = fake.filter_complex()
+        assert "color=c=" in " ".join(fake.calls[0])
+        assert "[s0][s1]concat=n=2:v=1:a=0" in filter_complex
+        # Transition clamped to half of the shortest neighbouring scene
+        assert "xfade=transition=wipeleft:duration=0.200:offset=3.800" in filter_complex
+        assert result.duration_seconds == pytest.approx(4.2)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_storyboard_is_served_from_cache(self, renderer, images, monkeypatch):
+        fake = _FakeFFmpeg()
+        monkeypatch.setattr(renderer, "_run_ffmpeg", fake)
+        scenes = [AnimaticScene(duration_seconds=3, image_path=images[0])]
+
+        first = await renderer.render(scenes)
+        second = await renderer.render(scenes)
+        assert len(fake.calls) == 1
+        assert second.video_url == first.video_url
+
+        # Changing timing produces a new preview
+        third = await renderer.render([AnimaticScene(duration_seconds=5, image_path=images[0])])
+        assert len(fake.calls) == 2
+        assert third.video_url != first.video_url
+
+    @pytest.mark.asyncio
+    async def test_failed_render(self, renderer, images, monkeypatch):
+        monkeypatch.setattr(renderer, "_run_ffmpeg", _FakeFFmpeg(fail=True))
+
+        result = await renderer.render([AnimaticScene(duration_seconds=3, image_path=images[0])])
+
+        assert result.status == "failed"
+        assert "boom" in result.error_message
+        assert list(Path(renderer.output_dir).iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_no_scenes(self, renderer):
+        result = await renderer.render([])
+        assert result.status == "failed"
@@ -351,3 +351,96 @@ class TestBatchPerformance:
             results = await generator.generate_batch(images)
 
             assert len(results) == 50
+
+
+class TestSlideBatchGeneration:
+    """Test suite for slide batches (the /generate-background engine)."""
+
+    @pytest.mark.asyncio
+    async def test_item_updates_and_retries(self):
+        """Test that items report status changes and failed calls are retried."""
+        from app.services.slide_scheduler import build_slide_tasks
+
+        generator = BatchImageGenerator(config=BatchConfig(max_concurrent_jobs=4, max_retries=1))
+        generator.RETRY_DELAY_SECONDS = 0
+        attempts = {}
+        updates = []
+
+        async def generate(task, previous):
+            attempts[task.key] = attempts.get(task.key, 0) + 1
+            if task.key == (1, 1) and attempts[task.key] == 1:
+                raise RuntimeError("transient")
+            if task.key == (2, 0):
+                raise RuntimeError("permanent")
+            return f"image-{task.key}"
+
+        async def on_item_update(task, item, output):
+            updates.append((task.key, item.status, output))
+
+        outputs = await generator.generate_slide_batch(
+            build_slide_tasks(2, 2, chained=False),
+            generate,
+            batch_id="batch-items",
+            on_item_update=on_item_update,
+        )
+
+        assert outputs[(1, 1)] == "image-(1, 1)"
+        assert outputs[(2, 0)] is None
+        assert attempts[(2, 0)] == 2
+        assert ((1, 0), BatchJobStatus.PROCESSING, None) in updates
+        assert ((1, 0), BatchJobStatus.COMPLETED, "image-(1, 0)") in updates
+        assert ((2, 0), BatchJobStatus.FAILED, None) in updates
+
+        progress = generator.get_batch_progress("batch-items")
+        assert progress["status"] == "completed"
+        assert progress["status_counts"]["completed"] == 3
+        assert progress["status_counts"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_batch_cancels_in_flight_calls(self):
+        """Test that cancel_batch stops running generation calls."""
+        from app.services.batch_image_generator import BatchCancelledError
+        from app.services.slide_scheduler import build_slide_tasks
+
+        generator = BatchImageGenerator(config=BatchConfig(max_concurrent_jobs=2))
+        started = asyncio.Event()
+        cancelled = []
+
+        async def generate(task, previous):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(task.key)
+                raise
+            return "image"
+
+        run = asyncio.create_task(
+            generator.generate_slide_batch(build_slide_tasks(3, 2, chained=False), generate, batch_id="batch-cancel")
+        )
+        await started.wait()
+
+        assert generator.is_running("batch-cancel")
+        assert await generator.cancel_batch("batch-cancel") is True
+        with pytest.raises(BatchCancelledError):
+            await asyncio.wait_for(run, timeout=1)
+
+        assert len(cancelled) == 2
+        progress = generator.get_batch_progress("batch-cancel")
+        assert progress["status"] == "cancelled"
+        assert progress["status_counts"]["cancelled"] == 6
+        assert await generator.cancel_batch("batch-cancel") is False
+
+    @pytest.mark.asyncio
+    async def test_finished_batches_are_evicted(self):
+        """Test that finished batches do not accumulate forever."""
+        generator = BatchImageGenerator()
+        generator.FINISHED_BATCH_RETENTION_SECONDS = 0
+
+        with patch.object(generator, '_generate_single_image', new_callable=AsyncMock) as mock_gen:
+            mock_gen.return_value = {"image_data": "base64", "status": "completed"}
+            await generator.generate_batch([{"product_name": "Product"}], batch_id="batch-old")
+
+        await asyncio.sleep(0.01)
+        assert generator.get_batch_progress("batch-old")["status"] == "not_found"
+        assert generator._active_batches == {}
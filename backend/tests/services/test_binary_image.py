@@ -0,0 +1,70 @@
+"""
+Tests for the binary image type used between generators and storage.
+"""
+
+import base64
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from app.services.binary_image import BinaryImage, first_inline_image, image_from_inline_data
+from app.services.image_editor import GeminiImageEditor
+
+
+def _png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _part(data, mime_type="image/png"):
+    return SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type=mime_type))
+
+
+class TestBinaryImage:
+    """Test suite for BinaryImage."""
+
+    def test_base64_only_at_the_edge(self):
+        png = _png_bytes()
+        image = BinaryImage(png, "image/png")
+
+        assert len(image) == len(png)
+        assert image.to_bytes() is png  # No copy for bytes
+        assert BinaryImage(memoryview(png)).to_bytes() == png
+        assert BinaryImage.from_base64(image.to_base64()).data == png
+        assert BinaryImage.from_base64(f"data:image/jpeg;base64,{image.to_base64()}").mime_type == "image/jpeg"
+        assert image.to_pil().size == (4, 4)
+
+    def test_inline_data_is_decoded_once(self):
+        png = _png_bytes()
+
+        assert image_from_inline_data(png, "image/png").data is png
+        # Some SDK responses carry base64 text instead of raw bytes
+        assert image_from_inline_data(base64.b64encode(png), "image/png").data == png
+        assert image_from_inline_data(base64.b64encode(png).decode(), None).data == png
+        assert image_from_inline_data(None) is None
+
+        parts = [SimpleNamespace(inline_data=None, text="caption"), _part(png, "image/jpeg")]
+        image = first_inline_image(parts)
+        assert image.data is png and image.mime_type == "image/jpeg"
+        assert first_inline_image([]) is None
+
+
+class TestGeneratorsReturnBinary:
+    """Generators hand raw bytes to callers instead of base64."""
+
+    @pytest.mark.asyncio
+    async def test_image_editor(self):
+        png = _png_bytes()
+        editor = GeminiImageEditor()
+        editor.client = SimpleNamespace(models=SimpleNamespace(
+            generate_content=lambda **kwargs: SimpleNamespace(parts=[_part(png, "image/jpeg")]),
+        ))
+
+        result = await editor.compose_scene(product_image_data=png, product_mime_type="image/png")
+
+        assert isinstance(result["image_data"], BinaryImage)
+        assert result["image_data"].data is png
+        assert result["mime_type"] == "image/jpeg"
@@ -0,0 +1,215 @@
+"""
+Tests for the async upload API of CloudStorageService.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.cloud_storage import CloudStorageService, UploadRequest
+from app.services.storage import LocalStorageDriver
+from app.services.storage.cos_driver import CosStorageDriver
+
+
+class _FakeCosClient:
+    """Records COS calls; put_object and upload_part block like the real SDK."""
+
+    def __init__(self, delay=0.0, fail_part=None):
+        self.delay = delay
+        self.fail_part = fail_part
+        self.objects = {}
+        self.parts = {}
+        self.threads = set()
+        self.completed = None
+        self.aborted = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        self.threads.add(threading.current_thread().name)
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+    def put_object(self, Bucket, Body, Key, ContentType):
+        self._enter()
+        self.objects[Key] = Body.read()
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, Body, PartNumber, UploadId):
+        self._enter()
+        if PartNumber == self.fail_part:
+            raise RuntimeError("part failed")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = MultipartUpload["Part"]
+        self.objects[Key] = b"".join(self.parts[p["PartNumber"]] for p in self.completed)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(UploadId)
+
+
+def _cos_service(client, **kwargs):
+    driver = CosStorageDriver(bucket="bucket", region="ap-seoul", client=client)
+    return CloudStorageService(driver=driver, **kwargs)
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TEMP_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestAsyncUploads:
+    """Test suite for non-blocking uploads."""
+
+    @pytest.mark.asyncio
+    async def test_upload_runs_off_the_event_loop(self):
+        client = _FakeCosClient(delay=0.2)
+        service = _cos_service(client, max_workers=2)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        url = await service.upload_bytes_async(b"image", "a.jpg", "generated")
+        ticking.cancel()
+        service.shutdown()
+
+        assert url == "https://bucket.cos.ap-seoul.myqcloud.com/generated/a.jpg"
+        assert client.objects["generated/a.jpg"] == b"image"
+        assert all(name.startswith("cloud-storage") for name in client.threads)
+        assert ticks >= 10  # The loop kept running during the upload
+
+    @pytest.mark.asyncio
+    async def test_upload_many_is_concurrent_and_bounded(self):
+        client = _FakeCosClient(delay=0.05)
+        service = _cos_service(client, max_workers=3)
+
+        urls = await service.upload_many_async([
+            UploadRequest(f"img-{i}".encode(), f"{i}.jpg", "references") for i in range(9)
+        ])
+        service.shutdown()
+
+        assert urls == [f"https://bucket.cos.ap-seoul.myqcloud.com/references/{i}.jpg" for i in range(9)]
+        assert client.max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_local_fallback(self, local_storage):
+        service = CloudStorageService(max_workers=1, driver=LocalStorageDriver(str(local_storage)))
+
+        url = await service.upload_bytes_async(b"local", "b.png", "generated")
+
+        assert url == "/static/generated/b.png"
+        assert (local_storage / "generated" / "b.png").read_bytes() == b"local"
+
+
+class TestMultipartUploads:
+    """Test suite for multipart uploads of large objects."""
+
+    @pytest.mark.asyncio
+    async def test_large_bytes_are_uploaded_in_parts(self):
+        client = _FakeCosClient(delay=0.02)
+        service = _cos_service(client, max_workers=4, multipart_threshold=10, part_size=4)
+        data = b"0123456789abcdef!"
+
+        url = await service.upload_bytes_async(data, "big.bin", "videos")
+        service.shutdown()
+
+        assert url.endswith("/videos/big.bin")
+        assert [p["PartNumber"] for p in client.completed] == [1, 2, 3, 4, 5]
+        assert client.objects["videos/big.bin"] == data
+        assert client.max_active == 2  # Half of the pool per multipart upload
+
+    @pytest.mark.asyncio
+    async def test_large_file_is_streamed_in_parts(self, tmp_path):
+        client = _FakeCosClient()
+        service = _cos_service(client, max_workers=2, multipart_threshold=8, part_size=5)
+        video = tmp_path / "video.mp4"
+        video.write_bytes(b"x" * 12)
+
+        await service.upload_file_async(str(video), "video.mp4", "videos")
+
+        assert len(client.completed) == 3
+        assert client.objects["videos/video.mp4"] == b"x" * 12
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_and_falls_back(self, local_storage):
+        client = _FakeCosClient(fail_part=2)
+        service = _cos_service(client, max_workers=2, multipart_threshold=4, part_size=4)
+
+        url = await service.upload_bytes_async(b"abcdefghij", "c.bin", "videos")
+
+        assert client.aborted == ["upload-1"]
+        assert url == "/static/videos/c.bin"
+        assert (local_storage / "videos" / "c.bin").read_bytes() == b"abcdefghij"
+
+
+class TestDeduplicatedUploads:
+    """Test suite for content-addressed uploads."""
+
+    @pytest.fixture
+    def index_path(self, tmp_path, monkeypatch):
+        path = tmp_path / "index" / "blobs.sqlite3"
+        monkeypatch.setattr(settings, "BLOB_INDEX_PATH", str(path))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_uploaded_once(self, index_path):
+        client = _FakeCosClient(delay=0.05)
+        client.object_exists = lambda Bucket, Key: Key in client.objects
+        service = _cos_service(client)
+
+        urls = await service.upload_many_async([
+            UploadRequest(b"same image", folder="references"),
+            UploadRequest(b"same image", folder="references"),
+            UploadRequest(b"other image", folder="references", content_type="image/png"),
+        ])
+        again = await service.upload_deduplicated_async(b"same image", "references")
+
+        assert urls[0] == urls[1] == again
+        assert urls[0].endswith(".jpg") and urls[2].endswith(".png")
+        assert len(client.objects) == 2
+        assert index_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_lost_index_is_rebuilt_from_storage(self, index_path):
+        client = _FakeCosClient()
+        client.object_exists = lambda Bucket, Key: Key in client.objects
+        first = await _cos_service(client).upload_deduplicated_async(b"product", "products")
+
+        index_path.unlink()
+        uploads = []
+        client.put_object = lambda **kwargs: uploads.append(kwargs)
+        second = await _cos_service(client).upload_deduplicated_async(b"product", "products")
+
+        assert second == first
+        assert uploads == []
+
+    @pytest.mark.asyncio
+    async def test_local_storage_reuploads_missing_files(self, index_path, local_storage):
+        service = CloudStorageService(driver=LocalStorageDriver(str(local_storage)))
+
+        url = await service.upload_deduplicated_async(b"ref", "references")
+        stored = local_storage / url.removeprefix("/static/")
+        assert stored.read_bytes() == b"ref"
+
+        stored.unlink()
+        assert await service.upload_deduplicated_async(b"ref", "references") == url
+        assert stored.read_bytes() == b"ref"
@@ -0,0 +1,62 @@
+"""
+Tests for the process-wide ffmpeg limiter.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from app.services.video_generator.ffmpeg_limiter import FFmpegLimiter
+from app.services.video_generator.video_concatenator import VideoConcatenator
+
+
+class TestFFmpegLimiter:
+    """Test suite for FFmpegLimiter."""
+
+    def test_rejects_zero_jobs(self):
+        with pytest.raises(ValueError):
+            FFmpegLimiter(max_concurrent_jobs=0)
+
+    def test_thread_args(self):
+        assert FFmpegLimiter(max_concurrent_jobs=1, threads_per_job=3).thread_args() == ["-threads", "3"]
+        assert FFmpegLimiter(max_concurrent_jobs=1, threads_per_job=0).thread_args() == []
+
+    @pytest.mark.asyncio
+    async def test_slot_caps_concurrency(self):
+        limiter = FFmpegLimiter(max_concurrent_jobs=2)
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[job() for _ in range(6)])
+
+        assert peak == 2
+        assert limiter.active == 0
+
+    @pytest.mark.asyncio
+    async def test_run_ffmpeg_applies_thread_limit(self, tmp_path):
+        # A python script stands in for ffmpeg and records its arguments
+        fake_ffmpeg = tmp_path / "ffmpeg"
+        fake_ffmpeg.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            "open(sys.argv[-1], 'w').write(' '.join(sys.argv[1:-1]))\n"
+        )
+        fake_ffmpeg.chmod(0o755)
+        limiter = FFmpegLimiter(max_concurrent_jobs=1, threads_per_job=2)
+        concatenator = VideoConcatenator(
+            output_dir=str(tmp_path / "out"),
+            ffmpeg_path=str(fake_ffmpeg),
+            ffmpeg_limiter=limiter,
+        )
+        output = tmp_path / "args.txt"
+
+        success, error = await concatenator._run_ffmpeg([str(fake_ffmpeg), "-y", str(output)])
+
+        assert success is True, error
+        assert output.read_text().endswith("-y -threads 2")
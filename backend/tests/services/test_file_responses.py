@@ -0,0 +1,154 @@
+"""
+Tests for streaming file download responses.
+"""
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from app.core.http_client import HostLimitedTransport
+from app.core.file_responses import (
+    RangeNotSatisfiableError,
+    local_file_response,
+    parse_range_header,
+    proxy_remote_file,
+)
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        yield self.body
+
+
+class _BrokenStream(httpx.AsyncByteStream):
+    """Body that fails partway through, like a mid-body ReadTimeout."""
+
+    async def __aiter__(self):
+        yield b"partial"
+        raise httpx.ReadTimeout("upstream stalled")
+
+
+class _CosTransport(httpx.AsyncBaseTransport):
+    """Serves one object from memory and honours single byte ranges."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.requests = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        if request.url.path.startswith("/broken"):
+            return httpx.Response(200, stream=_BrokenStream())
+        byte_range = request.headers.get("range")
+        if byte_range:
+            start, end = parse_range_header(byte_range, len(self.body))
+            return httpx.Response(
+                206,
+                stream=_BodyStream(self.body[start:end + 1]),
+                headers={"content-range": f"bytes {start}-{end}/{len(self.body)}"},
+            )
+        return httpx.Response(200, stream=_BodyStream(self.body), headers={"etag": '"v1"'})
+
+
+def _download_app(build_response):
+    async def endpoint(request):
+        return await build_response(request.headers.get("range"))
+
+    return Starlette(routes=[Route("/download", endpoint)])
+
+
+class TestParseRangeHeader:
+    """Test suite for Range header parsing."""
+
+    def test_ranges(self):
+        assert parse_range_header(None, 100) is None
+        assert parse_range_header("bytes=0-9", 100) == (0, 9)
+        assert parse_range_header("bytes=90-", 100) == (90, 99)
+        assert parse_range_header("bytes=-10", 100) == (90, 99)
+        assert parse_range_header("bytes=50-500", 100) == (50, 99)
+        # Malformed and multi-range requests get the whole file
+        assert parse_range_header("bytes=a-b", 100) is None
+        assert parse_range_header("bytes=0-1,5-6", 100) is None
+
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header("bytes=100-", 100)
+
+
+class TestLocalFileResponse:
+    """Test suite for local file downloads."""
+
+    @pytest.mark.asyncio
+    async def test_full_and_partial_downloads(self, tmp_path):
+        image = tmp_path / "a.png"
+        image.write_bytes(b"0123456789")
+
+        async def build(range_value):
+            return local_file_response(str(image), "image/png", "image_1.png", range_value)
+
+        transport = httpx.ASGITransport(app=_download_app(build))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            full = await client.get("/download")
+            partial = await client.get("/download", headers={"Range": "bytes=2-5"})
+            invalid = await client.get("/download", headers={"Range": "bytes=20-"})
+
+        assert full.status_code == 200 and full.content == b"0123456789"
+        assert full.headers["accept-ranges"] == "bytes"
+        assert full.headers["content-disposition"] == 'attachment; filename="image_1.png"'
+
+        assert partial.status_code == 206 and partial.content == b"2345"
+        assert partial.headers["content-range"] == "bytes 2-5/10"
+        assert partial.headers["content-length"] == "4"
+
+        assert invalid.status_code == 416
+        assert invalid.headers["content-range"] == "bytes */10"
+
+
+class TestProxyRemoteFile:
+    """Test suite for streamed remote downloads."""
+
+    @pytest.mark.asyncio
+    async def test_streams_and_forwards_ranges(self):
+        cos = _CosTransport(b"remote-image-bytes")
+        upstream = httpx.AsyncClient(transport=cos)
+        url = "https://bucket.cos.ap-seoul.myqcloud.com/generated/a.png"
+
+        async def build(range_value):
+            return await proxy_remote_file(upstream, url, "image/png", "image_1.png", range_value)
+
+        transport = httpx.ASGITransport(app=_download_app(build))
+        async with upstream, httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            full = await client.get("/download")
+            partial = await client.get("/download", headers={"Range": "bytes=0-5"})
+
+        assert full.status_code == 200 and full.content == b"remote-image-bytes"
+        assert full.headers["etag"] == '"v1"'
+        assert full.headers["content-disposition"] == 'attachment; filename="image_1.png"'
+        assert partial.status_code == 206 and partial.content == b"remote"
+        assert partial.headers["content-range"] == "bytes 0-5/18"
+        assert cos.requests[-1].headers["range"] == "bytes=0-5"
+
+    @pytest.mark.asyncio
+    async def test_failed_upstream_body_releases_host_slot(self):
+        cos = _CosTransport(b"remote-image-bytes")
+        upstream = httpx.AsyncClient(
+            transport=HostLimitedTransport(cos, max_per_host=1),
+            timeout=httpx.Timeout(5, pool=0.5),
+        )
+        host = "https://bucket.cos.ap-seoul.myqcloud.com"
+
+        async def build(range_value):
+            return await proxy_remote_file(upstream, f"{host}/broken/a.png", "image/png", "a.png", range_value)
+
+        transport = httpx.ASGITransport(app=_download_app(build))
+        async with upstream, httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(2):
+                with pytest.raises(Exception):  # ReadTimeout, wrapped by starlette's task group
+                    await client.get("/download")
+
+            # The only slot for the storage host was released both times
+            response = await upstream.get(f"{host}/generated/b.png")
+            assert response.status_code == 200
@@ -0,0 +1,119 @@
+"""
+Tests for the shared pooled HTTP client.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import http_client
+from app.core.config import settings
+from app.core.http_client import HostLimitedTransport, create_http_client
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        yield self.body
+
+
+class _SlowTransport(httpx.AsyncBaseTransport):
+    """Answers every request after a delay and tracks concurrency per host."""
+
+    def __init__(self, delay=0.05, streaming=False):
+        self.delay = delay
+        self.streaming = streaming
+        self.active = {}
+        self.max_active = {}
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active[host] -= 1
+        body = f"image from {host}".encode()
+        if self.streaming:
+            return httpx.Response(200, stream=_BodyStream(body))
+        return httpx.Response(200, content=body)
+
+
+class TestHostLimitedTransport:
+    """Test suite for per-host request limits."""
+
+    @pytest.mark.asyncio
+    async def test_limits_each_host_separately(self):
+        transport = _SlowTransport()
+        async with httpx.AsyncClient(transport=HostLimitedTransport(transport, max_per_host=2)) as client:
+            urls = [f"https://cdn-{i % 2}.example.com/{i}.jpg" for i in range(8)]
+            responses = await asyncio.gather(*(client.get(url) for url in urls))
+
+        assert all(r.status_code == 200 for r in responses)
+        assert transport.max_active == {"cdn-0.example.com": 2, "cdn-1.example.com": 2}
+
+    @pytest.mark.asyncio
+    async def test_slot_is_held_while_streaming(self):
+        transport = HostLimitedTransport(_SlowTransport(delay=0, streaming=True), max_per_host=1)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "https://cdn.example.com/a.mp4") as response:
+                second = asyncio.create_task(client.get("https://cdn.example.com/b.mp4"))
+                await asyncio.sleep(0.05)
+                assert not second.done()
+                await response.aread()
+            assert (await second).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_leaked_slot_times_out_instead_of_hanging(self):
+        transport = HostLimitedTransport(_SlowTransport(delay=0, streaming=True), max_per_host=1)
+        async with httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(5, pool=0.05)) as client:
+            # A streamed response that is never closed keeps the only slot
+            leaked = await client.send(client.build_request("GET", "https://cdn.example.com/a.mp4"), stream=True)
+
+            with pytest.raises(httpx.PoolTimeout):
+                await client.get("https://cdn.example.com/b.mp4")
+            assert (await client.get("https://other.example.com/c.jpg")).status_code == 200
+
+            await leaked.aclose()
+            assert (await client.get("https://cdn.example.com/b.mp4")).status_code == 200
+
+
+class TestSharedClient:
+    """Test suite for the application-scoped client."""
+
+    @pytest.mark.asyncio
+    async def test_lifespan_client_is_shared(self, monkeypatch):
+        monkeypatch.setattr(http_client, "_http_client", None)
+
+        started = await http_client.start_http_client()
+        assert http_client.get_http_client() is started
+
+        await http_client.close_http_client()
+        assert started.is_closed
+        # Outside the lifespan a fresh client is created on demand
+        fresh = http_client.get_http_client()
+        assert fresh is not started and not fresh.is_closed
+        await http_client.close_http_client()
+
+    @pytest.mark.asyncio
+    async def test_client_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS", 3.0)
+        async with create_http_client(transport=_SlowTransport(delay=0)) as client:
+            assert client.timeout.connect == 3.0
+            assert client.timeout.read == settings.HTTP_CLIENT_READ_TIMEOUT_SECONDS
+            assert (await client.get("https://cdn.example.com/a.jpg")).content == b"image from cdn.example.com"
+
+    @pytest.mark.asyncio
+    async def test_image_loader_uses_injected_client(self):
+        from app.api.v1.image_project import load_image_from_url
+
+        transport = _SlowTransport(delay=0)
+        async with httpx.AsyncClient(transport=transport) as client:
+            data, mime_type = await load_image_from_url("https://cos.example.com/p.png", settings, client=client)
+
+        assert data == b"image from cos.example.com"
+        assert mime_type == "image/png"
@@ -0,0 +1,114 @@
+"""
+Tests for the in-process image byte cache.
+"""
+
+import os
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.image_cache import ImageByteCache
+
+
+class _CdnTransport(httpx.AsyncBaseTransport):
+    """Serves one image with an ETag and honours If-None-Match."""
+
+    def __init__(self, body=b"product-image", etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content=self.body,
+            headers={"etag": self.etag, "content-type": "image/png"},
+        )
+
+
+@pytest.fixture
+def cdn():
+    return _CdnTransport()
+
+
+class TestImageByteCache:
+    """Test suite for ImageByteCache."""
+
+    def test_lru_eviction_by_size(self):
+        cache = ImageByteCache(max_bytes=10)
+        cache.put("a", b"aaaa", "image/png", "1")
+        cache.put("b", b"bbbb", "image/png", "1")
+        cache.get("a")  # a is now most recently used
+        cache.put("c", b"cccc", "image/png", "1")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["bytes"] == 8
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_items_are_not_cached(self):
+        cache = ImageByteCache(max_bytes=100, max_item_bytes=5)
+        cache.put("big", b"x" * 6, "image/png", "1")
+        assert cache.get("big") is None
+
+    @pytest.mark.asyncio
+    async def test_local_file_is_revalidated_by_mtime(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "TEMP_DIR", str(tmp_path))
+        (tmp_path / "products").mkdir()
+        image = tmp_path / "products" / "p.jpg"
+        image.write_bytes(b"v1")
+        cache = ImageByteCache(max_bytes=1024)
+
+        assert await cache.load("/static/products/p.jpg") == (b"v1", "image/jpeg")
+        assert await cache.load("http://localhost:8000/static/products/p.jpg") == (b"v1", "image/jpeg")
+        assert await cache.load("/static/products/p.jpg") == (b"v1", "image/jpeg")
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        image.write_bytes(b"v2-changed")
+        os.utime(image, ns=(1, 1))
+        assert (await cache.load("/static/products/p.jpg"))[0] == b"v2-changed"
+        assert cache.misses == 3
+
+        assert await cache.load("/static/products/missing.jpg") == (None, None)
+
+    @pytest.mark.asyncio
+    async def test_remote_image_is_revalidated_with_etag(self, cdn):
+        cache = ImageByteCache(max_bytes=1024, revalidate_seconds=60)
+        url = "https://bucket.cos.ap-seoul.myqcloud.com/products/p.png"
+
+        async with httpx.AsyncClient(transport=cdn) as client:
+            assert await cache.load(url, client) == (b"product-image", "image/png")
+            assert await cache.load(url, client) == (b"product-image", "image/png")
+            assert len(cdn.requests) == 1  # Served from memory within the TTL
+
+            cache.revalidate_seconds = 0
+            assert (await cache.load(url, client))[0] == b"product-image"
+            assert cdn.requests[-1].headers["if-none-match"] == '"v1"'
+
+            cdn.body, cdn.etag = b"new-image", '"v2"'
+            assert (await cache.load(url, client))[0] == b"new-image"
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["revalidations"]) == (2, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_caches_found_objects_only(self):
+        cache = ImageByteCache(max_bytes=1024)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return b"temp-image"
+
+        async def missing():
+            return None
+
+        assert await cache.get_or_load("storage:temp/a.png", loader) == (b"temp-image", "image/png")
+        assert await cache.get_or_load("storage:temp/a.png", loader) == (b"temp-image", "image/png")
+        assert await cache.get_or_load("storage:temp/a.jpg", missing) == (None, None)
+        assert len(calls) == 1
+        assert cache.stats()["entries"] == 1
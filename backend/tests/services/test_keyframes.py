@@ -0,0 +1,206 @@
+"""
+Tests for scene-change-aware keyframe extraction.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.core.config import settings
+from app.services.reference_analyzer.analyzer import ReferenceAnalyzer
+from app.services.reference_analyzer.keyframes import (
+    KeyframeSelector,
+    extract_keyframes,
+    frame_delta,
+    informativeness,
+    stream_keyframes,
+)
+from app.services.reference_analyzer.keyframes import _signature
+from app.services.reference_analyzer.result_cache import hash_media
+from app.services.video_generator import ffmpeg_limiter as ffmpeg_limiter_module
+from app.services.video_generator.ffmpeg_limiter import FFmpegLimiter
+
+COLORS = ["red", "blue", "green", "yellow", "purple", "orange"]
+
+
+def _frame(color: str, detail: int = 0) -> Image.Image:
+    image = Image.new("RGB", (160, 90), color)
+    draw = ImageDraw.Draw(image)
+    for i in range(detail):
+        draw.line((i * 8, 0, 160 - i * 8, 90), fill="white")
+    return image
+
+
+class TestKeyframeSelector:
+    """Test suite for KeyframeSelector."""
+
+    def test_frame_delta_and_score(self):
+        red, blue = _signature(_frame("red")), _signature(_frame("blue"))
+        assert frame_delta(red, red) == 0
+        assert frame_delta(red, blue) > 0.25
+        assert informativeness(_frame("red", detail=10)) > informativeness(_frame("red"))
+
+    def test_one_keyframe_per_shot(self):
+        selector = KeyframeSelector(max_keyframes=10, max_shot_seconds=100)
+        timestamp = 0.0
+        for color in ["red", "blue", "green"]:
+            for detail in (0, 6, 2):  # the middle frame of each shot is the most detailed
+                selector.add(_frame(color, detail), timestamp)
+                timestamp += 0.5
+
+        keyframes = selector.keyframes()
+
+        assert selector.cuts == 2
+        assert [k.timestamp for k in keyframes] == [0.5, 2.0, 3.5]
+        assert [(k.shot_start, k.shot_end) for k in keyframes] == [(0.0, 1.5), (1.5, 3.0), (3.0, 4.0)]
+
+    def test_long_static_shots_are_split(self):
+        selector = KeyframeSelector(max_keyframes=10, max_shot_seconds=4)
+        for second in range(10):
+            selector.add(_frame("red", 3), float(second))
+
+        assert [k.shot_start for k in selector.keyframes()] == [0.0, 4.0, 8.0]
+        assert selector.cuts == 0
+
+    def test_bounded_candidates_and_opening_shot_kept(self):
+        selector = KeyframeSelector(max_keyframes=3, max_shot_seconds=100, max_candidates=4)
+        for i in range(24):
+            selector.add(_frame(COLORS[i % len(COLORS)], detail=i % 5), float(i))
+            assert len(selector._shots) <= 4
+
+        keyframes = selector.keyframes()
+
+        assert len(keyframes) == 3
+        assert keyframes[0].shot_start == 0.0
+        assert [k.timestamp for k in keyframes] == sorted(k.timestamp for k in keyframes)
+
+
+class TestExtractKeyframes:
+    """Test suite for the single-pass ffmpeg extractor."""
+
+    @pytest.mark.asyncio
+    async def test_reads_raw_frames_from_one_ffmpeg_process(self, tmp_path, monkeypatch):
+        # A python script stands in for ffmpeg: it writes 3 shots of raw RGB frames to stdout
+        fake_ffmpeg = tmp_path / "ffmpeg"
+        args_file = tmp_path / "args.txt"
+        fake_ffmpeg.write_text(
+            f"#!{sys.executable}\n"
+            "import re, sys\n"
+            f"open({str(args_file)!r}, 'w').write(' '.join(sys.argv[1:]))\n"
+            "w, h = map(int, re.search(r'scale=(\\d+):(\\d+)', ' '.join(sys.argv)).groups())\n"
+            "for rgb in [(255, 0, 0)] * 3 + [(0, 0, 255)] * 3 + [(0, 255, 0)] * 3:\n"
+            "    sys.stdout.buffer.write(bytes(rgb) * (w * h))\n"
+        )
+        fake_ffmpeg.chmod(0o755)
+        monkeypatch.setattr(settings, "REFERENCE_KEYFRAME_SAMPLE_FPS", 2.0)
+
+        keyframes = await extract_keyframes(
+            "video.mp4",
+            duration=4.5,
+            width=1920,
+            height=1080,
+            ffmpeg_path=str(fake_ffmpeg),
+            ffmpeg_limiter=FFmpegLimiter(1, threads_per_job=2),
+        )
+
+        assert [k.shot_start for k in keyframes] == [0.0, 1.5, 3.0]
+        assert keyframes[1].image.size == (768, 432)
+        assert keyframes[1].image.getpixel((0, 0)) == (0, 0, 255)
+        args = args_file.read_text()
+        assert "-f rawvideo -pix_fmt rgb24 -threads 2 -" in args
+        assert "fps=2.0000,scale=768:432" in args
+
+
+def _write_script(path, body):
+    path.write_text(f"#!{sys.executable}\nimport sys\n" + body)
+    path.chmod(0o755)
+
+
+class TestStreamKeyframes:
+    """Test suite for keyframe extraction from a download stream."""
+
+    FAKE_FFMPEG = (
+        "data = sys.stdin.buffer.read()\n"
+        "open(sys.argv[0] + '.in', 'wb').write(data)\n"
+        "open(sys.argv[0] + '.args', 'w').write(' '.join(sys.argv[1:]))\n"
+        "sys.stderr.write(\"Input #0, matroska,webm, from 'pipe:0':\\n\"\n"
+        "    '  Duration: 00:00:04.50, start: 0.000000, bitrate: N/A\\n'\n"
+        "    '  Stream #0:0: Video: vp9 (Profile 0), yuv420p(tv), 1080x1920, SAR 1:1 DAR 9:16, 30 fps\\n'\n"
+        "    \"Output #0, rawvideo, to 'pipe:':\\n\"\n"
+        "    '  Stream #0:0: Video: rawvideo (RGB[24] / 0x18424752), rgb24, 432x768, q=2-31\\n')\n"
+        "sys.stderr.flush()\n"
+        "for rgb in [(255, 0, 0)] * 3 + [(0, 0, 255)] * 3 + [(0, 255, 0)] * 3:\n"
+        "    sys.stdout.buffer.write(bytes(rgb) * (432 * 768))\n"
+    )
+
+    @pytest.mark.asyncio
+    async def test_metadata_and_frames_from_stream_header(self, tmp_path, monkeypatch):
+        fake_ffmpeg = tmp_path / "ffmpeg"
+        _write_script(fake_ffmpeg, self.FAKE_FFMPEG)
+        monkeypatch.setattr(settings, "REFERENCE_KEYFRAME_SAMPLE_FPS", 2.0)
+
+        async def chunks():
+            for i in range(5):
+                yield f"chunk{i}".encode()
+
+        metadata, keyframes = await stream_keyframes(
+            chunks(), ffmpeg_path=str(fake_ffmpeg), ffmpeg_limiter=FFmpegLimiter(1)
+        )
+
+        assert metadata == {"duration": 4.5, "width": 1080, "height": 1920}
+        assert [k.shot_start for k in keyframes] == [0.0, 1.5, 3.0]
+        assert keyframes[0].image.size == (432, 768)  # Portrait size read from the output header
+        assert (tmp_path / "ffmpeg.in").read_bytes() == b"chunk0chunk1chunk2chunk3chunk4"
+        args = (tmp_path / "ffmpeg.args").read_text()
+        assert "-i pipe:0" in args and "force_original_aspect_ratio=decrease" in args
+
+    @pytest.mark.asyncio
+    async def test_streaming_does_not_hold_a_render_slot(self, tmp_path, monkeypatch):
+        fake_ffmpeg = tmp_path / "ffmpeg"
+        _write_script(fake_ffmpeg, self.FAKE_FFMPEG)
+        render_limiter = FFmpegLimiter(1, threads_per_job=2)
+        monkeypatch.setattr(ffmpeg_limiter_module, "_ffmpeg_limiter", render_limiter)
+
+        async def chunks():
+            yield b"webm"
+
+        # A render holds the only shared ffmpeg slot; the network-paced stream must not wait for it
+        async with render_limiter.slot():
+            _, keyframes = await asyncio.wait_for(
+                stream_keyframes(chunks(), ffmpeg_path=str(fake_ffmpeg)), timeout=5
+            )
+
+        assert len(keyframes) == 3
+        assert "-threads 2" in (tmp_path / "ffmpeg.args").read_text()  # Thread cap still applies
+
+    @pytest.mark.asyncio
+    async def test_analyzer_streams_yt_dlp_into_ffmpeg(self, tmp_path, monkeypatch):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        _write_script(bin_dir / "ffmpeg", self.FAKE_FFMPEG)
+        _write_script(
+            bin_dir / "yt-dlp",
+            "open(sys.argv[0] + '.args', 'w').write(' '.join(sys.argv[1:]))\n"
+            "if 'private' in sys.argv[-1]:\n"
+            "    sys.stderr.write('ERROR: Private video')\n"
+            "    sys.exit(1)\n"
+            "sys.stdout.buffer.write(b'webm' * 100000)\n",
+        )
+        monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+        monkeypatch.setattr(settings, "REFERENCE_STREAM_MAX_HEIGHT", 360)
+        analyzer = ReferenceAnalyzer()
+
+        metadata, keyframes, content_hash = await analyzer.stream_video("https://youtu.be/abc123")
+
+        assert metadata["duration"] == 4.5 and len(keyframes) == 3
+        assert content_hash == hash_media([b"webm" * 100000])
+        assert (bin_dir / "ffmpeg.in").read_bytes() == b"webm" * 100000
+        yt_dlp_args = (bin_dir / "yt-dlp.args").read_text()
+        assert "-f bv[height<=360]/b[height<=360]/wv/w" in yt_dlp_args and "-o -" in yt_dlp_args
+        assert not list(tmp_path.glob("**/*.mp4"))  # Nothing written to disk
+
+        with pytest.raises(Exception, match="비공개"):
+            await analyzer.stream_video("https://youtu.be/private")
@@ -0,0 +1,128 @@
+"""
+Tests for the shared long-running operation tracker.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.video_generator.operation_tracker import OperationTracker
+
+
+class FakeOperation(SimpleNamespace):
+    """Operation stand-in that finishes after a number of polls."""
+
+
+def _make_poller(polls_until_done: dict, calls: list, threads: set):
+    def poll(operation):
+        calls.append(operation.name)
+        threads.add(threading.get_ident())
+        polls_until_done[operation.name] -= 1
+        return FakeOperation(name=operation.name, done=polls_until_done[operation.name] <= 0)
+    return poll
+
+
+def _fast_tracker(poll, **kwargs) -> OperationTracker:
+    return OperationTracker(
+        poll_operation=poll,
+        min_poll_interval=0.01,
+        max_poll_interval=0.05,
+        **kwargs,
+    )
+
+
+class TestOperationTracker:
+    """Test suite for OperationTracker."""
+
+    @pytest.mark.asyncio
+    async def test_wait_resolves_when_done(self):
+        """Test that wait() returns the finished operation."""
+        remaining = {"op-1": 3}
+        calls, threads = [], set()
+        tracker = _fast_tracker(_make_poller(remaining, calls, threads))
+
+        op_id = tracker.track(FakeOperation(name="op-1", done=False), expected_seconds=0.01)
+        operation = await tracker.wait(op_id, timeout_seconds=2)
+
+        assert operation.done is True
+        assert calls.count("op-1") == 3
+        assert tracker.outstanding == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_operations_share_one_poller(self):
+        """Test that many operations are polled in shared batches."""
+        remaining = {f"op-{i}": 2 for i in range(10)}
+        calls, threads = [], set()
+        tracker = _fast_tracker(_make_poller(remaining, calls, threads))
+
+        op_ids = [
+            tracker.track(FakeOperation(name=name, done=False), expected_seconds=0.01)
+            for name in remaining
+        ]
+        results = await asyncio.gather(*[tracker.wait(op_id, timeout_seconds=2) for op_id in op_ids])
+
+        assert all(r.done for r in results)
+        assert tracker.polls_issued == 20
+        # Ten operations polled twice each in far fewer thread hops
+        assert tracker.poll_batches < tracker.polls_issued
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_tracking(self):
+        """Test that an operation keeps being tracked after a waiter times out."""
+        remaining = {"slow": 4}
+        calls, threads = [], set()
+        tracker = _fast_tracker(_make_poller(remaining, calls, threads))
+
+        op_id = tracker.track(FakeOperation(name="slow", done=False), expected_seconds=0.01)
+        snapshot = await tracker.wait(op_id, timeout_seconds=0)
+        assert snapshot.done is False
+
+        operation = await tracker.wait(op_id, timeout_seconds=2)
+        assert operation.done is True
+        assert tracker.get(op_id).done is True
+
+    @pytest.mark.asyncio
+    async def test_poll_error_propagates_to_waiter(self):
+        """Test that polling errors are raised to the waiting caller."""
+        def poll(operation):
+            raise RuntimeError("API unavailable")
+
+        tracker = _fast_tracker(poll)
+        op_id = tracker.track(FakeOperation(name="broken", done=False), expected_seconds=0.01)
+
+        with pytest.raises(RuntimeError, match="API unavailable"):
+            await tracker.wait(op_id, timeout_seconds=2)
+
+    @pytest.mark.asyncio
+    async def test_already_done_operation_is_not_polled(self):
+        """Test that a finished operation resolves without polling."""
+        calls, threads = [], set()
+        tracker = _fast_tracker(_make_poller({}, calls, threads))
+
+        op_id = tracker.track(FakeOperation(name="instant", done=True))
+        operation = await tracker.wait(op_id, timeout_seconds=1)
+
+        assert operation.done is True
+        assert calls == []
+
+    def test_adaptive_delay(self):
+        """Test that polls are sparse early and back off when overdue."""
+        tracker = OperationTracker(
+            poll_operation=lambda op: op,
+            min_poll_interval=5,
+            max_poll_interval=30,
+            overdue_backoff=0.25,
+        )
+        tracked = SimpleNamespace(expected_seconds=90, submitted_at=0.0)
+
+        assert tracker._next_delay(tracked, now=0.0) == 45
+        assert tracker._next_delay(tracked, now=88.0) == 5
+        assert tracker._next_delay(tracked, now=130.0) == 15
+        assert tracker._next_delay(tracked, now=1000.0) == 30
+
+    def test_unknown_operation(self):
+        """Test lookups for unknown operation IDs."""
+        tracker = OperationTracker(poll_operation=lambda op: op)
+        assert tracker.get("missing") is None
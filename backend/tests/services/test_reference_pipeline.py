@@ -0,0 +1,204 @@
+"""
+Tests for the stage-parallel reference analysis pipeline.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.reference_analysis import ReferenceAnalysis
+from app.services.cloud_storage import cloud_storage
+from app.services.reference_analyzer.pipeline import AnalysisJob, ReferenceAnalysisPipeline
+from app.services.reference_analyzer.result_cache import hash_media
+
+
+class _FakeAnalyzer:
+    """Stands in for ReferenceAnalyzer, recording how many calls of each stage overlap."""
+
+    def __init__(self, tmp_path, delay=0.02):
+        self.tmp_path = tmp_path
+        self.delay = delay
+        self.delays = {"process": delay / 4, "analyze": delay * 3}  # Gemini is the slow stage
+        self.active = {"download": 0, "process": 0, "analyze": 0}
+        self.max_active = dict(self.active)
+        self.overlapped = False  # Downloads ran while Gemini was busy
+        self.gemini_calls = 0
+
+    async def _track(self, stage):
+        self.active[stage] += 1
+        self.max_active[stage] = max(self.max_active[stage], self.active[stage])
+        if self.active["download"] and self.active["analyze"]:
+            self.overlapped = True
+        try:
+            await asyncio.sleep(self.delays.get(stage, self.delay))
+        finally:
+            self.active[stage] -= 1
+
+    async def _download_video(self, url):
+        await self._track("download")
+        if "private" in url:
+            raise Exception("영상이 비공개이거나 삭제되었습니다.")
+        if "empty" in url:
+            raise Exception("ERROR: No video formats found")
+        path = self.tmp_path / f"video_{uuid.uuid4().hex}.mp4"
+        path.write_bytes(url.rsplit("=", 1)[-1].encode())  # Same video ID -> same bytes
+        return str(path)
+
+    async def prepare_video(self, video_path):
+        await self._track("process")
+        return {"duration": 12.0}, []
+
+    async def stream_video(self, url, frames_only=True):
+        await self._track("download")  # Network paced, bounded by the download workers
+        if "moov-at-end" in url:
+            return None  # Not decodable from a stream
+        return {"duration": 30.0}, [], hash_media([url.encode()])
+
+    async def analyze_frames(self, video_path, frames, duration=0):
+        await self._track("analyze")
+        self.gemini_calls += 1
+        return {"duration": duration, "reference_name": "Analyzed", "segments": [{"segment_type": "hook"}]}
+
+    async def analyze_images(self, images, source_url=""):
+        await self._track("analyze")
+        self.gemini_calls += 1
+        return {"reference_name": f"{len(images)} images", "segments": []}
+
+
+async def _create(session_factory, url):
+    analysis_id = str(uuid.uuid4())
+    async with session_factory() as db:
+        db.add(ReferenceAnalysis(id=analysis_id, source_url=url, title="REF", status="pending"))
+        await db.commit()
+    return analysis_id
+
+
+async def _get(session_factory, analysis_id):
+    async with session_factory() as db:
+        result = await db.execute(select(ReferenceAnalysis).where(ReferenceAnalysis.id == analysis_id))
+        return result.scalar_one_or_none()
+
+
+class TestReferenceAnalysisPipeline:
+    """Test suite for ReferenceAnalysisPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_burst_keeps_stages_busy_within_limits(self, session_factory, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "REFERENCE_STREAM_DOWNLOADS", False)
+        analyzer = _FakeAnalyzer(tmp_path)
+        pipeline = ReferenceAnalysisPipeline(
+            download_workers=3, process_workers=1, analyze_workers=2, queue_size=2,
+            analyzer=analyzer, session_factory=session_factory,
+        )
+        ids = [await _create(session_factory, f"https://youtu.be/v{i}") for i in range(12)]
+
+        for i, analysis_id in enumerate(ids):
+            assert pipeline.submit(AnalysisJob(analysis_id, f"https://www.youtube.com/watch?v=v{i}"))
+        assert not pipeline.submit(AnalysisJob(ids[0], "https://youtu.be/v0"))  # Already queued
+        await pipeline.join()
+        await pipeline.stop()
+
+        assert analyzer.max_active == {"download": 3, "process": 1, "analyze": 2}
+        assert analyzer.overlapped
+        assert not list(tmp_path.glob("video_*"))  # Downloads removed after analysis
+
+        for analysis_id in ids:
+            analysis = await _get(session_factory, analysis_id)
+            assert analysis.status == "completed"
+            assert analysis.title == "Analyzed" and analysis.duration == 12.0
+            assert analysis.content_hash and analysis.analyzed_at
+
+        stats = pipeline.stats()
+        assert stats["completed"] == 12 and stats["in_flight"] == 0
+        assert stats["stages"]["process"]["processed"] == 12
+        assert stats["stages"]["analyze"]["avg_latency_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failures_and_identical_media(self, session_factory, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "REFERENCE_STREAM_DOWNLOADS", False)
+        analyzer = _FakeAnalyzer(tmp_path, delay=0)
+        pipeline = ReferenceAnalysisPipeline(analyzer=analyzer, session_factory=session_factory)
+
+        first = await _create(session_factory, "https://youtu.be/same")
+        pipeline.submit(AnalysisJob(first, "https://www.youtube.com/watch?v=same"))
+        await pipeline.join()
+        # Another URL serving the same bytes reuses the stored result
+        second = await _create(session_factory, "https://example.com/ad?v=same")
+        private = await _create(session_factory, "https://youtu.be/private")
+        empty = await _create(session_factory, "https://youtu.be/empty")
+        pipeline.submit(AnalysisJob(second, "https://example.com/ad?v=same"))
+        pipeline.submit(AnalysisJob(private, "https://youtu.be/private"))
+        pipeline.submit(AnalysisJob(empty, "https://youtu.be/empty"))
+        await pipeline.join()
+        await pipeline.stop()
+
+        assert analyzer.gemini_calls == 1
+        cached = await _get(session_factory, second)
+        assert cached.status == "completed" and cached.segments == [{"segment_type": "hook"}]
+        assert cached.analyzed_at == (await _get(session_factory, first)).analyzed_at
+
+        failed = await _get(session_factory, private)
+        assert failed.status == "failed" and "비공개" in failed.error_message
+        assert await _get(session_factory, empty) is None  # No media at all: record deleted
+        assert pipeline.stats()["stages"]["download"]["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_videos_skip_the_process_stage(self, session_factory, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "REFERENCE_STREAM_DOWNLOADS", True)
+        analyzer = _FakeAnalyzer(tmp_path, delay=0)
+        pipeline = ReferenceAnalysisPipeline(analyzer=analyzer, session_factory=session_factory)
+        downloads = []
+        original_download = analyzer._download_video
+
+        async def download(url):
+            downloads.append(url)
+            return await original_download(url)
+
+        analyzer._download_video = download
+
+        streamed = await _create(session_factory, "https://youtu.be/streamed")
+        fallback = await _create(session_factory, "https://example.com/moov-at-end.mp4")
+        pipeline.submit(AnalysisJob(streamed, "https://youtu.be/streamed"))
+        pipeline.submit(AnalysisJob(fallback, "https://example.com/moov-at-end.mp4"))
+        await pipeline.join()
+        await pipeline.stop()
+
+        analysis = await _get(session_factory, streamed)
+        assert analysis.status == "completed" and analysis.duration == 30.0
+        assert analysis.content_hash == hash_media([b"https://youtu.be/streamed"])
+        # Only the stream that could not be decoded fell back to a file download
+        assert downloads == ["https://example.com/moov-at-end.mp4"]
+        assert (await _get(session_factory, fallback)).duration == 12.0
+        stages = pipeline.stats()["stages"]
+        assert stages["download"]["processed"] == 2 and stages["process"]["processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uploaded_images_and_shutdown(self, session_factory, tmp_path, monkeypatch):
+        async def fake_upload_many(requests):
+            return [f"https://cdn/references/{i}.jpg" for i, _ in enumerate(requests)]
+
+        monkeypatch.setattr(cloud_storage, "upload_many_async", fake_upload_many)
+        analyzer = _FakeAnalyzer(tmp_path, delay=0)
+        pipeline = ReferenceAnalysisPipeline(analyzer=analyzer, session_factory=session_factory)
+
+        upload = await _create(session_factory, "upload://https://cdn/uploads/a.jpg")
+        pipeline.submit(AnalysisJob(upload, "upload://https://cdn/uploads/a.jpg", image_bytes=[b"a", b"b"]))
+        await pipeline.join()
+
+        analysis = await _get(session_factory, upload)
+        assert analysis.status == "completed" and analysis.title == "2 images"
+        assert analysis.images == ["https://cdn/references/0.jpg", "https://cdn/references/1.jpg"]
+
+        # Jobs still queued when the process stops are marked failed
+        monkeypatch.setattr(settings, "REFERENCE_STREAM_DOWNLOADS", False)
+        analyzer.delays["download"] = 10
+        stuck = await _create(session_factory, "https://youtu.be/slow")
+        pipeline.submit(AnalysisJob(stuck, "https://youtu.be/slow"))
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+
+        assert (await _get(session_factory, stuck)).status == "failed"
+        assert not pipeline.running
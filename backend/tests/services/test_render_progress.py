@@ -0,0 +1,152 @@
+"""
+Tests for ffmpeg progress parsing and render progress tracking.
+"""
+
+import sys
+import time
+
+import pytest
+
+from app.services.video_generator.ffmpeg_limiter import FFmpegLimiter
+from app.services.video_generator.render_progress import (
+    FFmpegProgress,
+    FFmpegProgressParser,
+    RenderProgress,
+    RenderProgressRegistry,
+)
+from app.services.video_generator.video_concatenator import VideoConcatenator
+
+PROGRESS_BLOCK = """frame=120
+fps=48.5
+stream_0_0_q=28.0
+bitrate=N/A
+out_time_us=5000000
+out_time_ms=5000000
+out_time=00:00:05.000000
+speed=1.94x
+progress=continue
+"""
+
+
+def _fake_ffmpeg(tmp_path, body: str):
+    """Write an executable python script standing in for ffmpeg."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\nimport sys, time\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestFFmpegProgressParser:
+    """Test suite for FFmpegProgressParser."""
+
+    def test_parses_report(self):
+        parser = FFmpegProgressParser()
+        reports = [parser.feed(line) for line in PROGRESS_BLOCK.splitlines()]
+
+        assert reports[:-1] == [None] * (len(reports) - 1)
+        report = reports[-1]
+        assert report.out_time_seconds == 5.0
+        assert report.frame == 120
+        assert report.fps == 48.5
+        assert report.speed == 1.94
+        assert report.done is False
+
+    def test_end_and_unavailable_values(self):
+        parser = FFmpegProgressParser()
+        for line in ["fps=0.00", "speed=N/A", "out_time_us=N/A"]:
+            assert parser.feed(line) is None
+
+        report = parser.feed("progress=end")
+
+        assert report.done is True
+        assert report.speed is None
+        assert report.out_time_seconds == 0.0
+
+
+class TestRenderProgress:
+    """Test suite for RenderProgress aggregation."""
+
+    def test_weighted_percent(self):
+        progress = RenderProgress(key="p")
+        progress.add_work("a", 10.0)
+        progress.add_work("b", 10.0)
+        progress.add_work("join", 20.0, weight=0.5)
+
+        progress.update("a", FFmpegProgress(out_time_seconds=5.0, fps=30.0, speed=1.0))
+        progress.update("b", FFmpegProgress(out_time_seconds=10.0, fps=20.0, speed=2.0))
+
+        assert progress.percent == 50.0
+        assert progress.fps == 50.0
+        assert progress.speed == 3.0
+
+        progress.update("b", FFmpegProgress(out_time_seconds=10.0, done=True))
+        progress.complete_work("join")
+
+        assert progress.percent == 83.3
+        assert progress.fps == 30.0
+
+    def test_finish(self):
+        progress = RenderProgress(key="p")
+        progress.add_work("a", 10.0)
+
+        progress.finish(True)
+
+        assert progress.to_dict()["status"] == "completed"
+        assert progress.percent == 100.0
+
+    def test_registry_evicts_finished_renders(self):
+        registry = RenderProgressRegistry(finished_retention_seconds=60)
+        progress = registry.start("p")
+        progress.finish(False, "boom")
+        assert registry.get("p") is progress
+
+        progress.finished_at = time.time() - 120
+
+        assert registry.get("p") is None
+
+
+class TestRunFFmpegProgress:
+    """Test suite for progress streaming and stall detection in _run_ffmpeg."""
+
+    @pytest.mark.asyncio
+    async def test_reports_streamed_progress(self, tmp_path):
+        ffmpeg = _fake_ffmpeg(
+            tmp_path,
+            "for us in (1000000, 2000000):\n"
+            "    print(f'fps=25\\nout_time_us={us}\\nspeed=2.0x\\nprogress=continue', flush=True)\n"
+            "print('out_time_us=3000000\\nprogress=end', flush=True)",
+        )
+        concatenator = VideoConcatenator(
+            output_dir=str(tmp_path / "out"),
+            ffmpeg_path=ffmpeg,
+            ffmpeg_limiter=FFmpegLimiter(max_concurrent_jobs=1),
+        )
+        reports = []
+
+        success, error = await concatenator._run_ffmpeg([ffmpeg, "out.mp4"], on_progress=reports.append)
+
+        assert success is True, error
+        assert [r.out_time_seconds for r in reports] == [1.0, 2.0, 3.0]
+        assert reports[-1].done is True
+
+    @pytest.mark.asyncio
+    async def test_stalled_process_is_killed(self, tmp_path, monkeypatch):
+        ffmpeg = _fake_ffmpeg(
+            tmp_path,
+            "while True:\n"
+            "    print('out_time_us=1000000\\nprogress=continue', flush=True)\n"
+            "    time.sleep(0.05)",
+        )
+        concatenator = VideoConcatenator(
+            output_dir=str(tmp_path / "out"),
+            ffmpeg_path=ffmpeg,
+            ffmpeg_limiter=FFmpegLimiter(max_concurrent_jobs=1),
+        )
+        monkeypatch.setattr(concatenator, "STALL_TIMEOUT_SECONDS", 0.3)
+
+        start = time.monotonic()
+        success, error = await concatenator._run_ffmpeg([ffmpeg, "out.mp4"])
+
+        assert success is False
+        assert error.startswith("FFmpeg stalled")
+        assert time.monotonic() - start < 5
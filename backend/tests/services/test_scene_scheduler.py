@@ -0,0 +1,196 @@
+"""
+Tests for concurrent per-scene video scheduling and the token bucket rate limiter.
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.services.binary_image import BinaryImage
+from app.services.video_generator.rate_limiter import TokenBucketRateLimiter
+from app.services.video_generator.scene_scheduler import SceneScheduler
+from app.services.video_generator.video_generator_service import (
+    MockVideoGenerator,
+    SceneInput,
+    VideoGenerationResult,
+)
+
+
+def _make_scenes(count: int, with_images: bool = False):
+    return [
+        SceneInput(
+            scene_number=i + 1,
+            description=f"Scene {i + 1} description",
+            duration_seconds=6,
+            image_data=BinaryImage(b"image") if with_images else None,
+            scene_type="hook",
+        )
+        for i in range(count)
+    ]
+
+
+class TestTokenBucketRateLimiter:
+    """Test suite for TokenBucketRateLimiter."""
+
+    def test_invalid_max_in_flight(self):
+        """Test that max_in_flight must be positive."""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(requests_per_minute=60, max_in_flight=0)
+
+    @pytest.mark.asyncio
+    async def test_burst_tokens_available_immediately(self):
+        """Test that burst tokens can be consumed without waiting."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, max_in_flight=5, burst=3)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        """Test that acquiring beyond the burst waits for a refill."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=600, max_in_flight=5, burst=1)
+
+        await limiter.acquire()
+        start = time.monotonic()
+        await limiter.acquire()
+
+        # 600 rpm = one token every 0.1 seconds
+        assert time.monotonic() - start >= 0.08
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_disables_limiting(self):
+        """Test that a non-positive rate never blocks."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=0, max_in_flight=1)
+
+        start = time.monotonic()
+        for _ in range(20):
+            await limiter.acquire()
+
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_slot_limits_in_flight(self):
+        """Test that slot() never exceeds max_in_flight."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=0, max_in_flight=2)
+        peak = {"value": 0}
+
+        async def work():
+            async with limiter.slot():
+                peak["value"] = max(peak["value"], limiter.in_flight)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(*[work() for _ in range(6)])
+
+        assert peak["value"] == 2
+        assert limiter.in_flight == 0
+
+
+class TestSceneScheduler:
+    """Test suite for SceneScheduler with MockVideoGenerator."""
+
+    @pytest.mark.asyncio
+    async def test_empty_scenes(self):
+        """Test that no scenes produces a failed result."""
+        result = await SceneScheduler().generate(MockVideoGenerator(), [])
+
+        assert result.status == "failed"
+        assert result.error_message == "No scenes provided"
+
+    @pytest.mark.asyncio
+    async def test_scenes_run_concurrently(self):
+        """Test that wall-clock time approaches the slowest scene."""
+        generator = MockVideoGenerator()
+        scenes = _make_scenes(4)
+
+        async def fake_generate(prompt, duration_seconds=5, aspect_ratio="16:9"):
+            await asyncio.sleep(0.2)
+            return VideoGenerationResult(video_url="https://example.com/v.mp4", status="completed")
+
+        with patch.object(generator, "generate_from_prompt", side_effect=fake_generate):
+            start = time.monotonic()
+            result = await SceneScheduler().generate(generator, scenes)
+            elapsed = time.monotonic() - start
+
+        assert result.status == "completed"
+        assert len(result.scene_results) == 4
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_results_keep_storyboard_order(self):
+        """Test that scene results are returned in input order."""
+        generator = MockVideoGenerator()
+        scenes = _make_scenes(3)
+        delays = [0.15, 0.05, 0.1]
+
+        async def fake_generate(prompt, duration_seconds=5, aspect_ratio="16:9"):
+            # Earlier submissions finish later
+            await asyncio.sleep(delays.pop(0))
+            return VideoGenerationResult(video_url="https://example.com/v.mp4", status="completed")
+
+        with patch.object(generator, "generate_from_prompt", side_effect=fake_generate):
+            result = await SceneScheduler().generate(generator, scenes)
+
+        assert [r.scene_number for r in result.scene_results] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_respects_max_in_flight(self):
+        """Test that the shared limiter caps concurrent operations."""
+        limiter = TokenBucketRateLimiter(requests_per_minute=0, max_in_flight=2)
+        generator = MockVideoGenerator(rate_limiter=limiter)
+        peak = {"value": 0}
+
+        async def fake_generate(image_data, prompt=None, duration_seconds=5, aspect_ratio="16:9"):
+            peak["value"] = max(peak["value"], limiter.in_flight)
+            await asyncio.sleep(0.05)
+            return VideoGenerationResult(video_url="https://example.com/v.mp4", status="completed")
+
+        with patch.object(generator, "generate_from_image", side_effect=fake_generate):
+            result = await generator.generate_per_scene_videos(_make_scenes(5, with_images=True))
+
+        assert result.status == "completed"
+        assert peak["value"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_scene_does_not_stop_others(self):
+        """Test that one failing scene yields a partial result."""
+        generator = MockVideoGenerator()
+        calls = {"count": 0}
+
+        async def fake_generate(prompt, duration_seconds=5, aspect_ratio="16:9"):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise RuntimeError("quota exceeded")
+            return VideoGenerationResult(video_url="https://example.com/v.mp4", status="completed")
+
+        with patch.object(generator, "generate_from_prompt", side_effect=fake_generate):
+            result = await SceneScheduler().generate(generator, _make_scenes(3))
+
+        assert result.status == "partial"
+        assert result.error_message == "1 scene(s) failed"
+        failed = [r for r in result.scene_results if r.status == "failed"]
+        assert len(failed) == 1
+        assert failed[0].error_message == "quota exceeded"
+
+    @pytest.mark.asyncio
+    async def test_duration_clamped_to_veo_range(self):
+        """Test that scene durations are clamped to 4-8 seconds."""
+        generator = MockVideoGenerator()
+        scenes = _make_scenes(2)
+        scenes[0].duration_seconds = 2
+        scenes[1].duration_seconds = 12
+        durations = []
+
+        async def fake_generate(prompt, duration_seconds=5, aspect_ratio="16:9"):
+            durations.append(duration_seconds)
+            return VideoGenerationResult(video_url="https://example.com/v.mp4", status="completed")
+
+        with patch.object(generator, "generate_from_prompt", side_effect=fake_generate):
+            result = await SceneScheduler().generate(generator, scenes)
+
+        assert sorted(durations) == [4, 8]
+        assert result.duration_seconds == 12
@@ -0,0 +1,137 @@
+"""
+Tests for the dependency-aware slide generation scheduler.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.slide_scheduler import SlideGenerationScheduler, build_slide_tasks
+
+
+class _FakeGeneration:
+    """Records generation order and concurrency."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.active = 0
+        self.max_active = 0
+        self.previous = {}
+        self.started = []
+
+    async def __call__(self, task, previous):
+        self.started.append(task.key)
+        self.previous[task.key] = previous
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if task.key in self.fail:
+                raise RuntimeError("generation failed")
+            return f"image-{task.slide_number}-{task.variant_index}"
+        finally:
+            self.active -= 1
+
+
+class TestBuildSlideTasks:
+    """Test suite for the task graph."""
+
+    def test_independent_slides(self):
+        tasks = build_slide_tasks(3, 2, chained=False)
+        assert len(tasks) == 6
+        assert all(task.depends_on is None for task in tasks)
+
+    def test_carousel_chains_same_variant(self):
+        tasks = {task.key: task for task in build_slide_tasks(3, 2, chained=True)}
+        assert tasks[(1, 0)].depends_on is None
+        assert tasks[(2, 1)].depends_on == (1, 1)
+        assert tasks[(3, 0)].depends_on == (2, 0)
+
+
+class TestSlideGenerationScheduler:
+    """Test suite for SlideGenerationScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_independent_slides_fan_out(self):
+        fake = _FakeGeneration(delay=0.1)
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(20))
+
+        start = time.monotonic()
+        outputs = await scheduler.run(build_slide_tasks(10, 2, chained=False), fake)
+
+        assert time.monotonic() - start < 0.5  # one round instead of 20 sequential calls
+        assert fake.max_active == 20
+        assert outputs[(10, 1)] == "image-10-1"
+
+    @pytest.mark.asyncio
+    async def test_shared_limit_is_respected(self):
+        fake = _FakeGeneration(delay=0.02)
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(3))
+
+        await scheduler.run(build_slide_tasks(5, 2, chained=False), fake)
+
+        assert fake.max_active == 3
+        assert len(fake.started) == 10
+
+    @pytest.mark.asyncio
+    async def test_carousel_variants_run_in_parallel_chains(self):
+        fake = _FakeGeneration(delay=0.05)
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(10))
+
+        start = time.monotonic()
+        await scheduler.run(build_slide_tasks(4, 2, chained=True), fake)
+        elapsed = time.monotonic() - start
+
+        # Critical path is the 4-slide chain; both variant chains run side by side
+        assert 0.2 <= elapsed < 0.35
+        assert fake.max_active == 2
+        assert fake.previous[(1, 0)] is None
+        assert fake.previous[(3, 1)] == "image-2-1"
+
+    @pytest.mark.asyncio
+    async def test_failed_task_does_not_stop_its_chain(self):
+        fake = _FakeGeneration(delay=0.01, fail={(2, 0)})
+        results = []
+
+        async def on_result(task, output, error):
+            results.append((task.key, output, error))
+
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(4))
+        outputs = await scheduler.run(build_slide_tasks(3, 1, chained=True), fake, on_result=on_result)
+
+        assert outputs[(2, 0)] is None
+        assert fake.previous[(3, 0)] is None
+        assert outputs[(3, 0)] == "image-3-0"
+        failed = [r for r in results if r[0] == (2, 0)][0]
+        assert failed[2] == "generation failed"
+
+    @pytest.mark.asyncio
+    async def test_failed_result_callback_does_not_abort_batch(self):
+        fake = _FakeGeneration(delay=0.01)
+        saved = []
+
+        async def on_result(task, output, error):
+            if task.key == (1, 0):
+                raise RuntimeError("commit failed")
+            saved.append(task.key)
+
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(4))
+        outputs = await scheduler.run(build_slide_tasks(3, 2, chained=True), fake, on_result=on_result)
+
+        assert all(output is not None for output in outputs.values())
+        assert sorted(saved) == [(1, 1), (2, 0), (2, 1), (3, 0), (3, 1)]
+
+    @pytest.mark.asyncio
+    async def test_cancellation_waits_for_runners(self):
+        fake = _FakeGeneration(delay=10)
+        scheduler = SlideGenerationScheduler(semaphore=asyncio.Semaphore(4))
+        batch = asyncio.create_task(scheduler.run(build_slide_tasks(2, 2, chained=False), fake))
+        await asyncio.sleep(0.02)
+
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+
+        assert fake.active == 0  # Every generation call was unwound before run() returned
@@ -12,11 +12,13 @@ import pytest
 import asyncio
 import tempfile
 import os
+import sys
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, patch
 from PIL import Image
 import io
 
+from app.core.config import settings
 from app.services.sns_media_downloader import (
     SNSMediaDownloader,
     SNSMediaDownloadError,
@@ -127,13 +129,9 @@ class TestSNSMediaDownloader:
         """Test Instagram URL download with mocked gallery-dl."""
         url = 'https://www.instagram.com/p/ABC123def456/'
 
-        with patch('app.services.sns_media_downloader.job') as mock_job:
-            # Mock the DownloadJob
-            mock_download_job = MagicMock()
-            mock_job.DownloadJob.return_value = mock_download_job
-            mock_download_job.run.return_value = None
-
+        with patch.object(downloader, '_run_gallery_dl', new=AsyncMock()) as mock_run:
             result = await downloader.download(url, temp_dir)
+            mock_run.assert_awaited_once()
 
             assert result is not None
             assert 'platform' in result
@@ -145,12 +143,9 @@ class TestSNSMediaDownloader:
         """Test Facebook URL download with mocked gallery-dl."""
         url = 'https://www.facebook.com/user/posts/123456789/'
 
-        with patch('app.services.sns_media_downloader.job') as mock_job:
-            mock_download_job = MagicMock()
-            mock_job.DownloadJob.return_value = mock_download_job
-            mock_download_job.run.return_value = None
-
+        with patch.object(downloader, '_run_gallery_dl', new=AsyncMock()) as mock_run:
             result = await downloader.download(url, temp_dir)
+            mock_run.assert_awaited_once()
 
             assert result is not None
             assert result['platform'] == 'facebook'
@@ -160,12 +155,9 @@ class TestSNSMediaDownloader:
         """Test Pinterest URL download with mocked gallery-dl."""
         url = 'https://www.pinterest.com/pin/123456789/'
 
-        with patch('app.services.sns_media_downloader.job') as mock_job:
-            mock_download_job = MagicMock()
-            mock_job.DownloadJob.return_value = mock_download_job
-            mock_download_job.run.return_value = None
-
+        with patch.object(downloader, '_run_gallery_dl', new=AsyncMock()) as mock_run:
             result = await downloader.download(url, temp_dir)
+            mock_run.assert_awaited_once()
 
             assert result is not None
             assert result['platform'] == 'pinterest'
@@ -260,8 +252,7 @@ class TestSNSMediaDownloader:
         """Test handling of network errors during download."""
         url = 'https://www.instagram.com/p/ABC123def456/'
 
-        with patch('app.services.sns_media_downloader.job') as mock_job:
-            mock_job.DownloadJob.side_effect = Exception("Network error")
+        with patch.object(downloader, '_run_gallery_dl', new=AsyncMock(side_effect=Exception("Network error"))):
 
             with pytest.raises(SNSMediaDownloadError):
                 await downloader.download(url, temp_dir)
@@ -271,8 +262,7 @@ class TestSNSMediaDownloader:
         """Test handling of timeout errors during download."""
         url = 'https://www.instagram.com/p/ABC123def456/'
 
-        with patch('app.services.sns_media_downloader.job') as mock_job:
-            mock_job.DownloadJob.side_effect = asyncio.TimeoutError("Download timeout")
+        with patch.object(downloader, '_run_gallery_dl', new=AsyncMock(side_effect=asyncio.TimeoutError("Download timeout"))):
 
             with pytest.raises(SNSMediaDownloadError):
                 await downloader.download(url, temp_dir)
@@ -324,7 +314,7 @@ class TestSNSMediaDownloader:
         assert downloader.max_concurrent_downloads > 0
 
     @pytest.mark.asyncio
-    async def test_concurrent_downloads_limited(self, downloader, temp_dir):
+    async def test_concurrent_downloads_limited(self, temp_dir):
         """Test that concurrent downloads are limited."""
         urls = [
             'https://www.instagram.com/p/ABC123def456/',
@@ -332,20 +322,67 @@ class TestSNSMediaDownloader:
             'https://www.instagram.com/p/JKL345mno678/',
         ]
 
-        # Mock gallery-dl to track concurrent calls
-        with patch('app.services.sns_media_downloader.job') as mock_job:
-            call_count = {'concurrent': 0, 'max': 0}
+        # A python script stands in for gallery-dl: it records how many copies run at
+        # once, then writes a file named after the URL into its --destination
+        fake_gallery_dl = Path(temp_dir) / "gallery-dl"
+        fake_gallery_dl.write_text(
+            f"#!{sys.executable}\n"
+            "import os, sys, time\n"
+            f"state = {str(Path(temp_dir) / 'state')!r}\n"
+            "open(os.path.join(state, str(os.getpid())), 'w').close()\n"
+            "running = len(os.listdir(state))\n"
+            "with open(state + '.max', 'a') as f: f.write(f'{running}\\n')\n"
+            "time.sleep(0.3)\n"
+            "os.remove(os.path.join(state, str(os.getpid())))\n"
+            "args = sys.argv[1:]\n"
+            "dest, cookies = args[args.index('--destination') + 1], args[args.index('--cookies') + 1]\n"
+            "post = args[-1].rstrip('/').rsplit('/', 1)[-1]\n"
+            "open(os.path.join(dest, post + '.jpg'), 'w').write(cookies)\n"
+        )
+        fake_gallery_dl.chmod(0o755)
+        (Path(temp_dir) / "state").mkdir()
+        downloader = SNSMediaDownloader(gallery_dl_command=[str(fake_gallery_dl)])
+
+        with patch('app.services.sns_media_downloader._gallery_dl_semaphore', asyncio.Semaphore(2)):
+            results = await asyncio.gather(*(
+                downloader.download(url, os.path.join(temp_dir, f"out{i}"), self._cookies(temp_dir, i))
+                for i, url in enumerate(urls)
+            ))
+
+        # Every download kept its own destination and cookies
+        for i, (url, result) in enumerate(zip(urls, results)):
+            assert [os.path.basename(path) for path in result['images']] == [url.rstrip('/').rsplit('/', 1)[-1] + '.jpg']
+            assert Path(result['images'][0]).read_text() == self._cookies(temp_dir, i)
+
+        # Two processes overlapped, never more than the limit
+        assert max(int(n) for n in (Path(temp_dir) / "state.max").read_text().split()) == 2
+
+    @staticmethod
+    def _cookies(temp_dir, index):
+        path = os.path.join(temp_dir, f"cookies{index}.txt")
+        Path(path).touch()
+        return path
 
-            def track_concurrent(*args, **kwargs):
-                call_count['concurrent'] += 1
-                call_count['max'] = max(call_count['max'], call_count['concurrent'])
-                call_count['concurrent'] -= 1
-                return MagicMock()
-
-            mock_job.DownloadJob.side_effect = track_concurrent
-
-            # Should not exceed max_concurrent_downloads
-            assert call_count['max'] <= downloader.max_concurrent_downloads
+    @pytest.mark.asyncio
+    async def test_gallery_dl_errors_and_timeouts(self, temp_dir, monkeypatch):
+        """Test that a failing or hanging gallery-dl process raises SNSMediaDownloadError."""
+        fake_gallery_dl = Path(temp_dir) / "gallery-dl"
+        fake_gallery_dl.write_text(
+            f"#!{sys.executable}\n"
+            "import sys, time\n"
+            "if 'hang' in sys.argv[-1]: time.sleep(30)\n"
+            "sys.stderr.write('[instagram][error] HttpError: 404 Not Found')\n"
+            "sys.exit(4)\n"
+        )
+        fake_gallery_dl.chmod(0o755)
+        downloader = SNSMediaDownloader(gallery_dl_command=[str(fake_gallery_dl)])
+
+        with pytest.raises(SNSMediaDownloadError, match="404 Not Found"):
+            await downloader.download('https://www.instagram.com/p/ABC123def456/', temp_dir)
+
+        monkeypatch.setattr(settings, "SNS_DOWNLOAD_TIMEOUT_SECONDS", 0.2)
+        with pytest.raises(SNSMediaDownloadError, match="timeout"):
+            await downloader.download('https://www.instagram.com/p/hang/', temp_dir)
 
 
 class TestSNSMediaDownloadError:
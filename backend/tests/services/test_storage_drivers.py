@@ -0,0 +1,135 @@
+"""
+Tests for the storage drivers and backend selection.
+"""
+
+from io import BytesIO
+from urllib.parse import urlparse
+
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from app.core.config import settings
+from app.services.cloud_storage import CloudStorageService
+from app.services.storage import LocalStorageDriver, create_storage_driver
+from app.services.storage.s3_driver import S3StorageDriver
+
+
+@pytest.fixture
+def driver():
+    return S3StorageDriver(
+        bucket="media",
+        endpoint_url="http://localhost:9000",
+        access_key="minioadmin",
+        secret_key="minioadmin",
+    )
+
+
+class TestLocalStorageDriver:
+    """Test suite for the filesystem driver."""
+
+    def test_put_and_range_read(self, tmp_path):
+        driver = LocalStorageDriver(str(tmp_path))
+        driver.put_object("generated/a.bin", b"0123456789", "application/octet-stream")
+
+        assert driver.exists("generated/a.bin")
+        assert driver.get_url("generated/a.bin") == "/static/generated/a.bin"
+        assert driver.read_range("generated/a.bin") == b"0123456789"
+        assert driver.read_range("generated/a.bin", 2, 5) == b"2345"
+        assert driver.read_range("generated/a.bin", 8) == b"89"
+        assert driver.read_range("generated/missing.bin") is None
+        assert driver.presigned_url("generated/a.bin") == "/static/generated/a.bin"
+
+
+class TestS3StorageDriver:
+    """Test suite for the S3/MinIO driver."""
+
+    def test_minio_urls_are_path_style(self, driver):
+        assert driver.get_url("generated/a.png") == "http://localhost:9000/media/generated/a.png"
+        presigned = urlparse(driver.presigned_url("generated/a.png", expires_seconds=60))
+        assert presigned.path == "/media/generated/a.png"
+        assert "X-Amz-Expires=60" in presigned.query
+
+    def test_download_urls(self, driver):
+        assert driver.key_for_url("http://localhost:9000/media/generated/a.png") == "generated/a.png"
+        assert driver.key_for_url("https://cdn.example.com/generated/a.png") is None
+
+        presigned = urlparse(driver.presigned_url("generated/a.png", download_filename="image_1.png"))
+        assert "response-content-disposition=attachment%3B%20filename%3D%22image_1.png%22" in presigned.query
+
+    def test_range_read_and_missing_object(self, driver):
+        with Stubber(driver.client) as stubber:
+            stubber.add_response(
+                "get_object",
+                {"Body": StreamingBody(BytesIO(b"2345"), 4)},
+                {"Bucket": "media", "Key": "videos/a.mp4", "Range": "bytes=2-5"},
+            )
+            stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+
+            assert driver.read_range("videos/a.mp4", 2, 5) == b"2345"
+            assert driver.exists("videos/missing.mp4") is False
+
+    def test_multipart_calls(self, driver):
+        parts = [{"PartNumber": 1, "ETag": "e1"}]
+
+        with Stubber(driver.client) as stubber:
+            stubber.add_response(
+                "create_multipart_upload",
+                {"UploadId": "u1"},
+                {"Bucket": "media", "Key": "videos/a.mp4", "ContentType": "video/mp4"},
+            )
+            stubber.add_response(
+                "upload_part",
+                {"ETag": "e1"},
+                {"Bucket": "media", "Key": "videos/a.mp4", "Body": b"data", "PartNumber": 1, "UploadId": "u1"},
+            )
+            stubber.add_response(
+                "complete_multipart_upload",
+                {},
+                {"Bucket": "media", "Key": "videos/a.mp4", "UploadId": "u1", "MultipartUpload": {"Parts": parts}},
+            )
+
+            upload_id = driver.create_multipart_upload("videos/a.mp4", "video/mp4")
+            etag = driver.upload_part("videos/a.mp4", upload_id, 1, b"data")
+            driver.complete_multipart_upload("videos/a.mp4", upload_id, [{"PartNumber": 1, "ETag": etag}])
+
+
+class TestBackendSelection:
+    """Test suite for STORAGE_BACKEND handling."""
+
+    def test_auto_without_cos_is_local(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", "auto")
+        monkeypatch.setattr(settings, "TENCENT_SECRET_ID", None)
+        monkeypatch.setattr(settings, "TEMP_DIR", str(tmp_path))
+
+        driver = create_storage_driver()
+
+        assert isinstance(driver, LocalStorageDriver)
+        assert driver.root_dir == str(tmp_path)
+
+    def test_s3_backend(self, monkeypatch):
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", "s3")
+        monkeypatch.setattr(settings, "S3_ENDPOINT", "http://minio:9000")
+        monkeypatch.setattr(settings, "S3_BUCKET_NAME", "media")
+        monkeypatch.setattr(settings, "S3_ACCESS_KEY", "minioadmin")
+        monkeypatch.setattr(settings, "S3_SECRET_KEY", "minioadmin")
+
+        driver = create_storage_driver(max_pool_connections=16)
+
+        assert isinstance(driver, S3StorageDriver)
+        assert driver.client.meta.config.max_pool_connections == 16
+        assert driver.get_url("a.png") == "http://minio:9000/media/a.png"
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_storage_driver("ftp")
+
+    def test_misconfigured_backend_falls_back_to_local(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", "s3")
+        monkeypatch.setattr(settings, "S3_BUCKET_NAME", None)
+        monkeypatch.setattr(settings, "TEMP_DIR", str(tmp_path))
+
+        service = CloudStorageService()
+
+        assert service.upload_bytes(b"x", "a.png", "temp") == "/static/temp/a.png"
+        assert not service.is_cloud_storage_enabled()
@@ -0,0 +1,421 @@
+"""
+Tests for the VideoConcatenator download stage and local clip handling.
+"""
+
+import asyncio
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.video_generator.render_progress import FFmpegProgress, RenderProgress
+from app.services.video_generator.video_concatenator import VideoConcatenator
+
+
+class _FakeDownloads:
+    """Records download concurrency and writes a placeholder file per clip."""
+
+    def __init__(self, delays=None, fail_urls=()):
+        self.delays = delays or {}
+        self.fail_urls = set(fail_urls)
+        self.active = 0
+        self.max_active = 0
+        self.clients = set()
+        self.started = []
+
+    async def __call__(self, url, destination, client=None):
+        self.clients.add(id(client))
+        self.started.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.01))
+            if url in self.fail_urls:
+                return False
+            Path(destination).write_bytes(b"video")
+            return True
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def concatenator(tmp_path):
+    return VideoConcatenator(output_dir=str(tmp_path / "out"))
+
+
+class TestVideoConcatenatorDownloads:
+    """Test suite for the concurrent download stage."""
+
+    @pytest.mark.asyncio
+    async def test_downloads_are_concurrent_and_bounded(self, concatenator, tmp_path, monkeypatch):
+        fake = _FakeDownloads()
+        monkeypatch.setattr(concatenator, "download_video", fake)
+        scenes = [{"video_url": f"https://cdn/{i}.mp4", "duration_seconds": 5} for i in range(10)]
+
+        videos, failed = await concatenator._download_scene_videos(scenes, tmp_path, probe_durations=True)
+
+        assert failed is None
+        assert len(videos) == 10
+        assert fake.max_active == concatenator.DOWNLOAD_CONCURRENCY
+        assert len(fake.clients) == 1 and id(None) not in fake.clients
+
+    @pytest.mark.asyncio
+    async def test_results_keep_scene_order(self, concatenator, tmp_path, monkeypatch):
+        fake = _FakeDownloads(delays={"https://cdn/0.mp4": 0.05})
+        monkeypatch.setattr(concatenator, "download_video", fake)
+        scenes = [
+            {"video_url": "https://cdn/0.mp4", "transition_effect": "fade"},
+            {"video_url": None},
+            {"video_url": "https://cdn/2.mp4"},
+        ]
+
+        async def probe(path):
+            return 4.0
+
+        monkeypatch.setattr(concatenator, "get_video_duration", probe)
+
+        videos, failed = await concatenator._download_scene_videos(scenes, tmp_path, probe_durations=True)
+
+        assert failed is None
+        assert [v.video_url for v in videos] == ["https://cdn/0.mp4", "https://cdn/2.mp4"]
+        assert videos[0].transition_effect == "fade"
+        assert videos[0].local_path.endswith("scene_000.mp4")
+        assert videos[1].local_path.endswith("scene_002.mp4")
+        assert all(v.duration_seconds == 4.0 for v in videos)
+
+    @pytest.mark.asyncio
+    async def test_probe_runs_while_other_downloads_continue(self, concatenator, tmp_path, monkeypatch):
+        fake = _FakeDownloads(delays={"https://cdn/0.mp4": 0.0, "https://cdn/1.mp4": 0.1})
+        monkeypatch.setattr(concatenator, "download_video", fake)
+        probes_during_download = []
+
+        async def probe(path):
+            probes_during_download.append(fake.active)
+            return 5.0
+
+        monkeypatch.setattr(concatenator, "get_video_duration", probe)
+        scenes = [{"video_url": "https://cdn/0.mp4"}, {"video_url": "https://cdn/1.mp4"}]
+
+        await concatenator._download_scene_videos(scenes, tmp_path, probe_durations=True)
+
+        assert probes_during_download[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_probe_skipped_when_not_needed(self, concatenator, tmp_path, monkeypatch):
+        monkeypatch.setattr(concatenator, "download_video", _FakeDownloads())
+        probes = []
+
+        async def probe(path):
+            probes.append(path)
+            return 5.0
+
+        monkeypatch.setattr(concatenator, "get_video_duration", probe)
+        scenes = [{"video_url": f"https://cdn/{i}.mp4"} for i in range(3)]
+
+        videos, _ = await concatenator._download_scene_videos(scenes, tmp_path, probe_durations=False)
+
+        assert probes == []
+        assert all(v.duration_seconds is None for v in videos)
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_remaining_downloads(self, concatenator, tmp_path, monkeypatch):
+        fake = _FakeDownloads(
+            delays={f"https://cdn/{i}.mp4": 1.0 for i in range(2, 10)},
+            fail_urls={"https://cdn/1.mp4"},
+        )
+        monkeypatch.setattr(concatenator, "download_video", fake)
+        scenes = [{"video_url": f"https://cdn/{i}.mp4", "duration_seconds": 5} for i in range(10)]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        videos, failed = await concatenator._download_scene_videos(scenes, tmp_path, probe_durations=False)
+
+        assert failed == 1
+        assert videos == []
+        assert loop.time() - start < 0.5
+        assert len(fake.started) < 10
+
+    @pytest.mark.asyncio
+    async def test_concatenate_reports_failed_scene(self, concatenator, monkeypatch):
+        monkeypatch.setattr(
+            concatenator, "download_video", _FakeDownloads(fail_urls={"https://cdn/1.mp4"})
+        )
+        scenes = [{"video_url": f"https://cdn/{i}.mp4"} for i in range(3)]
+
+        result = await concatenator.concatenate(scenes)
+
+        assert result.success is False
+        assert result.error_message == "Failed to download video for scene 1"
+
+
+class TestVideoConcatenatorLocalSources:
+    """Test suite for zero-copy handling of local clips."""
+
+    def test_resolve_local_path(self, concatenator, tmp_path):
+        clip = tmp_path / "clip.mp4"
+        clip.write_bytes(b"video")
+
+        assert concatenator.resolve_local_path(str(clip)) == str(clip)
+        assert concatenator.resolve_local_path(f"file://{clip}") == str(clip)
+        assert concatenator.resolve_local_path(f"file://{tmp_path / 'missing.mp4'}") is None
+        assert concatenator.resolve_local_path("https://cdn/clip.mp4") is None
+
+    @pytest.mark.asyncio
+    async def test_download_video_hardlinks_local_file(self, concatenator, tmp_path):
+        clip = tmp_path / "clip.mp4"
+        clip.write_bytes(b"video")
+        destination = tmp_path / "linked.mp4"
+
+        assert await concatenator.download_video(str(clip), str(destination)) is True
+        assert destination.read_bytes() == b"video"
+        assert os.stat(destination).st_ino == os.stat(clip).st_ino
+
+    @pytest.mark.asyncio
+    async def test_download_video_copies_across_filesystems(self, concatenator, tmp_path, monkeypatch):
+        clip = tmp_path / "clip.mp4"
+        clip.write_bytes(b"video")
+        destination = tmp_path / "copied.mp4"
+
+        def cross_device(src, dst):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "link", cross_device)
+
+        assert await concatenator.download_video(f"file://{clip}", str(destination)) is True
+        assert destination.read_bytes() == b"video"
+        assert os.stat(destination).st_ino != os.stat(clip).st_ino
+
+    @pytest.mark.asyncio
+    async def test_local_clips_are_used_in_place(self, concatenator, tmp_path, monkeypatch):
+        clips = []
+        for i in range(3):
+            clip = tmp_path / f"clip_{i}.mp4"
+            clip.write_bytes(b"video")
+            clips.append(clip)
+        fake = _FakeDownloads()
+        monkeypatch.setattr(concatenator, "download_video", fake)
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        scenes = [{"video_url": str(clips[0])}, {"video_url": "https://cdn/1.mp4"}, {"video_url": f"file://{clips[2]}"}]
+
+        videos, failed = await concatenator._download_scene_videos(scenes, work_dir, probe_durations=False)
+
+        assert failed is None
+        assert fake.started == ["https://cdn/1.mp4"]
+        assert [v.local_path for v in videos] == [str(clips[0]), str(work_dir / "scene_001.mp4"), str(clips[2])]
+
+
+class _FakeFFmpeg:
+    """Stands in for _run_ffmpeg, writing the output file of every command."""
+
+    def __init__(self):
+        self.commands = []
+
+    async def __call__(self, args, on_progress=None):
+        self.commands.append(args)
+        Path(args[-1]).write_bytes(b"encoded")
+        if on_progress is not None:
+            on_progress(FFmpegProgress(out_time_seconds=1.0, done=True))
+        return True, None
+
+    @property
+    def segment_renders(self):
+        return [c for c in self.commands if "-filter_complex" in c]
+
+
+@pytest.fixture
+def incremental(tmp_path, monkeypatch):
+    concatenator = VideoConcatenator(
+        output_dir=str(tmp_path / "out"),
+        segment_cache_dir=str(tmp_path / "segments"),
+    )
+    ffmpeg = _FakeFFmpeg()
+    monkeypatch.setattr(concatenator, "_run_ffmpeg", ffmpeg)
+    return concatenator, ffmpeg
+
+
+def _clips(tmp_path, contents):
+    paths = []
+    for i, content in enumerate(contents):
+        path = tmp_path / f"clip_{i}_{content}.mp4"
+        path.write_bytes(content.encode())
+        paths.append(path)
+    return [{"video_url": str(p), "duration_seconds": 6.0, "transition_effect": "fade"} for p in paths]
+
+
+class TestVideoConcatenatorIncremental:
+    """Test suite for incremental xfade rendering."""
+
+    @pytest.mark.asyncio
+    async def test_first_render_encodes_every_segment(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+
+        result = await concatenator.concatenate(_clips(tmp_path, ["a", "b", "c"]))
+
+        assert result.success is True
+        # 3 bodies + 2 transitions, then one stream-copy concat
+        assert len(ffmpeg.segment_renders) == 5
+        assert ffmpeg.commands[-1][ffmpeg.commands[-1].index("-c") + 1] == "copy"
+        assert result.transitions_applied == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_rerender_uses_cache(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b", "c"])
+
+        await concatenator.concatenate(scenes)
+        ffmpeg.commands.clear()
+        result = await concatenator.concatenate(scenes)
+
+        assert result.success is True
+        assert ffmpeg.segment_renders == []
+        assert len(ffmpeg.commands) == 1
+
+    @pytest.mark.asyncio
+    async def test_single_scene_change_renders_touching_segments(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b", "c", "d"])
+
+        await concatenator.concatenate(scenes)
+        ffmpeg.commands.clear()
+        scenes[1] = _clips(tmp_path, ["x"])[0]
+        await concatenator.concatenate(scenes)
+
+        # Body of the new scene plus the transitions on either side
+        assert len(ffmpeg.segment_renders) == 3
+        assert all(any("clip_0_x" in arg for arg in cmd) for cmd in ffmpeg.segment_renders)
+
+    @pytest.mark.asyncio
+    async def test_transition_change_invalidates_only_that_transition(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b", "c"])
+
+        await concatenator.concatenate(scenes)
+        ffmpeg.commands.clear()
+        scenes[0]["transition_effect"] = "wipeleft"
+        await concatenator.concatenate(scenes)
+
+        assert len(ffmpeg.segment_renders) == 1
+        filter_complex = ffmpeg.segment_renders[0][ffmpeg.segment_renders[0].index("-filter_complex") + 1]
+        assert "transition=wipeleft" in filter_complex
+
+    @pytest.mark.asyncio
+    async def test_short_clips_fall_back_to_full_graph(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b"])
+        scenes[1]["duration_seconds"] = 0.6
+
+        result = await concatenator.concatenate(scenes, transition_duration_ms=500)
+
+        assert result.success is True
+        assert len(ffmpeg.commands) == 1
+        assert ffmpeg.commands[0].count("-i") == 2
+        assert not (tmp_path / "segments").exists()
+
+
+class TestVideoConcatenatorProfiles:
+    """Test suite for encoding profiles."""
+
+    @pytest.mark.asyncio
+    async def test_profile_sets_encoder_options(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+
+        await concatenator.concatenate(_clips(tmp_path, ["a", "b"]), encoding_profile="fast-preview")
+
+        for cmd in ffmpeg.segment_renders:
+            assert cmd[cmd.index("-preset") + 1] == "ultrafast"
+            assert cmd[cmd.index("-crf") + 1] == "30"
+
+    @pytest.mark.asyncio
+    async def test_profiles_do_not_share_cached_segments(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b"])
+
+        await concatenator.concatenate(scenes, encoding_profile="fast-preview")
+        ffmpeg.commands.clear()
+        await concatenator.concatenate(scenes, encoding_profile="final")
+
+        assert len(ffmpeg.segment_renders) == 3
+        assert all(cmd[cmd.index("-preset") + 1] == "slow" for cmd in ffmpeg.segment_renders)
+
+    @pytest.mark.asyncio
+    async def test_segments_pruned_by_concurrent_render_are_rendered_again(self, incremental, tmp_path, monkeypatch):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b", "c"])
+        await concatenator.concatenate(scenes)
+        cached = sorted((tmp_path / "segments").glob("*.mp4"))
+        ffmpeg.commands.clear()
+
+        async def prune_while_rendering(args, on_progress=None):
+            # Another render prunes the segments this one already found in the cache
+            if not ffmpeg.commands:
+                for path in cached:
+                    path.unlink()
+            return await ffmpeg(args, on_progress)
+
+        monkeypatch.setattr(concatenator, "_run_ffmpeg", prune_while_rendering)
+        scenes[2] = _clips(tmp_path, ["x"])[0]
+        result = await concatenator.concatenate(scenes)
+
+        assert result.success is True
+        # Body of the new scene and its transition, then the 3 pruned segments still in use
+        assert len(ffmpeg.segment_renders) == 5
+        assert len(list((tmp_path / "segments").glob("*.mp4"))) == 5
+
+    @pytest.mark.asyncio
+    async def test_unknown_profile_is_rejected(self, incremental, tmp_path):
+        concatenator, ffmpeg = incremental
+
+        result = await concatenator.concatenate(_clips(tmp_path, ["a", "b"]), encoding_profile="turbo")
+
+        assert result.success is False
+        assert result.error_message == "Unknown encoding profile: turbo"
+        assert ffmpeg.commands == []
+
+
+class TestVideoConcatenatorProgress:
+    """Test suite for progress reporting during concatenation."""
+
+    @pytest.mark.asyncio
+    async def test_progress_reaches_completion(self, incremental, tmp_path):
+        concatenator, _ = incremental
+        progress = RenderProgress(key="project-1")
+
+        result = await concatenator.concatenate(_clips(tmp_path, ["a", "b"]), progress=progress)
+
+        assert result.success is True
+        assert progress.status == "completed"
+        assert progress.percent == 100.0
+
+    @pytest.mark.asyncio
+    async def test_cached_segments_count_as_done(self, incremental, tmp_path, monkeypatch):
+        concatenator, ffmpeg = incremental
+        scenes = _clips(tmp_path, ["a", "b", "c"])
+        await concatenator.concatenate(scenes)
+
+        stages = []
+        progress = RenderProgress(key="project-1")
+
+        async def join_only(args, on_progress=None):
+            stages.append((progress.stage, progress.percent))
+            return await ffmpeg(args, on_progress)
+
+        monkeypatch.setattr(concatenator, "_run_ffmpeg", join_only)
+        await concatenator.concatenate(scenes, progress=progress)
+
+        # Every segment came from the cache, only the join is left
+        assert stages == [("joining", 95.2)]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_reported(self, incremental, tmp_path):
+        concatenator, _ = incremental
+        progress = RenderProgress(key="project-1")
+
+        result = await concatenator.concatenate(
+            _clips(tmp_path, ["a", "b"]), encoding_profile="turbo", progress=progress
+        )
+
+        assert result.success is False
+        assert progress.status == "failed"
+        assert progress.error_message == "Unknown encoding profile: turbo"
@@ -0,0 +1,139 @@
+"""
+Tests for pipelined extension hops in GeminiVeoGenerator.generate_extended_video.
+"""
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.video_generator import video_generator_service
+from app.services.video_generator.rate_limiter import TokenBucketRateLimiter
+from app.services.video_generator.video_generator_service import GeminiVeoGenerator, SceneInput
+
+
+class _FakeVideo:
+    def __init__(self, data: bytes):
+        self.video_bytes = data
+        self.uri = None
+
+    def save(self, path):
+        Path(path).write_bytes(self.video_bytes)
+
+
+class _FakeVeoClient:
+    """Stands in for genai.Client; every call returns a finished operation."""
+
+    def __init__(self, fail_on_hop=None):
+        self.fail_on_hop = fail_on_hop
+        self.extension_inputs = []
+        self.models = SimpleNamespace(generate_videos=self.generate_videos)
+        self.files = SimpleNamespace(download=self.download)
+
+    def generate_videos(self, model, prompt, config, video=None, image=None):
+        if video is None:
+            output = b"initial"
+        else:
+            self.extension_inputs.append(video.video_bytes)
+            hop = len(self.extension_inputs)
+            if hop == self.fail_on_hop:
+                return SimpleNamespace(done=True, result=None)
+            output = f"hop{hop}".encode()
+        return SimpleNamespace(
+            done=True,
+            result=SimpleNamespace(generated_videos=[SimpleNamespace(video=_FakeVideo(output))]),
+        )
+
+    def download(self, file):
+        return file.video_bytes
+
+
+def _make_scenes(count: int):
+    return [
+        SceneInput(scene_number=i + 1, description=f"Scene {i + 1}", duration_seconds=7, scene_type="hook")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_generator_service, "VIDEO_OUTPUT_DIR", tmp_path)
+    gen = GeminiVeoGenerator()
+    gen.rate_limiter = TokenBucketRateLimiter(requests_per_minute=0, max_in_flight=1)
+
+    async def wait_for_operation(operation, expected_seconds=None):
+        assert gen.rate_limiter.in_flight == 1
+        return "op-1", operation
+
+    monkeypatch.setattr(gen, "_wait_for_operation", wait_for_operation)
+    return gen
+
+
+class TestExtendedVideoPipeline:
+    """Test suite for the extension hop pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_hops_chain_in_memory_without_fixed_delay(self, generator):
+        client = _FakeVeoClient()
+        generator.client = client
+
+        start = time.monotonic()
+        result = await generator.generate_extended_video(_make_scenes(4), target_duration_seconds=29)
+
+        assert time.monotonic() - start < 5
+        assert result.status == "completed"
+        assert result.extension_hops_completed == 3
+        assert result.final_duration_seconds == 29
+        # Each hop extends the previous hop's output
+        assert client.extension_inputs == [b"initial", b"hop1", b"hop2"]
+        for i, hop in enumerate(result.hop_results, start=1):
+            assert Path(hop.video_path).read_bytes() == f"hop{i}".encode()
+        assert result.video_path == result.hop_results[-1].video_path
+
+    @pytest.mark.asyncio
+    async def test_failed_hop_returns_last_saved_video(self, generator):
+        generator.client = _FakeVeoClient(fail_on_hop=2)
+
+        result = await generator.generate_extended_video(_make_scenes(4), target_duration_seconds=29)
+
+        assert result.status == "partial"
+        assert result.extension_hops_completed == 1
+        assert result.final_duration_seconds == 15
+        assert [h.status for h in result.hop_results] == ["completed", "failed"]
+        assert Path(result.video_path).read_bytes() == b"hop1"
+        assert "hop 2" in result.error_message
+
+    @pytest.mark.asyncio
+    async def test_failed_middle_save_is_superseded_by_later_hop(self, generator, monkeypatch):
+        generator.client = _FakeVeoClient()
+        save_extended_video = generator._save_extended_video
+
+        async def flaky_save(video_bytes):
+            if video_bytes == b"hop2":
+                raise OSError("disk full")
+            return await save_extended_video(video_bytes)
+
+        monkeypatch.setattr(generator, "_save_extended_video", flaky_save)
+
+        result = await generator.generate_extended_video(_make_scenes(4), target_duration_seconds=29)
+
+        # hop3's output already contains hop2, so nothing is missing
+        assert result.status == "completed"
+        assert result.extension_hops_completed == 3
+        assert result.final_duration_seconds == 29
+        assert result.scenes_processed == 4
+        assert result.hop_results[1].video_path is None
+        assert Path(result.video_path).read_bytes() == b"hop3"
+
+    @pytest.mark.asyncio
+    async def test_extend_video_from_file(self, generator, tmp_path):
+        generator.client = _FakeVeoClient()
+        source = tmp_path / "source.mp4"
+        source.write_bytes(b"source")
+
+        result = await generator.extend_video(str(source), "continue the scene")
+
+        assert result.status == "completed"
+        assert generator.client.extension_inputs == [b"source"]
+        assert Path(result.video_path).read_bytes() == b"hop1"
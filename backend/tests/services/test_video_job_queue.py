@@ -0,0 +1,307 @@
+"""
+Tests for the durable video generation job queue.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Storyboard, VideoGenerationJob, VideoProject
+from app.models.scene_video import SceneVideo
+from app.services.video_generator import MockVideoGenerator, VideoGenerationResult
+from app.services.video_job_queue import (
+    VideoJobWorkerPool,
+    enqueue_video_generation_job,
+)
+
+
+async def _create_project(session_factory, num_scenes: int = 3) -> str:
+    project_id = str(uuid.uuid4())
+    async with session_factory() as db:
+        db.add(VideoProject(
+            id=project_id,
+            title="Test project",
+            brand_id=str(uuid.uuid4()),
+            product_id=str(uuid.uuid4()),
+            status="draft",
+            current_step=1,
+            aspect_ratio="16:9",
+        ))
+        db.add(Storyboard(
+            id=str(uuid.uuid4()),
+            video_project_id=project_id,
+            generation_mode="ai_optimized",
+            scenes=[
+                {"scene_number": i, "description": f"Scene {i}", "duration_seconds": 5, "scene_type": "hook"}
+                for i in range(1, num_scenes + 1)
+            ],
+            version=1,
+            is_active=True,
+        ))
+        await db.commit()
+    return project_id
+
+
+async def _enqueue(session_factory, project_id: str, num_scenes: int = 3) -> str:
+    async with session_factory() as db:
+        job = await enqueue_video_generation_job(
+            db,
+            project_id=project_id,
+            provider="mock",
+            params={"aspect_ratio": "16:9", "mode": "per_scene"},
+            total_scenes=num_scenes,
+        )
+        await db.commit()
+        return job.id
+
+
+def _mock_generator(fail_scenes=(), calls=None):
+    generator = MockVideoGenerator()
+
+    async def generate_from_prompt(prompt, duration_seconds=8, aspect_ratio="16:9"):
+        if calls is not None:
+            calls.append(prompt)
+        await asyncio.sleep(0)
+        if any(f"Scene {n}" in prompt for n in fail_scenes):
+            return VideoGenerationResult(status="failed", error_message="boom")
+        return VideoGenerationResult(
+            status="completed",
+            video_url=f"/static/videos/{uuid.uuid4()}.mp4",
+            duration_seconds=duration_seconds,
+        )
+
+    generator.generate_from_prompt = generate_from_prompt
+    return generator
+
+
+def _pool(session_factory, **kwargs) -> VideoJobWorkerPool:
+    return VideoJobWorkerPool(
+        session_factory=session_factory,
+        num_workers=kwargs.pop("num_workers", 2),
+        poll_interval_seconds=0.05,
+        heartbeat_seconds=0.05,
+        stale_seconds=kwargs.pop("stale_seconds", 60),
+    )
+
+
+async def _get_job(session_factory, job_id: str) -> VideoGenerationJob:
+    async with session_factory() as db:
+        return await db.get(VideoGenerationJob, job_id)
+
+
+async def _scene_videos(session_factory, project_id: str):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(SceneVideo)
+            .where(SceneVideo.video_project_id == project_id)
+            .order_by(SceneVideo.scene_number)
+        )
+        return result.scalars().all()
+
+
+class TestVideoJobQueue:
+    """Test suite for VideoJobWorkerPool."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_creates_queued_job(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "queued"
+        assert job.total_scenes == 3
+        assert job.attempts == 0
+
+    @pytest.mark.asyncio
+    async def test_claim_is_exclusive(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+
+        first = _pool(session_factory)
+        second = _pool(session_factory)
+
+        assert await first._claim_next_job() == job_id
+        assert await second._claim_next_job() is None
+
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "processing"
+        assert job.worker_id == first.worker_id
+        assert job.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_process_job_persists_scene_videos(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+        pool = _pool(session_factory)
+        await pool._claim_next_job()
+
+        with patch("app.services.video_job_queue.get_video_generator", return_value=_mock_generator()):
+            await pool.process_job(job_id)
+
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "completed"
+        assert job.completed_scenes == 3
+        assert job.completed_at is not None
+
+        scene_videos = await _scene_videos(session_factory, project_id)
+        assert [sv.scene_number for sv in scene_videos] == [1, 2, 3]
+        assert all(sv.status == "completed" for sv in scene_videos)
+        assert all(sv.generation_params["job_id"] == job_id for sv in scene_videos)
+        assert all(sv.scene_segment_type == "hook" for sv in scene_videos)
+
+        async with session_factory() as db:
+            project = await db.get(VideoProject, project_id)
+            assert project.status == "video_generated"
+
+    @pytest.mark.asyncio
+    async def test_scene_progress_is_visible_while_running(self, session_factory):
+        project_id = await _create_project(session_factory, num_scenes=2)
+        job_id = await _enqueue(session_factory, project_id, num_scenes=2)
+        pool = _pool(session_factory)
+        await pool._claim_next_job()
+
+        release = asyncio.Event()
+        generator = MockVideoGenerator()
+
+        async def generate_from_prompt(prompt, duration_seconds=8, aspect_ratio="16:9"):
+            if "Scene 2" in prompt:
+                await release.wait()
+            return VideoGenerationResult(status="completed", video_url="/static/videos/x.mp4")
+
+        generator.generate_from_prompt = generate_from_prompt
+
+        with patch("app.services.video_job_queue.get_video_generator", return_value=generator):
+            task = asyncio.create_task(pool.process_job(job_id))
+            for _ in range(100):
+                job = await _get_job(session_factory, job_id)
+                if job.completed_scenes == 1:
+                    break
+                await asyncio.sleep(0.01)
+
+            scene_videos = await _scene_videos(session_factory, project_id)
+            assert [sv.status for sv in scene_videos] == ["completed", "processing"]
+
+            release.set()
+            await task
+
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_marks_job_partial(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+        pool = _pool(session_factory)
+        await pool._claim_next_job()
+
+        with patch(
+            "app.services.video_job_queue.get_video_generator",
+            return_value=_mock_generator(fail_scenes=(2,)),
+        ):
+            await pool.process_job(job_id)
+
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "partial"
+        assert job.completed_scenes == 2
+        assert job.failed_scenes == 1
+        assert job.error_message == "1 scene(s) failed"
+
+    @pytest.mark.asyncio
+    async def test_retry_skips_scenes_completed_by_earlier_attempt(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+        pool = _pool(session_factory)
+        await pool._claim_next_job()
+
+        with patch(
+            "app.services.video_job_queue.get_video_generator",
+            return_value=_mock_generator(fail_scenes=(3,)),
+        ):
+            await pool.process_job(job_id)
+
+        calls = []
+        with patch(
+            "app.services.video_job_queue.get_video_generator",
+            return_value=_mock_generator(calls=calls),
+        ):
+            await pool.process_job(job_id)
+
+        assert len(calls) == 1
+        assert "Scene 3" in calls[0]
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "completed"
+        assert job.completed_scenes == 3
+
+    @pytest.mark.asyncio
+    async def test_stale_jobs_are_requeued_then_failed(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+        pool = _pool(session_factory, stale_seconds=10)
+
+        async with session_factory() as db:
+            job = await db.get(VideoGenerationJob, job_id)
+            job.status = "processing"
+            job.attempts = 1
+            job.worker_id = "dead-worker"
+            job.heartbeat_at = datetime.utcnow() - timedelta(seconds=60)
+            await db.commit()
+
+        assert await pool.recover_stale_jobs() == 1
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "queued"
+        assert job.worker_id is None
+
+        async with session_factory() as db:
+            job = await db.get(VideoGenerationJob, job_id)
+            job.status = "processing"
+            job.attempts = job.max_attempts
+            job.heartbeat_at = datetime.utcnow() - timedelta(seconds=60)
+            await db.commit()
+
+        await pool.recover_stale_jobs()
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_crashed_job_fails_its_processing_scenes(self, session_factory):
+        project_id = await _create_project(session_factory)
+        job_id = await _enqueue(session_factory, project_id)
+        pool = _pool(session_factory)
+        generator = _mock_generator()
+
+        async def crash(**kwargs):
+            raise RuntimeError("provider unavailable")
+
+        generator.generate_per_scene_videos = crash
+        with patch("app.services.video_job_queue.get_video_generator", return_value=generator):
+            await pool._run_job(job_id)
+
+        job = await _get_job(session_factory, job_id)
+        assert job.status == "failed" and job.error_message == "provider unavailable"
+        scene_videos = await _scene_videos(session_factory, project_id)
+        assert [v.status for v in scene_videos] == ["failed"] * 3
+        assert all(v.error_message == "provider unavailable" for v in scene_videos)
+
+    @pytest.mark.asyncio
+    async def test_started_pool_runs_queued_jobs(self, session_factory):
+        project_ids = [await _create_project(session_factory) for _ in range(3)]
+        job_ids = [await _enqueue(session_factory, pid) for pid in project_ids]
+        pool = _pool(session_factory, num_workers=2)
+
+        with patch("app.services.video_job_queue.get_video_generator", return_value=_mock_generator()):
+            await pool.start()
+            try:
+                for _ in range(200):
+                    statuses = [(await _get_job(session_factory, j)).status for j in job_ids]
+                    if all(s == "completed" for s in statuses):
+                        break
+                    await asyncio.sleep(0.02)
+            finally:
+                await pool.stop()
+
+        assert statuses == ["completed"] * 3
+        assert pool.running_jobs == []
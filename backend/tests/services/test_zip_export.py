@@ -0,0 +1,103 @@
+"""
+Tests for the streaming ZIP export.
+"""
+
+import asyncio
+import io
+import warnings
+import zipfile
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.zip_export import ZipEntry, stream_zip
+
+
+class _CosTransport(httpx.AsyncBaseTransport):
+    """Serves images by path after a delay and tracks concurrent requests."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def handle_async_request(self, request):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if "missing" in request.url.path:
+            return httpx.Response(404)
+        return httpx.Response(200, content=f"image {request.url.path}".encode())
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class TestStreamZip:
+    """Test suite for stream_zip."""
+
+    @pytest.mark.asyncio
+    async def test_archive_of_remote_and_local_images(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "TEMP_DIR", str(tmp_path))
+        (tmp_path / "generated").mkdir()
+        (tmp_path / "generated" / "local.png").write_bytes(b"local image" * 100)
+
+        cos = _CosTransport()
+        entries = [
+            ZipEntry(f"slide_0{i}.png", f"https://bucket.cos.ap-seoul.myqcloud.com/{i}.png")
+            for i in range(1, 7)
+        ]
+        entries.insert(1, ZipEntry("missing.png", "https://bucket.cos.ap-seoul.myqcloud.com/missing.png"))
+        entries.append(ZipEntry("local.png", "/static/generated/local.png"))
+
+        async with httpx.AsyncClient(transport=cos) as client:
+            chunks = await _collect(stream_zip(entries, client=client, prefetch=3, chunk_size=256))
+
+        assert len(chunks) > 2  # Streamed as it was built
+        assert cos.max_active == 3  # Fetched concurrently, bounded by the window
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert archive.testzip() is None
+        assert archive.namelist() == [f"slide_0{i}.png" for i in range(1, 7)] + ["local.png"]
+        assert archive.read("slide_03.png") == b"image /3.png"
+        assert archive.read("local.png") == b"local image" * 100
+
+    @pytest.mark.asyncio
+    async def test_deflate_compression(self, tmp_path):
+        image = tmp_path / "a.png"
+        image.write_bytes(b"a" * 10_000)
+
+        chunks = await _collect(stream_zip([ZipEntry("a.png", str(image))], compression_level=6))
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        info = archive.getinfo("a.png")
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+        assert info.compress_size < 1000
+        assert archive.read("a.png") == b"a" * 10_000
+
+    @pytest.mark.asyncio
+    async def test_images_sharing_slide_and_variant_keep_unique_names(self, tmp_path):
+        # Regenerating a slide adds rows with the same slide number and variant
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.png"
+            path.write_bytes(f"image {i}".encode())
+            paths.append(str(path))
+        entries = [
+            ZipEntry("slide_01_variant_1.png", paths[0]),
+            ZipEntry("slide_01_variant_1.png", paths[1]),
+            ZipEntry("slide_01_variant_1_2.png", paths[2]),
+        ]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # zipfile warns on duplicate names
+            chunks = await _collect(stream_zip(entries))
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert archive.namelist() == ["slide_01_variant_1.png", "slide_01_variant_1_2.png", "slide_01_variant_1_2_2.png"]
+        assert [archive.read(name) for name in archive.namelist()] == [b"image 0", b"image 1", b"image 2"]
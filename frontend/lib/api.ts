@@ -27,6 +27,7 @@ export interface AnalyzeRequest {
   url: string;
   title?: string;
   extract_audio?: boolean;
+  force_refresh?: boolean;
 }
 
 // Score breakdown for detailed scoring criteria
@@ -167,11 +168,14 @@ export interface AnalysisResult {
 }
 
 export const referenceApi = {
-  analyze: async (url: string, title?: string) => {
+  analyze: async (url: string, title?: string, forceRefresh?: boolean) => {
     const data: AnalyzeRequest = { url };
     if (title) {
       data.title = title;
     }
+    if (forceRefresh) {
+      data.force_refresh = true;
+    }
     const response = await api.post("/references/analyze", data);
     return response.data;
   },
@@ -195,8 +199,10 @@ export const referenceApi = {
     await api.delete(`/references/${analysisId}`);
   },
 
-  reanalyze: async (analysisId: string): Promise<{ analysis_id: string; status: string; message: string }> => {
-    const response = await api.post(`/references/${analysisId}/reanalyze`);
+  reanalyze: async (analysisId: string, forceRefresh?: boolean): Promise<{ analysis_id: string; status: string; message: string }> => {
+    const response = await api.post(`/references/${analysisId}/reanalyze`, null, {
+      params: forceRefresh ? { force_refresh: true } : undefined,
+    });
     return response.data;
   },
 
@@ -574,7 +580,7 @@ export interface SceneVideoStatus {
 
 // Extended video generation status with per-scene support
 export interface ExtendedVideoGenerationStatus {
-  status: "pending" | "processing" | "completed" | "failed";
+  status: "pending" | "queued" | "processing" | "completed" | "partial" | "failed";
   video_url?: string;
   operation_id?: string;
   error_message?: string;
@@ -582,6 +588,36 @@ export interface ExtendedVideoGenerationStatus {
   scene_videos?: SceneVideoStatus[];
   concatenation_status?: "pending" | "processing" | "completed" | "failed";
   final_video_url?: string;
+  job_id?: string;  // Set when per-scene generation was queued as a background job
+}
+
+// Progress of the latest concatenation of a project
+export interface VideoRenderProgress {
+  status: "running" | "completed" | "failed";
+  stage: "preparing" | "downloading" | "rendering" | "joining";
+  percent: number;
+  fps?: number;
+  speed?: number;
+  error_message?: string;
+  started_at: number;
+  updated_at: number;
+}
+
+// Progress of a queued video generation job
+export interface VideoGenerationJob {
+  id: string;
+  video_project_id: string;
+  status: "queued" | "processing" | "completed" | "partial" | "failed";
+  provider: string;
+  total_scenes: number;
+  completed_scenes: number;
+  failed_scenes: number;
+  attempts: number;
+  error_message?: string;
+  created_at: string;
+  started_at?: string;
+  completed_at?: string;
+  scene_videos: SceneVideoStatus[];
 }
 
 // Scene Extension video generation response
@@ -884,12 +920,22 @@ export const studioApi = {
     data: {
       provider?: string;  // "veo" or "mock"
       aspect_ratio?: string;  // "16:9", "9:16", "1:1"
+      mode?: "single" | "per_scene";
     }
-  ): Promise<VideoGenerationStatus> => {
+  ): Promise<ExtendedVideoGenerationStatus> => {
     const response = await api.post(`/studio/projects/${projectId}/video/generate`, data);
     return response.data;
   },
 
+  // Get progress of a queued per-scene video generation job
+  getVideoJob: async (
+    projectId: string,
+    jobId: string
+  ): Promise<VideoGenerationJob> => {
+    const response = await api.get(`/studio/projects/${projectId}/video/jobs/${jobId}`);
+    return response.data;
+  },
+
   getVideoStatus: async (
     projectId: string,
     operationId?: string
@@ -899,16 +945,18 @@ export const studioApi = {
     return response.data;
   },
 
+  // Low-res animatic of the whole storyboard, or of one scene when sceneNumber is given
   generateVideoPreview: async (
     projectId: string,
-    sceneNumber: number,
+    sceneNumber: number | null,
     data: {
       provider?: string;
       aspect_ratio?: string;
     }
   ): Promise<VideoGenerationStatus> => {
+    const query = sceneNumber != null ? `?scene_number=${sceneNumber}` : "";
     const response = await api.post(
-      `/studio/projects/${projectId}/video/generate-preview?scene_number=${sceneNumber}`,
+      `/studio/projects/${projectId}/video/generate-preview${query}`,
       data
     );
     return response.data;
@@ -936,6 +984,7 @@ export const studioApi = {
     data?: {
       transition_type?: string;
       include_audio?: boolean;
+      encoding_profile?: "fast-preview" | "balanced" | "final";
     }
   ): Promise<ExtendedVideoGenerationStatus> => {
     const response = await api.post(
@@ -945,6 +994,13 @@ export const studioApi = {
     return response.data;
   },
 
+  // Get progress of the running concatenation
+  // (SSE stream: /studio/projects/{projectId}/video/concatenate/progress/stream)
+  getConcatenationProgress: async (projectId: string): Promise<VideoRenderProgress> => {
+    const response = await api.get(`/studio/projects/${projectId}/video/concatenate/progress`);
+    return response.data;
+  },
+
   // Get scene video status
   getSceneVideoStatus: async (
     projectId: string,
@@ -1222,6 +1278,27 @@ export interface ImageProject {
   generated_images?: GeneratedImage[];
 }
 
+export interface ImageGenerationItem {
+  slide_number: number;
+  variant_index: number;
+  status: "pending" | "processing" | "completed" | "failed" | "skipped" | "cancelled";
+  retry_count: number;
+  generated_image_id?: string;
+  error_message?: string;
+  started_at?: string;
+  completed_at?: string;
+}
+
+export interface ImageGenerationProgress {
+  project_id: string;
+  batch_id?: string;
+  status: string;
+  total: number;
+  status_counts: Record<string, number>;
+  progress_percentage: number;
+  items: ImageGenerationItem[];
+}
+
 export interface ReferenceImageBase64 {
   data: string;
   mime_type: string;
@@ -1403,11 +1480,21 @@ export const imageProjectApi = {
   // Start background image generation (returns immediately)
   startBackgroundGeneration: async (
     projectId: string
-  ): Promise<{ project_id: string; status: string; message: string; total_slides: number }> => {
+  ): Promise<{ project_id: string; status: string; message: string; total_slides: number; batch_id?: string }> => {
     const response = await api.post(`/image-projects/${projectId}/generate-background`);
     return response.data;
   },
 
+  getGenerationProgress: async (projectId: string): Promise<ImageGenerationProgress> => {
+    const response = await api.get(`/image-projects/${projectId}/generation-progress`);
+    return response.data;
+  },
+
+  cancelBackgroundGeneration: async (projectId: string): Promise<ImageGenerationProgress> => {
+    const response = await api.post(`/image-projects/${projectId}/generate-background/cancel`);
+    return response.data;
+  },
+
   // Download image with project aspect ratio applied
   downloadImage: async (imageId: string, filename?: string): Promise<void> => {
     const response = await api.get(`/image-projects/images/${imageId}/download`, {
@@ -1435,6 +1522,23 @@ export const imageProjectApi = {
     document.body.removeChild(link);
     window.URL.revokeObjectURL(url);
   },
+
+  // Download project images as one ZIP (streamed by the browser straight to disk)
+  exportImages: (projectId: string, options?: { imageIds?: string[]; selectedOnly?: boolean }): void => {
+    const params = new URLSearchParams();
+    options?.imageIds?.forEach((id) => params.append('image_ids', id));
+    if (options?.selectedOnly) {
+      params.set('selected_only', 'true');
+    }
+    const query = params.toString();
+
+    const link = document.createElement('a');
+    link.href = `/api/v1/image-projects/${projectId}/export${query ? `?${query}` : ''}`;
+    link.download = `project_${projectId}.zip`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+  },
 };
 
 export default api;